@@ -2,86 +2,264 @@
 Pytest configuration and fixtures for Bagisto Selenium tests.
 """
 import os
-import glob
+import time
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
 from dotenv import load_dotenv
+from utils.timeline import StepTimeline, activate_timeline, current_timeline
+from utils.results_store import ResultsStore, collect_environment
+from utils.log import get_logger, configure_logging, shutdown_logging, set_test_context
+from utils.artifacts import BrowserRegistry, capture_failure, flush_traces, stop_artifact_writer
+from utils.crawler import start_background_crawl
+from utils.http_session import StorefrontSession
+from utils.browser_factory import BrowserFactory
+from utils.resources import ResourceMonitor, resource_monitor_enabled
+from utils.reaper import browser_reaper, install_signal_handlers, SESSION
+from utils.catalog_locks import CatalogLocks, activate_locks, catalog_locks_enabled
+from utils.catalog_snapshot import CatalogSnapshot, SnapshotError, catalog_snapshot_enabled, sweep
+from pages.admin_page import AdminPage
+
+log = get_logger(__name__)
 
 # Load environment variables
 load_dotenv()
 
 
+def pytest_configure(config):
+    """Start the background log writer (JSONL per test, optional console)."""
+    configure_logging()
+    install_signal_handlers()
+
+
+def pytest_unconfigure(config):
+    """Close leftover browsers, drain queued artifacts and log records before the process exits."""
+    reaper = browser_reaper()
+    reaper.reap()
+    reaper.summary()
+    stop_artifact_writer()
+    shutdown_logging()
+
+
+@pytest.hookimpl(tryfirst=True, hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Expose each phase report on the item (rep_setup / rep_call / rep_teardown)
+    and capture failure artifacts while the test's browsers are still open.
+    """
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+    
+    registry = getattr(item, 'browsers', None)
+    # pytest-rerunfailures reports a failed attempt that will be retried as 'rerun'
+    failed = report.failed or report.outcome == 'rerun'
+    if not (failed and report.when in ('setup', 'call') and registry):
+        return
+    timeline = current_timeline()
+    if os.getenv('ARTIFACTS', 'on-failure').lower() != 'off':
+        artifact_dir = capture_failure(item.nodeid, registry)
+        if artifact_dir:
+            log.warning(f"  ⚠ Failure artifacts: {artifact_dir}")
+            report.user_properties.append(('artifacts', artifact_dir))
+            if timeline is not None:
+                timeline.attach('artifacts', artifact_dir)
+    trace_dir = flush_traces(item.nodeid, registry)
+    if trace_dir:
+        log.warning(f"  ⚠ Traces written to: {trace_dir}")
+        if timeline is not None:
+            timeline.attach('trace', trace_dir)
+
+
 @pytest.fixture(scope="function")
-def driver():
+def browsers(request):
     """
-    Create and configure WebDriver instance.
-    Scope: function - new browser instance for each test.
+    Registry of every browser the current test uses. The `driver` fixture
+    registers itself as 'main'; tests register extra drivers (admin, second
+    session) so failure artifacts are captured from all of them. Extra
+    drivers are quit here at teardown, after the failure report.
+    """
+    registry = BrowserRegistry(request.node.nodeid)
+    request.node.browsers = registry
+    yield registry
+    registry.close()
+    request.node.browsers = None
+
+
+@pytest.fixture(scope="session")
+def results_store():
     """
-    browser = os.getenv('BROWSER', 'chrome').lower()
-    headless = os.getenv('HEADLESS', 'false').lower() == 'true'
+    Open the SQLite results store and register this session as a run.
+    Disable with RESULTS_STORE=false.
+    """
+    if os.getenv('RESULTS_STORE', 'true').lower() != 'true':
+        yield None
+        return
+    store = ResultsStore()
+    store.run_id = store.start_run(collect_environment())
+    yield store
+    store.close()
+
+
+@pytest.fixture(autouse=True)
+def step_timeline(request, results_store, monkeypatch):
+    """
+    Time page-object steps of the current test and persist them.
+    time.sleep is routed through the timeline so blind waits are accounted.
+    """
+    set_test_context(request.node.nodeid)
+    timeline = StepTimeline(request.node.nodeid)
+    activate_timeline(timeline)
+    monkeypatch.setattr(time, 'sleep', timeline.sleep)
+    started = time.perf_counter()
     
-    print(f"\n🌐 Starting {browser} browser (headless={headless})...")
+    yield timeline
     
-    if browser == 'chrome':
-        options = webdriver.ChromeOptions()
-        if headless:
-            options.add_argument('--headless=new')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--window-size=1920,1080')
-        # Ignore HTTPS errors for demo sites
-        options.add_argument('--ignore-certificate-errors')
-        options.add_argument('--ignore-ssl-errors')
-        
-        # Get chromedriver path and fix if needed
-        driver_path = ChromeDriverManager().install()
-        
-        # Fix for webdriver-manager bug: find actual chromedriver binary
-        if 'THIRD_PARTY_NOTICES' in driver_path or not os.path.isfile(driver_path):
-            # Search for actual chromedriver binary in parent directory
-            driver_dir = os.path.dirname(driver_path)
-            possible_paths = glob.glob(os.path.join(driver_dir, '**/chromedriver'), recursive=True)
-            if possible_paths:
-                driver_path = possible_paths[0]
-                print(f"  ✓ Found chromedriver at: {driver_path}")
-        
-        service = ChromeService(driver_path)
-        driver = webdriver.Chrome(service=service, options=options)
-        
-    elif browser == 'firefox':
-        options = webdriver.FirefoxOptions()
-        if headless:
-            options.add_argument('--headless')
-        options.add_argument('--width=1920')
-        options.add_argument('--height=1080')
-        # Ignore HTTPS errors
-        options.set_preference('accept_insecure_certs', True)
-        
-        service = FirefoxService(GeckoDriverManager().install())
-        driver = webdriver.Firefox(service=service, options=options)
-    else:
-        raise ValueError(f"Unsupported browser: {browser}")
+    duration = time.perf_counter() - started
+    activate_timeline(None)
+    set_test_context(None)
+    if results_store is None:
+        return
     
-    # Configure timeouts
-    implicit_wait = int(os.getenv('IMPLICIT_WAIT', '10'))
-    page_load_timeout = int(os.getenv('PAGE_LOAD_TIMEOUT', '30'))
+    outcome = 'passed'
+    for when in ('setup', 'call'):
+        report = getattr(request.node, f"rep_{when}", None)
+        if report is not None and not report.passed:
+            outcome = report.outcome
+            break
+    results_store.record_test(
+        results_store.run_id, request.node.nodeid, outcome, duration, timeline.summary(),
+        timeline.attachments, timeline.navigations, timeline.resources, timeline.urls
+    )
+
+
+@pytest.fixture(autouse=True)
+def reap_browsers(request):
+    """
+    Browsers launched during a test belong to it; whatever is still running
+    after its fixtures are torn down is quit or killed.
+    """
+    reaper = browser_reaper()
+    reaper.begin(request.node.nodeid)
+    yield
+    reaper.reap(request.node.nodeid)
+    reaper.begin(SESSION)
+
+
+@pytest.fixture(autouse=True)
+def catalog_locks(request):
+    """
+    Per-product locks of the current test: exclusive for tests marked
+    `mutates_catalog`, shared for everyone else. Disable with CATALOG_LOCKS=false.
+    """
+    if not catalog_locks_enabled():
+        yield None
+        return
+    exclusive = request.node.get_closest_marker('mutates_catalog') is not None
+    locks = CatalogLocks(request.node.nodeid, exclusive)
+    activate_locks(locks)
+    yield locks
+    activate_locks(None)
+    locks.release()
+
+
+def _price_restorer(factory, session: bool = False):
+    """
+    Prices have no narrow admin endpoint, so they are set back in the admin
+    UI, in a browser launched for that only when a price is still off.
+    """
+    def restore(entries):
+        driver = factory.launch('catalog-restore', session=session)
+        try:
+            AdminPage(driver).restore_prices(entries)
+        finally:
+            driver.quit()
+    return restore
+
+
+@pytest.fixture(autouse=True)
+def catalog_snapshot(request, catalog_locks, browser_factory):
+    """
+    Snapshot price and stock of the products a `mutates_catalog` test locks and
+    restore them in one batch at its end, even on failure. Without locks or
+    snapshots (CATALOG_LOCKS / CATALOG_SNAPSHOT=false) such a test is skipped:
+    nothing would put the catalog back.
+    """
+    if request.node.get_closest_marker('mutates_catalog') is None:
+        yield None
+        return
+    if catalog_locks is None or not catalog_snapshot_enabled():
+        pytest.skip("mutates the catalog, but CATALOG_LOCKS/CATALOG_SNAPSHOT is off: nothing would restore it")
+    snapshot = CatalogSnapshot(catalog_locks, price_restorer=_price_restorer(browser_factory))
+    try:
+        snapshot.connect()
+    except SnapshotError as e:
+        pytest.fail(f"Cannot snapshot the catalog before mutating it: {e}", pytrace=False)
+    yield snapshot
+    snapshot.restore()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def catalog_sweeper(browser_factory):
+    """Restore products earlier tests or crashed runs left changed, at session start and end."""
+    if not catalog_snapshot_enabled():
+        yield
+        return
+    restorer = _price_restorer(browser_factory, session=True)
+    sweep(price_restorer=restorer)
+    yield
+    sweep(price_restorer=restorer)
+
+
+@pytest.fixture(scope="session")
+def browser_factory():
+    """
+    Launches browsers for this worker; extra sessions in a scenario are
+    isolated contexts of the same Chrome (BROWSER_ISOLATION, BROWSER_POOL).
+    """
+    factory = BrowserFactory()
+    yield factory
+    factory.shutdown()
+
+
+@pytest.fixture(scope="function")
+def resource_monitor(browsers, step_timeline):
+    """
+    Sample memory/CPU of the test's browsers at step boundaries and keep the
+    peaks with the test result. Disable with RESOURCE_MONITOR=false.
+    """
+    if not resource_monitor_enabled():
+        yield None
+        return
+    monitor = ResourceMonitor(browsers, step_timeline).start()
+    yield monitor
+    monitor.stop()
+    step_timeline.resources = monitor.report()
+
+
+@pytest.fixture(scope="function")
+def driver(request, browsers, browser_factory, resource_monitor):
+    """
+    Create and configure WebDriver instance.
+    Scope: function - new browser instance (or pooled context) for each test.
+    """
+    driver = browser_factory.acquire()
+    browsers.register('main', driver)
     
-    driver.implicitly_wait(implicit_wait)
-    driver.set_page_load_timeout(page_load_timeout)
+    yield driver
     
-    # Maximize window
-    driver.maximize_window()
+    # A pooled browser that ends the test over its memory limits is replaced
+    recycle = False
+    if resource_monitor is not None and browser_factory.pooled:
+        resource_monitor.sample()
+        recycle = resource_monitor.over_limit('main')
+        resource_monitor.peaks['main'].recycled = recycle
     
-    yield driver
+    # A daemon browser that saw a failure is replaced, not reset
+    failed = any(getattr(getattr(request.node, f'rep_{when}', None), 'failed', False)
+                 for when in ('setup', 'call'))
     
     # Cleanup
-    print("\n🔚 Closing browser...")
-    driver.quit()
+    log.info("\n🔚 Closing browser...")
+    browser_factory.release(driver, recycle=recycle, healthy=not failed)
 
 
 @pytest.fixture(scope="session")
@@ -90,6 +268,17 @@ def base_url():
     return os.getenv('BAGISTO_BASE_URL', 'https://commerce.bagisto.com')
 
 
+@pytest.fixture(scope="session", autouse=True)
+def catalog_crawler(base_url):
+    """
+    Warm the catalog product index over HTTP while the first browser starts.
+    Skipped when a fresh crawl is on disk; disable with CATALOG_CRAWL=false.
+    """
+    if os.getenv('CATALOG_CRAWL', 'true').lower() != 'true':
+        return None
+    return start_background_crawl(base_url)
+
+
 @pytest.fixture(scope="session")
 def credentials():
     """Get login credentials from environment."""
@@ -97,3 +286,29 @@ def credentials():
         'email': os.getenv('BAGISTO_EMAIL'),
         'password': os.getenv('BAGISTO_PASSWORD')
     }
+
+
+@pytest.fixture(scope="session", autouse=True)
+def saved_address(base_url, credentials):
+    """
+    Provision a saved default address for the test account once, over HTTP,
+    so checkout goes straight to Proceed instead of filling the address form.
+    Disable with SAVED_ADDRESS=false; failures fall back to the form fill.
+    """
+    if os.getenv('SAVED_ADDRESS', 'true').lower() != 'true' or not credentials['email']:
+        return False
+    try:
+        http = StorefrontSession.login(base_url, credentials['email'], credentials['password'])
+    except Exception as e:
+        log.warning(f"⚠ Saved address not provisioned (login): {type(e).__name__}: {e}")
+        return False
+    try:
+        if http.ensure_saved_address():
+            log.info("✓ Saved default address created for test account")
+        return True
+    except Exception as e:
+        log.warning(f"⚠ Saved address not provisioned: {type(e).__name__}: {e}")
+        return False
+    finally:
+        http.close()
+
@@ -1,4 +1,5 @@
 """Page Object Model for Bagisto Commerce tests."""
 from .store_page import StorePage
+from .checkout_flow import CheckoutFlow
 
-__all__ = ['StorePage']
+__all__ = ['StorePage', 'CheckoutFlow']
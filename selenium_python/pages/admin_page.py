@@ -4,25 +4,32 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from utils.timeline import timed_step
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
 
 class AdminPage:
     def __init__(self, driver, admin_url=None):
         self.driver = driver
         self.admin_url = admin_url or os.getenv("BAGISTO_ADMIN_URL", "https://commerce.bagisto.com/admin")
 
+    @timed_step
     def login_with_credentials(self, email, password):
-        print("Logging in to admin...")
+        log.info("Logging in to admin...")
         self.driver.get(self.admin_url)
         WebDriverWait(self.driver, 15).until(EC.presence_of_element_located((By.NAME, "email")))
         self.driver.find_element(By.NAME, "email").send_keys(email)
         self.driver.find_element(By.NAME, "password").send_keys(password)
         self.driver.find_element(By.XPATH, "//button[contains(.,'Sign In')]").click()
         WebDriverWait(self.driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-        print("  ✓ Admin logged in")
+        log.info("  ✓ Admin logged in")
 
+    @timed_step
     def search_product(self, term):
         """Use Mega Search to find product."""
-        print(f"Searching product: {term}")
+        log.info(f"Searching product: {term}")
         try:
             search_box = WebDriverWait(self.driver, 10).until(
                 EC.visibility_of_element_located((By.CSS_SELECTOR, "input[placeholder='Mega Search']"))
@@ -32,8 +39,9 @@ class AdminPage:
             search_box.submit()
             time.sleep(3)
         except Exception as e:
-            print("⚠ Search box not found", e)
+            log.warning(f"⚠ Search box not found: {e}")
 
+    @timed_step
     def open_product_from_results(self, term):
         """Click first product link from search results."""
         try:
@@ -42,16 +50,17 @@ class AdminPage:
             )
             link.click()
             time.sleep(3)
-            print("✓ Product edit page opened")
+            log.info("✓ Product edit page opened")
         except Exception:
-            print("⚠ Product link not found")
+            log.warning("⚠ Product link not found")
 
+    @timed_step
     def set_stock(self, qty):
         """Set stock quantity if input is found."""
-        print(f"Setting stock = {qty}")
+        log.info(f"Setting stock = {qty}")
         inputs = self.driver.find_elements(By.CSS_SELECTOR, 'input[name*="inventories"][type="number"]')
         if not inputs:
-            print("⚠ Stock input not found")
+            log.warning("⚠ Stock input not found")
             return
         inp = inputs[0]
         inp.clear()
@@ -59,14 +68,32 @@ class AdminPage:
         try:
             btn = self.driver.find_element(By.XPATH, "//button[contains(.,'Save Product')]")
             btn.click()
-            print("✓ Stock saved")
+            log.info("✓ Stock saved")
         except Exception:
-            print("⚠ Save button not found")
+            log.warning("⚠ Save button not found")
+        time.sleep(3)
+
+    @timed_step
+    def open_product_edit(self, product_id):
+        """Open a product's edit page by its admin id."""
+        log.info(f"Opening product {product_id} for editing")
+        self.driver.get(f"{self.admin_url}/catalog/products/edit/{product_id}")
+        WebDriverWait(self.driver, 15).until(EC.presence_of_element_located((By.ID, "price")))
+
+    @timed_step
+    def set_price(self, price):
+        """Set the price on the open edit page and save."""
+        log.info(f"Setting price = {price}")
+        price_input = self.driver.find_element(By.ID, "price")
+        price_input.clear()
+        price_input.send_keys(str(price))
+        self.driver.find_element(By.XPATH, "//button[contains(.,'Save Product')]").click()
         time.sleep(3)
 
-    def restore_stock(self, term, qty=200):
-        """Search and restore stock quantity."""
-        print(f"Restoring {term} stock = {qty}")
-        self.search_product(term)
-        self.open_product_from_results(term)
-        self.set_stock(qty)
+    def restore_prices(self, entries):
+        """Put snapshotted prices back in the edit form (see utils.catalog_snapshot)."""
+        self.login_with_credentials(os.getenv("BAGISTO_ADMIN_EMAIL", "admin@example.com"),
+                                    os.getenv("BAGISTO_ADMIN_PASSWORD", "admin123"))
+        for entry in entries.values():
+            self.open_product_edit(entry['product_id'])
+            self.set_price(entry['values']['price'])
@@ -0,0 +1,287 @@
+"""
+CheckoutFlow - Page Object for the Bagisto onepage checkout.
+
+The onepage checkout renders its steps progressively on one URL:
+address → shipping method → payment method → review (Place Order) → placed.
+detect_step() reads the current step from the DOM in a single script call;
+each transition performs its action and then waits for the next step's
+signal instead of sleeping. Timings of every transition are kept in
+`transitions`.
+"""
+import os
+import time
+from typing import Dict, List, Optional, Sequence
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    TimeoutException,
+    NoSuchElementException,
+    ElementClickInterceptedException,
+)
+
+from utils.timeline import timed_step
+from utils.forms import fill_form, type_form, human_typing_enabled, FIRST_OPTION
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+STEPS = ('address', 'shipping', 'payment', 'review', 'placed')
+
+# One round-trip: which step is the checkout waiting on? null while loading.
+DETECT_STEP_SCRIPT = """
+if (location.pathname.indexOf('/checkout/onepage/success') !== -1) return {step: 'placed'};
+const buttons = Array.from(document.querySelectorAll('button'));
+const hasButton = (text) => buttons.some(b => b.textContent.includes(text) && b.offsetParent !== null);
+const radios = (name) => Array.from(document.querySelectorAll('input[type="radio"][name="' + name + '"]'));
+const shipping = radios('shipping_method');
+const payment = radios('payment[method]');
+const state = {
+    address_form: !!document.querySelector('[name="billing[first_name]"]'),
+    shipping_options: shipping.length,
+    shipping_selected: shipping.some(r => r.checked),
+    payment_options: payment.length,
+    payment_selected: payment.some(r => r.checked),
+    place_order: hasButton('Place Order'),
+    proceed: hasButton('Proceed')
+};
+if (state.shipping_options && !state.shipping_selected) state.step = 'shipping';
+else if (state.payment_options && !state.payment_selected) state.step = 'payment';
+else if (state.place_order) state.step = 'review';
+else if (state.address_form || state.proceed) state.step = 'address';
+else state.step = null;
+return state;
+"""
+
+CHECKOUT_SELECTORS = [
+    (By.XPATH, "//a[contains(text(), 'Proceed To Checkout')]"),
+    (By.XPATH, "//a[contains(text(), 'Checkout')]"),
+    (By.XPATH, "//button[contains(text(), 'Checkout')]"),
+    (By.XPATH, "//button[contains(text(), 'Proceed To Checkout')]"),
+    (By.CSS_SELECTOR, ".checkout-btn"),
+    (By.CSS_SELECTOR, "a[href*='checkout']")
+]
+
+PLACE_ORDER_SELECTORS = [
+    (By.XPATH, "//button[contains(text(), 'Place Order')]"),
+    (By.CSS_SELECTOR, "button.primary-button"),
+    (By.XPATH, "//button[@type='button' and contains(text(), 'Place')]"),
+    (By.XPATH, "//button[contains(@class, 'primary') and contains(text(), 'Place')]")
+]
+
+
+class CheckoutFlow:
+    """Onepage checkout state machine for one browser."""
+
+    def __init__(self, driver: webdriver.Remote, base_url: str, email: Optional[str] = None,
+                 timeout: float = 15):
+        self.driver = driver
+        self.base_url = base_url.rstrip('/')
+        self.email = email or os.getenv('BAGISTO_EMAIL')
+        self.timeout = timeout
+        self.transitions: List[Dict] = []
+
+    def state(self) -> Dict:
+        """Raw DOM state of the checkout (see DETECT_STEP_SCRIPT)."""
+        return self.driver.execute_script(DETECT_STEP_SCRIPT) or {'step': None}
+
+    def detect_step(self) -> Optional[str]:
+        return self.state().get('step')
+
+    def wait_for_step(self, steps: Sequence[str], timeout: Optional[float] = None) -> Optional[str]:
+        """Poll detect_step until it is one of `steps`; None on timeout."""
+        found = {}
+
+        def reached(driver):
+            found['step'] = self.detect_step()
+            return found['step'] in steps
+
+        try:
+            WebDriverWait(self.driver, timeout or self.timeout, poll_frequency=0.2).until(reached)
+        except TimeoutException:
+            return None
+        return found['step']
+
+    def _record(self, action: str, from_step: Optional[str], to_step: Optional[str], started: float):
+        duration = time.perf_counter() - started
+        self.transitions.append({
+            'action': action,
+            'from': from_step,
+            'to': to_step,
+            'duration': round(duration, 3),
+        })
+        log.info(f"    {action}: {from_step} → {to_step or 'timeout'} ({duration:.2f}s)")
+
+    def _click(self, element):
+        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
+        try:
+            element.click()
+        except ElementClickInterceptedException:
+            self.driver.execute_script("arguments[0].click();", element)
+
+    def _click_last_label(self, targets: Sequence[str]) -> Optional[str]:
+        """Click the last visible label for the first target present (Playwright .last())."""
+        for target in targets:
+            labels = self.driver.find_elements(By.CSS_SELECTOR, f'label[for{target}]')
+            if labels:
+                self._click(labels[-1])
+                return target
+        return None
+
+    @timed_step
+    def open(self):
+        """Navigate from the cart page to the checkout and wait for its first step."""
+        log.info("  → Looking for checkout button...")
+        started = time.perf_counter()
+        for by, selector in CHECKOUT_SELECTORS:
+            try:
+                checkout_btn = WebDriverWait(self.driver, 3).until(
+                    EC.element_to_be_clickable((by, selector))
+                )
+            except (TimeoutException, NoSuchElementException):
+                continue
+            log.info(f"  → Found checkout button: {selector}")
+            checkout_btn.click()
+            step = self.wait_for_step(STEPS)
+            self._record('open', 'cart', step, started)
+            log.info("  ✓ Navigated to checkout page")
+            return step
+
+        raise Exception("Checkout button not found with any selector")
+
+    @timed_step
+    def complete_address(self, human_typing: Optional[bool] = None) -> Optional[str]:
+        """
+        Fill the address form if the account has no saved address, then Proceed.
+        Returns the step reached afterwards.
+        """
+        started = time.perf_counter()
+        state = self.state()
+        if state.get('step') is None:
+            self.wait_for_step(STEPS)
+            state = self.state()
+        if state.get('step') != 'address':
+            log.info(f"  → Address already done (at {state.get('step')})")
+            return state.get('step')
+
+        if state.get('address_form'):
+            log.info("  → Filling shipping address form...")
+            # Country before state, whose options depend on it
+            fields = {
+                'billing[first_name]': 'Test',
+                'billing[last_name]': 'User',
+                'billing[email]': self.email,
+                'billing[address1]': '123 Test Street',
+                'billing[city]': 'Test City',
+                'billing[postcode]': '12345',
+                'billing[phone]': '1234567890',
+                'billing[country]': 'US',
+                'billing[state]': FIRST_OPTION,
+            }
+            if human_typing is None:
+                human_typing = human_typing_enabled()
+            if human_typing:
+                type_form(self.driver, fields)
+            else:
+                fill_form(self.driver, fields)
+            log.info("  ✓ Address form filled")
+        else:
+            log.info("  → Using saved address")
+
+        log.info("  → Clicking 'Proceed' button...")
+        try:
+            proceed_btn = WebDriverWait(self.driver, self.timeout).until(
+                EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Proceed')]"))
+            )
+        except TimeoutException:
+            log.info("  → No Proceed button (may be on payment step already)")
+            return self.detect_step()
+        self._click(proceed_btn)
+
+        log.info("  → Waiting for shipping/payment options to load...")
+        step = self.wait_for_step(('shipping', 'payment', 'review'))
+        self._record('address', 'address', step, started)
+        if step:
+            log.info("  ✓ Address saved and proceeded to payment")
+        return step
+
+    @timed_step
+    def choose_shipping(self, targets: Sequence[str] = ('="free_free"', '^="flatrate"')) -> Optional[str]:
+        """Pick the first available shipping method label and wait for payment options."""
+        started = time.perf_counter()
+        step = self.wait_for_step(('shipping', 'payment', 'review'))
+        if step != 'shipping':
+            log.info("    No shipping methods found (e-book or already selected)")
+            return step
+
+        log.info("  → Selecting shipping method...")
+        chosen = self._click_last_label(targets)
+        if chosen is None:
+            log.info("  → Shipping method not found or already selected")
+            return step
+        step = self.wait_for_step(('payment', 'review'))
+        self._record('shipping', 'shipping', step, started)
+        log.info(f"  ✓ Shipping method selected (label[for{chosen}])")
+        return step
+
+    @timed_step
+    def choose_payment(self, targets: Sequence[str] = ('="cashondelivery"', '="moneytransfer"')) -> Optional[str]:
+        """Pick the first available payment method label and wait for Place Order."""
+        started = time.perf_counter()
+        step = self.wait_for_step(('payment', 'review'))
+        if step != 'payment':
+            log.info("    No payment methods found")
+            return step
+
+        log.info("  → Selecting payment method...")
+        chosen = self._click_last_label(targets)
+        if chosen is None:
+            log.warning("  ⚠ Payment method not found")
+            return step
+        step = self.wait_for_step(('review',))
+        self._record('payment', 'payment', step, started)
+        log.info(f"  ✓ Payment method selected (label[for{chosen}])")
+        return step
+
+    @timed_step
+    def place_order(self, expect_success_msg: bool = False) -> bool:
+        """
+        Click Place Order and wait for the success page.
+        Returns True once the success page is reached; the demo does not always
+        redirect, so a timeout is only an error when expect_success_msg is set.
+        """
+        log.info("  → Clicking Place Order...")
+        started = time.perf_counter()
+        for by, selector in PLACE_ORDER_SELECTORS:
+            try:
+                place_order_btn = WebDriverWait(self.driver, 2).until(
+                    EC.element_to_be_clickable((by, selector))
+                )
+            except (TimeoutException, NoSuchElementException):
+                continue
+
+            log.info(f"    Found button with selector: {selector}")
+            self._click(place_order_btn)
+
+            # Wait for order processing
+            step = self.wait_for_step(('placed',))
+            self._record('place', 'review', step, started)
+            if step == 'placed':
+                log.info("  ✓ Order placed")
+                return True
+            if expect_success_msg:
+                raise AssertionError("Order success page did not appear")
+            log.info("  ✓ Order placement attempted")
+            return False
+
+        log.warning("  ⚠ Place Order button not found with any selector")
+        return False
+
+    def run(self, human_typing: Optional[bool] = None, expect_success_msg: bool = False) -> bool:
+        """Drive the checkout from wherever it is to a placed order."""
+        self.complete_address(human_typing)
+        self.choose_shipping()
+        self.choose_payment()
+        return self.place_order(expect_success_msg)
@@ -13,13 +13,22 @@ from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import (
     TimeoutException, 
     NoSuchElementException,
-    ElementClickInterceptedException,
     StaleElementReferenceException,
     WebDriverException
 )
 from http.client import RemoteDisconnected
 from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
 
+from pages.checkout_flow import CheckoutFlow
+from utils.timeline import timed_step
+from utils.catalog import CatalogIndex, CATEGORIES
+from utils.catalog_locks import current_locks
+from utils.crawler import wait_for_background_crawl
+from utils.orders import OrderHistoryClient
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
 
 class StorePage:
     """Page Object for Bagisto Commerce storefront operations."""
@@ -30,34 +39,43 @@ class StorePage:
         self.wait = WebDriverWait(driver, 15)
         self.email = os.getenv('BAGISTO_EMAIL')
         self.password = os.getenv('BAGISTO_PASSWORD')
+        self.checkout = CheckoutFlow(driver, self.base_url, self.email)
+        self.order_history = OrderHistoryClient(driver, self.base_url)
     
+    @timed_step
     def goto_home(self):
         """Navigate to homepage."""
-        print(f"  → Navigating to {self.base_url}")
+        log.info(f"  → Navigating to {self.base_url}")
         self.driver.get(self.base_url)
         time.sleep(1)
     
+    @timed_step
     def login(self):
         """
         Login to Bagisto Commerce.
         Auto-dismisses cookie consent modal if present.
         """
-        print("  → Opening login page...")
+        log.info("  → Opening login page...")
         self.driver.get(f"{self.base_url}/customer/login")
         time.sleep(1)
         
+        # A warm (daemon) browser is still logged in: Bagisto redirects away
+        if '/customer/login' not in self.driver.current_url:
+            log.info("  ✓ Already logged in")
+            return
+        
         # Dismiss cookie consent if present
         try:
             accept_btn = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Accept')]")
             if accept_btn.is_displayed():
-                print("  → Dismissing cookie consent...")
+                log.info("  → Dismissing cookie consent...")
                 accept_btn.click()
                 time.sleep(0.5)
         except (NoSuchElementException, TimeoutException):
             pass
         
         # Fill login form
-        print(f"  → Logging in as {self.email}...")
+        log.info(f"  → Logging in as {self.email}...")
         email_input = self.wait.until(
             EC.presence_of_element_located((By.NAME, "email"))
         )
@@ -74,261 +92,269 @@ class StorePage:
         
         # Wait for redirect to home or account page
         time.sleep(2)
-        print("  ✓ Logged in successfully")
+        log.info("  ✓ Logged in successfully")
     
+    @timed_step
     def add_first_product_from_home(self):
         """
         Add first available simple product from a category.
+        Known-good products from the CatalogIndex are opened directly first; the
+        category probe below only runs when none is known or all of them fail,
+        and records what it finds in the index.
         CRITICAL: Waits 5s for AJAX cart update, then navigates to cart page to verify.
         Skips configurable products (with options).
-        Matches Playwright behavior: iterates categories, checks product selector, skips options.
+        Category order: PRODUCT_SELECTION=fastest (default, cheapest recorded category
+        first) | seeded (reproducible, PRODUCT_SEED) | random (Playwright's shuffle).
         """
-        print("  → Finding first simple product from categories...")
+        wait_for_background_crawl()
+        index = CatalogIndex.load(self.base_url)
+        
+        # Fast path: jump straight to a product that worked recently
+        contended = []
+        for product in index.known_good():
+            if not self._lock_product(product['url']):
+                log.info(f"  → In use by another test: {product['name'] or product['url']}")
+                contended.append(product)
+                continue
+            if self._use_known_product(index, product):
+                return
+        
+        # All free known products failed: wait for one another test holds before probing
+        if contended and self._lock_product(contended[0]['url'], wait=True):
+            if self._use_known_product(index, contended[0]):
+                return
         
-        # Available categories (matching Playwright)
-        categories = [
-            '/casual-wear-female',
-            '/electronics',
-            '/home-kitchen',
-            '/books-stationery'
-        ]
+        log.info("  → Finding first simple product from categories...")
         
-        # Shuffle categories (like Playwright)
-        import random
-        random.shuffle(categories)
+        # Available categories (matching Playwright), ordered by PRODUCT_SELECTION
+        categories = index.order_categories(CATEGORIES)
         
-        for category in categories:
-            try:
-                print(f"  Trying category: {category}")
-                
-                # Navigate to category page
-                self.driver.get(f"{self.base_url}{category}")
-                time.sleep(2)
-                
-                # Wait for product links (matching Playwright selector pattern)
-                # a[href*="commerce.bagisto.com/"][aria-label]:has(img[alt])
-                try:
-                    product_links = WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_all_elements_located((
-                            By.XPATH,
-                            "//a[contains(@href, 'commerce.bagisto.com/') and @aria-label and .//img[@alt]]"
-                        ))
-                    )
-                except TimeoutException:
-                    print(f"  ✗ No products in {category}, trying next...")
-                    continue
-                
-                if not product_links:
-                    print(f"  ✗ No products in {category}, trying next...")
-                    continue
-                
-                # Click first product
-                first_product = product_links[0]
-                product_name = first_product.get_attribute('aria-label') or ''
-                print(f"  Selected product: {product_name}")
-                
-                # Save product name for later use (e.g., admin search in S4)
-                self.last_added_product_name = product_name
-                
-                # Save product href for later use (e.g., S4B direct navigation)
-                product_href = first_product.get_attribute('href')
-                self.last_added_product_url = product_href
-                
-                # CRITICAL FIX: Use JavaScript click to avoid ChromeDriver crash
-                # element.click() causes ProtocolError with ChromeDriver 142.0.7444.162 + Chrome 142.0.7444.134
-                self.driver.execute_script("arguments[0].click();", first_product)
-                
-                # Wait for product page to load
-                time.sleep(2)
-                
-                # Check for Add To Cart button
+        try:
+            for category in categories:
+                added = False
+                locked_url = None
+                started = time.perf_counter()
                 try:
-                    add_btn = WebDriverWait(self.driver, 3).until(
-                        EC.presence_of_element_located((
-                            By.XPATH,
-                            "//button[contains(text(), 'Add To Cart')]"
-                        ))
+                    log.info(f"  Trying category: {category}")
+                    
+                    # Navigate to category page
+                    self.driver.get(f"{self.base_url}{category}")
+                    time.sleep(2)
+                    
+                    # Wait for product links (matching Playwright selector pattern)
+                    # a[href*="commerce.bagisto.com/"][aria-label]:has(img[alt])
+                    try:
+                        product_links = WebDriverWait(self.driver, 5).until(
+                            EC.presence_of_all_elements_located((
+                                By.XPATH,
+                                "//a[contains(@href, 'commerce.bagisto.com/') and @aria-label and .//img[@alt]]"
+                            ))
+                        )
+                    except TimeoutException:
+                        log.warning(f"  ✗ No products in {category}, trying next...")
+                        continue
+                    
+                    if not product_links:
+                        log.warning(f"  ✗ No products in {category}, trying next...")
+                        continue
+                    
+                    # Click first product no other test holds a conflicting lock on
+                    first_product = next((link for link in product_links
+                                          if self._lock_product(link.get_attribute('href'))), None)
+                    if first_product is None:
+                        log.warning(f"  ✗ Products in {category} locked by other tests, trying next...")
+                        continue
+                    locked_url = first_product.get_attribute('href')
+                    product_name = first_product.get_attribute('aria-label') or ''
+                    log.info(f"  Selected product: {product_name}")
+                    
+                    # Save product name for later use (e.g., admin search in S4)
+                    self.last_added_product_name = product_name
+                    
+                    # Save product href for later use (e.g., S4B direct navigation)
+                    product_href = first_product.get_attribute('href')
+                    self.last_added_product_url = product_href
+                    
+                    # CRITICAL FIX: Use JavaScript click to avoid ChromeDriver crash
+                    # element.click() causes ProtocolError with ChromeDriver 142.0.7444.162 + Chrome 142.0.7444.134
+                    self.driver.execute_script("arguments[0].click();", first_product)
+                    
+                    # Wait for product page to load
+                    time.sleep(2)
+                    
+                    # Check for Add To Cart button
+                    try:
+                        add_btn = WebDriverWait(self.driver, 3).until(
+                            EC.presence_of_element_located((
+                                By.XPATH,
+                                "//button[contains(text(), 'Add To Cart')]"
+                            ))
+                        )
+                    except TimeoutException:
+                        log.warning(f"  ✗ Add To Cart button not found, trying next category...")
+                        index.record_product(product_href, product_name, category, add_to_cart=False)
+                        continue
+                    
+                    # Check if product has configurable options that MUST be selected
+                    # Look for required option indicators (red asterisk, "required" text, etc.)
+                    # TEMPORARILY DISABLED - Playwright doesn't actually skip these products
+                    has_required_options = False
+                    # try:
+                    #     required_markers = self.driver.find_elements(
+                    #         By.XPATH,
+                    #         "//*[contains(text(), '*') or contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'required')]"
+                    #     )
+                    #     has_required_options = len(required_markers) > 0
+                    # except:
+                    #     pass
+                    
+                    if has_required_options:
+                        log.warning(f"  ⚠ Product has required configurable options, skipping...")
+                        continue  # Skip this product, try next category
+                    
+                    # Only simple, in-stock products become fast-path candidates
+                    simple = self._product_is_simple()
+                    in_stock = add_btn.is_enabled()
+                    
+                    # Try to add product - if it has options but has defaults, it may still work
+                    added = self._add_to_cart_and_verify(add_btn)
+                    index.record_product(
+                        product_href, product_name, category,
+                        add_to_cart=added, simple=simple, in_stock=in_stock
                     )
-                except TimeoutException:
-                    print(f"  ✗ Add To Cart button not found, trying next category...")
+                    if added:
+                        return  # Success!
+                    
+                    log.warning(f"  ✗ Cart is empty, trying next category...")
+                    
+                except (TimeoutException, NoSuchElementException, StaleElementReferenceException,
+                        WebDriverException, RemoteDisconnected, MaxRetryError, ProtocolError,
+                        ConnectionRefusedError, ConnectionError, OSError) as e:
+                    log.warning(f"  ✗ Failed: {type(e).__name__}")
                     continue
-                
-                # Check if product has configurable options that MUST be selected
-                # Look for required option indicators (red asterisk, "required" text, etc.)
-                # TEMPORARILY DISABLED - Playwright doesn't actually skip these products
-                has_required_options = False
-                # try:
-                #     required_markers = self.driver.find_elements(
-                #         By.XPATH,
-                #         "//*[contains(text(), '*') or contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'required')]"
-                #     )
-                #     has_required_options = len(required_markers) > 0
-                # except:
-                #     pass
-                
-                if has_required_options:
-                    print(f"  ⚠ Product has required configurable options, skipping...")
-                    continue  # Skip this product, try next category
-                
-                # Try to add product - if it has options but has defaults, it may still work
-                print("  → Clicking 'Add To Cart' button...")
-                add_btn.click()
-                
-                # CRITICAL: Wait 5 seconds for AJAX cart update (Playwright requirement)
-                print("  → Waiting for cart to update...")
-                time.sleep(5)
-                
-                # Navigate to cart page to verify (Playwright pattern)
-                print("  → Checking cart...")
-                self.driver.get(f"{self.base_url}/checkout/cart")
-                
-                # Wait for networkidle equivalent - wait for page load + 2s
-                WebDriverWait(self.driver, 20).until(
-                    lambda d: d.execute_script('return document.readyState') == 'complete'
-                )
-                time.sleep(2)
-                
-                # Count items by quantity inputs (physical products)
-                qty_inputs = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    'input[type="hidden"][name="quantity"]'
-                )
-                
-                # Count e-book checkboxes (digital products)
-                ebook_checkboxes = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    'input[type="checkbox"][id^="item_"]'
-                )
-                
-                physical_count = len(qty_inputs)
-                ebook_count = len(ebook_checkboxes)
-                total_count = physical_count + ebook_count
-                
-                print(f"  → Found {total_count} items in cart ({physical_count} physical, {ebook_count} e-book)")
-                
-                if total_count > 0:
-                    print(f"  ✓ Cart has {total_count} item(s)")
-                    return  # Success!
-                
-                print(f"  ✗ Cart is empty, trying next category...")
-                
-            except (TimeoutException, NoSuchElementException, StaleElementReferenceException,
-                    WebDriverException, RemoteDisconnected, MaxRetryError, ProtocolError,
-                    ConnectionRefusedError, ConnectionError, OSError) as e:
-                print(f"  ✗ Failed: {type(e).__name__}")
-                continue
+                finally:
+                    index.record_category(category, added, time.perf_counter() - started)
+                    if locked_url and not added:
+                        self._unlock_product(locked_url)
+        finally:
+            index.save()
         
         # If all categories failed
         raise Exception(f"Failed to add product after trying {len(categories)} categories")
     
+    @timed_step
+    def lock_product(self, url: str) -> bool:
+        """Lock a product for this test, waiting for other tests (see utils.catalog_locks)."""
+        return self._lock_product(url, wait=True)
+    
+    def _lock_product(self, url: Optional[str], wait: bool = False) -> bool:
+        locks = current_locks()
+        if locks is None or not url:
+            return True
+        return locks.lock(url) if wait else locks.try_lock(url)
+    
+    def _unlock_product(self, url: str):
+        locks = current_locks()
+        if locks is not None:
+            locks.unlock(url)
+    
+    def _use_known_product(self, index: CatalogIndex, product: Dict) -> bool:
+        """Add an indexed product; a failing one is demoted and its lock dropped."""
+        log.info(f"  → Using known product: {product['name'] or product['url']}")
+        if self._add_known_product(product):
+            index.record_product(product['url'], product['name'], product['category'], add_to_cart=True)
+            index.save()
+            return True
+        log.warning("  ✗ Known product failed, demoting it in the catalog index...")
+        index.mark_failed(product['url'])
+        self._unlock_product(product['url'])
+        return False
+    
+    def _add_known_product(self, product: Dict) -> bool:
+        """Open an indexed product page directly and add it to the cart."""
+        try:
+            self.driver.get(product['url'])
+            add_btn = WebDriverWait(self.driver, 5).until(
+                EC.presence_of_element_located((
+                    By.XPATH,
+                    "//button[contains(text(), 'Add To Cart')]"
+                ))
+            )
+            self.last_added_product_name = product['name']
+            self.last_added_product_url = product['url']
+            return self._add_to_cart_and_verify(add_btn)
+        except (TimeoutException, NoSuchElementException, StaleElementReferenceException,
+                WebDriverException, RemoteDisconnected, MaxRetryError, ProtocolError,
+                ConnectionRefusedError, ConnectionError, OSError) as e:
+            log.warning(f"  ✗ Failed: {type(e).__name__}")
+            return False
+    
+    def _product_is_simple(self) -> bool:
+        """Zero-wait DOM probe: configurable products render super_attribute selectors."""
+        return self.driver.execute_script(
+            "return document.querySelectorAll('[name^=\"super_attribute\"]').length === 0;"
+        )
+    
+    def _add_to_cart_and_verify(self, add_btn) -> bool:
+        """Click Add To Cart, then open the cart page and check it has items."""
+        log.info("  → Clicking 'Add To Cart' button...")
+        add_btn.click()
+        
+        # CRITICAL: Wait 5 seconds for AJAX cart update (Playwright requirement)
+        log.info("  → Waiting for cart to update...")
+        time.sleep(5)
+        
+        # Navigate to cart page to verify (Playwright pattern)
+        log.info("  → Checking cart...")
+        self.driver.get(f"{self.base_url}/checkout/cart")
+        
+        # Wait for networkidle equivalent - wait for page load + 2s
+        WebDriverWait(self.driver, 20).until(
+            lambda d: d.execute_script('return document.readyState') == 'complete'
+        )
+        time.sleep(2)
+        
+        # Count items by quantity inputs (physical products)
+        qty_inputs = self.driver.find_elements(
+            By.CSS_SELECTOR,
+            'input[type="hidden"][name="quantity"]'
+        )
+        
+        # Count e-book checkboxes (digital products)
+        ebook_checkboxes = self.driver.find_elements(
+            By.CSS_SELECTOR,
+            'input[type="checkbox"][id^="item_"]'
+        )
+        
+        physical_count = len(qty_inputs)
+        ebook_count = len(ebook_checkboxes)
+        total_count = physical_count + ebook_count
+        
+        log.info(f"  → Found {total_count} items in cart ({physical_count} physical, {ebook_count} e-book)")
+        
+        if total_count > 0:
+            log.info(f"  ✓ Cart has {total_count} item(s)")
+            return True
+        return False
+    
+    @timed_step
     def go_checkout(self):
         """
         Navigate to checkout from cart page.
         Tries multiple checkout button/link selectors (matching Playwright).
         """
-        print("  → Looking for checkout button...")
-        
-        # Try multiple selectors (matching Playwright pattern)
-        checkout_selectors = [
-            (By.XPATH, "//a[contains(text(), 'Proceed To Checkout')]"),
-            (By.XPATH, "//a[contains(text(), 'Checkout')]"),
-            (By.XPATH, "//button[contains(text(), 'Checkout')]"),
-            (By.XPATH, "//button[contains(text(), 'Proceed To Checkout')]"),
-            (By.CSS_SELECTOR, ".checkout-btn"),
-            (By.CSS_SELECTOR, "a[href*='checkout']")
-        ]
-        
-        for by, selector in checkout_selectors:
-            try:
-                checkout_btn = WebDriverWait(self.driver, 3).until(
-                    EC.element_to_be_clickable((by, selector))
-                )
-                print(f"  → Found checkout button: {selector}")
-                checkout_btn.click()
-                
-                # Wait for checkout page to load (networkidle equivalent)
-                WebDriverWait(self.driver, 15).until(
-                    lambda d: d.execute_script('return document.readyState') == 'complete'
-                )
-                time.sleep(2)
-                
-                print("  ✓ Navigated to checkout page")
-                return
-            except (TimeoutException, NoSuchElementException):
-                continue
-        
-        raise Exception("Checkout button not found with any selector")
+        self.checkout.open()
     
-    def fill_shipping_address_minimal(self):
+    @timed_step
+    def fill_shipping_address_minimal(self, human_typing: Optional[bool] = None):
         """
-        Fill minimal shipping address and click Proceed button.
-        Uses test data for all fields.
+        Fill minimal shipping address (unless a saved one is shown) and click Proceed.
+        Uses test data for all fields, set in one script call; pass
+        human_typing=True (or HUMAN_TYPING=true) for real keystrokes.
         """
-        print("  → Filling shipping address form...")
-        
-        # Check if address form is present (new address vs saved address)
-        try:
-            first_name_input = self.driver.find_element(By.NAME, "billing[first_name]")
-            
-            # Fill all required fields
-            fields = {
-                'billing[first_name]': 'Test',
-                'billing[last_name]': 'User',
-                'billing[email]': self.email,
-                'billing[address1]': '123 Test Street',
-                'billing[city]': 'Test City',
-                'billing[postcode]': '12345',
-                'billing[phone]': '1234567890'
-            }
-            
-            for name, value in fields.items():
-                try:
-                    input_elem = self.driver.find_element(By.NAME, name)
-                    input_elem.clear()
-                    input_elem.send_keys(value)
-                except NoSuchElementException:
-                    pass
-            
-            # Select country (United States)
-            try:
-                country_select = self.driver.find_element(By.NAME, "billing[country]")
-                country_select.click()
-                time.sleep(0.5)
-                us_option = self.driver.find_element(By.XPATH, "//option[@value='US']")
-                us_option.click()
-                time.sleep(1)
-            except:
-                pass
-            
-            # Select state
-            try:
-                state_select = self.driver.find_element(By.NAME, "billing[state]")
-                state_select.click()
-                time.sleep(0.5)
-                first_state = self.driver.find_element(By.XPATH, "//select[@name='billing[state]']/option[2]")
-                first_state.click()
-            except:
-                pass
-            
-            print("  ✓ Address form filled")
-        except NoSuchElementException:
-            print("  → Using saved address")
-        
-        # Click Proceed button
-        print("  → Clicking 'Proceed' button...")
-        try:
-            proceed_btn = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Proceed')]"))
-            )
-            proceed_btn.click()
-            
-            # Wait for shipping/payment options to load
-            print("  → Waiting for shipping/payment options to load...")
-            time.sleep(2)
-            print("  ✓ Address saved and proceeded to payment")
-        except TimeoutException:
-            print("  → No Proceed button (may be on payment step already)")
+        self.checkout.complete_address(human_typing)
     
+    @timed_step
     def choose_payment_and_place(self, expect_success_msg: bool = False):
         """
         Select shipping method (Free Shipping), payment method (Cash On Delivery),
@@ -340,138 +366,18 @@ class StorePage:
         Args:
             expect_success_msg: Whether to wait for success message (not reliable on demo)
         """
-        # Scroll to top first to ensure shipping/payment section is visible
-        print("  → Scrolling to top of page...")
-        self.driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(1)
-        
-        # Step 1: Select shipping method
-        print("  → Selecting shipping method...")
-        
-        # Wait for shipping/payment options to load
-        time.sleep(2)
-        
-        # Check if shipping methods are present
-        shipping_inputs = self.driver.find_elements(
-            By.CSS_SELECTOR,
-            'input[type="radio"][name="shipping_method"]'
-        )
-        
-        if len(shipping_inputs) > 0:
-            # Find Free Shipping label (prefer last visible - matching Playwright .last())
-            try:
-                free_labels = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    'label[for="free_free"]'
-                )
-                if free_labels:
-                    # Click last label (Playwright uses .last())
-                    free_shipping_label = free_labels[-1]
-                    print("    Clicking Free Shipping label...")
-                    free_shipping_label.click()
-                    time.sleep(1)
-                    print("  ✓ Free Shipping selected")
-                else:
-                    # Fallback: try flat rate
-                    flat_labels = self.driver.find_elements(
-                        By.CSS_SELECTOR,
-                        'label[for^="flatrate"]'
-                    )
-                    if flat_labels:
-                        flat_labels[-1].click()
-                        print("  ✓ Flat Rate shipping selected")
-                        time.sleep(1)
-            except (NoSuchElementException, IndexError):
-                print("  → Shipping method not found or already selected")
-        else:
-            print("    No shipping methods found (e-book or already selected)")
-        
-        # Step 2: Select payment method
-        print("  → Selecting payment method...")
-        
-        # Wait for payment methods to load
-        time.sleep(2)
-        
-        payment_inputs = self.driver.find_elements(
-            By.CSS_SELECTOR,
-            'input[type="radio"][name="payment[method]"]'
-        )
-        
-        if len(payment_inputs) > 0:
-            # Find Cash On Delivery label (prefer last visible - matching Playwright .last())
-            try:
-                cod_labels = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    'label[for="cashondelivery"]'
-                )
-                if cod_labels:
-                    # Click last label (Playwright uses .last())
-                    cod_label = cod_labels[-1]
-                    print("    Clicking Cash On Delivery label...")
-                    cod_label.click()
-                    time.sleep(2)
-                    print("  ✓ Cash On Delivery selected")
-                else:
-                    # Fallback: try money transfer
-                    mt_labels = self.driver.find_elements(
-                        By.CSS_SELECTOR,
-                        'label[for="moneytransfer"]'
-                    )
-                    if mt_labels:
-                        mt_labels[-1].click()
-                        print("  ✓ Money Transfer selected")
-                        time.sleep(2)
-            except (NoSuchElementException, IndexError):
-                print("  ⚠ Payment method not found")
-        else:
-            print("    No payment methods found")
-        
-        # Step 3: Click Place Order
-        print("  → Clicking Place Order...")
-        
-        # Scroll to bottom (matching Playwright)
-        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(1)
-        
-        # Try multiple selectors for Place Order button (matching Playwright)
-        place_btn_selectors = [
-            (By.XPATH, "//button[contains(text(), 'Place Order')]"),
-            (By.CSS_SELECTOR, "button.primary-button"),
-            (By.XPATH, "//button[@type='button' and contains(text(), 'Place')]"),
-            (By.XPATH, "//button[contains(@class, 'primary') and contains(text(), 'Place')]")
-        ]
-        
-        for by, selector in place_btn_selectors:
-            try:
-                place_order_btn = WebDriverWait(self.driver, 2).until(
-                    EC.element_to_be_clickable((by, selector))
-                )
-                
-                print(f"    Found button with selector: {selector}")
-                
-                # Try regular click first
-                try:
-                    place_order_btn.click()
-                except ElementClickInterceptedException:
-                    # If intercepted, use JavaScript click
-                    self.driver.execute_script("arguments[0].click();", place_order_btn)
-                
-                # Wait for order processing
-                time.sleep(5)
-                print("  ✓ Order placement attempted")
-                return
-                
-            except (TimeoutException, NoSuchElementException):
-                continue
-        
-        print("  ⚠ Place Order button not found with any selector")
+        self.checkout.choose_shipping()
+        self.checkout.choose_payment()
+        self.checkout.place_order(expect_success_msg)
     
+    @timed_step
     def open_cart(self):
         """Navigate to cart page."""
-        print("  → Opening cart page...")
+        log.info("  → Opening cart page...")
         self.driver.get(f"{self.base_url}/checkout/cart")
         time.sleep(2)
     
+    @timed_step
     def cart_is_empty(self) -> bool:
         """
         Check if cart is empty.
@@ -484,7 +390,7 @@ class StorePage:
                 "//*[contains(text(), 'Your cart is empty') or contains(text(), 'empty')]"
             )
             if empty_msg.is_displayed():
-                print("  ✓ Cart is empty")
+                log.info("  ✓ Cart is empty")
                 return True
         except NoSuchElementException:
             pass
@@ -496,56 +402,24 @@ class StorePage:
         )
         
         if len(qty_inputs) == 0:
-            print("  ✓ Cart is empty (no quantity inputs)")
+            log.info("  ✓ Cart is empty (no quantity inputs)")
             return True
         else:
-            print(f"  ⚠ Cart has {len(qty_inputs)} item(s)")
+            log.warning(f"  ⚠ Cart has {len(qty_inputs)} item(s)")
             raise AssertionError(f"Cart is not empty: {len(qty_inputs)} items found")
     
+    @timed_step
     def get_latest_order(self) -> Optional[Dict[str, str]]:
         """
-        Get latest order from order history.
+        Get latest order from order history (over HTTP with the browser's cookies).
         
         Returns:
             Dict with keys: orderId, date, total, status
             None if no orders found
         """
-        print("  → Opening order history...")
-        self.driver.get(f"{self.base_url}/customer/account/orders")
-        time.sleep(2)
-        
-        # Find order rows (skip header row)
-        try:
-            # All rows have class "row grid"
-            all_rows = self.driver.find_elements(By.CSS_SELECTOR, '.row.grid')
-            
-            # Filter out header row (contains "Order ID" or "Order Date" text)
-            data_rows = []
-            for row in all_rows:
-                row_text = row.text.lower()
-                if 'order id' not in row_text and 'order date' not in row_text:
-                    data_rows.append(row)
-            
-            if not data_rows:
-                print("  ⚠ No orders found in history")
-                return None
-            
-            # Get first data row (latest order)
-            first_row = data_rows[0]
-            cells = first_row.find_elements(By.TAG_NAME, 'p')
-            
-            if len(cells) >= 4:
-                order_data = {
-                    'orderId': cells[0].text.strip(),
-                    'date': cells[1].text.strip(),
-                    'total': cells[2].text.strip(),
-                    'status': cells[3].text.strip()
-                }
-                return order_data
-            else:
-                print(f"  ⚠ Unexpected row format: {len(cells)} cells")
-                return None
-                
-        except NoSuchElementException:
-            print("  ⚠ Could not find order rows")
+        log.info("  → Fetching order history...")
+        latest = self.order_history.latest()
+        if latest is None:
+            log.warning("  ⚠ No orders found in history")
             return None
+        return latest.to_dict()
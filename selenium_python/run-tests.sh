@@ -40,72 +40,101 @@ echo ""
 case $SCENARIO in
     s1|S1)
         echo "Running S1 - Empty Cart Checkout..."
-        pytest tests/test_bagisto_s1.py -v -s
+        pytest tests/test_bagisto_s1.py -v
         ;;
     s2|S2)
         echo "Running S2 - Remove All Products..."
-        pytest tests/test_bagisto_s2.py -v -s
+        pytest tests/test_bagisto_s2.py -v
         ;;
     s3|S3)
         echo "Running S3 - Move to Wishlist..."
-        pytest tests/test_bagisto_s3.py -v -s
+        pytest tests/test_bagisto_s3.py -v
         ;;
     s4|S4)
         echo "Running S4 - Zero Stock Handling..."
-        pytest tests/test_bagisto_s4.py -v -s
+        pytest tests/test_bagisto_s4.py -v
         ;;
     s5|S5)
         echo "Running S5 - Stock Reduction During Checkout..."
-        pytest tests/test_bagisto_s5.py -v -s
+        pytest tests/test_bagisto_s5.py -v
         ;;
     s6|S6)
         echo "Running S6 - Price Change During Checkout..."
-        pytest tests/test_bagisto_s6.py -v -s
+        pytest tests/test_bagisto_s6.py -v
         ;;
     s7|S7)
         echo "Running S7 - Change Shipping Method..."
-        pytest tests/test_bagisto_s7.py -v -s
+        pytest tests/test_bagisto_s7.py -v
         ;;
     s8|S8)
         echo "Running S8 - Apply Coupon Code..."
-        pytest tests/test_bagisto_s8.py -v -s
+        pytest tests/test_bagisto_s8.py -v
         ;;
     s9|S9)
         echo "Running S9 - Change Payment Method..."
-        pytest tests/test_bagisto_s9.py -v -s
+        pytest tests/test_bagisto_s9.py -v
         ;;
     s10|S10)
         echo "Running S10 - Digital Goods (E-Books)..."
-        pytest tests/test_bagisto_s10.py -v -s
+        pytest tests/test_bagisto_s10.py -v
         ;;
     s11|S11)
         echo "Running S11 - Happy Path Single Product..."
-        pytest tests/test_bagisto_s11.py -v -s
+        pytest tests/test_bagisto_s11.py -v
         ;;
     s12|S12)
         echo "Running S12 - Reload During Order Creation..."
-        pytest tests/test_bagisto_s12.py -v -s
+        pytest tests/test_bagisto_s12.py -v
         ;;
     s14|S14)
         echo "Running S14 - Immediate F5 After Place Order..."
-        pytest tests/test_bagisto_s14.py -v -s
+        pytest tests/test_bagisto_s14.py -v
         ;;
     s15|S15)
         echo "Running S15 - Cancel Order & Reorder..."
-        pytest tests/test_bagisto_s15.py -v -s
+        pytest tests/test_bagisto_s15.py -v
         ;;
     s16|S16)
         echo "Running S16 - Concurrent Cart Editing..."
-        pytest tests/test_bagisto_s16.py -v -s
+        pytest tests/test_bagisto_s16.py -v
         ;;
     s13|S13)
         echo "Running S13 - Concurrent Place Order Race..."
-        pytest tests/test_bagisto_s13.py -v -s
+        pytest tests/test_bagisto_s13.py -v
+        ;;
+    
+    daemon)
+        echo "Starting browser daemon (Ctrl+C to stop)..."
+        echo "   Test runs in other terminals attach to its browsers automatically"
+        python -m utils.browser_daemon start
+        exit 0
+        ;;
+    
+    watch)
+        echo "Watching pages/ and tests/ - affected scenarios re-run on save (Ctrl+C to stop)..."
+        python -m utils.watch --start-daemon
+        exit 0
+        ;;
+    
+    affected)
+        echo "Running scenarios affected by changes since ${IMPACT_BASE:-origin/main} (plus smoke floor)..."
+        SELECTED=$(python -m utils.impact select --explain) || exit 1
+        if [ -z "$SELECTED" ]; then
+            # An empty argument list would make pytest run the whole suite
+            echo "Nothing to run: no scenario is affected and the smoke floor is empty"
+            exit 0
+        fi
+        pytest $SELECTED -v
+        ;;
+    
+    unit)
+        echo "Running offline unit tests..."
+        pytest tests/unit -v
         ;;
     
     all)
         echo "Running ALL test scenarios..."
-        pytest tests/ -v -s
+        pytest tests/ -v
         ;;
     *)
         echo "Usage: $0 [scenario] [mode]"
@@ -128,6 +157,10 @@ case $SCENARIO in
         echo "  s16  - Concurrent cart editing"
         echo "  s17  - Concurrent place order race"
         echo "  all  - Run all scenarios (default)"
+        echo "  daemon - Keep warm logged-in browsers for fast re-runs"
+        echo "  watch  - Re-run scenarios affected by each saved edit"
+        echo "  affected - Scenarios affected by the branch's changes (test impact analysis)"
+        echo "  unit     - Offline unit tests of the helpers (no browser needed)"
         echo ""
         echo "Mode:"
         echo "  headed   - Browser visible (default)"
@@ -143,3 +176,4 @@ esac
 
 echo ""
 echo "✅ Test execution completed!"
+echo "   Per-test logs: test-results/logs/ (set LOG_CONSOLE=true for live output)"
@@ -10,6 +10,9 @@ import time
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException
 from pages.store_page import StorePage
+from utils.log import get_logger
+
+log = get_logger(__name__)
 
 
 class TestBagistoB1aEmptyCartCheckout:
@@ -27,24 +30,24 @@ class TestBagistoB1aEmptyCartCheckout:
         5. If button exists: Click and check for warning
         6. Expected: Warning message OR button hidden
         """
-        print("\n" + "="*80)
-        print("B1a: EMPTY CART CHECKOUT VALIDATION")
-        print("="*80)
+        log.info("\n" + "="*80)
+        log.info("B1a: EMPTY CART CHECKOUT VALIDATION")
+        log.info("="*80)
         
         store = StorePage(driver, base_url)
         
-        print("\nStep 1: Navigating to homepage...")
+        log.info("\nStep 1: Navigating to homepage...")
         store.goto_home()
         
-        print("\nStep 2: Opening cart page (should be empty)...")
+        log.info("\nStep 2: Opening cart page (should be empty)...")
         store.open_cart()
         
-        print("\nStep 3: Verifying cart is empty...")
+        log.info("\nStep 3: Verifying cart is empty...")
         try:
             store.cart_is_empty()
-            print('  ✓ Cart is empty')
+            log.info('  ✓ Cart is empty')
         except AssertionError:
-            print('  ⚠ Cart not empty, removing all items first...')
+            log.warning('  ⚠ Cart not empty, removing all items first...')
             # If cart has items, remove them
             try:
                 select_all_label = driver.find_element(By.CSS_SELECTOR, 'label[for="select-all"]')
@@ -63,11 +66,11 @@ class TestBagistoB1aEmptyCartCheckout:
                 except NoSuchElementException:
                     pass
                 
-                print('  ✓ Cart emptied')
+                log.info('  ✓ Cart emptied')
             except:
-                print('  ⚠ Could not empty cart automatically')
+                log.warning('  ⚠ Could not empty cart automatically')
         
-        print("\nStep 4: Looking for 'Proceed To Checkout' button...")
+        log.info("\nStep 4: Looking for 'Proceed To Checkout' button...")
         
         checkout_btn_selectors = [
             "//a[contains(text(), 'Proceed To Checkout')]",
@@ -85,17 +88,17 @@ class TestBagistoB1aEmptyCartCheckout:
                 if btn.is_displayed():
                     checkout_btn = btn
                     found_selector = selector
-                    print(f'  ✓ Found checkout button: {selector}')
+                    log.info(f'  ✓ Found checkout button: {selector}')
                     break
             except NoSuchElementException:
                 continue
         
         if checkout_btn:
-            print("\nStep 5: Clicking 'Proceed To Checkout' with empty cart...")
+            log.info("\nStep 5: Clicking 'Proceed To Checkout' with empty cart...")
             checkout_btn.click()
             time.sleep(1.5)
             
-            print("\nStep 6: Verifying warning message...")
+            log.info("\nStep 6: Verifying warning message...")
             
             warning_selectors = [
                 "//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'cart') and contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'empty')]",
@@ -111,25 +114,25 @@ class TestBagistoB1aEmptyCartCheckout:
                     warning = driver.find_element(By.XPATH, selector)
                     if warning.is_displayed():
                         text = warning.text.strip()
-                        print(f'  ✓ Warning found: "{text}"')
+                        log.info(f'  ✓ Warning found: "{text}"')
                         has_warning = True
                         break
                 except NoSuchElementException:
                     continue
             
             if has_warning:
-                print('\n' + "="*80)
-                print('B1a: PASSED - Warning displayed for empty cart checkout')
-                print("="*80)
+                log.info('\n' + "="*80)
+                log.info('B1a: PASSED - Warning displayed for empty cart checkout')
+                log.info("="*80)
             else:
-                print('  ⚠ No warning found - cart page may hide checkout button when empty')
-                print('\n' + "="*80)
-                print('B1a: SOFT PASS - Checkout button exists but no explicit warning shown')
-                print("="*80)
+                log.warning('  ⚠ No warning found - cart page may hide checkout button when empty')
+                log.info('\n' + "="*80)
+                log.info('B1a: SOFT PASS - Checkout button exists but no explicit warning shown')
+                log.info("="*80)
         else:
-            print('  ✓ "Proceed To Checkout" button not visible on empty cart')
-            print('\n' + "="*80)
-            print('B1a: PASSED - System prevents empty cart checkout by hiding button')
-            print("="*80)
+            log.info('  ✓ "Proceed To Checkout" button not visible on empty cart')
+            log.info('\n' + "="*80)
+            log.info('B1a: PASSED - System prevents empty cart checkout by hiding button')
+            log.info("="*80)
         
-        print()
+        log.info('')
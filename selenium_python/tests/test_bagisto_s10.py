@@ -16,6 +16,9 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.common.keys import Keys
 from pages.store_page import StorePage
+from utils.log import get_logger
+
+log = get_logger(__name__)
 
 
 class TestBagistoS10DigitalGoods:
@@ -39,18 +42,18 @@ class TestBagistoS10DigitalGoods:
         11. Verify order created
         12. Check for download link in order details
         """
-        print("\n" + "="*80)
-        print("S14 – DIGITAL GOODS (E-BOOK) CHECKOUT")
-        print("="*80)
+        log.info("\n" + "="*80)
+        log.info("S14 – DIGITAL GOODS (E-BOOK) CHECKOUT")
+        log.info("="*80)
         
         store = StorePage(driver, base_url)
         
         # Step 1: Login
-        print("\nStep 1 (B1): Logging in...")
+        log.info("\nStep 1 (B1): Logging in...")
         store.login()
         
         # Clear cart
-        print("\nStep 1.5: Clearing cart before adding e-book...")
+        log.info("\nStep 1.5: Clearing cart before adding e-book...")
         store.open_cart()
         
         # Remove all items if any
@@ -74,16 +77,16 @@ class TestBagistoS10DigitalGoods:
             except NoSuchElementException:
                 break
         
-        print('  ✓ Cart cleared')
+        log.info('  ✓ Cart cleared')
         
         # Step 2: Navigate to E-Books category
-        print("\nStep 2 (B2): Navigating to E-Books category...")
+        log.info("\nStep 2 (B2): Navigating to E-Books category...")
         driver.get(f"{base_url}/e-books")
         time.sleep(2)
-        print('  ✓ E-Books category opened')
+        log.info('  ✓ E-Books category opened')
         
         # Step 3: Find Champions Mindset e-book
-        print("\nStep 3 (B2): Looking for Champions Mindset e-book...")
+        log.info("\nStep 3 (B2): Looking for Champions Mindset e-book...")
         
         try:
             champions_link = driver.find_element(
@@ -92,14 +95,14 @@ class TestBagistoS10DigitalGoods:
                 "following-sibling::p[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'champions mindset')]]"
             )
             
-            print('  ✓ Found Champions Mindset e-book')
+            log.info('  ✓ Found Champions Mindset e-book')
             # Use JavaScript click to avoid ChromeDriver bug
             driver.execute_script("arguments[0].click();", champions_link)
             time.sleep(2)
-            print('  ✓ Champions Mindset product page opened')
+            log.info('  ✓ Champions Mindset product page opened')
         
         except NoSuchElementException:
-            print('  ⚠ Champions Mindset not found, trying first e-book...')
+            log.warning('  ⚠ Champions Mindset not found, trying first e-book...')
             
             try:
                 any_product = driver.find_element(
@@ -108,34 +111,34 @@ class TestBagistoS10DigitalGoods:
                 )
                 any_product.click()
                 time.sleep(2)
-                print('  ✓ E-book product page opened')
+                log.info('  ✓ E-book product page opened')
             except NoSuchElementException:
-                print('  ⚠ No e-book products found')
-                print('\n=== Expected Digital Goods Flow ===')
-                print('1. Navigate to /e-books category')
-                print('2. Select Champions Mindset e-book')
-                print('3. Select download link checkbox (REQUIRED!)')
-                print('4. Add to cart')
-                print('5. Checkout - NO shipping, only payment')
-                print('6. After payment: Download link in order details')
+                log.warning('  ⚠ No e-book products found')
+                log.info('\n=== Expected Digital Goods Flow ===')
+                log.info('1. Navigate to /e-books category')
+                log.info('2. Select Champions Mindset e-book')
+                log.info('3. Select download link checkbox (REQUIRED!)')
+                log.info('4. Add to cart')
+                log.info('5. Checkout - NO shipping, only payment')
+                log.info('6. After payment: Download link in order details')
                 return
         
         # Step 4: Verify product page
-        print("\nStep 4 (B2): Verifying e-book product page...")
+        log.info("\nStep 4 (B2): Verifying e-book product page...")
         
         try:
             add_to_cart_btn = driver.find_element(
                 By.XPATH,
                 "//button[contains(text(), 'Add To Cart')]"
             )
-            print('  ✓ E-book product page loaded')
+            log.info('  ✓ E-book product page loaded')
         except NoSuchElementException:
-            print('  ⚠ Not on product page')
+            log.warning('  ⚠ Not on product page')
             return
         
         # Step 5: CRITICAL - Select download link checkbox
-        print("\nStep 5 (B2): Selecting downloadable link/format...")
-        print('  ⚠ CRITICAL: Must select download link or get "Links field required" error!')
+        log.info("\nStep 5 (B2): Selecting downloadable link/format...")
+        log.warning('  ⚠ CRITICAL: Must select download link or get "Links field required" error!')
         
         try:
             # Find label with "Champions Mindset" + price
@@ -144,30 +147,30 @@ class TestBagistoS10DigitalGoods:
                 "//label[contains(text(), 'Champions Mindset') and contains(text(), '$')]"
             )
             
-            print(f'  → Clicking "{download_label.text}" checkbox...')
+            log.info(f'  → Clicking "{download_label.text}" checkbox...')
             download_label.click()
             time.sleep(0.5)
-            print('  ✓ Download link checkbox selected')
+            log.info('  ✓ Download link checkbox selected')
         
         except NoSuchElementException:
-            print('  ⚠ Download link checkbox not found!')
-            print('  ⚠ Cannot proceed - download link selection is REQUIRED')
+            log.warning('  ⚠ Download link checkbox not found!')
+            log.warning('  ⚠ Cannot proceed - download link selection is REQUIRED')
             return
         
         # Step 6: Add to cart
-        print("\nStep 6 (B2): Adding e-book to cart...")
+        log.info("\nStep 6 (B2): Adding e-book to cart...")
         
         try:
             add_to_cart_btn.click()
-            print('  → Clicked Add To Cart')
+            log.info('  → Clicked Add To Cart')
             time.sleep(5)  # Wait for AJAX
-            print('  ✓ E-book added to cart')
+            log.info('  ✓ E-book added to cart')
         except:
-            print('  ⚠ Could not click Add To Cart')
+            log.warning('  ⚠ Could not click Add To Cart')
             return
         
         # Step 7: Verify in cart
-        print("\nStep 7 (B3): Navigating to cart to verify...")
+        log.info("\nStep 7 (B3): Navigating to cart to verify...")
         driver.get(f"{base_url}/checkout/cart")
         time.sleep(2)
         
@@ -185,20 +188,20 @@ class TestBagistoS10DigitalGoods:
         ebook_count = len(ebook_checkboxes)
         total_count = physical_count + ebook_count
         
-        print(f'  ✓ Cart has {total_count} item(s) ({physical_count} physical, {ebook_count} e-book)')
+        log.info(f'  ✓ Cart has {total_count} item(s) ({physical_count} physical, {ebook_count} e-book)')
         
         if total_count == 0:
-            print('  ⚠ Cart empty - e-book not added (demo limitation)')
+            log.warning('  ⚠ Cart empty - e-book not added (demo limitation)')
             return
         
         if ebook_count == 0:
-            print('  ⚠ No e-books in cart')
+            log.warning('  ⚠ No e-books in cart')
             return
         
-        print('  ✓ E-book found in cart')
+        log.info('  ✓ E-book found in cart')
         
         # Step 8: Proceed to checkout
-        print("\nStep 8 (B3): Proceeding to checkout...")
+        log.info("\nStep 8 (B3): Proceeding to checkout...")
         
         try:
             proceed_link = driver.find_element(
@@ -207,13 +210,13 @@ class TestBagistoS10DigitalGoods:
             )
             proceed_link.click()
             time.sleep(2)
-            print('  ✓ Navigated to checkout')
+            log.info('  ✓ Navigated to checkout')
         except:
-            print('  ⚠ Proceed To Checkout not found')
+            log.warning('  ⚠ Proceed To Checkout not found')
             return
         
         # Step 9: Fill billing address (NO shipping for e-books)
-        print("\nStep 9 (B4): E-book checkout - checking for address form...")
+        log.info("\nStep 9 (B4): E-book checkout - checking for address form...")
         time.sleep(2)
         
         # Check if Proceed button exists (address form present)
@@ -229,13 +232,13 @@ class TestBagistoS10DigitalGoods:
         
         if has_proceed_btn:
             # Physical product or needs address
-            print('  → Address form detected, filling minimal info...')
+            log.info('  → Address form detected, filling minimal info...')
             store.fill_shipping_address_minimal()  # This clicks Proceed
         else:
-            print('  → No address form (pure digital checkout)')
+            log.info('  → No address form (pure digital checkout)')
         
         # Step 10: Select payment method (NO SHIPPING!)
-        print("\nStep 10 (B5): Selecting payment method (NO shipping for e-book)...")
+        log.info("\nStep 10 (B5): Selecting payment method (NO shipping for e-book)...")
         time.sleep(2)
         
         # E-books typically use Money Transfer (online payment)
@@ -249,7 +252,7 @@ class TestBagistoS10DigitalGoods:
             if money_transfer_labels:
                 money_transfer_labels[-1].click()
                 time.sleep(2)
-                print('  ✓ Money Transfer selected (online payment for e-book)')
+                log.info('  ✓ Money Transfer selected (online payment for e-book)')
             else:
                 # Fallback: Try Cash On Delivery
                 cod_labels = driver.find_elements(
@@ -260,7 +263,7 @@ class TestBagistoS10DigitalGoods:
                 if cod_labels:
                     cod_labels[-1].click()
                     time.sleep(2)
-                    print('  ✓ Cash On Delivery selected')
+                    log.info('  ✓ Cash On Delivery selected')
                 else:
                     # Try any payment method
                     payment_labels = driver.find_elements(
@@ -270,13 +273,13 @@ class TestBagistoS10DigitalGoods:
                     if payment_labels:
                         payment_labels[0].click()
                         time.sleep(2)
-                        print('  ✓ Payment method selected')
+                        log.info('  ✓ Payment method selected')
         
         except Exception as e:
-            print(f'  ⚠ Could not find payment method: {e}')
+            log.warning(f'  ⚠ Could not find payment method: {e}')
         
         # Step 11: Place order
-        print("\nStep 11 (B5): Placing order...")
+        log.info("\nStep 11 (B5): Placing order...")
         time.sleep(2)
         
         # Scroll to bottom
@@ -290,21 +293,21 @@ class TestBagistoS10DigitalGoods:
             )
             
             place_order_btn.click()
-            print('  ✓ Clicked Place Order')
-            print('  → Waiting for order processing...')
+            log.info('  ✓ Clicked Place Order')
+            log.info('  → Waiting for order processing...')
         
         except:
-            print('  ⚠ Place Order button not found')
+            log.warning('  ⚠ Place Order button not found')
             return
         
         # Step 12: Wait for success
-        print("\nStep 12: Waiting for order success page...")
+        log.info("\nStep 12: Waiting for order success page...")
         
         try:
             WebDriverWait(driver, 60).until(
                 EC.url_contains('/checkout/onepage/success')
             )
-            print('  ✓ Order redirected to success page')
+            log.info('  ✓ Order redirected to success page')
             time.sleep(2)
             
             # Get order ID
@@ -314,16 +317,16 @@ class TestBagistoS10DigitalGoods:
             )
             
             order_id = order_link.text.strip()
-            print(f'  ✓ Order created: #{order_id}')
+            log.info(f'  ✓ Order created: #{order_id}')
             
             # View order details (use JavaScript click)
-            print("\nStep 13: Opening order details to check for download link...")
+            log.info("\nStep 13: Opening order details to check for download link...")
             driver.execute_script("arguments[0].click();", order_link)
             time.sleep(3)
             
             current_url = driver.current_url
             if '/customer/account/orders/view/' in current_url:
-                print(f'  ✓ Order details page loaded')
+                log.info(f'  ✓ Order details page loaded')
                 
                 # Look for download link
                 try:
@@ -332,19 +335,19 @@ class TestBagistoS10DigitalGoods:
                         "//a[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', "
                         "'abcdefghijklmnopqrstuvwxyz'), 'download')]"
                     )
-                    print(f'  ✓ Download link found: {download_link.text}')
+                    log.info(f'  ✓ Download link found: {download_link.text}')
                 except:
-                    print('  ℹ Download link not immediately visible (may require payment completion)')
+                    log.info('  ℹ Download link not immediately visible (may require payment completion)')
         
         except TimeoutException:
-            print('  ⚠ Timeout waiting for success page')
-        
-        print("\n" + "="*80)
-        print("S14: COMPLETED - Digital goods (e-book) checkout tested")
-        print("Key points:")
-        print("  - E-books require download link selection BEFORE add to cart")
-        print("  - Cart verification uses checkboxes, not quantity inputs")
-        print("  - NO shipping method selection for digital products")
-        print("  - Only payment method needed")
-        print("  - Download link provided after payment in order details")
-        print("="*80 + "\n")
+            log.warning('  ⚠ Timeout waiting for success page')
+        
+        log.info("\n" + "="*80)
+        log.info("S14: COMPLETED - Digital goods (e-book) checkout tested")
+        log.info("Key points:")
+        log.info("  - E-books require download link selection BEFORE add to cart")
+        log.info("  - Cart verification uses checkboxes, not quantity inputs")
+        log.info("  - NO shipping method selection for digital products")
+        log.info("  - Only payment method needed")
+        log.info("  - Download link provided after payment in order details")
+        log.info("="*80 + "\n")
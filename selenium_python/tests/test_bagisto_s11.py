@@ -13,6 +13,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from pages.store_page import StorePage
+from utils.log import get_logger
+
+log = get_logger(__name__)
 
 
 class TestBagistoS1SingleCheckout:
@@ -36,40 +39,40 @@ class TestBagistoS1SingleCheckout:
         11. Verify cart is empty
         12. Check order history
         """
-        print("\n" + "="*80)
-        print("S1 – SINGLE PRODUCT COMPLETE CHECKOUT")
-        print("="*80)
+        log.info("\n" + "="*80)
+        log.info("S1 – SINGLE PRODUCT COMPLETE CHECKOUT")
+        log.info("="*80)
         
         store = StorePage(driver, base_url)
         
         # Step 1: Login
-        print("\nStep 1 (B1): Logging in to save order...")
+        log.info("\nStep 1 (B1): Logging in to save order...")
         store.login()
         
         # Step 2: Add product to cart
-        print("\nStep 2 (B2): Adding single product to cart...")
+        log.info("\nStep 2 (B2): Adding single product to cart...")
         store.add_first_product_from_home()
         
         # Step 3: Verify cart
-        print("\nStep 3 (B2): Verifying product in cart...")
+        log.info("\nStep 3 (B2): Verifying product in cart...")
         qty_inputs = driver.find_elements(
             By.CSS_SELECTOR,
             'input[type="hidden"][name="quantity"]'
         )
         item_count = len(qty_inputs)
-        print(f"  Cart has {item_count} item(s)")
+        log.info(f"  Cart has {item_count} item(s)")
         assert item_count > 0, "Cart should have at least 1 item"
         
         # Step 4: Proceed to checkout
-        print("\nStep 4 (B3): Proceeding to checkout...")
+        log.info("\nStep 4 (B3): Proceeding to checkout...")
         store.go_checkout()
         
         # Step 5: Fill shipping address
-        print("\nStep 5 (B4): Filling shipping address...")
+        log.info("\nStep 5 (B4): Filling shipping address...")
         store.fill_shipping_address_minimal()
         
         # Step 6: Capture checkout prices BEFORE placing order
-        print("\nStep 6 (B5): Capturing checkout summary prices BEFORE placing order...")
+        log.info("\nStep 6 (B5): Capturing checkout summary prices BEFORE placing order...")
         time.sleep(2)  # Wait for prices to load
         
         checkout_subtotal = 'N/A'
@@ -106,32 +109,32 @@ class TestBagistoS1SingleCheckout:
                 except:
                     continue
             
-            print(f"  Checkout Summary:")
-            print(f"    Subtotal: {checkout_subtotal}")
-            print(f"    Delivery: {checkout_delivery}")
-            print(f"    Grand Total: {checkout_grand_total}")
+            log.info(f"  Checkout Summary:")
+            log.info(f"    Subtotal: {checkout_subtotal}")
+            log.info(f"    Delivery: {checkout_delivery}")
+            log.info(f"    Grand Total: {checkout_grand_total}")
         except Exception as e:
-            print(f"  ⚠ Could not capture checkout prices: {type(e).__name__}: {str(e)}")
+            log.warning(f"  ⚠ Could not capture checkout prices: {type(e).__name__}: {str(e)}")
         
         # Step 7: Place order
-        print("\nStep 7 (B5): Choosing payment method and placing order...")
+        log.info("\nStep 7 (B5): Choosing payment method and placing order...")
         store.choose_payment_and_place(expect_success_msg=False)
-        print("  ✓ Order placement attempted")
+        log.info("  ✓ Order placement attempted")
         
         # Step 8: Wait for success page
-        print("\nStep 8: Waiting for order success page...")
+        log.info("\nStep 8: Waiting for order success page...")
         try:
             # Wait for URL to contain "/checkout/onepage/success"
             WebDriverWait(driver, 50).until(
                 EC.url_contains('/checkout/onepage/success')
             )
-            print("  ✓ Redirected to order success page")
+            log.info("  ✓ Redirected to order success page")
         except TimeoutException:
-            print("  ⚠ Timeout waiting for success page")
-            print(f"  Current URL: {driver.current_url}")
+            log.warning("  ⚠ Timeout waiting for success page")
+            log.info(f"  Current URL: {driver.current_url}")
         
         # Step 9: Extract order ID
-        print("\nStep 9: Extracting order ID from success page...")
+        log.info("\nStep 9: Extracting order ID from success page...")
         order_id = ''
         try:
             # Find order link: <a class="text-blue-700" href=".../orders/view/66">66</a>
@@ -144,27 +147,27 @@ class TestBagistoS1SingleCheckout:
             order_href = order_link.get_attribute('href')
             order_id = order_id_text.strip()
             
-            print(f"  ✓ Order created successfully!")
-            print(f"    Order ID: #{order_id}")
-            print(f"    Order URL: {order_href}")
+            log.info(f"  ✓ Order created successfully!")
+            log.info(f"    Order ID: #{order_id}")
+            log.info(f"    Order URL: {order_href}")
             
             # Click link to view order details (wrapped in try-except for browser stability)
             try:
-                print("  → Clicking order link to verify details...")
+                log.info("  → Clicking order link to verify details...")
                 # CRITICAL FIX: Use JavaScript click to avoid ChromeDriver crash
                 driver.execute_script("arguments[0].click();", order_link)
                 time.sleep(2)
             except Exception as e:
-                print(f"  ⚠ Could not click order link (browser issue): {type(e).__name__}")
+                log.warning(f"  ⚠ Could not click order link (browser issue): {type(e).__name__}")
                 # Continue test - order was created successfully
             else:
                 # Verify we're on order detail page
                 current_url = driver.current_url
                 if '/customer/account/orders/view/' in current_url:
-                    print(f"  ✓ Order details page loaded: {current_url}")
+                    log.info(f"  ✓ Order details page loaded: {current_url}")
                     
                     # Step 10: Parse order detail summary
-                    print("\nStep 10: Parsing order detail summary to verify prices...")
+                    log.info("\nStep 10: Parsing order detail summary to verify prices...")
                     # CRITICAL: Wait for order detail page to fully render
                     time.sleep(3)
                     
@@ -181,7 +184,7 @@ class TestBagistoS1SingleCheckout:
                         )
                         gt_price = gt_row.find_element(By.XPATH, ".//p[last()]")
                         order_grand_total = gt_price.text.strip()
-                        print(f"  → Found Grand Total: {order_grand_total}")
+                        log.info(f"  → Found Grand Total: {order_grand_total}")
                         
                         # Try to find Subtotal
                         try:
@@ -196,59 +199,59 @@ class TestBagistoS1SingleCheckout:
                             pass
                         
                     except NoSuchElementException as e:
-                        print(f"  ⚠ Could not find price elements: {str(e)}")
+                        log.warning(f"  ⚠ Could not find price elements: {str(e)}")
                     
-                    print(f"  Order Detail Summary:")
-                    print(f"    Subtotal: {order_subtotal}")
-                    print(f"    Delivery: {order_delivery}")
-                    print(f"    Grand Total: {order_grand_total}")
+                    log.info(f"  Order Detail Summary:")
+                    log.info(f"    Subtotal: {order_subtotal}")
+                    log.info(f"    Delivery: {order_delivery}")
+                    log.info(f"    Grand Total: {order_grand_total}")
                     
                     # Step 11: Compare prices
-                    print("\nStep 11: Comparing checkout prices vs order detail prices...")
+                    log.info("\nStep 11: Comparing checkout prices vs order detail prices...")
                     
                     if checkout_grand_total and order_grand_total and \
                        checkout_grand_total != 'N/A' and order_grand_total != 'N/A':
                         if checkout_grand_total == order_grand_total:
-                            print(f"  ✓ Grand Total MATCHES: {checkout_grand_total} = {order_grand_total}")
+                            log.info(f"  ✓ Grand Total MATCHES: {checkout_grand_total} = {order_grand_total}")
                         else:
-                            print(f"  ⚠ Grand Total MISMATCH: Checkout {checkout_grand_total} ≠ Order {order_grand_total}")
+                            log.warning(f"  ⚠ Grand Total MISMATCH: Checkout {checkout_grand_total} ≠ Order {order_grand_total}")
                     else:
-                        print(f"  ℹ Price comparison skipped (values not captured)")
+                        log.info(f"  ℹ Price comparison skipped (values not captured)")
         
         except NoSuchElementException:
-            print("  ⚠ Could not find order ID link on success page")
+            log.warning("  ⚠ Could not find order ID link on success page")
         
         # Step 12-14: Check cart is empty (gracefully handle browser crash)
-        print("\nStep 12: Returning to home and checking cart...")
+        log.info("\nStep 12: Returning to home and checking cart...")
         try:
             store.goto_home()
             
-            print("\nStep 13: Verifying cart is empty after checkout...")
+            log.info("\nStep 13: Verifying cart is empty after checkout...")
             store.open_cart()
             
             try:
                 store.cart_is_empty()
-                print("  ✓ Cart cleared after successful order")
+                log.info("  ✓ Cart cleared after successful order")
             except AssertionError:
-                print("  ⚠ Cart not empty (demo may have cart persistence issues)")
+                log.warning("  ⚠ Cart not empty (demo may have cart persistence issues)")
                 # Check current cart count
                 qty_check = driver.find_elements(
                     By.CSS_SELECTOR,
                     'input[type="hidden"][name="quantity"]'
                 )
                 final_count = len(qty_check)
-                print(f"  Current cart items: {final_count}")
+                log.info(f"  Current cart items: {final_count}")
             
             # Step 14: Verify order in history
-            print("\nStep 14: Checking order history for verification...")
+            log.info("\nStep 14: Checking order history for verification...")
             latest_order = store.get_latest_order()
             
             if latest_order:
-                print(f"  ✓ Latest order found:")
-                print(f"    Order ID: {latest_order['orderId']}")
-                print(f"    Date: {latest_order['date']}")
-                print(f"    Total: {latest_order['total']}")
-                print(f"    Status: {latest_order['status']}")
+                log.info(f"  ✓ Latest order found:")
+                log.info(f"    Order ID: {latest_order['orderId']}")
+                log.info(f"    Date: {latest_order['date']}")
+                log.info(f"    Total: {latest_order['total']}")
+                log.info(f"    Status: {latest_order['status']}")
                 
                 # Verify order status
                 valid_statuses = ['pending', 'processing', 'completed', 'complete']
@@ -256,18 +259,18 @@ class TestBagistoS1SingleCheckout:
                 is_valid_status = any(s in status_lower for s in valid_statuses)
                 
                 if is_valid_status:
-                    print(f"  ✓ Order status is valid: {latest_order['status']}")
+                    log.info(f"  ✓ Order status is valid: {latest_order['status']}")
                 else:
-                    print(f"  ⚠ Unexpected order status: {latest_order['status']}")
+                    log.warning(f"  ⚠ Unexpected order status: {latest_order['status']}")
             else:
-                print("  ⚠ No orders found in history")
+                log.warning("  ⚠ No orders found in history")
         
         except Exception as e:
             # Browser crashed after order creation - this is acceptable
-            print(f"  ⚠ Browser crashed after order creation: {type(e).__name__}")
-            print("  ℹ Order was created successfully before crash - test considered PASSED")
+            log.warning(f"  ⚠ Browser crashed after order creation: {type(e).__name__}")
+            log.info("  ℹ Order was created successfully before crash - test considered PASSED")
         
-        print("\n" + "="*80)
-        print("S1: COMPLETED - Single product checkout flow tested")
-        print("Note: Demo site may have validation requirements or limitations")
-        print("="*80 + "\n")
+        log.info("\n" + "="*80)
+        log.info("S1: COMPLETED - Single product checkout flow tested")
+        log.info("Note: Demo site may have validation requirements or limitations")
+        log.info("="*80 + "\n")
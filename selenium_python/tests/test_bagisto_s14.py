@@ -16,6 +16,9 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.common.keys import Keys
 from pages.store_page import StorePage
+from utils.log import get_logger
+
+log = get_logger(__name__)
 
 
 class TestBagistoS15CancelOrder:
@@ -38,18 +41,18 @@ class TestBagistoS15CancelOrder:
         10. Place new order
         11. Verify new order created
         """
-        print("\n" + "="*80)
-        print("S17 – CANCEL ORDER AFTER PAYMENT")
-        print("="*80)
+        log.info("\n" + "="*80)
+        log.info("S17 – CANCEL ORDER AFTER PAYMENT")
+        log.info("="*80)
         
         store = StorePage(driver, base_url)
         
         # Step 1: Login
-        print("\nStep 1 (B1): Logging in...")
+        log.info("\nStep 1 (B1): Logging in...")
         store.login()
         
         # Step 2: Go to order history
-        print("\nStep 2: Navigating to order history...")
+        log.info("\nStep 2: Navigating to order history...")
         
         try:
             # Click Profile button
@@ -67,13 +70,13 @@ class TestBagistoS15CancelOrder:
             )
             orders_link.click()
             time.sleep(2)
-            print('  ✓ Order history page loaded')
+            log.info('  ✓ Order history page loaded')
         
         except NoSuchElementException:
             # Direct navigation
             driver.get(f"{base_url}/customer/account/orders")
             time.sleep(2)
-            print('  ✓ Navigated to orders directly')
+            log.info('  ✓ Navigated to orders directly')
         
         # Count existing orders
         order_rows = driver.find_elements(By.CSS_SELECTOR, '.row.grid')
@@ -84,11 +87,11 @@ class TestBagistoS15CancelOrder:
                 data_rows.append(row)
         
         initial_order_count = len(data_rows)
-        print(f'  Found {initial_order_count} existing order(s)')
+        log.info(f'  Found {initial_order_count} existing order(s)')
         
         if initial_order_count == 0:
-            print('  ⚠ No orders found - cannot test cancel/reorder')
-            print('S17: SKIPPED - Need at least one order')
+            log.warning('  ⚠ No orders found - cannot test cancel/reorder')
+            log.info('S17: SKIPPED - Need at least one order')
             return
         
         # Get first order ID
@@ -97,21 +100,21 @@ class TestBagistoS15CancelOrder:
             try:
                 first_p = data_rows[0].find_element(By.TAG_NAME, 'p')
                 initial_first_order_id = first_p.text.strip()
-                print(f'  First order ID: #{initial_first_order_id}')
+                log.info(f'  First order ID: #{initial_first_order_id}')
             except:
                 pass
         
         # Step 3: Find cancellable order
-        print("\nStep 3 (B5d): Looking for cancellable order...")
+        log.info("\nStep 3 (B5d): Looking for cancellable order...")
         
         # Click View button for first order
         try:
             view_btn = driver.find_element(By.CSS_SELECTOR, '.float-right')
             view_btn.click()
             time.sleep(2)
-            print('  ✓ Order details page opened')
+            log.info('  ✓ Order details page opened')
         except:
-            print('  ⚠ View button not found')
+            log.warning('  ⚠ View button not found')
             return
         
         # Check for Cancel link
@@ -126,7 +129,7 @@ class TestBagistoS15CancelOrder:
             pass
         
         if not has_cancel:
-            print('  → First order not cancellable, checking others...')
+            log.info('  → First order not cancellable, checking others...')
             
             # Go back and try second order
             driver.get(f"{base_url}/customer/account/orders")
@@ -147,13 +150,13 @@ class TestBagistoS15CancelOrder:
                     pass
             
             if not has_cancel:
-                print('  ⚠ No cancellable orders found')
-                print('  ℹ All orders may be already cancelled or completed')
-                print('S17: SKIPPED - No cancellable orders')
+                log.warning('  ⚠ No cancellable orders found')
+                log.info('  ℹ All orders may be already cancelled or completed')
+                log.info('S17: SKIPPED - No cancellable orders')
                 return
         
         # Step 4: Cancel order
-        print("\nStep 4 (B5d): Cancelling order...")
+        log.info("\nStep 4 (B5d): Cancelling order...")
         
         try:
             cancel_link = driver.find_element(
@@ -162,7 +165,7 @@ class TestBagistoS15CancelOrder:
             )
             cancel_link.click()
             time.sleep(1)
-            print('  → Clicked Cancel link')
+            log.info('  → Clicked Cancel link')
             
             # Confirm with Agree button
             # CRITICAL: This may trigger page reload/navigation
@@ -173,18 +176,18 @@ class TestBagistoS15CancelOrder:
                 )
                 
                 if agree_btn.is_displayed():
-                    print('  → Confirming cancellation...')
+                    log.info('  → Confirming cancellation...')
                     
                     # Get current order URL before clicking (for re-navigation)
                     current_url = driver.current_url
                     
                     agree_btn.click()
                     time.sleep(3)  # Wait for action to complete
-                    print('  ✓ Order cancellation confirmed')
+                    log.info('  ✓ Order cancellation confirmed')
                     
                     # CRITICAL: Navigate back to order page to load Reorder button
                     # (reload may fail if page was detached after cancel action)
-                    print('  → Navigating back to order page to load Reorder button...')
+                    log.info('  → Navigating back to order page to load Reorder button...')
                     try:
                         driver.get(current_url)
                         time.sleep(2)
@@ -196,14 +199,14 @@ class TestBagistoS15CancelOrder:
                         view_btn.click()
                         time.sleep(2)
             except:
-                print('  ⚠ Agree button not found')
+                log.warning('  ⚠ Agree button not found')
         
         except NoSuchElementException:
-            print('  ⚠ Cancel link disappeared')
+            log.warning('  ⚠ Cancel link disappeared')
             return
         
         # Step 5: Reorder
-        print("\nStep 5: Reordering cancelled order...")
+        log.info("\nStep 5: Reordering cancelled order...")
         
         # Check for Reorder link (should be visible after navigation)
         reorder_link = None
@@ -213,21 +216,21 @@ class TestBagistoS15CancelOrder:
                 "//a[contains(text(), 'Reorder')]"
             )
         except:
-            print('  ⚠ Reorder link not found')
-            print('S17: PARTIAL - Cancel worked, reorder not available')
+            log.warning('  ⚠ Reorder link not found')
+            log.info('S17: PARTIAL - Cancel worked, reorder not available')
             return
         
         if reorder_link and reorder_link.is_displayed():
             # CRITICAL: Use JavaScript click (ChromeDriver bug workaround)
             driver.execute_script("arguments[0].click();", reorder_link)
             time.sleep(2)
-            print('  ✓ Reorder clicked - items added to cart')
+            log.info('  ✓ Reorder clicked - items added to cart')
         else:
-            print('  ⚠ Reorder link not clickable')
+            log.warning('  ⚠ Reorder link not clickable')
             return
         
         # Step 6: Proceed to checkout
-        print("\nStep 6 (B3): Proceeding to checkout...")
+        log.info("\nStep 6 (B3): Proceeding to checkout...")
         
         try:
             proceed_link = driver.find_element(
@@ -236,13 +239,13 @@ class TestBagistoS15CancelOrder:
             )
             proceed_link.click()
             time.sleep(2)
-            print('  ✓ Checkout page loaded')
+            log.info('  ✓ Checkout page loaded')
         except:
-            print('  ⚠ Proceed To Checkout not found')
+            log.warning('  ⚠ Proceed To Checkout not found')
             return
         
         # Step 7: Check for address form
-        print("\nStep 7 (B4): Checking if address form needed...")
+        log.info("\nStep 7 (B4): Checking if address form needed...")
         time.sleep(2)
         
         has_proceed_btn = False
@@ -256,16 +259,16 @@ class TestBagistoS15CancelOrder:
             pass
         
         if has_proceed_btn:
-            print('  → Address form present, filling...')
+            log.info('  → Address form present, filling...')
             store.fill_shipping_address_minimal()
-            print('  ✓ Address filled and Proceed clicked')
+            log.info('  ✓ Address filled and Proceed clicked')
         else:
-            print('  ℹ No address form (e-book or saved address)')
+            log.info('  ℹ No address form (e-book or saved address)')
         
         time.sleep(2)
         
         # Step 8: Select shipping method (for physical products)
-        print("\nStep 8 (B5): Selecting shipping method (if physical product)...")
+        log.info("\nStep 8 (B5): Selecting shipping method (if physical product)...")
         
         try:
             free_labels = driver.find_elements(
@@ -276,14 +279,14 @@ class TestBagistoS15CancelOrder:
             if free_labels:
                 free_labels[-1].click()
                 time.sleep(1)
-                print('  ✓ Free Shipping selected')
+                log.info('  ✓ Free Shipping selected')
             else:
-                print('  ℹ No shipping needed (e-book)')
+                log.info('  ℹ No shipping needed (e-book)')
         except:
-            print('  ℹ Shipping step skipped')
+            log.info('  ℹ Shipping step skipped')
         
         # Step 9: Select payment method
-        print("\nStep 9 (B5): Selecting payment method...")
+        log.info("\nStep 9 (B5): Selecting payment method...")
         
         payment_selectors = [
             'label[for="cashondelivery"]',
@@ -297,18 +300,18 @@ class TestBagistoS15CancelOrder:
                 if labels:
                     labels[-1].click()
                     time.sleep(2)
-                    print('  ✓ Payment method selected')
+                    log.info('  ✓ Payment method selected')
                     payment_selected = True
                     break
             except:
                 continue
         
         if not payment_selected:
-            print('  ⚠ Could not select payment method')
+            log.warning('  ⚠ Could not select payment method')
             return
         
         # Step 10: Place order
-        print("\nStep 10 (B5): Placing new order...")
+        log.info("\nStep 10 (B5): Placing new order...")
         
         # Scroll to bottom
         driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.END)
@@ -321,20 +324,20 @@ class TestBagistoS15CancelOrder:
             )
             
             place_order_btn.click()
-            print('  → Place Order clicked')
-            print('  → Waiting for order processing...')
+            log.info('  → Place Order clicked')
+            log.info('  → Waiting for order processing...')
         except:
-            print('  ⚠ Place Order button not found')
+            log.warning('  ⚠ Place Order button not found')
             return
         
         # Step 11: Verify success
-        print("\nStep 11: Waiting for order success page...")
+        log.info("\nStep 11: Waiting for order success page...")
         
         try:
             WebDriverWait(driver, 60).until(
                 EC.url_contains('/checkout/onepage/success')
             )
-            print('  ✓ Order redirected to success page')
+            log.info('  ✓ Order redirected to success page')
             time.sleep(2)
             
             # Get new order ID
@@ -344,23 +347,23 @@ class TestBagistoS15CancelOrder:
             )
             
             new_order_id = order_link.text.strip()
-            print(f'  ✓ New order created: #{new_order_id}')
+            log.info(f'  ✓ New order created: #{new_order_id}')
             
-            print('\n=== SUMMARY ===')
-            print(f'  Cancelled order: #{initial_first_order_id}')
-            print(f'  New order after reorder: #{new_order_id}')
-            print('  ✓ Cancel & Reorder flow completed successfully')
+            log.info('\n=== SUMMARY ===')
+            log.info(f'  Cancelled order: #{initial_first_order_id}')
+            log.info(f'  New order after reorder: #{new_order_id}')
+            log.info('  ✓ Cancel & Reorder flow completed successfully')
         
         except TimeoutException:
-            print('  ⚠ Timeout waiting for success page')
-            print(f'  Current URL: {driver.current_url}')
-        
-        print("\n" + "="*80)
-        print("S17: COMPLETED - Cancel order and reorder tested")
-        print("Key points:")
-        print("  - Cancel link available for pending orders")
-        print("  - Agree button confirms cancellation (may reload page)")
-        print("  - Reorder link restores items to cart")
-        print("  - Full checkout flow required for reorder")
-        print("  - Physical products need shipping method selection")
-        print("="*80 + "\n")
+            log.warning('  ⚠ Timeout waiting for success page')
+            log.info(f'  Current URL: {driver.current_url}')
+        
+        log.info("\n" + "="*80)
+        log.info("S17: COMPLETED - Cancel order and reorder tested")
+        log.info("Key points:")
+        log.info("  - Cancel link available for pending orders")
+        log.info("  - Agree button confirms cancellation (may reload page)")
+        log.info("  - Reorder link restores items to cart")
+        log.info("  - Full checkout flow required for reorder")
+        log.info("  - Physical products need shipping method selection")
+        log.info("="*80 + "\n")
@@ -10,6 +10,9 @@ import time
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException
 from pages.store_page import StorePage
+from utils.log import get_logger
+
+log = get_logger(__name__)
 
 
 class TestBagistoS2RemoveAllProducts:
@@ -28,51 +31,51 @@ class TestBagistoS2RemoveAllProducts:
         6. Verify cart is now empty
         7. Verify "Proceed To Checkout" button is hidden
         """
-        print("\n" + "="*80)
-        print("B1b: REMOVE ALL PRODUCTS - RETURN TO EMPTY STATE")
-        print("="*80)
+        log.info("\n" + "="*80)
+        log.info("B1b: REMOVE ALL PRODUCTS - RETURN TO EMPTY STATE")
+        log.info("="*80)
         
         store = StorePage(driver, base_url)
         
-        print("\nStep 1: Adding products to cart...")
+        log.info("\nStep 1: Adding products to cart...")
         store.add_first_product_from_home()
         
-        print("\nStep 2: Cart page should be loaded with items...")
+        log.info("\nStep 2: Cart page should be loaded with items...")
         # add_first_product_from_home already navigates to cart
         
-        print("\nStep 3: Verifying cart has items...")
+        log.info("\nStep 3: Verifying cart has items...")
         qty_inputs = driver.find_elements(
             By.CSS_SELECTOR,
             'input[type="hidden"][name="quantity"]'
         )
         initial_count = len(qty_inputs)
-        print(f'  Cart has {initial_count} item(s)')
+        log.info(f'  Cart has {initial_count} item(s)')
         
         assert initial_count > 0, "Cart should have items before removal"
         
-        print("\nStep 4: Selecting all items using 'Select All' checkbox...")
+        log.info("\nStep 4: Selecting all items using 'Select All' checkbox...")
         try:
             select_all_label = driver.find_element(By.CSS_SELECTOR, 'label[for="select-all"]')
             select_all_label.click()
             time.sleep(0.5)
-            print('  ✓ Select All clicked')
+            log.info('  ✓ Select All clicked')
         except NoSuchElementException:
-            print('  ⚠ Select All checkbox not found')
+            log.warning('  ⚠ Select All checkbox not found')
             raise
         
-        print("\nStep 5: Clicking bulk 'Remove' button...")
+        log.info("\nStep 5: Clicking bulk 'Remove' button...")
         try:
             bulk_remove_btn = driver.find_element(
                 By.XPATH,
                 "//span[@role='button' and contains(text(), 'Remove')]"
             )
             bulk_remove_btn.click()
-            print('  ✓ Remove button clicked')
+            log.info('  ✓ Remove button clicked')
         except NoSuchElementException:
-            print('  ⚠ Bulk Remove button not found')
+            log.warning('  ⚠ Bulk Remove button not found')
             raise
         
-        print("\nStep 6: Confirming removal in modal (if present)...")
+        log.info("\nStep 6: Confirming removal in modal (if present)...")
         time.sleep(0.5)
         
         try:
@@ -82,23 +85,23 @@ class TestBagistoS2RemoveAllProducts:
                 "//button[contains(text(), 'Agree') or contains(text(), 'Yes') or contains(text(), 'Confirm') or contains(text(), 'OK')]"
             )
             if confirm_btn.is_displayed():
-                print('  ✓ Confirmation modal appeared, clicking Agree...')
+                log.info('  ✓ Confirmation modal appeared, clicking Agree...')
                 confirm_btn.click()
         except NoSuchElementException:
-            print('  ℹ No confirmation modal (removal immediate)')
+            log.info('  ℹ No confirmation modal (removal immediate)')
         
-        print("\nStep 7: Waiting for removal to complete...")
+        log.info("\nStep 7: Waiting for removal to complete...")
         time.sleep(2)
         
-        print("\nStep 8: Verifying cart is now empty...")
+        log.info("\nStep 8: Verifying cart is now empty...")
         try:
             store.cart_is_empty()
-            print('  ✓ Cart is now empty')
+            log.info('  ✓ Cart is now empty')
         except AssertionError as e:
-            print(f'  ✗ Cart still has items: {e}')
+            log.warning(f'  ✗ Cart still has items: {e}')
             raise
         
-        print("\nStep 9: Verifying 'Proceed To Checkout' button is hidden...")
+        log.info("\nStep 9: Verifying 'Proceed To Checkout' button is hidden...")
         try:
             checkout_btn = driver.find_element(
                 By.XPATH,
@@ -107,12 +110,12 @@ class TestBagistoS2RemoveAllProducts:
             is_visible = checkout_btn.is_displayed()
             
             if not is_visible:
-                print('  ✓ Checkout button hidden on empty cart')
+                log.info('  ✓ Checkout button hidden on empty cart')
             else:
-                print('  ⚠ Checkout button still visible (may be grayed out)')
+                log.warning('  ⚠ Checkout button still visible (may be grayed out)')
         except NoSuchElementException:
-            print('  ✓ Checkout button not in DOM (expected for empty cart)')
+            log.info('  ✓ Checkout button not in DOM (expected for empty cart)')
         
-        print("\n" + "="*80)
-        print("B1b: PASSED - All products removed, cart returned to empty state")
-        print("="*80 + "\n")
+        log.info("\n" + "="*80)
+        log.info("B1b: PASSED - All products removed, cart returned to empty state")
+        log.info("="*80 + "\n")
@@ -10,17 +10,20 @@ import time
 import os
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from pages.store_page import StorePage
+from utils.log import get_logger
 
+log = get_logger(__name__)
 
+
+@pytest.mark.mutates_catalog
 class TestBagistoS5PriceChange:
     """S5 - Price Change Handling Test Suite with FULL Admin Automation"""
     
-    def test_s5_price_change_during_checkout(self, driver, base_url, credentials):
+    def test_s5_price_change_during_checkout(self, driver, base_url, credentials, catalog_snapshot):
         """
         S5 – Admin changes price during user checkout, order reflects updated price
         
@@ -31,20 +34,19 @@ class TestBagistoS5PriceChange:
         4. User: Open product page from cart
         5. Admin: Open admin panel in new window via "Opens in a new tab"
         6. Admin: Login (fill email/password, click Sign In)
-        7. Admin: Search for product using Mega Search
-        8. Admin: Open product edit page
-        9. Admin: Multiply price by 2x
-        10. Admin: Save product
-        11. User: Return to cart (refresh to see new price)
-        12. User: Proceed to checkout
-        13. User: Capture checkout prices (should reflect 2x price)
-        14. User: Place order
-        15. Verify: Order uses updated 2x price
-        16. Admin Cleanup: Restore original price
+        7. Admin: Open the snapshotted product's edit page by id
+        8. Admin: Multiply price by 2x
+        9. Admin: Save product
+        10. User: Return to cart (refresh to see new price)
+        11. User: Proceed to checkout
+        12. User: Capture checkout prices (should reflect 2x price)
+        13. User: Place order
+        14. Verify: Order uses updated 2x price
+        15. Price is restored from the catalog snapshot at teardown
         """
-        print("\n" + "="*80)
-        print("S5 – PRICE CHANGE HANDLING (Full Admin Automation)")
-        print("="*80)
+        log.info("\n" + "="*80)
+        log.info("S5 – PRICE CHANGE HANDLING (Full Admin Automation)")
+        log.info("="*80)
         
         store = StorePage(driver, base_url)
         
@@ -54,14 +56,14 @@ class TestBagistoS5PriceChange:
         admin_password = os.getenv('BAGISTO_ADMIN_PASSWORD', 'admin123')
         
         # Step 1: User login and clear cart
-        print("\nStep 1 (User): Logging in and clearing cart...")
+        log.info("\nStep 1 (User): Logging in and clearing cart...")
         store.login()
         
         driver.get(f"{base_url}/checkout/cart")
         time.sleep(2)
         
         # Clear existing cart items
-        print("  → Clearing existing cart items...")
+        log.info("  → Clearing existing cart items...")
         clear_count = 0
         while clear_count < 20:  # Max 20 items to avoid infinite loop
             try:
@@ -91,17 +93,17 @@ class TestBagistoS5PriceChange:
             except NoSuchElementException:
                 break
         
-        print(f'  ✓ Cart cleared ({clear_count} items removed)')
+        log.info(f'  ✓ Cart cleared ({clear_count} items removed)')
         
         # Step 2: Add product to cart
-        print("\nStep 2 (User): Adding product to cart...")
+        log.info("\nStep 2 (User): Adding product to cart...")
         store.add_first_product_from_home()
         
         product_name = getattr(store, 'last_added_product_name', 'Unknown Product')
-        print(f"  ✓ Added: {product_name}")
+        log.info(f"  ✓ Added: {product_name}")
         
         # Step 3: Go to cart and open product page in NEW TAB (keep cart tab)
-        print("\nStep 3 (User): Opening product page in new tab from cart...")
+        log.info("\nStep 3 (User): Opening product page in new tab from cart...")
         driver.get(f"{base_url}/checkout/cart")
         time.sleep(2)
         
@@ -114,7 +116,7 @@ class TestBagistoS5PriceChange:
         
         itemPriceElem = driver.find_elements(By.CSS_SELECTOR, 'p.text-lg.font-semibold')
         originalItemPrice = itemPriceElem[0].text.strip() if len(itemPriceElem) > 0 else 'N/A'
-        print(f"  Cart BEFORE: {quantity}x @ {originalItemPrice}")
+        log.info(f"  Cart BEFORE: {quantity}x @ {originalItemPrice}")
         
         # Get product URL to open in new tab
         product_url = None
@@ -126,7 +128,7 @@ class TestBagistoS5PriceChange:
             
             if len(product_links) > 0:
                 product_url = product_links[0].get_attribute('href')
-                print(f"  → Opening product in new tab: {product_url}")
+                log.info(f"  → Opening product in new tab: {product_url}")
                 
                 # Open product page in NEW TAB using JavaScript
                 driver.execute_script(f"window.open('{product_url}', '_blank');")
@@ -141,19 +143,19 @@ class TestBagistoS5PriceChange:
                 
                 if product_window:
                     driver.switch_to.window(product_window)
-                    print(f"  ✓ Product page opened in new tab")
+                    log.info(f"  ✓ Product page opened in new tab")
                 else:
-                    print("  ⚠ Could not switch to product tab")
+                    log.warning("  ⚠ Could not switch to product tab")
                     return
             else:
-                print("  ⚠ No product links found in cart")
+                log.warning("  ⚠ No product links found in cart")
                 return
         except Exception as e:
-            print(f"  ⚠ Could not open product page: {type(e).__name__}")
+            log.warning(f"  ⚠ Could not open product page: {type(e).__name__}")
             return
         
         # Step 4: Open admin in new tab via "Opens in a new tab" link
-        print("\nStep 4 (Admin): Opening admin panel from product page...")
+        log.info("\nStep 4 (Admin): Opening admin panel from product page...")
         
         admin_link_found = False
         try:
@@ -163,17 +165,17 @@ class TestBagistoS5PriceChange:
             )
             
             if admin_link.is_displayed():
-                print('  → Clicking "Opens in a new tab" link...')
+                log.info('  → Clicking "Opens in a new tab" link...')
                 driver.execute_script("arguments[0].click();", admin_link)
                 time.sleep(3)
                 admin_link_found = True
-                print('  ✓ Admin tab opened via product page link')
+                log.info('  ✓ Admin tab opened via product page link')
         except NoSuchElementException:
             pass
         
         if not admin_link_found:
             # Fallback: open admin URL directly
-            print('  → Admin link not found, opening admin URL directly...')
+            log.info('  → Admin link not found, opening admin URL directly...')
             driver.execute_script(f"window.open('{admin_url}', '_blank');")
             time.sleep(2)
         
@@ -189,14 +191,14 @@ class TestBagistoS5PriceChange:
             admin_window = driver.window_handles[-1]
         
         if not admin_window:
-            print("  ✗ Could not open admin window")
+            log.warning("  ✗ Could not open admin window")
             return
         
         driver.switch_to.window(admin_window)
         time.sleep(2)
         
         # Step 5: Login to admin (JUST CLICK Sign In - credentials autofilled)
-        print("\nStep 5 (Admin): Logging in to admin panel...")
+        log.info("\nStep 5 (Admin): Logging in to admin panel...")
         
         try:
             sign_in_btn = driver.find_element(
@@ -205,99 +207,26 @@ class TestBagistoS5PriceChange:
             )
             
             if sign_in_btn.is_displayed():
-                print("  → Clicking Sign In button (credentials autofilled)...")
+                log.info("  → Clicking Sign In button (credentials autofilled)...")
                 sign_in_btn.click()
                 time.sleep(3)
-                print("  ✓ Admin logged in")
+                log.info("  ✓ Admin logged in")
             else:
-                print("  ℹ Already logged in to admin")
+                log.info("  ℹ Already logged in to admin")
         except NoSuchElementException:
-            print("  ℹ Already logged in to admin")
-        
-        # Step 6: Search for product using Mega Search
-        print("\nStep 6 (Admin): Searching for product...")
-        
-        try:
-            # Find Mega Search textbox
-            search_box = None
-            search_selectors = [
-                (By.XPATH, "//input[@aria-label='Mega Search']"),
-                (By.XPATH, "//input[@placeholder='Mega Search']"),
-                (By.CSS_SELECTOR, "input[aria-label='Mega Search']"),
-                (By.CSS_SELECTOR, "input[placeholder='Mega Search']")
-            ]
-            
-            for by, selector in search_selectors:
-                try:
-                    search_box = driver.find_element(by, selector)
-                    if search_box.is_displayed():
-                        print(f"  → Found Mega Search box")
-                        break
-                except NoSuchElementException:
-                    continue
-            
-            if not search_box:
-                raise NoSuchElementException("Mega Search box not found")
-            
-            # Use first 3 words only for better search match
-            search_term = ' '.join(product_name.split()[:3])
-            print(f'  → Searching for: "{search_term}"')
-            
-            search_box.click()
-            time.sleep(1)
-            search_box.send_keys(search_term)
-            search_box.send_keys(Keys.RETURN)
-            time.sleep(3)  # Wait for search results
-            
-            print("  ✓ Search completed")
-            
-        except (NoSuchElementException, Exception) as e:
-            print(f"  ⚠ Mega Search failed: {type(e).__name__}")
-            print(f"  ℹ Cannot search for product - skipping price modification")
-            
-            # Close admin and return to cart window
-            driver.close()
-            driver.switch_to.window(cart_window)
-            return
+            log.info("  ℹ Already logged in to admin")
         
-        # Step 7: Click on product from search results
-        print("\nStep 7 (Admin): Opening product edit page...")
-        
-        try:
-            # Use first word of search term
-            first_word = search_term.split()[0]
-            print(f"  → Looking for product containing: '{first_word}'")
-            
-            # Wait for search results to load
-            time.sleep(2)
-            
-            # Find edit link
-
-            search_result_link = driver.find_element(
-                By.XPATH,
-                f"//a[contains(@href, '/catalog/products/edit/') and .//p[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{first_word.lower()}')]]"
-            )
-
-            
-            if search_result_link.is_displayed():
-                print(f"  → Found product in search results")
-                driver.execute_script("arguments[0].click();", search_result_link)
-                time.sleep(3)
-                print("  ✓ Product edit page opened")
-            else:
-                raise NoSuchElementException("Product edit link not visible")
-                
-        except NoSuchElementException:
-            print('  ⚠ Product not found in search results')
-            print('  ⚠ Cannot modify price - skipping')
-            
-            # Close admin and return to cart window
-            driver.close()
-            driver.switch_to.window(cart_window)
-            return
+        # Step 6: Open the added product's edit page by id, not via search:
+        # the catalog snapshot restores exactly that product
+        log.info("\nStep 6 (Admin): Opening product edit page...")
+        product_id = catalog_snapshot.product_id(store.last_added_product_url)
+        admin_base = admin_url.replace('/login', '')
+        driver.get(f"{admin_base}/catalog/products/edit/{product_id}")
+        time.sleep(3)
+        log.info(f"  ✓ Product edit page opened (id {product_id})")
         
-        # Step 8: Find price input and multiply by 2x
-        print("\nStep 8 (Admin): Multiplying price by 2x...")
+        # Step 7: Find price input and multiply by 2x
+        log.info("\nStep 7 (Admin): Multiplying price by 2x...")
         
         original_price_value = 0.0
         new_price = 0.0
@@ -310,13 +239,13 @@ class TestBagistoS5PriceChange:
                 original_price_value = float(current_price_str.replace('$', '').replace(',', ''))
                 new_price = original_price_value * 2
                 
-                print(f"  Current price: ${original_price_value:.2f}")
-                print(f"  New price (2x): ${new_price:.2f}")
+                log.info(f"  Current price: ${original_price_value:.2f}")
+                log.info(f"  New price (2x): ${new_price:.2f}")
                 
                 price_input.click()
                 price_input.clear()
                 price_input.send_keys(str(new_price))
-                print("  ✓ Set price to 2x original")
+                log.info("  ✓ Set price to 2x original")
                 
                 # Save product
                 try:
@@ -328,24 +257,23 @@ class TestBagistoS5PriceChange:
                     if save_btn.is_displayed():
                         driver.execute_script("arguments[0].click();", save_btn)
                         time.sleep(3)
-                        print("  ✓ Product saved with 2x price")
+                        log.info("  ✓ Product saved with 2x price")
                 except NoSuchElementException:
-                    print("  ⚠ Save Product button not found")
+                    log.warning("  ⚠ Save Product button not found")
             else:
-                print("  ⚠ Price input not visible")
+                log.warning("  ⚠ Price input not visible")
                 
         except NoSuchElementException:
-            print('  ⚠ Price input not found (demo may not allow editing)')
+            log.warning('  ⚠ Price input not found (demo may not allow editing)')
         
         # Go back to catalog (like S4)
-        print("  → Returning to product catalog...")
-        admin_base = admin_url.replace('/login', '')
+        log.info("  → Returning to product catalog...")
         driver.get(f"{admin_base}/catalog/products")
         time.sleep(2)
-        print("  ✓ Admin price change completed")
+        log.info("  ✓ Admin price change completed")
         
         # We're currently in admin window, need to close admin + product tabs
-        print("  → Closing admin tab...")
+        log.info("  → Closing admin tab...")
         admin_window_handle = driver.current_window_handle
         
         # First, switch to cart window BEFORE closing anything
@@ -360,7 +288,7 @@ class TestBagistoS5PriceChange:
                 break
         
         # Close product window (if still open)
-        print("  → Closing product tab...")
+        log.info("  → Closing product tab...")
         remaining_handles = driver.window_handles
         for handle in remaining_handles:
             if handle != cart_window:
@@ -369,8 +297,8 @@ class TestBagistoS5PriceChange:
                 driver.switch_to.window(cart_window)
                 break
         
-        # Step 9: Return to cart tab and proceed to checkout
-        print("\nStep 9 (User): Returning to cart and proceeding to checkout...")
+        # Step 8: Return to cart tab and proceed to checkout
+        log.info("\nStep 8 (User): Returning to cart and proceeding to checkout...")
         driver.switch_to.window(cart_window)
         
         # Refresh cart to see updated price
@@ -380,7 +308,7 @@ class TestBagistoS5PriceChange:
         # Capture UPDATED cart price after admin change
         updatedItemPriceElem = driver.find_elements(By.CSS_SELECTOR, 'p.text-lg.font-semibold')
         updatedItemPrice = updatedItemPriceElem[0].text.strip() if len(updatedItemPriceElem) > 0 else 'N/A'
-        print(f"  Cart AFTER admin change: {updatedItemPrice}")
+        log.info(f"  Cart AFTER admin change: {updatedItemPrice}")
         
         # Proceed to checkout
         store.go_checkout()
@@ -407,12 +335,12 @@ class TestBagistoS5PriceChange:
                 price_elem = row.find_elements(By.TAG_NAME, 'p')[-1]
                 checkoutGrandTotal = price_elem.text.strip()
         
-        print(f"  Checkout Summary:")
-        print(f"    Subtotal: {checkoutSubtotal}")
-        print(f"    Grand Total: {checkoutGrandTotal}")
+        log.info(f"  Checkout Summary:")
+        log.info(f"    Subtotal: {checkoutSubtotal}")
+        log.info(f"    Grand Total: {checkoutGrandTotal}")
         
-        # Step 10: Place order
-        print("\nStep 10 (User): Placing order...")
+        # Step 9: Place order
+        log.info("\nStep 9 (User): Placing order...")
         
         # Use StorePage method (handles both physical and digital products automatically)
         store.choose_payment_and_place(expect_success_msg=False)
@@ -421,12 +349,12 @@ class TestBagistoS5PriceChange:
             WebDriverWait(driver, 50).until(
                 EC.url_contains('/checkout/onepage/success')
             )
-            print("  ✓ Order placed successfully")
+            log.info("  ✓ Order placed successfully")
         except TimeoutException:
-            print("  ⚠ Timeout waiting for success page")
+            log.warning("  ⚠ Timeout waiting for success page")
         
-        # Step 11: Verify order
-        print("\nStep 11: Verifying order prices...")
+        # Step 10: Verify order
+        log.info("\nStep 10: Verifying order prices...")
         time.sleep(3)  # CRITICAL wait for order page to load
         
         try:
@@ -436,7 +364,7 @@ class TestBagistoS5PriceChange:
             )
             
             order_id = order_link.text.strip()
-            print(f"  ✓ Order #{order_id} created")
+            log.info(f"  ✓ Order #{order_id} created")
             
             # Click to view order details
             driver.execute_script("arguments[0].click();", order_link)
@@ -462,13 +390,13 @@ class TestBagistoS5PriceChange:
                     price_elem = row.find_elements(By.TAG_NAME, 'p')[-1]
                     order_grand_total = price_elem.text.strip()
             
-            print(f"  Order Detail Summary:")
-            print(f"    Subtotal: {order_subtotal}")
-            print(f"    Grand Total: {order_grand_total}")
+            log.info(f"  Order Detail Summary:")
+            log.info(f"    Subtotal: {order_subtotal}")
+            log.info(f"    Grand Total: {order_grand_total}")
             
-            print(f"\n  Expected:")
-            print(f"    Admin changed price to 2x original")
-            print(f"    Order should reflect 2x price: {order_grand_total}")
+            log.info(f"\n  Expected:")
+            log.info(f"    Admin changed price to 2x original")
+            log.info(f"    Order should reflect 2x price: {order_grand_total}")
             
             # If we saved the original price from admin, we can compare
             if new_price > 0:
@@ -480,127 +408,27 @@ class TestBagistoS5PriceChange:
                     expected_max = new_price * 3    # Max 3x for multiple items + shipping
                     
                     if expected_min <= order_price <= expected_max:
-                        print(f"\n  ✓ Order price (${order_price:.2f}) is in expected range for 2x pricing!")
+                        log.info(f"\n  ✓ Order price (${order_price:.2f}) is in expected range for 2x pricing!")
                     else:
-                        print(f"\n  ℹ Order price: ${order_price:.2f} vs admin 2x price: ${new_price:.2f}")
+                        log.info(f"\n  ℹ Order price: ${order_price:.2f} vs admin 2x price: ${new_price:.2f}")
                 except ValueError:
-                    print(f"\n  ⚠ Could not parse order price for comparison")
+                    log.warning(f"\n  ⚠ Could not parse order price for comparison")
             else:
-                print(f"\n  ℹ Admin price change completed, order created with total: {order_grand_total}")
+                log.info(f"\n  ℹ Admin price change completed, order created with total: {order_grand_total}")
         
         except NoSuchElementException:
-            print("  ⚠ Could not find order link")
-        
-        # Step 12: Cleanup - Restore original price
-        print("\nStep 12 (Admin Cleanup): Restoring original price...")
-        
-        # Admin tab was closed in Step 9, need to open new admin tab
-        print("  → Opening admin panel in new tab...")
-        driver.execute_script(f"window.open('{admin_url}', '_blank');")
-        time.sleep(2)
-        
-        # Switch to new admin tab
-        new_admin_window = None
-        for handle in driver.window_handles:
-            if handle != cart_window:
-                new_admin_window = handle
-                break
-        
-        if not new_admin_window:
-            print("  ⚠ Could not open admin tab for cleanup")
-            driver.switch_to.window(cart_window)
-            print("\n" + "="*80)
-            print("S5: COMPLETED - Price change handling tested (cleanup skipped)")
-            print("="*80 + "\n")
-            return
-        
-        driver.switch_to.window(new_admin_window)
-        time.sleep(2)
-        
-        # Login to admin (if needed)
-        try:
-            sign_in_btn = driver.find_element(
-                By.XPATH,
-                "//button[contains(text(), 'Sign In')]"
-            )
-            if sign_in_btn.is_displayed():
-                sign_in_btn.click()
-                time.sleep(3)
-                print("  ✓ Admin logged in")
-        except NoSuchElementException:
-            print("  ℹ Already logged in to admin")
-        
-        try:
-            # Search for product again
-            search_box2 = None
-            for by, selector in search_selectors:
-                try:
-                    search_box2 = driver.find_element(by, selector)
-                    if search_box2.is_displayed():
-                        break
-                except NoSuchElementException:
-                    continue
-            
-            if search_box2:
-                search_term2 = ' '.join(product_name.split()[:3])
-                print(f'  → Searching for: "{search_term2}"')
-                
-                search_box2.click()
-                time.sleep(1)
-                search_box2.send_keys(search_term2)
-                search_box2.send_keys(Keys.RETURN)
-                time.sleep(2)
-                
-                # Click product from search
-                first_word2 = search_term2.split()[0]
-                search_result_link2 = driver.find_element(
-                    By.XPATH,
-                    f"//a[contains(@href, '/catalog/products/edit/') and contains(text(), '{first_word2}')]"
-                )
-                
-                if search_result_link2.is_displayed():
-                    driver.execute_script("arguments[0].click();", search_result_link2)
-                    time.sleep(2)
-                    
-                    # Restore price to original
-                    restore_price_input = driver.find_element(By.ID, "price")
-                    if restore_price_input.is_displayed():
-                        restore_price_input.click()
-                        restore_price_input.clear()
-                        restore_price_input.send_keys(str(original_price_value))
-                        print(f'  ✓ Price restored to ${original_price_value:.2f}')
-                        
-                        # Save
-                        save_btn2 = driver.find_element(
-                            By.XPATH,
-                            "//button[contains(text(), 'Save Product')]"
-                        )
-                        driver.execute_script("arguments[0].click();", save_btn2)
-                        time.sleep(2)
-                        print('  ✓ Product saved with original price')
-        
-        except Exception as e:
-            print(f'  ⚠ Could not restore price: {type(e).__name__}')
-            print('  ℹ Manual cleanup may be required')
-        
-        # Close admin window (new one we just opened)
-        try:
-            driver.switch_to.window(new_admin_window)
-            driver.close()
-            print("  ✓ Admin tab closed")
-        except:
-            pass
-        
-        # Switch back to cart window
-        driver.switch_to.window(cart_window)
-        
-        print("\n" + "="*80)
-        print("S5: COMPLETED - Price change handling tested")
-        print("Flow:")
-        print("  1. User adds product to cart")
-        print("  2. User opens product page in NEW TAB (keeps cart tab)")
-        print("  3. Admin changes price to 2x in product/admin tabs")
-        print("  4. Close product/admin tabs, return to cart tab")
-        print("  5. User proceeds to checkout and places order")
-        print("Expected: Order should use UPDATED 2x price from admin")
-        print("="*80 + "\n")
+            log.warning("  ⚠ Could not find order link")
+        
+        # Cleanup: the catalog_snapshot fixture restores the product's price at teardown,
+        # even when a step above fails (see utils.catalog_snapshot)
+        
+        log.info("\n" + "="*80)
+        log.info("S5: COMPLETED - Price change handling tested")
+        log.info("Flow:")
+        log.info("  1. User adds product to cart")
+        log.info("  2. User opens product page in NEW TAB (keeps cart tab)")
+        log.info("  3. Admin changes price to 2x in product/admin tabs")
+        log.info("  4. Close product/admin tabs, return to cart tab")
+        log.info("  5. User proceeds to checkout and places order")
+        log.info("Expected: Order should use UPDATED 2x price from admin")
+        log.info("="*80 + "\n")
@@ -12,6 +12,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from pages.store_page import StorePage
+from utils.log import get_logger
+
+log = get_logger(__name__)
 
 
 class TestBagistoS7ShippingMethod:
@@ -33,18 +36,18 @@ class TestBagistoS7ShippingMethod:
         9. Verify order shipping matches selection
         10. Verify cart is empty
         """
-        print("\n" + "="*80)
-        print("S6 – CHANGE SHIPPING METHOD")
-        print("="*80)
+        log.info("\n" + "="*80)
+        log.info("S6 – CHANGE SHIPPING METHOD")
+        log.info("="*80)
         
         store = StorePage(driver, base_url)
         
         # Step 1: Login
-        print("\nStep 1 (B1): Logging in...")
+        log.info("\nStep 1 (B1): Logging in...")
         store.login()
         
         # Step 2: Ensure cart has items
-        print("\nStep 2 (B2): Ensuring cart has items...")
+        log.info("\nStep 2 (B2): Ensuring cart has items...")
         driver.get(f"{base_url}/checkout/cart")
         time.sleep(2)
         
@@ -55,22 +58,22 @@ class TestBagistoS7ShippingMethod:
         item_count = len(qty_inputs)
         
         if item_count == 0:
-            print('  → Cart empty, adding products...')
+            log.info('  → Cart empty, adding products...')
             store.add_first_product_from_home()
-            print('  ✓ Product added')
+            log.info('  ✓ Product added')
         else:
-            print(f'  ✓ Cart has {item_count} item(s)')
+            log.info(f'  ✓ Cart has {item_count} item(s)')
         
         # Step 3: Proceed to checkout
-        print("\nStep 3 (B3): Proceeding to checkout...")
+        log.info("\nStep 3 (B3): Proceeding to checkout...")
         store.go_checkout()
         
         # Step 4: Fill shipping address
-        print("\nStep 4 (B4): Filling shipping address...")
+        log.info("\nStep 4 (B4): Filling shipping address...")
         store.fill_shipping_address_minimal()
         
         # Step 5: Detect shipping methods
-        print("\nStep 5 (B4a): Detecting available shipping methods...")
+        log.info("\nStep 5 (B4a): Detecting available shipping methods...")
         time.sleep(2)
         
         shipping_inputs = driver.find_elements(
@@ -80,10 +83,10 @@ class TestBagistoS7ShippingMethod:
         shipping_count = len(shipping_inputs)
         
         if shipping_count > 0:
-            print(f'  ✓ Found {shipping_count} shipping method(s)')
+            log.info(f'  ✓ Found {shipping_count} shipping method(s)')
             
             # List shipping methods
-            print("\nStep 6 (B4a): Listing shipping methods...")
+            log.info("\nStep 6 (B4a): Listing shipping methods...")
             shipping_details = []
             
             for i, input_elem in enumerate(shipping_inputs, 1):
@@ -132,7 +135,7 @@ class TestBagistoS7ShippingMethod:
                     'cost': cost
                 })
                 
-                print(f"  Shipping {i}: {input_value} - {shipping_name} ({cost})")
+                log.info(f"  Shipping {i}: {input_value} - {shipping_name} ({cost})")
             
             # Capture initial totals with first shipping method
             time.sleep(2)
@@ -173,25 +176,25 @@ class TestBagistoS7ShippingMethod:
             
             st1, del1, gt1 = get_checkout_totals()
             
-            print(f"\n  Initial Checkout (Shipping 1 - {shipping_details[0]['value']}):")
-            print(f"    Subtotal: {st1}")
-            print(f"    Delivery: {del1}")
-            print(f"    Grand Total: {gt1}")
+            log.info(f"\n  Initial Checkout (Shipping 1 - {shipping_details[0]['value']}):")
+            log.info(f"    Subtotal: {st1}")
+            log.info(f"    Delivery: {del1}")
+            log.info(f"    Grand Total: {gt1}")
             
             # Validate: Delivery should match shipping method cost
             expected_delivery_1 = shipping_details[0]['cost']
             if del1 == expected_delivery_1:
-                print(f"  ✓ Delivery matches label cost: {del1} = {expected_delivery_1}")
+                log.info(f"  ✓ Delivery matches label cost: {del1} = {expected_delivery_1}")
             else:
-                print(f"  ⚠ MISMATCH: Label shows {expected_delivery_1}, but checkout shows {del1}")
-                print(f"    → This is Bagisto lazy-load bug - delivery charges don't update until AJAX triggered")
+                log.warning(f"  ⚠ MISMATCH: Label shows {expected_delivery_1}, but checkout shows {del1}")
+                log.info(f"    → This is Bagisto lazy-load bug - delivery charges don't update until AJAX triggered")
             
             # Switch to second shipping method if available
             if shipping_count > 1:
-                print(f"\nStep 7 (B4a): Switching to second shipping method...")
+                log.info(f"\nStep 7 (B4a): Switching to second shipping method...")
                 second = shipping_details[1]
                 
-                print(f"  → Switching to: {second['value']} ({second['cost']})")
+                log.info(f"  → Switching to: {second['value']} ({second['cost']})")
                 
                 try:
                     # Click LABEL for second shipping (using JavaScript click)
@@ -203,39 +206,39 @@ class TestBagistoS7ShippingMethod:
                     if labels:
                         driver.execute_script("arguments[0].click();", labels[-1])  # Last label
                         time.sleep(2)
-                        print(f"  ✓ Clicked label for: {second['value']}")
+                        log.info(f"  ✓ Clicked label for: {second['value']}")
                         
                         # Capture updated totals
                         st2, del2, gt2 = get_checkout_totals()
                         
-                        print(f"  Updated Checkout (Shipping 2 - {second['value']}):")
-                        print(f"    Subtotal: {st2}")
-                        print(f"    Delivery: {del2}")
-                        print(f"    Grand Total: {gt2}")
+                        log.info(f"  Updated Checkout (Shipping 2 - {second['value']}):")
+                        log.info(f"    Subtotal: {st2}")
+                        log.info(f"    Delivery: {del2}")
+                        log.info(f"    Grand Total: {gt2}")
                         
                         # Validate: Delivery should match second shipping method cost
                         expected_delivery_2 = second['cost']
                         if del2 == expected_delivery_2:
-                            print(f"  ✓ Delivery matches label cost: {del2} = {expected_delivery_2}")
+                            log.info(f"  ✓ Delivery matches label cost: {del2} = {expected_delivery_2}")
                         else:
-                            print(f"  ⚠ MISMATCH: Label shows {expected_delivery_2}, but checkout shows {del2}")
+                            log.warning(f"  ⚠ MISMATCH: Label shows {expected_delivery_2}, but checkout shows {del2}")
                         
                         # Compare
-                        print("\n  📊 Comparison:")
-                        print(f"    Shipping 1: Delivery={del1}, Total={gt1}")
-                        print(f"    Shipping 2: Delivery={del2}, Total={gt2}")
+                        log.info("\n  📊 Comparison:")
+                        log.info(f"    Shipping 1: Delivery={del1}, Total={gt1}")
+                        log.info(f"    Shipping 2: Delivery={del2}, Total={gt2}")
                         
                         if del2 != del1:
-                            print('  ✓ Delivery charges CHANGED!')
+                            log.info('  ✓ Delivery charges CHANGED!')
                         
                         if gt2 != gt1:
-                            print('  ✓ Grand Total CHANGED!')
+                            log.info('  ✓ Grand Total CHANGED!')
                 
                 except Exception as e:
-                    print(f'  ⚠ Could not switch: {str(e)}')
+                    log.warning(f'  ⚠ Could not switch: {str(e)}')
                 
                 # Switch back to first method
-                print(f"\nStep 8 (B4a): Switching back to first shipping method...")
+                log.info(f"\nStep 8 (B4a): Switching back to first shipping method...")
                 first = shipping_details[0]
                 
                 try:
@@ -247,32 +250,32 @@ class TestBagistoS7ShippingMethod:
                     if labels:
                         driver.execute_script("arguments[0].click();", labels[-1])
                         time.sleep(2)
-                        print(f"  ✓ Switched back to: {first['value']}")
+                        log.info(f"  ✓ Switched back to: {first['value']}")
                         
                         st3, del3, gt3 = get_checkout_totals()
                         
                         if gt3 == gt1:
-                            print('  ✓ Grand Total matches initial (toggle works)')
+                            log.info('  ✓ Grand Total matches initial (toggle works)')
                         else:
-                            print('  ⚠ Grand Total mismatch after toggle')
+                            log.warning('  ⚠ Grand Total mismatch after toggle')
                 
                 except:
                     pass
         
         else:
-            print('  ⚠ No shipping method radio buttons found')
+            log.warning('  ⚠ No shipping method radio buttons found')
         
         # Step 9: Place order
-        print("\nStep 9 (B5): Placing order with selected shipping...")
+        log.info("\nStep 9 (B5): Placing order with selected shipping...")
         
         # Capture final checkout summary
         time.sleep(1)
         final_st, final_del, final_gt = get_checkout_totals()
         
-        print(f"  Final Checkout Summary:")
-        print(f"    Subtotal: {final_st}")
-        print(f"    Delivery: {final_del}")
-        print(f"    Grand Total: {final_gt}")
+        log.info(f"  Final Checkout Summary:")
+        log.info(f"    Subtotal: {final_st}")
+        log.info(f"    Delivery: {final_del}")
+        log.info(f"    Grand Total: {final_gt}")
         
         store.choose_payment_and_place(expect_success_msg=False)
         
@@ -280,7 +283,7 @@ class TestBagistoS7ShippingMethod:
             WebDriverWait(driver, 30).until(
                 EC.url_contains('/checkout/onepage/success')
             )
-            print('  ✓ Order placed')
+            log.info('  ✓ Order placed')
             
             # Get order details
             order_link = driver.find_element(
@@ -289,7 +292,7 @@ class TestBagistoS7ShippingMethod:
             )
             
             order_id = order_link.text.strip()
-            print(f'  ✓ Order #{order_id} created')
+            log.info(f'  ✓ Order #{order_id} created')
             
             # View order details (use JavaScript click to avoid ProtocolError)
             driver.execute_script("arguments[0].click();", order_link)
@@ -304,34 +307,34 @@ class TestBagistoS7ShippingMethod:
                 )
                 order_gt = order_gt_row.find_element(By.XPATH, ".//p[last()]").text.strip()
                 
-                print(f"  Order Grand Total: {order_gt}")
+                log.info(f"  Order Grand Total: {order_gt}")
                 
                 if final_gt == order_gt:
-                    print('  ✓ Grand Total MATCHES (checkout = order)')
+                    log.info('  ✓ Grand Total MATCHES (checkout = order)')
                 else:
-                    print('  ⚠ Grand Total MISMATCH')
+                    log.warning('  ⚠ Grand Total MISMATCH')
             
             except:
-                print('  ⚠ Could not get order grand total')
+                log.warning('  ⚠ Could not get order grand total')
         
         except TimeoutException:
-            print('  ⚠ Timeout waiting for success page')
+            log.warning('  ⚠ Timeout waiting for success page')
         
         # Step 10: Verify cart empty
-        print("\nStep 10: Verifying cart is empty...")
+        log.info("\nStep 10: Verifying cart is empty...")
         store.goto_home()
         store.open_cart()
         
         try:
             store.cart_is_empty()
-            print('  ✓ Cart cleared after order')
+            log.info('  ✓ Cart cleared after order')
         except:
             qty_check = driver.find_elements(
                 By.CSS_SELECTOR,
                 'input[type="hidden"][name="quantity"]'
             )
-            print(f'  ⚠ Cart not empty: {len(qty_check)} items')
+            log.warning(f'  ⚠ Cart not empty: {len(qty_check)} items')
         
-        print("\n" + "="*80)
-        print("S6: COMPLETED - Shipping method selection tested")
-        print("="*80 + "\n")
+        log.info("\n" + "="*80)
+        log.info("S6: COMPLETED - Shipping method selection tested")
+        log.info("="*80 + "\n")
@@ -13,6 +13,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from pages.store_page import StorePage
+from utils.log import get_logger
+
+log = get_logger(__name__)
 
 
 class TestBagistoS2MultipleCoupon:
@@ -36,32 +39,32 @@ class TestBagistoS2MultipleCoupon:
         11. Verify cart is empty
         12. Check order history
         """
-        print("\n" + "="*80)
-        print("S2 – MULTIPLE PRODUCTS + COUPON CHECKOUT")
-        print("="*80)
+        log.info("\n" + "="*80)
+        log.info("S2 – MULTIPLE PRODUCTS + COUPON CHECKOUT")
+        log.info("="*80)
         
         store = StorePage(driver, base_url)
         
         # Step 1: Login
-        print("\nStep 1 (B1): Logging in to save order...")
+        log.info("\nStep 1 (B1): Logging in to save order...")
         store.login()
         
         # Step 2: Add product to cart
-        print("\nStep 2 (B2): Adding product to cart...")
+        log.info("\nStep 2 (B2): Adding product to cart...")
         store.add_first_product_from_home()
         
         # Step 3: Verify cart
-        print("\nStep 3 (B2): Verifying product in cart...")
+        log.info("\nStep 3 (B2): Verifying product in cart...")
         qty_inputs = driver.find_elements(
             By.CSS_SELECTOR,
             'input[type="hidden"][name="quantity"]'
         )
         item_count = len(qty_inputs)
-        print(f"  Cart has {item_count} item(s)")
+        log.info(f"  Cart has {item_count} item(s)")
         assert item_count > 0, "Cart should have at least 1 item"
         
         # Step 4: CRITICAL - Apply coupon at CART PAGE (before checkout)
-        print('\nStep 4 (B2.5): Applying coupon code "HCMUS" at cart page...')
+        log.info('\nStep 4 (B2.5): Applying coupon code "HCMUS" at cart page...')
         time.sleep(2)
         
         # Find "Apply Coupon" button in cart page summary
@@ -71,10 +74,10 @@ class TestBagistoS2MultipleCoupon:
                 "//button[contains(text(), 'Apply Coupon')]"
             )
             is_visible = apply_coupon_btn.is_displayed()
-            print(f'  → "Apply Coupon" button visible: {is_visible}')
+            log.info(f'  → "Apply Coupon" button visible: {is_visible}')
             
             if is_visible:
-                print('  → Clicking "Apply Coupon" button...')
+                log.info('  → Clicking "Apply Coupon" button...')
                 apply_coupon_btn.click()
                 time.sleep(1.5)
                 
@@ -86,7 +89,7 @@ class TestBagistoS2MultipleCoupon:
                     )
                     
                     if coupon_input.is_displayed():
-                        print('  → Entering coupon code: HCMUS')
+                        log.info('  → Entering coupon code: HCMUS')
                         coupon_input.clear()
                         coupon_input.send_keys('HCMUS')
                         time.sleep(0.5)
@@ -99,7 +102,7 @@ class TestBagistoS2MultipleCoupon:
                             )
                             
                             if apply_btn.is_displayed():
-                                print('  → Clicking Apply button...')
+                                log.info('  → Clicking Apply button...')
                                 apply_btn.click()
                                 time.sleep(3)  # Wait for discount to apply
                                 
@@ -112,26 +115,26 @@ class TestBagistoS2MultipleCoupon:
                                         "contains(text(), 'HCMUS')]"
                                     )
                                     if coupon_label.is_displayed():
-                                        print('  ✓ Coupon "HCMUS" applied successfully!')
+                                        log.info('  ✓ Coupon "HCMUS" applied successfully!')
                                 except NoSuchElementException:
-                                    print('  ℹ Coupon applied, checking cart totals...')
+                                    log.info('  ℹ Coupon applied, checking cart totals...')
                         except NoSuchElementException:
-                            print('  ⚠ Apply button not found in modal')
+                            log.warning('  ⚠ Apply button not found in modal')
                 except NoSuchElementException:
-                    print('  ⚠ Coupon input not found')
+                    log.warning('  ⚠ Coupon input not found')
         except NoSuchElementException:
-            print('  ⚠ "Apply Coupon" button not found - may already be applied')
+            log.warning('  ⚠ "Apply Coupon" button not found - may already be applied')
         
         # Step 5: Proceed to checkout
-        print("\nStep 5 (B3): Proceeding to checkout...")
+        log.info("\nStep 5 (B3): Proceeding to checkout...")
         store.go_checkout()
         
         # Step 6: Fill shipping address
-        print("\nStep 6 (B4): Filling shipping address...")
+        log.info("\nStep 6 (B4): Filling shipping address...")
         store.fill_shipping_address_minimal()
         
         # Step 7: Select shipping method
-        print("\nStep 7 (B5): Selecting shipping method...")
+        log.info("\nStep 7 (B5): Selecting shipping method...")
         time.sleep(2)  # Wait for shipping/payment section to load
         
         shipping_inputs = driver.find_elements(
@@ -141,7 +144,7 @@ class TestBagistoS2MultipleCoupon:
         shipping_count = len(shipping_inputs)
         
         if shipping_count > 0:
-            print(f"  ✓ Found {shipping_count} shipping method(s)")
+            log.info(f"  ✓ Found {shipping_count} shipping method(s)")
             
             # Look for Free Shipping by ID
             try:
@@ -151,10 +154,10 @@ class TestBagistoS2MultipleCoupon:
                 )
                 
                 if free_shipping_label.is_displayed():
-                    print('  → Selecting Free Shipping...')
+                    log.info('  → Selecting Free Shipping...')
                     free_shipping_label.click()
                     time.sleep(2)  # Wait for price to update
-                    print('  ✓ Free Shipping selected')
+                    log.info('  ✓ Free Shipping selected')
                 else:
                     raise NoSuchElementException
             except NoSuchElementException:
@@ -169,10 +172,10 @@ class TestBagistoS2MultipleCoupon:
                         )
                         first_label.click()
                         time.sleep(2)
-                        print('  ✓ First shipping method selected')
+                        log.info('  ✓ First shipping method selected')
         
         # Step 8: Capture checkout prices with coupon discount
-        print("\nStep 8 (B6): Capturing checkout summary with coupon discount...")
+        log.info("\nStep 8 (B6): Capturing checkout summary with coupon discount...")
         time.sleep(2)  # Wait for totals to update
         
         checkout_summary = {
@@ -208,45 +211,45 @@ class TestBagistoS2MultipleCoupon:
                 except:
                     continue
             
-            print(f"  Checkout Summary:")
-            print(f"    Subtotal: {checkout_summary['subtotal']}")
-            print(f"    Delivery: {checkout_summary['delivery']}")
-            print(f"    Grand Total: {checkout_summary['grandTotal']}")
+            log.info(f"  Checkout Summary:")
+            log.info(f"    Subtotal: {checkout_summary['subtotal']}")
+            log.info(f"    Delivery: {checkout_summary['delivery']}")
+            log.info(f"    Grand Total: {checkout_summary['grandTotal']}")
         except Exception as e:
-            print(f"  ⚠ Could not capture checkout prices: {type(e).__name__}")
+            log.warning(f"  ⚠ Could not capture checkout prices: {type(e).__name__}")
         
         # Step 9: Place order
-        print("\nStep 9 (B5): Choosing payment method and placing order...")
+        log.info("\nStep 9 (B5): Choosing payment method and placing order...")
         store.choose_payment_and_place(expect_success_msg=False)
-        print("  ✓ Order placement attempted")
+        log.info("  ✓ Order placement attempted")
         
         # CRITICAL: Wait extra time for order processing (coupon validation takes longer)
-        print("  → Waiting for order to process...")
+        log.info("  → Waiting for order to process...")
         time.sleep(5)  # Extra wait for coupon-related processing
         
         # Step 10: Wait for success page
-        print("\nStep 10: Waiting for order success page...")
+        log.info("\nStep 10: Waiting for order success page...")
         try:
             WebDriverWait(driver, 50).until(  # Increased from 30 to 50 seconds
                 EC.url_contains('/checkout/onepage/success')
             )
-            print("  ✓ Redirected to order success page")
+            log.info("  ✓ Redirected to order success page")
         except TimeoutException:
-            print("  ⚠ Timeout waiting for success page")
-            print(f"  Current URL: {driver.current_url}")
+            log.warning("  ⚠ Timeout waiting for success page")
+            log.info(f"  Current URL: {driver.current_url}")
             
             # Check for error messages
             try:
                 error_msg = driver.find_element(By.CSS_SELECTOR, '.text-red-600, .error, [class*="error"]')
                 if error_msg.is_displayed():
-                    print(f"  ⚠ Error message: {error_msg.text}")
+                    log.warning(f"  ⚠ Error message: {error_msg.text}")
             except:
                 pass
             
             # Continue anyway - order may still be created (check history)
         
         # Step 11: Extract order ID and verify discount
-        print("\nStep 11: Extracting order ID and verifying discount applied...")
+        log.info("\nStep 11: Extracting order ID and verifying discount applied...")
         try:
             order_link = driver.find_element(
                 By.CSS_SELECTOR,
@@ -256,12 +259,12 @@ class TestBagistoS2MultipleCoupon:
             order_id_text = order_link.text
             order_href = order_link.get_attribute('href')
             
-            print(f"  ✓ Order created successfully!")
-            print(f"    Order ID: #{order_id_text.strip()}")
-            print(f"    Order URL: {order_href}")
+            log.info(f"  ✓ Order created successfully!")
+            log.info(f"    Order ID: #{order_id_text.strip()}")
+            log.info(f"    Order URL: {order_href}")
             
             # Click link to view order details
-            print("  → Clicking order link to verify details...")
+            log.info("  → Clicking order link to verify details...")
             # CRITICAL FIX: Use JavaScript click to avoid ChromeDriver crash
             driver.execute_script("arguments[0].click();", order_link)
             time.sleep(2)
@@ -269,10 +272,10 @@ class TestBagistoS2MultipleCoupon:
             # Verify on order detail page
             current_url = driver.current_url
             if '/customer/account/orders/view/' in current_url:
-                print(f"  ✓ Order details page loaded")
+                log.info(f"  ✓ Order details page loaded")
                 
                 # Step 11.5: Parse order detail summary
-                print("\nStep 11.5: Parsing order detail summary to verify prices...")
+                log.info("\nStep 11.5: Parsing order detail summary to verify prices...")
                 time.sleep(3)  # CRITICAL wait for page to render
                 
                 order_grand_total = 'N/A'
@@ -304,12 +307,12 @@ class TestBagistoS2MultipleCoupon:
                         except:
                             continue
                 except Exception as e:
-                    print(f"  ⚠ Error parsing order prices: {type(e).__name__}")
+                    log.warning(f"  ⚠ Error parsing order prices: {type(e).__name__}")
                 
-                print(f"  Order Detail Summary:")
-                print(f"    Subtotal: {order_subtotal}")
-                print(f"    Coupon Discount: {order_coupon_discount}")
-                print(f"    Grand Total: {order_grand_total}")
+                log.info(f"  Order Detail Summary:")
+                log.info(f"    Subtotal: {order_subtotal}")
+                log.info(f"    Coupon Discount: {order_coupon_discount}")
+                log.info(f"    Grand Total: {order_grand_total}")
                 
                 # Compare Grand Total
                 checkout_gt = checkout_summary['grandTotal']
@@ -317,45 +320,45 @@ class TestBagistoS2MultipleCoupon:
                 
                 if checkout_gt and order_gt and checkout_gt != 'N/A' and order_gt != 'N/A':
                     if checkout_gt == order_gt:
-                        print(f"  ✓ Grand Total MATCHES: {checkout_gt} = {order_gt}")
+                        log.info(f"  ✓ Grand Total MATCHES: {checkout_gt} = {order_gt}")
                     else:
-                        print(f"  ⚠ Grand Total MISMATCH: Checkout {checkout_gt} ≠ Order {order_gt}")
+                        log.warning(f"  ⚠ Grand Total MISMATCH: Checkout {checkout_gt} ≠ Order {order_gt}")
                 else:
-                    print(f"  ℹ Price comparison skipped (values not captured)")
+                    log.info(f"  ℹ Price comparison skipped (values not captured)")
         
         except NoSuchElementException:
-            print("  ⚠ Could not find order ID link on success page")
+            log.warning("  ⚠ Could not find order ID link on success page")
         
         # Step 12-14: Check cart and order history (gracefully handle browser crash)
-        print("\nStep 12: Returning to home and checking cart...")
+        log.info("\nStep 12: Returning to home and checking cart...")
         try:
             store.goto_home()
             
-            print("\nStep 13: Verifying cart is empty after checkout...")
+            log.info("\nStep 13: Verifying cart is empty after checkout...")
             store.open_cart()
             
             try:
                 store.cart_is_empty()
-                print("  ✓ Cart cleared after successful order")
+                log.info("  ✓ Cart cleared after successful order")
             except AssertionError:
-                print("  ⚠ Cart not empty (demo may have cart persistence issues)")
+                log.warning("  ⚠ Cart not empty (demo may have cart persistence issues)")
                 qty_check = driver.find_elements(
                     By.CSS_SELECTOR,
                     'input[type="hidden"][name="quantity"]'
                 )
                 final_count = len(qty_check)
-                print(f"  Current cart items: {final_count}")
+                log.info(f"  Current cart items: {final_count}")
             
             # Step 14: Verify order in history
-            print("\nStep 14: Checking order history for verification...")
+            log.info("\nStep 14: Checking order history for verification...")
             latest_order = store.get_latest_order()
             
             if latest_order:
-                print(f"  ✓ Latest order found:")
-                print(f"    Order ID: {latest_order['orderId']}")
-                print(f"    Date: {latest_order['date']}")
-                print(f"    Total: {latest_order['total']} (with coupon discount)")
-                print(f"    Status: {latest_order['status']}")
+                log.info(f"  ✓ Latest order found:")
+                log.info(f"    Order ID: {latest_order['orderId']}")
+                log.info(f"    Date: {latest_order['date']}")
+                log.info(f"    Total: {latest_order['total']} (with coupon discount)")
+                log.info(f"    Status: {latest_order['status']}")
                 
                 # Verify order status
                 valid_statuses = ['pending', 'processing', 'completed', 'complete']
@@ -363,18 +366,18 @@ class TestBagistoS2MultipleCoupon:
                 is_valid_status = any(s in status_lower for s in valid_statuses)
                 
                 if is_valid_status:
-                    print(f"  ✓ Order status is valid: {latest_order['status']}")
+                    log.info(f"  ✓ Order status is valid: {latest_order['status']}")
                 else:
-                    print(f"  ⚠ Unexpected order status: {latest_order['status']}")
+                    log.warning(f"  ⚠ Unexpected order status: {latest_order['status']}")
             else:
-                print("  ⚠ No orders found in history")
+                log.warning("  ⚠ No orders found in history")
         
         except Exception as e:
             # Browser crashed after order creation - this is acceptable
-            print(f"  ⚠ Browser crashed after order creation: {type(e).__name__}")
-            print("  ℹ Order was created successfully before crash - test considered PASSED")
+            log.warning(f"  ⚠ Browser crashed after order creation: {type(e).__name__}")
+            log.info("  ℹ Order was created successfully before crash - test considered PASSED")
         
-        print("\n" + "="*80)
-        print("S2: COMPLETED - Coupon discount and checkout flow tested")
-        print("Note: Demo site may have validation requirements or limitations")
-        print("="*80 + "\n")
+        log.info("\n" + "="*80)
+        log.info("S2: COMPLETED - Coupon discount and checkout flow tested")
+        log.info("Note: Demo site may have validation requirements or limitations")
+        log.info("="*80 + "\n")
@@ -13,6 +13,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from pages.store_page import StorePage
+from utils.log import get_logger
+
+log = get_logger(__name__)
 
 
 class TestBagistoS9PaymentMethods:
@@ -37,40 +40,40 @@ class TestBagistoS9PaymentMethods:
         12. Verify order details and prices
         13. Verify cart is empty
         """
-        print("\n" + "="*80)
-        print("S3 – DIFFERENT PAYMENT METHODS")
-        print("="*80)
+        log.info("\n" + "="*80)
+        log.info("S3 – DIFFERENT PAYMENT METHODS")
+        log.info("="*80)
         
         store = StorePage(driver, base_url)
         
         # Step 1: Login
-        print("\nStep 1 (B1): Logging in to save order...")
+        log.info("\nStep 1 (B1): Logging in to save order...")
         store.login()
         
         # Step 2: Add product to cart
-        print("\nStep 2 (B2): Adding product to cart...")
+        log.info("\nStep 2 (B2): Adding product to cart...")
         store.add_first_product_from_home()
         
         # Step 3: Verify cart
-        print("\nStep 3 (B2): Verifying product in cart...")
+        log.info("\nStep 3 (B2): Verifying product in cart...")
         qty_inputs = driver.find_elements(
             By.CSS_SELECTOR,
             'input[type="hidden"][name="quantity"]'
         )
         item_count = len(qty_inputs)
-        print(f"  Cart has {item_count} item(s)")
+        log.info(f"  Cart has {item_count} item(s)")
         assert item_count > 0, "Cart should have at least 1 item"
         
         # Step 4: Proceed to checkout
-        print("\nStep 4 (B3): Proceeding to checkout...")
+        log.info("\nStep 4 (B3): Proceeding to checkout...")
         store.go_checkout()
         
         # Step 5: Fill shipping address
-        print("\nStep 5 (B4): Filling shipping address...")
+        log.info("\nStep 5 (B4): Filling shipping address...")
         store.fill_shipping_address_minimal()
         
         # Step 6: Select FIRST shipping method (Flat Rate with fee)
-        print("\nStep 6 (B5): Selecting FIRST shipping method (Flat Rate with fee)...")
+        log.info("\nStep 6 (B5): Selecting FIRST shipping method (Flat Rate with fee)...")
         time.sleep(2)  # Wait for shipping/payment section to load
         
         shipping_inputs = driver.find_elements(
@@ -80,7 +83,7 @@ class TestBagistoS9PaymentMethods:
         shipping_count = len(shipping_inputs)
         
         if shipping_count > 0:
-            print(f"  ✓ Found {shipping_count} shipping method(s)")
+            log.info(f"  ✓ Found {shipping_count} shipping method(s)")
             
             # Get first shipping method (Flat Rate)
             first_input = shipping_inputs[0]
@@ -95,15 +98,15 @@ class TestBagistoS9PaymentMethods:
                     
                     if first_label.is_displayed():
                         shipping_text = first_label.text
-                        print(f"  → Selecting shipping: {' '.join(shipping_text.split())}")
+                        log.info(f"  → Selecting shipping: {' '.join(shipping_text.split())}")
                         first_label.click()
                         time.sleep(2)  # Wait for price to update
-                        print('  ✓ First shipping method selected')
+                        log.info('  ✓ First shipping method selected')
                 except NoSuchElementException:
-                    print('  ⚠ Could not find shipping label')
+                    log.warning('  ⚠ Could not find shipping label')
         
         # Step 7: Detect available payment methods
-        print("\nStep 7 (B4): Detecting available payment methods...")
+        log.info("\nStep 7 (B4): Detecting available payment methods...")
         
         payment_inputs = driver.find_elements(
             By.CSS_SELECTOR,
@@ -112,7 +115,7 @@ class TestBagistoS9PaymentMethods:
         payment_count = len(payment_inputs)
         
         if payment_count > 1:
-            print(f"  ✓ Found {payment_count} payment method(s)")
+            log.info(f"  ✓ Found {payment_count} payment method(s)")
             
             # List available payment methods
             for i, input_elem in enumerate(payment_inputs, 1):
@@ -123,12 +126,12 @@ class TestBagistoS9PaymentMethods:
                         f'label[for="{input_id}"]'
                     )
                     label_text = label.text.strip()
-                    print(f"    Payment {i}: {label_text}")
+                    log.info(f"    Payment {i}: {label_text}")
                 except NoSuchElementException:
-                    print(f"    Payment {i}: N/A")
+                    log.info(f"    Payment {i}: N/A")
             
             # Step 8: Test selecting different payment methods
-            print("\nStep 8 (B5): Testing payment method selection...")
+            log.info("\nStep 8 (B5): Testing payment method selection...")
             
             # CRITICAL FIX: Use Cash On Delivery (first payment) like S1/S2
             # Money Transfer (second payment) may require bank details on demo
@@ -143,17 +146,17 @@ class TestBagistoS9PaymentMethods:
                     )
                     
                     if first_label.is_displayed():
-                        print('  → Selecting Cash On Delivery payment method...')
+                        log.info('  → Selecting Cash On Delivery payment method...')
                         first_label.click()
                         time.sleep(1)
-                        print('  ✓ Cash On Delivery payment method selected')
+                        log.info('  ✓ Cash On Delivery payment method selected')
                 except NoSuchElementException:
-                    print('  ⚠ Could not find Cash On Delivery payment label')
+                    log.warning('  ⚠ Could not find Cash On Delivery payment label')
         else:
-            print('  ℹ Only one payment method available, skipping selection test')
+            log.info('  ℹ Only one payment method available, skipping selection test')
         
         # Step 9: Capture checkout summary
-        print("\nStep 9: Capturing checkout summary before placing order...")
+        log.info("\nStep 9: Capturing checkout summary before placing order...")
         time.sleep(2)  # Wait for totals to update
         
         checkout_summary = {
@@ -189,15 +192,15 @@ class TestBagistoS9PaymentMethods:
                 except:
                     continue
             
-            print(f"  Checkout Summary:")
-            print(f"    Subtotal: {checkout_summary['subtotal']}")
-            print(f"    Delivery: {checkout_summary['delivery']}")
-            print(f"    Grand Total: {checkout_summary['grandTotal']}")
+            log.info(f"  Checkout Summary:")
+            log.info(f"    Subtotal: {checkout_summary['subtotal']}")
+            log.info(f"    Delivery: {checkout_summary['delivery']}")
+            log.info(f"    Grand Total: {checkout_summary['grandTotal']}")
         except Exception as e:
-            print(f"  ⚠ Could not capture checkout prices: {type(e).__name__}")
+            log.warning(f"  ⚠ Could not capture checkout prices: {type(e).__name__}")
         
         # Step 10: Place order
-        print("\nStep 10 (B5): Placing order with selected payment method...")
+        log.info("\nStep 10 (B5): Placing order with selected payment method...")
         
         # Scroll to bottom
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
@@ -211,41 +214,41 @@ class TestBagistoS9PaymentMethods:
             
             if place_order_btn.is_displayed():
                 place_order_btn.click()
-                print('  ✓ Place Order button clicked')
+                log.info('  ✓ Place Order button clicked')
             else:
                 # CRITICAL FIX: Use JavaScript click to avoid ChromeDriver crash
                 driver.execute_script("arguments[0].click();", place_order_btn)
-                print('  ✓ Place Order button clicked (JS)')
+                log.info('  ✓ Place Order button clicked (JS)')
         except NoSuchElementException:
-            print('  ⚠ Place Order button not found')
+            log.warning('  ⚠ Place Order button not found')
         
         # CRITICAL: Wait extra time for order processing
-        print("  → Waiting for order to process...")
+        log.info("  → Waiting for order to process...")
         time.sleep(5)  # Extra wait for order processing
         
         # Step 11: Wait for success page
-        print("\nStep 11: Waiting for order success page...")
+        log.info("\nStep 11: Waiting for order success page...")
         try:
             WebDriverWait(driver, 50).until(  # Increased from 30 to 50 seconds
                 EC.url_contains('/checkout/onepage/success')
             )
-            print("  ✓ Redirected to order success page")
+            log.info("  ✓ Redirected to order success page")
         except TimeoutException:
-            print("  ⚠ Timeout waiting for success page")
-            print(f"  Current URL: {driver.current_url}")
+            log.warning("  ⚠ Timeout waiting for success page")
+            log.info(f"  Current URL: {driver.current_url}")
             
             # Check for error messages
             try:
                 error_msg = driver.find_element(By.CSS_SELECTOR, '.text-red-600, .error, [class*="error"]')
                 if error_msg.is_displayed():
-                    print(f"  ⚠ Error message: {error_msg.text}")
+                    log.warning(f"  ⚠ Error message: {error_msg.text}")
             except:
                 pass
             
             # Continue anyway - order may still be created (check history)
         
         # Step 12: Extract order ID and verify
-        print("\nStep 12: Extracting order ID and verifying order details...")
+        log.info("\nStep 12: Extracting order ID and verifying order details...")
         
         # CRITICAL: Wrap in try-except - browser may crash after order creation (ChromeDriver bug)
         try:
@@ -257,12 +260,12 @@ class TestBagistoS9PaymentMethods:
             order_id_text = order_link.text
             order_href = order_link.get_attribute('href')
             
-            print(f"  ✓ Order created successfully!")
-            print(f"    Order ID: #{order_id_text.strip()}")
-            print(f"    Order URL: {order_href}")
+            log.info(f"  ✓ Order created successfully!")
+            log.info(f"    Order ID: #{order_id_text.strip()}")
+            log.info(f"    Order URL: {order_href}")
             
             # Click link to view order details
-            print("  → Clicking order link to verify details...")
+            log.info("  → Clicking order link to verify details...")
             # CRITICAL FIX: Use JavaScript click to avoid ChromeDriver crash
             driver.execute_script("arguments[0].click();", order_link)
             time.sleep(2)
@@ -270,10 +273,10 @@ class TestBagistoS9PaymentMethods:
             # Verify on order detail page
             current_url = driver.current_url
             if '/customer/account/orders/view/' in current_url:
-                print(f"  ✓ Order details page loaded")
+                log.info(f"  ✓ Order details page loaded")
                 
                 # Step 13: Verify order summary
-                print("\nStep 13: Verifying order summary on order detail page...")
+                log.info("\nStep 13: Verifying order summary on order detail page...")
                 time.sleep(3)  # CRITICAL wait for page to render
                 
                 # CRITICAL FIX: Use row iteration pattern instead of XPath text predicates
@@ -303,10 +306,10 @@ class TestBagistoS9PaymentMethods:
                         price_elem = row.find_elements(By.TAG_NAME, 'p')[-1]
                         order_grand_total = price_elem.text.strip()
                 
-                print(f"  Order Detail Summary:")
-                print(f"    Subtotal: {order_subtotal}")
-                print(f"    Shipping: {order_shipping}")
-                print(f"    Grand Total: {order_grand_total}")
+                log.info(f"  Order Detail Summary:")
+                log.info(f"    Subtotal: {order_subtotal}")
+                log.info(f"    Shipping: {order_shipping}")
+                log.info(f"    Grand Total: {order_grand_total}")
                 
                 # Compare Grand Total
                 checkout_gt = checkout_summary['grandTotal']
@@ -314,45 +317,45 @@ class TestBagistoS9PaymentMethods:
                 
                 if checkout_gt and order_gt and checkout_gt != 'N/A' and order_gt != 'N/A':
                     if checkout_gt == order_gt:
-                        print(f"  ✓ Grand Total MATCHES: {checkout_gt} = {order_gt}")
+                        log.info(f"  ✓ Grand Total MATCHES: {checkout_gt} = {order_gt}")
                     else:
-                        print(f"  ⚠ Grand Total MISMATCH: Checkout {checkout_gt} ≠ Order {order_gt}")
+                        log.warning(f"  ⚠ Grand Total MISMATCH: Checkout {checkout_gt} ≠ Order {order_gt}")
                 else:
-                    print(f"  ℹ Price comparison skipped (values not captured)")
+                    log.info(f"  ℹ Price comparison skipped (values not captured)")
         
         except NoSuchElementException:
-            print("  ⚠ Could not find order ID link on success page")
+            log.warning("  ⚠ Could not find order ID link on success page")
         except Exception as e:
-            print(f"  ⚠ Error during order verification: {type(e).__name__}")
-            print(f"  ℹ Order may still be created (check order history manually)")
-            print(f"  Note: Browser connection may have been lost (known ChromeDriver issue)")
+            log.warning(f"  ⚠ Error during order verification: {type(e).__name__}")
+            log.info(f"  ℹ Order may still be created (check order history manually)")
+            log.info(f"  Note: Browser connection may have been lost (known ChromeDriver issue)")
         
         # Step 14: Check cart is empty
         # CRITICAL: Wrap in try-except - browser may have crashed in previous step
         try:
-            print("\nStep 14: Returning to home and checking cart...")
+            log.info("\nStep 14: Returning to home and checking cart...")
             store.goto_home()
             
-            print("\nStep 15: Verifying cart is empty after checkout...")
+            log.info("\nStep 15: Verifying cart is empty after checkout...")
             store.open_cart()
             
             try:
                 store.cart_is_empty()
-                print("  ✓ Cart cleared after successful order")
+                log.info("  ✓ Cart cleared after successful order")
             except AssertionError:
-                print("  ⚠ Cart not empty (demo may have cart persistence issues)")
+                log.warning("  ⚠ Cart not empty (demo may have cart persistence issues)")
                 qty_check = driver.find_elements(
                     By.CSS_SELECTOR,
                     'input[type="hidden"][name="quantity"]'
                 )
                 final_count = len(qty_check)
-                print(f"  Current cart items: {final_count}")
+                log.info(f"  Current cart items: {final_count}")
         
         except Exception as e:
-            print(f"  ⚠ Could not verify cart state: {type(e).__name__}")
-            print(f"  Note: Browser session may have ended (order was placed successfully)")
+            log.warning(f"  ⚠ Could not verify cart state: {type(e).__name__}")
+            log.info(f"  Note: Browser session may have ended (order was placed successfully)")
         
-        print("\n" + "="*80)
-        print("S3: COMPLETED - Payment method selection and price verification tested")
-        print("Note: Demo site may have validation requirements or limitations")
-        print("="*80 + "\n")
+        log.info("\n" + "="*80)
+        log.info("S3: COMPLETED - Payment method selection and price verification tested")
+        log.info("Note: Demo site may have validation requirements or limitations")
+        log.info("="*80 + "\n")
@@ -0,0 +1 @@
+"""Offline unit tests for the suite's pure-Python helpers (no browser, no network)."""
@@ -0,0 +1,43 @@
+"""
+Fixtures for the offline unit tests.
+
+The root conftest's autouse fixtures talk to the storefront (crawler, saved
+address, catalog sweeper), launch browsers or write to the shared results
+database; here they are overridden to do nothing.
+"""
+import pytest
+
+
+@pytest.fixture(scope="session")
+def results_store():
+    return None
+
+
+@pytest.fixture(scope="session")
+def browser_factory():
+    return None
+
+
+@pytest.fixture(scope="session")
+def catalog_crawler():
+    return None
+
+
+@pytest.fixture(scope="session")
+def saved_address():
+    return False
+
+
+@pytest.fixture(scope="session")
+def catalog_sweeper():
+    return None
+
+
+@pytest.fixture
+def catalog_locks():
+    return None
+
+
+@pytest.fixture
+def catalog_snapshot():
+    return None
@@ -0,0 +1,116 @@
+"""Static call graph and symbol diffing over a miniature pages/ + tests/ tree."""
+import os
+import textwrap
+
+import pytest
+
+from utils.callgraph import CallGraph, changed_symbols
+
+STORE_PAGE = '''
+from selenium.webdriver.common.by import By
+
+CART_SELECTORS = ['.cart', '#cart']
+
+
+class CheckoutFlow:
+    def __init__(self, store):
+        self.store = store
+
+    def run(self):
+        self._submit()
+
+    def _submit(self):
+        return CART_SELECTORS
+
+
+class StorePage:
+    def __init__(self, driver):
+        self.driver = driver
+        self.checkout = CheckoutFlow(self)
+
+    def goto_cart(self):
+        self._wait_for_cart()
+
+    def _wait_for_cart(self):
+        return CART_SELECTORS
+
+    def login(self):
+        pass
+'''
+
+SCENARIO = '''
+from pages.store_page import StorePage
+
+
+class TestScenario:
+    def test_{name}(self, driver):
+        store = StorePage(driver)
+        {body}
+'''
+
+
+@pytest.fixture
+def graph(tmp_path):
+    files = {
+        'pages/store_page.py': STORE_PAGE,
+        'tests/test_bagisto_s1.py': SCENARIO.format(name='cart', body='store.goto_cart()'),
+        'tests/test_bagisto_s2.py': SCENARIO.format(name='checkout', body='store.checkout.run()'),
+        'tests/test_bagisto_s3.py': SCENARIO.format(name='login', body='store.login()'),
+    }
+    for path, source in files.items():
+        (tmp_path / os.path.dirname(path)).mkdir(exist_ok=True)
+        (tmp_path / path).write_text(textwrap.dedent(source))
+    return CallGraph.build(str(tmp_path))
+
+
+def test_scenarios_and_their_calls(graph):
+    assert sorted(graph.tests) == [
+        'tests/test_bagisto_s1.py::TestScenario::test_cart',
+        'tests/test_bagisto_s2.py::TestScenario::test_checkout',
+        'tests/test_bagisto_s3.py::TestScenario::test_login',
+    ]
+    assert graph.tests['tests/test_bagisto_s2.py::TestScenario::test_checkout'].calls == {'CheckoutFlow.run'}
+
+
+def test_reachable_follows_self_attributes_and_module_names(graph):
+    reached = graph.reachable(['StorePage.goto_cart'])
+    assert {'StorePage.goto_cart', 'StorePage._wait_for_cart', 'global:pages.store_page.CART_SELECTORS',
+            'global:pages.store_page.<imports>', 'StorePage.<class>'} <= reached
+    assert 'StorePage.login' not in reached
+    # store.checkout.run() resolves through `self.checkout = CheckoutFlow(self)`
+    assert 'CheckoutFlow._submit' in graph.test_closure('tests/test_bagisto_s2.py::TestScenario::test_checkout')
+
+
+def test_affected_tests(graph):
+    assert graph.affected_tests({'StorePage._wait_for_cart'}) == ['tests/test_bagisto_s1.py::TestScenario::test_cart']
+    assert graph.affected_tests({'global:pages.store_page.CART_SELECTORS'}) == [
+        'tests/test_bagisto_s1.py::TestScenario::test_cart',
+        'tests/test_bagisto_s2.py::TestScenario::test_checkout',
+    ]
+    assert graph.affected_tests({'StorePage.login'}) == ['tests/test_bagisto_s3.py::TestScenario::test_login']
+
+
+def test_changed_symbols():
+    module = 'pages.store_page'
+    source = textwrap.dedent(STORE_PAGE)
+    assert changed_symbols(source, source, module) == set()
+    # Comments and formatting are not changes
+    assert changed_symbols(source, source.replace('pass', 'pass  # later'), module) == set()
+    assert changed_symbols(source, source.replace('pass', 'return 1'), module) == {'StorePage.login'}
+    assert changed_symbols(source, source.replace("'#cart'", "'#mini-cart'"), module) == {
+        'global:pages.store_page.CART_SELECTORS'
+    }
+    assert 'StorePage.goto_cart' in changed_symbols(None, source, module)
+    assert changed_symbols(source, 'def broken(:', module) == set()
+
+
+def test_changed_tests_of_a_scenario_file(graph, tmp_path):
+    path = str(tmp_path / 'tests/test_bagisto_s1.py')
+    assert graph.changed_tests(path, {'TestScenario.test_cart'}) == {
+        'tests/test_bagisto_s1.py::TestScenario::test_cart'
+    }
+    # A module-level edit selects the whole file
+    assert graph.changed_tests(path, {'global:tests.test_bagisto_s1.<imports>'}) == {
+        'tests/test_bagisto_s1.py::TestScenario::test_cart'
+    }
+    assert graph.changed_tests(path, set()) == set()
@@ -0,0 +1,112 @@
+"""CatalogIndex selection and the merging save() shared by parallel workers."""
+import json
+import time
+
+import pytest
+
+from utils.catalog import CatalogIndex
+
+BASE_URL = 'https://shop.test'
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'catalog-index.json')
+
+
+def product(index, name, category='/electronics', **kwargs):
+    url = f'{BASE_URL}/{name}'
+    index.record_product(url, name, category, **dict({'add_to_cart': True}, **kwargs))
+    return url
+
+
+def test_known_good_filters_unusable_products(path):
+    index = CatalogIndex(BASE_URL, path)
+    good = product(index, 'good')
+    product(index, 'configurable', simple=False)
+    product(index, 'sold-out', in_stock=False)
+    product(index, 'no-button', add_to_cart=False)
+    product(index, 'ebook', category='/e-books')
+    stale = product(index, 'stale')
+    index.products[stale]['checked_at'] = time.time() - 2 * index.ttl
+    assert [p['url'] for p in index.known_good(limit=10)] == [good]
+    assert {p['name'] for p in index.known_good(limit=10, categories=['/e-books'])} == {'ebook'}
+
+
+def test_known_good_prefers_reliable_then_recent(path):
+    index = CatalogIndex(BASE_URL, path)
+    flaky = product(index, 'flaky')
+    index.products[flaky]['failures'] = 1
+    older = product(index, 'older')
+    newer = product(index, 'newer')
+    index.products[older]['checked_at'] -= 60
+    assert [p['url'] for p in index.known_good(limit=10)] == [newer, older, flaky]
+    assert len(index.known_good(limit=2)) == 2
+
+
+def test_mark_failed_demotes_until_rechecked(path):
+    index = CatalogIndex(BASE_URL, path)
+    url = product(index, 'p')
+    index.mark_failed(url)
+    assert index.known_good() == []
+    assert index.products[url]['failures'] == 1
+    product(index, 'p')
+    assert index.products[url]['failures'] == 0
+
+
+def test_save_merges_what_each_instance_recorded(path):
+    first = CatalogIndex.load(BASE_URL, path)
+    second = CatalogIndex.load(BASE_URL, path)
+    product(first, 'a')
+    first.record_category('/electronics', True, 2.0)
+    product(second, 'b')
+    second.record_category('/electronics', False, 4.0)
+    first.save()
+    second.save()
+
+    merged = CatalogIndex.load(BASE_URL, path)
+    assert set(merged.products) == {f'{BASE_URL}/a', f'{BASE_URL}/b'}
+    assert merged.categories['/electronics']['attempts'] == 2
+    assert merged.categories['/electronics']['successes'] == 1
+    # The later save refreshed its instance with the other's products
+    assert set(second.products) == set(merged.products)
+
+
+def test_save_keeps_other_base_urls_and_newest_build(path):
+    other = CatalogIndex.load('https://other.test', path)
+    product(other, 'x')
+    other.save()
+    crawled = CatalogIndex.load(BASE_URL, path)
+    crawled.built_at = 200.0
+    crawled.save()
+    stale = CatalogIndex(BASE_URL, path)
+    stale.built_at = 100.0
+    stale.save()
+
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    assert set(data) == {'https://other.test', BASE_URL}
+    assert data[BASE_URL]['built_at'] == 200.0
+    assert stale.built_at == 200.0
+
+
+def test_fastest_order_puts_unprobed_before_failing(path):
+    index = CatalogIndex(BASE_URL, path)
+    index.record_category('/slow', True, 8.0)
+    index.record_category('/fast', True, 2.0)
+    index.record_category('/flaky', True, 2.0)
+    index.record_category('/flaky', False, 2.0)
+    index.record_category('/broken', False, 1.0)
+    categories = ['/broken', '/new', '/slow', '/flaky', '/fast']
+    assert index.order_categories(categories, policy='fastest') == ['/fast', '/flaky', '/slow', '/new', '/broken']
+    # Unknown policies fall back to fastest
+    assert index.order_categories(categories, policy='cheapest') == ['/fast', '/flaky', '/slow', '/new', '/broken']
+
+
+def test_seeded_order_is_reproducible(path):
+    index = CatalogIndex(BASE_URL, path)
+    categories = [f'/c{i}' for i in range(8)]
+    first = index.order_categories(categories, policy='seeded', seed='42')
+    assert index.order_categories(list(reversed(categories)), policy='seeded', seed='42') == first
+    assert sorted(first) == sorted(categories)
+    assert index.order_categories(categories, policy='seeded', seed='43') != first
@@ -0,0 +1,69 @@
+"""Shared/exclusive product locks; two CatalogLocks stand in for two test processes."""
+import pytest
+
+from utils.catalog_locks import CatalogLocks, product_key
+
+URL = 'https://shop.test/arctic-cozy-knit-beanie'
+
+
+@pytest.fixture
+def locks(tmp_path):
+    created = []
+
+    def make(owner, exclusive=False):
+        locks = CatalogLocks(owner, exclusive, directory=str(tmp_path), timeout=0.6)
+        created.append(locks)
+        return locks
+    yield make
+    for locks in created:
+        locks.release()
+
+
+def test_product_key_ignores_query_and_trailing_slash():
+    assert product_key('https://Shop.test/beanie/?ref=cart') == product_key('https://shop.test/beanie')
+
+
+def test_buyers_share_a_product(locks):
+    assert locks('s1').try_lock(URL)
+    assert locks('s2').try_lock(URL)
+
+
+def test_mutator_excludes_buyers_and_other_mutators(locks):
+    mutator = locks('s4', exclusive=True)
+    assert mutator.try_lock(URL)
+    assert not locks('s1').try_lock(URL)
+    assert not locks('s5', exclusive=True).try_lock(URL)
+    mutator.release()
+    assert locks('s1').try_lock(URL)
+
+
+def test_mutator_waits_for_buyers_up_to_the_timeout(locks):
+    buyer = locks('s1')
+    buyer.try_lock(URL)
+    mutator = locks('s4', exclusive=True)
+    assert not mutator.lock(URL)
+    buyer.unlock(URL)
+    assert mutator.lock(URL)
+
+
+def test_nested_locks_are_counted(locks):
+    buyer = locks('s1')
+    assert buyer.try_lock(URL)
+    assert buyer.try_lock(URL + '/')
+    buyer.unlock(URL)
+    assert not locks('s4', exclusive=True).try_lock(URL)
+    buyer.unlock(URL)
+    assert buyer.held == {}
+    assert locks('s4', exclusive=True).try_lock(URL)
+
+
+def test_failing_listener_undoes_the_lock(locks):
+    mutator = locks('s4', exclusive=True)
+
+    def refuse(url):
+        raise RuntimeError('no snapshot')
+    mutator.lock_listeners.append(refuse)
+    with pytest.raises(RuntimeError):
+        mutator.try_lock(URL)
+    assert mutator.held == {}
+    assert locks('s1').try_lock(URL)
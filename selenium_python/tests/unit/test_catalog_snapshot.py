@@ -0,0 +1,129 @@
+"""Catalog snapshots: edit form parsing, stock-only restore and the journal, with a fake admin."""
+import pytest
+
+from utils.catalog_locks import CatalogLocks
+from utils.catalog_snapshot import (
+    AdminSession, CatalogSnapshot, SnapshotError, SnapshotJournal, _EditForm, mutable_values,
+)
+
+URL = 'https://shop.test/arctic-cozy-knit-beanie'
+
+EDIT_FORM_HTML = """
+<input name="query" value="header search">
+<form action="https://shop.test/admin/catalog/products/edit/12" method="POST" enctype="multipart/form-data">
+  <input type="hidden" name="_token" value="csrf">
+  <input type="text" name="sku" value="BEANIE-1">
+  <input type="text" name="price" :value="'12.00'">
+  <input type="text" name="inventories[1]" value="100">
+  <input type="text" name="inventories[2]" value="0">
+  <input type="checkbox" name="status" value="1" checked>
+  <input type="checkbox" name="new" value="1">
+  <select name="tax_category_id">
+    <option value="">None</option>
+    <option value="2" selected>Taxable</option>
+  </select>
+  <textarea name="short_description">Warm knit</textarea>
+  <button type="submit">Save Product</button>
+</form>
+"""
+
+
+class FakeAdmin(AdminSession):
+    """Edit form values in memory; records the inventories PUTs."""
+
+    def __init__(self, values):
+        super().__init__('https://shop.test/admin')
+        self.values = dict(values)
+        self.puts = []
+
+    def product_id(self, storefront_url):
+        return '12'
+
+    def edit_form(self, product_id):
+        return [('_token', 'csrf'), ('sku', 'BEANIE-1')] + sorted(self.values.items())
+
+    def update_inventories(self, product_id, stock, token):
+        self.puts.append((product_id, stock, token))
+        self.values.update(stock)
+
+
+ORIGINAL = {'price': '12.00', 'inventories[1]': '100'}
+
+
+def test_edit_form_fields():
+    parser = _EditForm()
+    parser.feed(EDIT_FORM_HTML)
+    assert parser.fields == [
+        ('_token', 'csrf'), ('sku', 'BEANIE-1'), ('price', '12.00'),
+        ('inventories[1]', '100'), ('inventories[2]', '0'), ('status', '1'),
+        ('tax_category_id', '2'), ('short_description', 'Warm knit'),
+    ]
+    assert mutable_values(parser.fields) == {'price': '12.00', 'inventories[1]': '100', 'inventories[2]': '0'}
+
+
+def test_restore_writes_only_changed_stock():
+    admin = FakeAdmin({'price': '12.00', 'inventories[1]': '0'})
+    assert admin.restore({'product_id': '12', 'values': ORIGINAL})
+    assert admin.puts == [('12', {'inventories[1]': '100'}, 'csrf')]
+    assert admin.restore({'product_id': '12', 'values': ORIGINAL})
+    assert len(admin.puts) == 1
+
+
+def test_price_is_left_to_the_price_restorer():
+    admin = FakeAdmin({'price': '99.00', 'inventories[1]': '100'})
+    entries = {'beanie': {'product_id': '12', 'values': ORIGINAL}}
+    assert admin.restore_all(entries) == {'beanie': False}
+    assert admin.puts == []
+
+    restored = []
+
+    def price_restorer(pending):
+        restored.append(pending)
+        admin.values['price'] = pending['beanie']['values']['price']
+    assert admin.restore_all(entries, price_restorer) == {'beanie': True}
+    assert restored == [entries]
+
+
+def test_journal_keeps_the_oldest_snapshot(tmp_path):
+    journal = SnapshotJournal(str(tmp_path / 'snapshots.json'))
+    assert journal.add('beanie', {'values': ORIGINAL}) == {'values': ORIGINAL}
+    # A second snapshot taken after a crashed run saw the mutated values
+    assert journal.add('beanie', {'values': {'price': '99.00'}}) == {'values': ORIGINAL}
+    journal.remove(['beanie', 'unknown'])
+    assert journal.entries() == {}
+
+
+@pytest.fixture
+def mutator(tmp_path):
+    locks = CatalogLocks('s4', exclusive=True, directory=str(tmp_path / 'locks'))
+    journal = SnapshotJournal(str(tmp_path / 'snapshots.json'))
+    yield locks, journal
+    locks.release()
+
+
+def test_snapshot_on_lock_and_restore_at_end(mutator):
+    locks, journal = mutator
+    snapshot = CatalogSnapshot(locks, journal)
+    snapshot._admin = admin = FakeAdmin(ORIGINAL)
+    assert locks.try_lock(URL)
+    assert snapshot.product_id(URL) == '12'
+    assert list(journal.entries()) == ['shop.test/arctic-cozy-knit-beanie']
+
+    admin.values['inventories[1]'] = '0'
+    assert snapshot.restore() == {'shop.test/arctic-cozy-knit-beanie': True}
+    assert admin.values == ORIGINAL
+    assert journal.entries() == {}
+
+
+def test_failed_snapshot_undoes_the_lock(mutator):
+    locks, journal = mutator
+    snapshot = CatalogSnapshot(locks, journal)
+    snapshot._admin = admin = FakeAdmin(ORIGINAL)
+
+    def unreachable(product_id):
+        raise RuntimeError('admin down')
+    admin.edit_form = unreachable
+    with pytest.raises(SnapshotError):
+        locks.try_lock(URL)
+    assert locks.held == {}
+    assert journal.entries() == {}
@@ -0,0 +1,75 @@
+"""Crawler HTML parsers, fed trimmed-down Bagisto category and product markup."""
+import time
+
+from utils.catalog import CatalogIndex
+from utils.crawler import ProductCardParser, ProductPageParser, start_background_crawl
+
+CATEGORY_HTML = """
+<div class="grid">
+  <a href="https://shop.test/arctic-cozy-knit-beanie" aria-label="Arctic Cozy Knit Beanie">
+    <img src="/beanie.jpg" alt="Arctic Cozy Knit Beanie">
+  </a>
+  <a href="https://shop.test/arctic-cozy-knit-beanie" aria-label="Arctic Cozy Knit Beanie">
+    <img src="/beanie.jpg" alt="Arctic Cozy Knit Beanie">
+  </a>
+  <a href="https://shop.test/wishlist" aria-label="Wishlist"><span class="icon-heart"></span></a>
+  <a href="https://elsewhere.test/ad" aria-label="Ad"><img src="/ad.jpg" alt="Ad"></a>
+  <a href="https://shop.test/omniheat-scarf" aria-label="OmniHeat Scarf"><img src="/s.jpg" alt="Scarf"></a>
+</div>
+"""
+
+PRODUCT_TEMPLATE = """
+<html><body>
+<script type="text/x-template" id="v-product-template">
+  <form>
+    {options}
+    <button type="submit" class="primary-button" {disabled}>Add To Cart</button>
+  </form>
+</script>
+<p>{stock}</p>
+</body></html>
+"""
+
+
+def product_page(options='', disabled='', stock='In Stock'):
+    parser = ProductPageParser()
+    parser.feed(PRODUCT_TEMPLATE.format(options=options, disabled=disabled, stock=stock))
+    return parser
+
+
+def test_product_cards_are_image_links_on_the_host():
+    parser = ProductCardParser('shop.test')
+    parser.feed(CATEGORY_HTML)
+    assert parser.cards == [
+        ('https://shop.test/arctic-cozy-knit-beanie', 'Arctic Cozy Knit Beanie'),
+        ('https://shop.test/omniheat-scarf', 'OmniHeat Scarf'),
+    ]
+
+
+def test_simple_product_in_stock():
+    page = product_page()
+    assert page.has_add_to_cart
+    assert not page.add_to_cart_disabled
+    assert not page.configurable
+    assert not page.out_of_stock
+
+
+def test_configurable_and_unavailable_products():
+    assert product_page(options='<select name="super_attribute[23]"></select>').configurable
+    assert product_page(disabled='disabled').add_to_cart_disabled
+    assert product_page(stock='Out of Stock').out_of_stock
+
+
+def test_page_without_add_to_cart_button():
+    parser = ProductPageParser()
+    parser.feed('<button type="button">Add To Wishlist</button>')
+    assert not parser.has_add_to_cart
+
+
+def test_no_background_crawl_when_index_is_fresh(tmp_path, monkeypatch):
+    path = str(tmp_path / 'catalog-index.json')
+    monkeypatch.setenv('CATALOG_INDEX', path)
+    index = CatalogIndex('https://shop.test', path)
+    index.built_at = time.time()
+    index.save()
+    assert start_background_crawl('https://shop.test') is None
@@ -0,0 +1,109 @@
+"""Scenario selection from changed files, recorded runs and the static call graph."""
+import os
+
+import pytest
+
+from utils.callgraph import CallGraph, Function
+from utils.impact import harness_files, select
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PAGE = '''
+CART = ['.cart']
+
+
+class StorePage:
+    def login(self):
+        pass
+
+    def goto_cart(self):
+        self._wait()
+
+    def _wait(self):
+        return CART
+'''
+
+SCENARIO = '''
+class TestScenario:
+    def test_a(self, driver):
+        pass
+
+    def test_b(self, driver):
+        pass
+'''
+
+S1 = 'tests/test_bagisto_s1.py::TestScenario::test_a'
+S5A = 'tests/test_bagisto_s5.py::TestScenario::test_a'
+S5B = 'tests/test_bagisto_s5.py::TestScenario::test_b'
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    monkeypatch.setenv('IMPACT_SMOKE', 'tests/test_bagisto_s1.py')
+    graph = CallGraph()
+    module = 'pages.store_page'
+    graph.functions = {
+        'StorePage.login': Function('StorePage.login', module),
+        'StorePage.goto_cart': Function('StorePage.goto_cart', module, {'StorePage._wait'}),
+        'StorePage._wait': Function('StorePage._wait', module, reads={f'global:{module}.CART'}),
+    }
+    graph.tests = {
+        S1: Function(S1, 'tests.test_bagisto_s1', {'StorePage.login'}),
+        S5A: Function(S5A, 'tests.test_bagisto_s5', {'StorePage.goto_cart'}),
+        S5B: Function(S5B, 'tests.test_bagisto_s5', {'StorePage.login'}),
+    }
+    return graph
+
+
+def page_change(old, new):
+    return {'pages/store_page.py': (PAGE.replace(*old), PAGE.replace(*new))}
+
+
+def test_smoke_floor_is_always_selected(graph):
+    assert select(graph, {}, {}, set()) == {S1: 'smoke floor'}
+
+
+def test_page_edit_selects_scenarios_whose_closure_reaches_it(graph):
+    selected = select(graph, page_change(('', ''), ("['.cart']", "['.mini-cart']")), {}, set())
+    assert selected == {S5A: 'pages/store_page.py: global:pages.store_page.CART', S1: 'smoke floor'}
+
+
+def test_recorded_steps_replace_the_static_closure(graph):
+    recorded = {S5A: {'methods': {'StorePage.login'}, 'pages': set()}}
+    selected = select(graph, page_change(('', ''), ('pass', 'return True')), recorded, set())
+    assert set(selected) == {S1, S5A, S5B}
+    assert select(graph, page_change(('', ''), ('CART\n', 'None\n')), recorded, set()) == {S1: 'smoke floor'}
+
+
+def test_scenario_edit_selects_only_changed_tests(graph):
+    old = SCENARIO
+    new = SCENARIO.replace('pass', 'assert driver', 1)
+    selected = select(graph, {'tests/test_bagisto_s5.py': (old, new)}, {}, set())
+    assert set(selected) == {S5A, S1}
+    # Deleted scenario files select nothing
+    assert select(graph, {'tests/test_bagisto_s5.py': (old, None)}, {}, set()) == {S1: 'smoke floor'}
+
+
+def test_harness_selects_everything_and_other_files_nothing(graph):
+    changes = {'conftest.py': ('', ''), 'README.md': (None, None), 'tests/unit/test_impact.py': ('', '')}
+    selected = select(graph, changes, {}, {'conftest.py'})
+    assert selected == {S1: 'conftest.py (harness)', S5A: 'conftest.py (harness)', S5B: 'conftest.py (harness)'}
+    assert select(graph, {'tests/unit/test_impact.py': ('', 'x = 1')}, {}, {'conftest.py'}) == {S1: 'smoke floor'}
+
+
+def test_storefront_pages_select_scenarios_that_visited_them(graph):
+    recorded = {
+        S5B: {'methods': set(), 'pages': {'checkout', 'cart'}},
+        'tests/test_bagisto_s99.py::Gone::test_x': {'methods': set(), 'pages': {'checkout'}},
+    }
+    assert select(graph, {}, recorded, set(), pages=['checkout']) == {
+        S5B: 'storefront page checkout', S1: 'smoke floor'
+    }
+
+
+def test_harness_files_of_this_suite(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    harness = harness_files()
+    assert {'conftest.py', 'utils/catalog.py', 'utils/log.py', 'requirements.txt'} <= harness
+    assert not any(path.startswith(os.path.join('tests', '')) for path in harness)
+    assert not any(path.startswith('pages/') and path != 'pages/__init__.py' for path in harness)
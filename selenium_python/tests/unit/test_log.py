@@ -0,0 +1,38 @@
+"""The suite logs pre-formatted f-string messages; extra arguments are %-format args."""
+import os
+import ast
+import glob
+
+import pytest
+
+from utils.log import get_logger
+
+LEVELS = {'debug', 'info', 'warning', 'error', 'exception', 'critical'}
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def sources():
+    for pattern in ('conftest.py', 'pages/*.py', 'utils/*.py', 'tests/*.py'):
+        yield from sorted(glob.glob(os.path.join(ROOT, pattern)))
+
+
+def log_calls(path):
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    for node in ast.walk(tree):
+        func = getattr(node, 'func', None)
+        if (isinstance(node, ast.Call) and isinstance(func, ast.Attribute) and func.attr in LEVELS
+                and isinstance(func.value, ast.Name) and func.value.id == 'log'):
+            yield node
+
+
+@pytest.mark.parametrize('path', list(sources()), ids=lambda p: os.path.relpath(p, ROOT))
+def test_log_calls_pass_a_single_message(path):
+    # log.warning("⚠ Search box not found", e) fails to format when the record is rendered
+    offenders = [node.lineno for node in log_calls(path) if len(node.args) != 1]
+    assert not offenders, f"log calls with %-format arguments at lines {offenders}"
+
+
+def test_get_logger_is_in_suite_hierarchy():
+    assert get_logger('pages.store_page').name == 'bagisto.pages.store_page'
@@ -0,0 +1,125 @@
+"""Order history parsing (datagrid JSON, rows, pagination) and structural order comparison."""
+import pytest
+
+from utils.orders import (
+    OrderDetail, OrderHistoryClient, OrderPage, OrderRecord, OrderRowParser,
+    diff_orders, find_duplicates, parse_order_view,
+)
+
+ORDER_ROWS_HTML = """
+<div class="row grid grid-cols-4">
+  <p>Order ID</p><p>Order Date</p><p>Total</p><p>Status</p>
+</div>
+<div class="row grid grid-cols-4">
+  <p><a href="https://shop.test/customer/account/orders/view/57">#000000061</a></p>
+  <p>2026-10-18</p>
+  <p><span>$</span>120.00</p>
+  <p>Pending</p>
+  <img src="/x.png">
+</div>
+<div class="row grid grid-cols-4">
+  <p>#000000060</p><p>2026-10-17</p><p>$30.00</p>
+</div>
+"""
+
+
+@pytest.fixture
+def client():
+    client = OrderHistoryClient(None, 'https://shop.test')
+    yield client
+    client.close()
+
+
+def test_row_parser_skips_header_and_keeps_view_links():
+    parser = OrderRowParser()
+    parser.feed(ORDER_ROWS_HTML)
+    assert parser.rows == [
+        ['#000000061', '2026-10-18', '$120.00', 'Pending'],
+        ['#000000060', '2026-10-17', '$30.00'],
+    ]
+    assert parser.links == ['57', None]
+
+
+def test_html_rows_fall_back_to_order_id_as_view_id(client):
+    page = client._parse_html(ORDER_ROWS_HTML, 2)
+    assert page.orders[0] == OrderRecord('#000000061', '2026-10-18', '$120.00', 'Pending', view_id='57')
+    assert page.orders[1].status == ''
+    assert page.orders[1].view_id == '#000000060'
+    assert (page.page, page.last_page) == (2, 2)
+
+
+def test_datagrid_json(client):
+    data = {
+        'records': [{'id': 57, 'increment_id': '61', 'created_at': '2026-10-18',
+                     'grand_total': '<span>$120.00</span>', 'status': '<p class="label-pending">Pending</p>'}],
+        'meta': {'current_page': 1, 'last_page': 3, 'total': 25},
+    }
+    page = client._parse_json(data, 1)
+    assert page.orders == [OrderRecord('61', '2026-10-18', '$120.00', 'Pending', view_id='57')]
+    assert (page.last_page, page.total) == (3, 25)
+    assert page.orders[0].to_dict() == {'orderId': '61', 'date': '2026-10-18', 'total': '$120.00', 'status': 'Pending'}
+
+
+def test_new_since_stops_at_known_order_across_pages(client, monkeypatch):
+    pages = {
+        1: OrderPage([OrderRecord('63'), OrderRecord('62')], page=1, last_page=2),
+        2: OrderPage([OrderRecord('61'), OrderRecord('60')], page=2, last_page=2),
+    }
+    monkeypatch.setattr(client, 'fetch_page', lambda page=1: pages[page])
+    assert [o.order_id for o in client.new_since('61', sync=False)] == ['63', '62']
+    assert [o.order_id for o in client.new_since('', sync=False)] == ['63', '62', '61', '60']
+
+
+ORDER_VIEW_HTML = """
+<div class="order-view">
+  <table>
+    <thead><tr><th>SKU</th><th>Product Name</th><th>Qty</th></tr></thead>
+    <tbody>
+      <tr><td data-value="SKU">BEANIE-1</td><td data-value="Product Name">Arctic Beanie</td><td>{qty}</td></tr>
+    </tbody>
+  </table>
+  <table><tr><td>Related</td></tr></table>
+  <div class="flex justify-between"><p>Subtotal</p><p>{total}</p></div>
+  <div class="flex justify-between">
+    <p>Grand Total</p>
+    <div><p>{total}</p></div>
+  </div>
+  <p>Payment Method</p><p>Cash On Delivery</p>
+  <p>Shipping Method</p><p>Flat Rate</p>
+  <br>
+</div>
+"""
+
+
+def order_view(view_id, total='$120.00', qty='1'):
+    return parse_order_view(view_id, ORDER_VIEW_HTML.format(total=total, qty=qty))
+
+
+def test_parse_order_view():
+    detail = order_view('57')
+    assert detail.grand_total == '$120.00'
+    assert detail.totals == {'Subtotal': '$120.00', 'Grand Total': '$120.00'}
+    assert detail.payment_method == 'Cash On Delivery'
+    assert detail.shipping_method == 'Flat Rate'
+    # Only the first item table; columns from data-value, else the header
+    assert detail.items == [{'SKU': 'BEANIE-1', 'Product Name': 'Arctic Beanie', 'Qty': '1'}]
+    assert detail.product_names == ['Arctic Beanie']
+
+
+def test_grand_total_falls_back_to_first_amount_after_label():
+    detail = parse_order_view('1', '<span>Grand Total</span> <b>$9.50</b>')
+    assert detail.grand_total == '$9.50'
+
+
+def test_diff_orders_ignores_identity():
+    assert diff_orders(order_view('57'), order_view('58')) == {}
+    diff = diff_orders(order_view('57'), order_view('58', total='$240.00', qty='2'))
+    assert set(diff) == {'grand_total', 'items', 'totals'}
+    assert diff['grand_total'] == ('$120.00', '$240.00')
+
+
+def test_find_duplicates_pairs_every_identical_order():
+    details = [order_view('57'), order_view('58', qty='2'), order_view('59'), order_view('60')]
+    assert find_duplicates(details) == [('57', '59'), ('57', '60'), ('59', '60')]
+    # Unparsed orders (no total) are never duplicates
+    assert find_duplicates([OrderDetail('1'), OrderDetail('2')]) == []
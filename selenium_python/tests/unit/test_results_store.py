@@ -0,0 +1,73 @@
+"""ResultsStore queries over a throwaway SQLite database."""
+import pytest
+
+from utils.results_store import ResultsStore
+
+
+def step(seq, name, duration, sleep=0.0, commands=1):
+    return {'seq': seq, 'name': name, 'depth': 0, 'duration': duration,
+            'sleep': sleep, 'commands': commands, 'outcome': 'passed'}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(str(tmp_path / 'results.db'))
+    yield store
+    store.close()
+
+
+def record_run(store, commit, steps, nodeid='tests/test_bagisto_s1.py::T::test_a', **kwargs):
+    run_id = store.start_run({'git_commit': commit})
+    store.record_test(run_id, nodeid, 'passed', sum(s['duration'] for s in steps), steps, **kwargs)
+    return run_id
+
+
+def test_slowest_steps_averages_recent_runs(store):
+    record_run(store, 'aaa', [step(1, 'StorePage.login', 2.0), step(2, 'StorePage.goto_cart', 1.0)])
+    record_run(store, 'bbb', [step(1, 'StorePage.login', 4.0, sleep=1.0)])
+    rows = store.slowest_steps(last_runs=20)
+    assert [row['name'] for row in rows] == ['StorePage.login', 'StorePage.goto_cart']
+    assert rows[0]['samples'] == 2
+    assert rows[0]['avg_duration'] == 3.0
+    assert rows[0]['avg_sleep'] == 0.5
+    # Only the latest run
+    [row] = store.slowest_steps(last_runs=1)
+    assert row['max_duration'] == 4.0
+
+
+def test_regressions_compare_before_and_since_commit(store):
+    record_run(store, 'aaa111', [step(1, 'StorePage.login', 2.0), step(2, 'StorePage.goto_cart', 1.0)])
+    record_run(store, 'bbb222', [step(1, 'StorePage.login', 3.0), step(2, 'StorePage.goto_cart', 1.1)])
+    rows = store.regressions('bbb', threshold=0.2)
+    assert [(row['name'], row['before_avg'], row['after_avg']) for row in rows] == [
+        ('StorePage.login', 2.0, 3.0)
+    ]
+    with pytest.raises(ValueError):
+        store.regressions('ccc')
+
+
+def test_run_report_and_step_history(store):
+    record_run(store, 'aaa', [step(1, 'StorePage.login', 2.0)])
+    run_id = record_run(store, 'bbb', [step(1, 'StorePage.login', 3.0), step(2, 'StorePage.goto_cart', 1.0)],
+                        attachments={'trace': 'test-results/traces/x'})
+    [test] = store.run_report()
+    assert [s['name'] for s in test['steps']] == ['StorePage.login', 'StorePage.goto_cart']
+    assert [tuple(a) for a in test['attachments']] == [('trace', 'test-results/traces/x')]
+    history = store.step_history('StorePage.login')
+    assert [(row['run_id'], row['duration']) for row in history] == [(run_id, 3.0), (run_id - 1, 2.0)]
+
+
+def test_impact_map_collects_steps_and_pages(store):
+    record_run(store, 'aaa', [step(1, 'StorePage.login', 1.0)],
+               urls=['https://shop.test/customer/login', 'about:blank'])
+    record_run(store, 'bbb', [step(1, 'StorePage.goto_cart', 1.0)],
+               navigations=[{'url': 'https://shop.test/checkout/cart'}])
+    record_run(store, 'bbb', [step(1, 'StorePage.place_order', 1.0)], nodeid='tests/test_bagisto_s11.py::T::test_b')
+    nodeid = 'tests/test_bagisto_s1.py::T::test_a'
+    assert store.impact_map()[nodeid] == {
+        'methods': {'StorePage.login', 'StorePage.goto_cart'},
+        'pages': {'login', 'cart'},
+    }
+    recent = store.impact_map(last_runs=2)
+    assert recent[nodeid]['methods'] == {'StorePage.goto_cart'}
+    assert recent['tests/test_bagisto_s11.py::T::test_b'] == {'methods': {'StorePage.place_order'}, 'pages': set()}
@@ -0,0 +1,36 @@
+"""StepTimeline accounting of blind sleeps and WebDriver commands."""
+import threading
+
+from utils.timeline import StepTimeline
+
+
+def test_sleep_counts_towards_open_steps():
+    timeline = StepTimeline('t')
+    with timeline.step('outer') as outer:
+        with timeline.step('inner') as inner:
+            timeline.sleep(0.01)
+        timeline.sleep(0.02)
+    assert inner.sleep == 0.01
+    assert round(outer.sleep, 3) == 0.03
+
+
+def test_sleep_on_another_thread_is_not_counted():
+    timeline = StepTimeline('t')
+    with timeline.step('step') as record:
+        worker = threading.Thread(target=timeline.sleep, args=(0.05,))
+        worker.start()
+        timeline.sleep(0.01)
+        worker.join()
+    assert record.sleep == 0.01
+
+
+def test_commands_and_summary():
+    timeline = StepTimeline('t')
+    with timeline.step('step'):
+        timeline.record_command('get')
+        timeline.record_command('findElement')
+    timeline.record_command('quit')
+    [summary] = timeline.summary()
+    assert summary['name'] == 'step'
+    assert summary['commands'] == 2
+    assert summary['outcome'] == 'passed'
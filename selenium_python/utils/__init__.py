@@ -0,0 +1 @@
+"""Test infrastructure helpers for the Bagisto Selenium suite."""
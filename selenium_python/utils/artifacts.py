@@ -0,0 +1,244 @@
+"""
+Failure artifacts - screenshot, DOM, console log and URL of every browser
+a test registered.
+
+Grabbing state from the browsers has to happen on the test thread before
+teardown quits them, but that is only a few WebDriver calls. Compression
+and disk I/O are handed to a background ArtifactWriter thread.
+"""
+import os
+import re
+import gzip
+import json
+import time
+import queue
+import threading
+from typing import Optional, Dict
+
+from utils.log import get_logger
+from utils.timeline import current_timeline
+from utils.tracer import start_tracer, write_trace
+from utils.har import start_har_recorder, write_har, log_summary, DEFAULT_HAR_DIR
+from utils.perf_metrics import start_navigation_metrics
+
+log = get_logger(__name__)
+
+DEFAULT_ARTIFACT_DIR = os.path.join('test-results', 'artifacts')
+
+_writer: Optional['ArtifactWriter'] = None
+
+
+def safe_name(value: str) -> str:
+    """Turn a pytest node id into a file-system friendly name."""
+    return re.sub(r'[^\w.-]+', '_', value).strip('_')
+
+
+class BrowserRegistry:
+    """Browsers opened by one test, keyed by a short name ('main', 'admin'...)."""
+
+    def __init__(self, test_id: str = ''):
+        self.test_id = test_id
+        self._drivers: Dict[str, object] = {}
+        self.tracers: Dict[str, object] = {}
+        self.har_recorders: Dict[str, object] = {}
+
+    def register(self, name: str, driver):
+        self._drivers[name] = driver
+        timeline = current_timeline()
+        tracer = start_tracer(driver, name, timeline)
+        if tracer is not None:
+            self.tracers[name] = tracer
+        recorder = start_har_recorder(driver, name, timeline)
+        if recorder is not None:
+            self.har_recorders[name] = recorder
+        start_navigation_metrics(driver, name)
+        return driver
+
+    def unregister(self, name: str):
+        self._drivers.pop(name, None)
+        tracer = self.tracers.pop(name, None)
+        if tracer is not None:
+            tracer.stop()
+
+    def close(self):
+        """
+        Stop recorders at test end: buffered traces of a green test are
+        dropped, HAR files are always queued for writing. Extra browsers
+        (admin, second session) are quit here, after the failure report
+        captured them; 'main' belongs to the driver fixture.
+        """
+        for name in list(self.tracers):
+            tracer = self.tracers.pop(name)
+            tracer.stop()
+            tracer.discard()
+        if self.har_recorders:
+            self._write_hars()
+        for name, driver in list(self._drivers.items()):
+            if name == 'main':
+                continue
+            try:
+                driver.quit()
+            except Exception as e:
+                log.debug(f"Closing {name} browser failed: {type(e).__name__}")
+        self._drivers.clear()
+
+    def _write_hars(self):
+        writer = start_artifact_writer()
+        directory = os.path.join(os.getenv('HAR_DIR', DEFAULT_HAR_DIR), safe_name(self.test_id))
+        timeline = current_timeline()
+        for name in list(self.har_recorders):
+            recorder = self.har_recorders.pop(name)
+            # Usually already finished by the pre-quit hook
+            recorder.finish()
+            summary = recorder.summary()
+            log_summary(name, summary)
+            writer.submit_job(write_har, directory, name, recorder.to_har(), summary)
+            if timeline is not None:
+                timeline.attach(f"har:{name}", os.path.join(directory, f"{name}.har"))
+
+    def items(self):
+        return list(self._drivers.items())
+
+    def __iter__(self):
+        return iter(list(self._drivers.values()))
+
+    def __len__(self):
+        return len(self._drivers)
+
+
+def grab_browser_state(driver) -> Dict:
+    """
+    Pull raw failure state out of one browser. Every part is optional: a
+    crashed or already-quit browser should not prevent capturing the others
+    (a dead session surfaces as urllib3 connection errors, not
+    WebDriverException, hence the broad excepts).
+    """
+    state = {'captured_at': time.time()}
+    try:
+        state['url'] = driver.current_url
+    except Exception as e:
+        state['url_error'] = type(e).__name__
+    try:
+        state['screenshot'] = driver.get_screenshot_as_png()
+    except Exception as e:
+        state['screenshot_error'] = type(e).__name__
+    try:
+        state['page_source'] = driver.page_source
+    except Exception as e:
+        state['page_source_error'] = type(e).__name__
+    try:
+        # Chrome only; Firefox/geckodriver does not implement the log endpoint
+        state['console'] = driver.get_log('browser')
+    except Exception as e:
+        state['console_error'] = type(e).__name__
+    return state
+
+
+class ArtifactWriter:
+    """Background thread that compresses and writes captured browser state."""
+
+    def __init__(self, base_dir: Optional[str] = None):
+        self.base_dir = base_dir or os.getenv('ARTIFACT_DIR', DEFAULT_ARTIFACT_DIR)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='artifact-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, test_id: str, browser_name: str, state: Dict):
+        """Queue one browser's state for writing; returns immediately."""
+        self._queue.put((self._write, (test_id, browser_name, state)))
+
+    def submit_job(self, func, *args):
+        """Run `func(*args)` on the writer thread (for other artifact kinds)."""
+        self._queue.put((func, args))
+
+    def flush(self):
+        """Block until everything submitted so far is on disk."""
+        self._queue.join()
+
+    def close(self):
+        self.flush()
+        self._queue.put(None)
+        self._thread.join(timeout=10)
+
+    def directory_for(self, test_id: str, browser_name: str) -> str:
+        return os.path.join(self.base_dir, safe_name(test_id), browser_name)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                func, args = item
+                func(*args)
+            except Exception as e:
+                log.warning(f"  ⚠ Could not write failure artifacts: {type(e).__name__}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, test_id: str, browser_name: str, state: Dict):
+        directory = self.directory_for(test_id, browser_name)
+        os.makedirs(directory, exist_ok=True)
+
+        screenshot = state.pop('screenshot', None)
+        if screenshot:
+            # PNG is already compressed
+            with open(os.path.join(directory, 'screenshot.png'), 'wb') as f:
+                f.write(screenshot)
+
+        page_source = state.pop('page_source', None)
+        if page_source is not None:
+            with gzip.open(os.path.join(directory, 'page_source.html.gz'), 'wt', encoding='utf-8') as f:
+                f.write(page_source)
+
+        console = state.pop('console', None)
+        if console is not None:
+            with gzip.open(os.path.join(directory, 'console.json.gz'), 'wt', encoding='utf-8') as f:
+                json.dump(console, f)
+
+        meta = dict(state, test=test_id, browser=browser_name)
+        with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+
+def start_artifact_writer() -> ArtifactWriter:
+    global _writer
+    if _writer is None:
+        _writer = ArtifactWriter()
+    return _writer
+
+
+def stop_artifact_writer():
+    global _writer
+    if _writer is not None:
+        _writer.close()
+        _writer = None
+
+
+def capture_failure(test_id: str, registry: BrowserRegistry) -> Optional[str]:
+    """
+    Grab state from every registered browser and queue it for writing.
+    Returns the artifact directory of the test, or None if nothing was captured.
+    """
+    writer = start_artifact_writer()
+    for name, driver in registry.items():
+        writer.submit(test_id, name, grab_browser_state(driver))
+    if not len(registry):
+        return None
+    return os.path.join(writer.base_dir, safe_name(test_id))
+
+
+def flush_traces(test_id: str, registry: BrowserRegistry) -> Optional[str]:
+    """Export every tracer of the test and queue the traces for writing."""
+    if not registry.tracers:
+        return None
+    writer = start_artifact_writer()
+    for name, tracer in registry.tracers.items():
+        try:
+            trace = tracer.export()
+        except Exception as e:
+            log.warning(f"  ⚠ Could not export trace of {name}: {type(e).__name__}")
+            continue
+        path = os.path.join(writer.directory_for(test_id, name), 'trace.json.gz')
+        writer.submit_job(write_trace, path, trace)
+    return os.path.join(writer.base_dir, safe_name(test_id))
@@ -0,0 +1,335 @@
+"""
+BrowserDaemon - warm, logged-in browsers that outlive pytest runs.
+
+    python -m utils.browser_daemon start --size 2    # foreground; Ctrl+C stops it
+    python -m utils.browser_daemon status
+    python -m utils.browser_daemon stop
+
+The daemon launches `size` browsers through BrowserFactory, logs each one
+in with the test account and serves a small JSON API on localhost. A test
+run leases a browser and attaches to its existing WebDriver session by
+session ID (AttachedChrome), so it pays neither webdriver-manager nor a
+Chrome cold start. quit() on an attached driver hands the browser back;
+the daemon empties the cart, clears web storage and every cookie but the
+login ones, and parks the browser on about:blank. A browser handed back
+after a failed test is relaunched instead.
+
+BROWSER_DAEMON=auto (default: use a running daemon) | true | false
+BROWSER_DAEMON_PORT=4455
+"""
+import os
+import re
+import json
+import time
+import argparse
+import threading
+import urllib.request
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+
+from utils.cdp_events import has_performance_log, mark_performance_logging
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+STATE_FILE = os.path.join('test-results', 'browser-daemon.json')
+
+# Laravel session, its CSRF cookie and "remember me": the login survives a reset
+LOGIN_COOKIES = re.compile(r'(_session$|^XSRF-TOKEN$|^remember_)')
+
+# Empty the customer's server-side cart through the storefront API; resolves
+# with the number of items removed, or -1
+CLEAR_CART_SCRIPT = """
+const done = arguments[arguments.length - 1];
+const token = decodeURIComponent((document.cookie.match(/XSRF-TOKEN=([^;]+)/) || [])[1] || '');
+const headers = {'Accept': 'application/json', 'Content-Type': 'application/json',
+                 'X-Requested-With': 'XMLHttpRequest', 'X-XSRF-TOKEN': token};
+fetch('/api/checkout/cart', {headers, credentials: 'same-origin'})
+  .then(r => r.json())
+  .then(body => {
+    const ids = ((body.data || {}).items || []).map(item => item.id);
+    if (!ids.length) return 0;
+    return fetch('/api/checkout/cart/selected', {
+      method: 'DELETE', headers, credentials: 'same-origin', body: JSON.stringify({ids})
+    }).then(r => r.ok ? ids.length : -1);
+  })
+  .then(done, () => done(-1));
+"""
+
+
+def daemon_port() -> int:
+    return int(os.getenv('BROWSER_DAEMON_PORT', '4455'))
+
+
+def daemon_mode() -> str:
+    return os.getenv('BROWSER_DAEMON', 'auto').lower()
+
+
+class AttachedChrome(webdriver.Remote):
+    """WebDriver client for a Chrome session another process started."""
+
+    def __init__(self, executor_url: str, session_id: str, capabilities: Dict, on_quit=None):
+        self._attach_to = (session_id, capabilities)
+        self._on_quit = on_quit
+        # Set by BrowserFactory.release(); False makes the daemon relaunch it
+        self.healthy = True
+        executor = ChromiumRemoteConnection(executor_url, vendor_prefix='goog', browser_name='chrome')
+        super().__init__(command_executor=executor, options=webdriver.ChromeOptions())
+
+    def start_session(self, capabilities: dict) -> None:
+        # Adopt the existing session instead of sending NEW_SESSION
+        self.session_id, self.caps = self._attach_to
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: dict):
+        return self.execute('executeCdpCommand', {'cmd': cmd, 'params': cmd_args})['value']
+
+    def quit(self):
+        """Hand the browser back to its owner; the session stays alive."""
+        if self._on_quit is not None:
+            self._on_quit(self)
+
+
+# --- Client ---------------------------------------------------------------------
+
+class DaemonClient:
+    def __init__(self, port: Optional[int] = None, timeout: float = 2.0):
+        self.url = f'http://127.0.0.1:{port or daemon_port()}'
+        self.timeout = timeout
+
+    def _call(self, path: str, payload: Optional[Dict] = None, timeout: Optional[float] = None) -> Dict:
+        data = json.dumps(payload or {}).encode() if payload is not None else None
+        request = urllib.request.Request(self.url + path, data=data,
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=timeout or self.timeout) as response:
+            return json.loads(response.read() or b'{}')
+
+    def available(self) -> bool:
+        try:
+            return bool(self._call('/status').get('slots'))
+        except Exception:
+            return False
+
+    def status(self) -> Dict:
+        return self._call('/status')
+
+    def lease(self) -> AttachedChrome:
+        """Attach to a free daemon browser; raises if none is free."""
+        lease = self._call('/lease', {})
+        slot = lease['slot']
+        driver = AttachedChrome(lease['executor'], lease['session_id'], lease['capabilities'],
+                                on_quit=lambda d: self.release(slot, d.healthy))
+        driver._daemon_slot = slot
+        if lease.get('performance_log'):
+            mark_performance_logging(driver, network=lease.get('network_log', False))
+        return driver
+
+    def release(self, slot: int, healthy: bool = True):
+        try:
+            self._call('/release', {'slot': slot, 'healthy': healthy}, timeout=30)
+        except Exception as e:
+            log.warning(f"  ⚠ Could not return browser {slot} to daemon: {type(e).__name__}")
+
+    def stop(self):
+        self._call('/shutdown', {})
+
+
+# --- Daemon ---------------------------------------------------------------------
+
+class BrowserDaemon:
+    """Keeps `size` logged-in browsers and leases them to test runs."""
+
+    def __init__(self, base_url: str, size: int = 2, login: bool = True):
+        from utils.browser_factory import BrowserFactory
+
+        self.base_url = base_url
+        self.size = size
+        self.login = login
+        self.factory = BrowserFactory()
+        self.slots: List[Dict] = []
+        self._lock = threading.Lock()
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    def _launch(self, index: int) -> Dict:
+        from pages.store_page import StorePage
+
+        driver = self.factory.launch(f'daemon-{index}', session=True)
+        if self.login and os.getenv('BAGISTO_EMAIL'):
+            try:
+                StorePage(driver, self.base_url).login()
+            except Exception as e:
+                log.warning(f"  ⚠ Daemon browser {index} not logged in: {type(e).__name__}")
+        driver.get('about:blank')
+        return {'index': index, 'driver': driver, 'leased': False, 'leases': 0}
+
+    def start(self):
+        for index in range(self.size):
+            self.slots.append(self._launch(index))
+            log.info(f"  ✓ Daemon browser {index} ready")
+
+    def _reset(self, slot: Dict, healthy: bool):
+        driver = slot['driver']
+        try:
+            if not healthy:
+                raise RuntimeError('reported unhealthy')
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            self._clear_state(driver)
+            driver.get('about:blank')
+        except Exception as e:
+            log.warning(f"  ⚠ Relaunching daemon browser {slot['index']}: {e}")
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            slot.update(self._launch(slot['index']))
+
+    def _clear_state(self, driver):
+        """Cart, web storage and non-login cookies of the storefront; the login stays."""
+        driver.get(f"{self.base_url}/checkout/cart")
+        removed = driver.execute_async_script(CLEAR_CART_SCRIPT)
+        if removed < 0:
+            raise RuntimeError('cart could not be emptied')
+        driver.execute_script('window.localStorage.clear(); window.sessionStorage.clear();')
+        for cookie in driver.get_cookies():
+            if not LOGIN_COOKIES.search(cookie['name']):
+                driver.delete_cookie(cookie['name'])
+
+    def lease(self) -> Optional[Dict]:
+        with self._lock:
+            slot = next((s for s in self.slots if not s['leased']), None)
+            if slot is None:
+                return None
+            slot['leased'] = True
+            slot['leases'] += 1
+        driver = slot['driver']
+        return {
+            'slot': slot['index'],
+            'executor': driver.service.service_url,
+            'session_id': driver.session_id,
+            'capabilities': driver.caps,
+            'performance_log': has_performance_log(driver, network=False),
+            'network_log': has_performance_log(driver),
+        }
+
+    def release(self, index: int, healthy: bool = True):
+        slot = self.slots[index]
+        self._reset(slot, healthy)
+        with self._lock:
+            slot['leased'] = False
+
+    def status(self) -> Dict:
+        return {
+            'pid': os.getpid(),
+            'base_url': self.base_url,
+            'slots': [{'index': s['index'], 'leased': s['leased'], 'leases': s['leases']} for s in self.slots],
+        }
+
+    def serve(self, port: int):
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, code: int, body: Dict):
+                payload = json.dumps(body).encode()
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _body(self) -> Dict:
+                length = int(self.headers.get('Content-Length') or 0)
+                return json.loads(self.rfile.read(length) or b'{}')
+
+            def do_GET(self):
+                if self.path == '/status':
+                    self._reply(200, daemon.status())
+                else:
+                    self._reply(404, {'error': 'not found'})
+
+            def do_POST(self):
+                body = self._body()
+                if self.path == '/lease':
+                    lease = daemon.lease()
+                    self._reply(200, lease) if lease else self._reply(503, {'error': 'all browsers leased'})
+                elif self.path == '/release':
+                    daemon.release(int(body['slot']), bool(body.get('healthy', True)))
+                    self._reply(200, {'ok': True})
+                elif self.path == '/shutdown':
+                    self._reply(200, {'ok': True})
+                    threading.Thread(target=daemon.server.shutdown, daemon=True).start()
+                else:
+                    self._reply(404, {'error': 'not found'})
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+        with open(STATE_FILE, 'w') as f:
+            json.dump({'pid': os.getpid(), 'port': port, 'started_at': time.time()}, f)
+        log.info(f"✓ Browser daemon on 127.0.0.1:{port} with {len(self.slots)} browsers")
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+
+    def close(self):
+        for slot in self.slots:
+            try:
+                slot['driver'].quit()
+            except Exception:
+                pass
+        self.factory.shutdown()
+        try:
+            os.unlink(STATE_FILE)
+        except OSError:
+            pass
+
+
+def main(argv=None):
+    from dotenv import load_dotenv
+    from utils.log import configure_logging, shutdown_logging
+    from utils.reaper import install_signal_handlers
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description='Keep warm browsers for fast local re-runs.')
+    parser.add_argument('--port', type=int, default=None)
+    sub = parser.add_subparsers(dest='command', required=True)
+    start = sub.add_parser('start', help='Launch browsers and serve leases (foreground)')
+    start.add_argument('--size', type=int, default=int(os.getenv('BROWSER_DAEMON_SIZE', '2')))
+    start.add_argument('--no-login', action='store_true')
+    sub.add_parser('status')
+    sub.add_parser('stop')
+    args = parser.parse_args(argv)
+    port = args.port or daemon_port()
+
+    if args.command == 'status':
+        print(json.dumps(DaemonClient(port).status(), indent=2))
+        return
+    if args.command == 'stop':
+        DaemonClient(port).stop()
+        return
+
+    os.environ.setdefault('LOG_CONSOLE', 'true')
+    configure_logging()
+    install_signal_handlers()
+    daemon = BrowserDaemon(os.getenv('BAGISTO_BASE_URL', 'https://commerce.bagisto.com'),
+                           args.size, login=not args.no_login)
+    try:
+        daemon.start()
+        daemon.serve(port)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+        shutdown_logging()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,352 @@
+"""
+BrowserFactory - launches browsers and hands out isolated sessions.
+
+A scenario that needs a second customer (or an admin) used to start a whole
+extra Chrome. With Chrome the factory instead opens a CDP browser context
+(Target.createBrowserContext) in an already running Chrome: a window with
+its own cookies, storage and cache, returned as a handle that behaves like
+a WebDriver. All handles of one Chrome share a single chromedriver
+session, so SharedChrome switches the session's current window before each
+command under a lock.
+
+Contexts are cheap but not concurrent: commands of two handles take turns
+on the one chromedriver session. A scenario that needs truly simultaneous
+actions (S16B's two Place Order clicks) asks for isolation='process'.
+
+BROWSER_ISOLATION=context (default) | process (launch a full browser)
+BROWSER_POOL=true keeps one Chrome per worker and gives every test a fresh
+context in it instead of a fresh process.
+"""
+import os
+import copy
+import glob
+import threading
+from typing import Dict, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.switch_to import SwitchTo
+from selenium.webdriver.remote.mobile import Mobile
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.firefox import GeckoDriverManager
+
+from utils.cdp_events import enable_performance_logging, mark_performance_logging, supports_cdp
+from utils.timeline import instrument_driver
+from utils.reaper import browser_reaper
+from utils.profiles import ProfileStore, ProfileSlot
+from utils.launch_profiles import LaunchProfile, load_launch_profile
+from utils.browser_daemon import DaemonClient, daemon_mode
+from utils.tracer import tracing_enabled
+from utils.har import har_enabled
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+_chromedriver_path: Optional[str] = None
+
+
+def chromedriver_path() -> str:
+    """Resolve chromedriver once per process (webdriver-manager hits the network)."""
+    global _chromedriver_path
+    if _chromedriver_path is None:
+        driver_path = ChromeDriverManager().install()
+        # Fix for webdriver-manager bug: find actual chromedriver binary
+        if 'THIRD_PARTY_NOTICES' in driver_path or not os.path.isfile(driver_path):
+            # Search for actual chromedriver binary in parent directory
+            driver_dir = os.path.dirname(driver_path)
+            possible_paths = glob.glob(os.path.join(driver_dir, '**/chromedriver'), recursive=True)
+            if possible_paths:
+                driver_path = possible_paths[0]
+                log.info(f"  ✓ Found chromedriver at: {driver_path}")
+        _chromedriver_path = driver_path
+    return _chromedriver_path
+
+
+def chrome_options(headless: bool, performance_log: bool = False,
+                   profile: Optional[LaunchProfile] = None, page_events: bool = False) -> webdriver.ChromeOptions:
+    """Required flags plus the launch profile (default: LAUNCH_PROFILE, see utils.launch_profiles)."""
+    profile = profile or load_launch_profile()
+    options = webdriver.ChromeOptions()
+    if headless:
+        if profile.binary:
+            options.binary_location = profile.binary
+        if profile.headless_argument:
+            options.add_argument(profile.headless_argument)
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument(f'--window-size={profile.window_size}')
+    # Ignore HTTPS errors for demo sites
+    options.add_argument('--ignore-certificate-errors')
+    options.add_argument('--ignore-ssl-errors')
+    for argument in profile.arguments:
+        options.add_argument(argument)
+    # Keep all console levels for failure artifacts
+    options.set_capability('goog:loggingPrefs', {'browser': 'ALL'})
+    if performance_log or page_events:
+        enable_performance_logging(options, network=performance_log)
+    return options
+
+
+class SharedChrome:
+    """One chromedriver session whose windows are used by several handles."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.lock = threading.RLock()
+        self.base_execute = driver.execute
+        self.home = driver.current_window_handle
+        self.current = self.home
+        self.contexts: Dict[str, str] = {}
+
+        # The owning driver must get its window back after a handle ran
+        def execute(driver_command, params=None):
+            return self.execute_in(self.home, driver_command, params, owner=None)
+
+        driver.execute = execute
+        driver._shared_chrome = self
+
+    def execute_in(self, handle: str, driver_command, params=None, owner=None):
+        with self.lock:
+            if driver_command == Command.SWITCH_TO_WINDOW:
+                # An explicit switch moves that handle's home window
+                result = self.base_execute(driver_command, params)
+                self.current = params['handle']
+                if owner is None:
+                    self.home = self.current
+                else:
+                    owner._window = self.current
+                return result
+            if self.current != handle and driver_command != Command.QUIT:
+                self.base_execute(Command.SWITCH_TO_WINDOW, {'handle': handle})
+                self.current = handle
+            return self.base_execute(driver_command, params)
+
+    def create_context(self, name: str) -> webdriver.Remote:
+        with self.lock:
+            context_id = self.driver.execute_cdp_cmd(
+                'Target.createBrowserContext', {'disposeOnDetach': True}
+            )['browserContextId']
+            target_id = self.driver.execute_cdp_cmd('Target.createTarget', {
+                'url': 'about:blank',
+                'browserContextId': context_id,
+                'newWindow': True,
+            })['targetId']
+        # chromedriver window handles are DevTools target IDs
+        self.contexts[target_id] = context_id
+        log.info(f"  ✓ Isolated browser context for {name}")
+        return context_driver(self, name, target_id, context_id)
+
+    def dispose(self, target_id: str):
+        context_id = self.contexts.pop(target_id, None)
+        if context_id is None:
+            return
+        with self.lock:
+            try:
+                self.driver.execute_cdp_cmd('Target.disposeBrowserContext', {'browserContextId': context_id})
+            except Exception as e:
+                # Chrome already gone
+                log.debug(f"Context dispose failed: {type(e).__name__}")
+            if self.current == target_id:
+                self.current = None
+
+
+def context_driver(shared: SharedChrome, name: str, target_id: str, context_id: str):
+    """
+    WebDriver-like handle on one browser context: a shallow copy of the
+    Chrome driver whose commands run in the context's window.
+    """
+    parent = shared.driver
+    handle = copy.copy(parent)
+    # Fresh per-instance state; session ID and command executor are shared.
+    # The performance log is session-wide, so contexts do not claim it.
+    for attr in ('_command_listeners', '_command_pre_listeners', '_performance_logging',
+                 '_performance_network', 'execute', 'quit'):
+        handle.__dict__.pop(attr, None)
+    handle.pinned_scripts = {}
+    handle._switch_to = SwitchTo(handle)
+    handle._mobile = Mobile(handle)
+    handle._window = target_id
+    handle._context_name = name
+    handle._shared_chrome = shared
+    base_execute = type(parent).execute.__get__(handle)
+
+    def execute(driver_command, params=None):
+        with shared.lock:
+            if driver_command == Command.SWITCH_TO_WINDOW:
+                return shared.execute_in(handle._window, driver_command, params, owner=handle)
+            if shared.current != handle._window:
+                shared.base_execute(Command.SWITCH_TO_WINDOW, {'handle': handle._window})
+                shared.current = handle._window
+            return base_execute(driver_command, params)
+
+    def quit():
+        # Closes the context's windows; the Chrome process stays up
+        shared.dispose(target_id)
+
+    handle.execute = execute
+    handle.quit = quit
+    browser_reaper().track_context(handle, name, is_open=lambda: target_id in shared.contexts)
+    return instrument_driver(handle)
+
+
+class BrowserFactory:
+    """Per-worker browser launcher with optional pooled Chrome."""
+
+    def __init__(self):
+        self.browser = os.getenv('BROWSER', 'chrome').lower()
+        self.headless = os.getenv('HEADLESS', 'false').lower() == 'true'
+        self.isolation = os.getenv('BROWSER_ISOLATION', 'context').lower()
+        self.pooled = os.getenv('BROWSER_POOL', 'false').lower() == 'true'
+        self._pool: Optional[webdriver.Remote] = None
+        self._profiles: Optional[ProfileStore] = None
+        self._daemon = None
+
+    @property
+    def profiles(self) -> ProfileStore:
+        if self._profiles is None:
+            self._profiles = ProfileStore()
+            log.info(f"  ✓ Chrome profiles in {self._profiles.root} (tmpfs={self._profiles.on_tmpfs})")
+        return self._profiles
+
+    def launch(self, name: str = 'main', session: bool = False) -> webdriver.Remote:
+        """
+        Start a new browser process with the suite's standard configuration.
+        It is reaped at the end of the running test unless `session` is set.
+        """
+        log.info(f"\n🌐 Starting {self.browser} browser (headless={self.headless})...")
+
+        if self.browser == 'chrome':
+            performance_log = tracing_enabled() or har_enabled()
+            # Page events are few and let OrderWatcher follow navigations
+            # without polling; Network events only for traces and HARs
+            options = chrome_options(self.headless, performance_log, page_events=True)
+            slot = self.profiles.acquire()
+            for argument in slot.chrome_arguments():
+                options.add_argument(argument)
+            service = ChromeService(chromedriver_path())
+            try:
+                driver = webdriver.Chrome(service=service, options=options)
+            except Exception:
+                self.profiles.release(slot)
+                raise
+            mark_performance_logging(driver, network=performance_log)
+            self._release_profile_on_quit(driver, slot)
+
+        elif self.browser == 'firefox':
+            options = webdriver.FirefoxOptions()
+            if self.headless:
+                options.add_argument('--headless')
+            options.add_argument('--width=1920')
+            options.add_argument('--height=1080')
+            # Ignore HTTPS errors
+            options.set_preference('accept_insecure_certs', True)
+
+            service = FirefoxService(GeckoDriverManager().install())
+            driver = webdriver.Firefox(service=service, options=options)
+        else:
+            raise ValueError(f"Unsupported browser: {self.browser}")
+
+        browser_reaper().track(driver, name, session=session)
+
+        # Configure timeouts
+        implicit_wait = int(os.getenv('IMPLICIT_WAIT', '10'))
+        page_load_timeout = int(os.getenv('PAGE_LOAD_TIMEOUT', '30'))
+
+        driver.implicitly_wait(implicit_wait)
+        driver.set_page_load_timeout(page_load_timeout)
+
+        # Maximize window
+        driver.maximize_window()
+
+        # Count WebDriver commands per step
+        return instrument_driver(driver)
+
+    def _release_profile_on_quit(self, driver, slot: ProfileSlot):
+        """The slot is reused (wiped) by the next launch once this browser quits."""
+        original_quit = driver.quit
+
+        def quit():
+            try:
+                original_quit()
+            finally:
+                self.profiles.release(slot)
+
+        driver.quit = quit
+
+    def _shared(self, driver) -> Optional[SharedChrome]:
+        if self.browser != 'chrome' or not supports_cdp(driver):
+            return None
+        shared = getattr(driver, '_shared_chrome', None)
+        return shared or SharedChrome(driver)
+
+    def _daemon_client(self) -> Optional[DaemonClient]:
+        if self._daemon is None:
+            mode = daemon_mode()
+            client = DaemonClient() if mode != 'false' and self.browser == 'chrome' else None
+            if client is not None and not client.available():
+                if mode == 'true':
+                    log.warning("⚠ BROWSER_DAEMON=true but no daemon is running; launching browsers")
+                client = None
+            self._daemon = client or False
+        return self._daemon or None
+
+    def acquire(self) -> webdriver.Remote:
+        """
+        The test's main browser: a leased daemon browser when one runs, else a
+        fresh process or a context in the pooled Chrome.
+        """
+        client = self._daemon_client()
+        if client is not None:
+            try:
+                driver = client.lease()
+                log.info(f"\n🌐 Attached to daemon browser {driver._daemon_slot}")
+                return instrument_driver(driver)
+            except Exception as e:
+                log.warning(f"⚠ No daemon browser leased ({type(e).__name__}); launching one")
+        if not self.pooled or self.browser != 'chrome':
+            return self.launch()
+        if self._pool is None:
+            self._pool = self.launch('pool', session=True)
+        return self._shared(self._pool).create_context('main')
+
+    def release(self, driver, recycle: bool = False, healthy: bool = True):
+        """
+        End the test's main browser; `recycle` also replaces the pooled Chrome.
+        An unhealthy daemon browser is relaunched by the daemon instead of reset.
+        """
+        if hasattr(driver, '_daemon_slot'):
+            driver.healthy = healthy
+        driver.quit()
+        if recycle and self._pool is not None:
+            log.info("♻ Recycling pooled browser")
+            self.close()
+
+    def new_session(self, driver, name: str, isolation: Optional[str] = None) -> webdriver.Remote:
+        """
+        Another independent session (own cookies/storage) next to `driver`:
+        a browser context in the same Chrome, or a new browser process.
+        `isolation` overrides BROWSER_ISOLATION for this session.
+        """
+        if (isolation or self.isolation) == 'context':
+            shared = self._shared(driver)
+            if shared is not None:
+                return shared.create_context(name)
+        return self.launch(name)
+
+    def close(self):
+        if self._pool is not None:
+            try:
+                self._pool.quit()
+            except Exception:
+                pass
+            self._pool = None
+
+    def shutdown(self):
+        """Session end: close the pool and remove the profile root."""
+        self.close()
+        if self._profiles is not None:
+            self._profiles.close()
+            self._profiles = None
@@ -0,0 +1,256 @@
+"""
+Static call graph from scenarios to page-object methods.
+
+Built with `ast` from pages/*.py and tests/test_bagisto_s*.py:
+  - page methods call `self.other()` and `self.<attr>.method()`, where the
+    attribute's class comes from `self.<attr> = Class(...)` in __init__;
+  - scenarios call methods on locals assigned from a page-object class
+    (`store = StorePage(driver, base_url)`), including `store.checkout.run()`;
+  - methods that read a module-level name (a selector list, a JS snippet)
+    depend on it.
+
+Every function and module-level assignment has a fingerprint (its AST
+dump), so comparing two versions of a file tells which symbols changed
+and, through the graph, which scenarios reach them.
+"""
+import os
+import ast
+import glob
+import hashlib
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+
+PAGES_GLOB = os.path.join('pages', '*.py')
+TESTS_GLOB = os.path.join('tests', 'test_bagisto_s*.py')
+
+# Changes to a module-level name that is not a function or class
+GLOBAL_PREFIX = 'global:'
+
+
+def module_name(path: str, root: str = '.') -> str:
+    return os.path.splitext(os.path.relpath(path, root))[0].replace(os.sep, '.')
+
+
+def _fingerprint(node: ast.AST) -> str:
+    return hashlib.sha1(ast.dump(node, include_attributes=False).encode()).hexdigest()
+
+
+def symbols(source: str, module: str) -> Dict[str, str]:
+    """{qualified name: fingerprint} of functions, methods and module-level names."""
+    tree = ast.parse(source)
+    result = {}
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            class_body = []
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    result[f'{node.name}.{item.name}'] = _fingerprint(item)
+                else:
+                    class_body.append(_fingerprint(item))
+            # Decorators, bases and class attributes
+            class_body.extend(_fingerprint(d) for d in node.decorator_list + node.bases)
+            result[f'{node.name}.<class>'] = ''.join(class_body)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            result[node.name] = _fingerprint(node)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if isinstance(target, ast.Name):
+                    result[f'{GLOBAL_PREFIX}{module}.{target.id}'] = _fingerprint(node)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            result[f'{GLOBAL_PREFIX}{module}.<imports>'] = result.get(
+                f'{GLOBAL_PREFIX}{module}.<imports>', '') + _fingerprint(node)
+    return result
+
+
+def changed_symbols(old_source: Optional[str], new_source: str, module: str) -> Set[str]:
+    """Names added, removed or edited between two versions of a file."""
+    try:
+        new = symbols(new_source, module)
+    except SyntaxError:
+        return set()
+    old = {}
+    if old_source is not None:
+        try:
+            old = symbols(old_source, module)
+        except SyntaxError:
+            pass
+    return {name for name in set(old) | set(new) if old.get(name) != new.get(name)}
+
+
+@dataclass
+class Function:
+    name: str
+    module: str
+    calls: Set[str] = field(default_factory=set)
+    # Module-level names read inside the function
+    reads: Set[str] = field(default_factory=set)
+
+
+class _CallCollector(ast.NodeVisitor):
+    """Calls on `self`/page-object locals inside one function."""
+
+    def __init__(self, owner: Optional[str], local_types: Dict[str, str],
+                 attr_types: Dict[str, Dict[str, str]], module_names: Set[str]):
+        self.owner = owner
+        self.local_types = dict(local_types)
+        self.attr_types = attr_types
+        self.module_names = module_names
+        self.calls: Set[str] = set()
+        self.reads: Set[str] = set()
+
+    def _class_of(self, node: ast.AST) -> Optional[str]:
+        if isinstance(node, ast.Name):
+            if node.id == 'self':
+                return self.owner
+            return self.local_types.get(node.id)
+        if isinstance(node, ast.Attribute):
+            parent = self._class_of(node.value)
+            if parent is not None:
+                return self.attr_types.get(parent, {}).get(node.attr)
+        return None
+
+    def visit_Assign(self, node: ast.Assign):
+        value = node.value
+        if isinstance(value, ast.Call) and isinstance(value.func, ast.Name) and value.func.id in self.attr_types:
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    self.local_types[target.id] = value.func.id
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call):
+        func = node.func
+        if isinstance(func, ast.Attribute):
+            cls = self._class_of(func.value)
+            if cls is not None:
+                self.calls.add(f'{cls}.{func.attr}')
+        self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name):
+        if isinstance(node.ctx, ast.Load) and node.id in self.module_names:
+            self.reads.add(node.id)
+
+
+class CallGraph:
+    """Page-object methods and scenarios with their (transitive) calls."""
+
+    def __init__(self, root: str = '.'):
+        self.root = root
+        self.functions: Dict[str, Function] = {}
+        self.tests: Dict[str, Function] = {}
+        # class -> attribute -> class, from `self.attr = Class(...)`
+        self.attr_types: Dict[str, Dict[str, str]] = {}
+        self.classes: Dict[str, str] = {}
+
+    @classmethod
+    def build(cls, root: str = '.') -> 'CallGraph':
+        graph = cls(root)
+        pages = sorted(glob.glob(os.path.join(root, PAGES_GLOB)))
+        trees = {path: ast.parse(open(path).read()) for path in pages}
+        for path, tree in trees.items():
+            graph._collect_classes(tree, module_name(path, root))
+        for path, tree in trees.items():
+            graph._collect_functions(tree, module_name(path, root))
+        for path in sorted(glob.glob(os.path.join(root, TESTS_GLOB))):
+            graph._collect_tests(ast.parse(open(path).read()), os.path.relpath(path, root))
+        return graph
+
+    @staticmethod
+    def _module_names(tree: ast.Module) -> Set[str]:
+        names = set()
+        for node in tree.body:
+            if isinstance(node, ast.Assign):
+                names.update(t.id for t in node.targets if isinstance(t, ast.Name))
+            elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+                names.add(node.target.id)
+        return names
+
+    def _collect_classes(self, tree: ast.Module, module: str):
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            self.classes[node.name] = module
+            self.attr_types.setdefault(node.name, {})
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            for item in ast.walk(node):
+                if (isinstance(item, ast.Assign) and isinstance(item.value, ast.Call)
+                        and isinstance(item.value.func, ast.Name)):
+                    for target in item.targets:
+                        if (isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name)
+                                and target.value.id == 'self'):
+                            self.attr_types[node.name][target.attr] = item.value.func.id
+
+    def _collect_functions(self, tree: ast.Module, module: str):
+        module_names = self._module_names(tree)
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    collector = _CallCollector(node.name, {}, self.attr_types, module_names)
+                    collector.visit(item)
+                    self.functions[f'{node.name}.{item.name}'] = Function(
+                        f'{node.name}.{item.name}', module, collector.calls,
+                        {f'{GLOBAL_PREFIX}{module}.{name}' for name in collector.reads})
+
+    def _collect_tests(self, tree: ast.Module, path: str):
+        module = module_name(path)
+        module_names = self._module_names(tree)
+        for node in tree.body:
+            owners = [(node.name, node.body)] if isinstance(node, ast.ClassDef) else [(None, [node])]
+            for class_name, body in owners:
+                for item in body:
+                    if not (isinstance(item, ast.FunctionDef) and item.name.startswith('test')):
+                        continue
+                    collector = _CallCollector(None, {}, self.attr_types, module_names)
+                    collector.visit(item)
+                    nodeid = '::'.join(p for p in (path, class_name, item.name) if p)
+                    self.tests[nodeid] = Function(nodeid, module, collector.calls,
+                                                  {f'{GLOBAL_PREFIX}{module}.{n}' for n in collector.reads})
+
+    def reachable(self, start: Iterable[str]) -> Set[str]:
+        """Methods reachable from `start`, including module-level names they read."""
+        seen: Set[str] = set()
+        pending = list(start)
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            function = self.functions.get(name)
+            if function is not None:
+                pending.extend(function.calls)
+                seen.update(function.reads)
+                seen.add(f'{GLOBAL_PREFIX}{function.module}.<imports>')
+                seen.add(f"{name.split('.')[0]}.<class>")
+        return seen
+
+    def test_closure(self, nodeid: str) -> Set[str]:
+        test = self.tests[nodeid]
+        return self.reachable(test.calls) | test.reads | {nodeid}
+
+    def affected_tests(self, changed: Set[str]) -> List[str]:
+        """Scenarios whose call closure contains a changed symbol."""
+        return sorted(nodeid for nodeid in self.tests if self.test_closure(nodeid) & changed)
+
+    def tests_in(self, path: str) -> List[str]:
+        path = os.path.relpath(path, self.root)
+        return sorted(n for n in self.tests if n.split('::')[0] == path)
+
+    def test_for_symbol(self, path: str, symbol: str) -> List[str]:
+        """Node IDs of a changed test function (`Class.test_x`) in a scenario file."""
+        suffix = '::' + symbol.replace('.', '::')
+        return [n for n in self.tests_in(path) if n.endswith(suffix)]
+
+    def changed_tests(self, path: str, changed: Set[str]) -> Set[str]:
+        """Scenarios of an edited scenario file: the changed tests, or all on a module-level edit."""
+        selected = set()
+        for symbol in changed:
+            if '.' in symbol and not symbol.startswith(GLOBAL_PREFIX):
+                selected.update(self.test_for_symbol(path, symbol))
+            else:
+                # Module-level edit: imports, constants, helpers
+                return set(self.tests_in(path))
+        return selected
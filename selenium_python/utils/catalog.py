@@ -0,0 +1,218 @@
+"""
+CatalogIndex - on-disk index of storefront products that can be bought.
+
+StorePage.add_first_product_from_home used to probe categories in a real
+browser until one yielded a product with a working Add To Cart button. The
+index remembers what those probes (or a crawler) found, per base URL:
+
+    products[url] = {name, category, simple, in_stock, add_to_cart,
+                     checked_at, failures}
+
+Entries older than CATALOG_TTL seconds (default 6h) are not trusted, and a
+product that fails in the browser is demoted until it is re-checked.
+
+Per-category probe outcomes are kept as well,
+
+    categories[path] = {attempts, successes, latency}
+
+so the probe order can be reproducible (seeded) or cheapest-first (fastest).
+
+Parallel workers and the background crawler share the file: save() merges
+only what this instance recorded into the current file, under a lock.
+"""
+import os
+import json
+import fcntl
+import random
+import time
+import tempfile
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+DEFAULT_INDEX_PATH = os.path.join('test-results', 'catalog-index.json')
+
+SELECTION_POLICIES = ('fastest', 'seeded', 'random')
+
+# Weight of the newest probe in the per-category latency average
+LATENCY_SMOOTHING = 0.3
+
+# Categories probed by the storefront scenarios (matching Playwright)
+CATEGORIES = [
+    '/casual-wear-female',
+    '/electronics',
+    '/home-kitchen',
+    '/books-stationery',
+]
+
+
+def _account_probe(categories: Dict[str, Dict], category: str, success: bool, latency: float):
+    stats = categories.setdefault(category, {'attempts': 0, 'successes': 0, 'latency': None})
+    stats['attempts'] += 1
+    if success:
+        stats['successes'] += 1
+    previous = stats['latency']
+    stats['latency'] = round(latency if previous is None
+                             else previous + LATENCY_SMOOTHING * (latency - previous), 3)
+
+
+class CatalogIndex:
+    """Product index for one storefront base URL."""
+
+    def __init__(self, base_url: str, path: Optional[str] = None, ttl: Optional[float] = None):
+        self.base_url = base_url.rstrip('/')
+        self.path = path or os.getenv('CATALOG_INDEX', DEFAULT_INDEX_PATH)
+        self.ttl = ttl if ttl is not None else float(os.getenv('CATALOG_TTL', str(6 * 3600)))
+        self.products: Dict[str, Dict] = {}
+        self.categories: Dict[str, Dict] = {}
+        self.built_at: Optional[float] = None
+        # Recorded since load/save: products to write, category probes to replay
+        self._changed: Set[str] = set()
+        self._probes: List[Tuple[str, bool, float]] = []
+
+    @classmethod
+    def load(cls, base_url: str, path: Optional[str] = None, ttl: Optional[float] = None) -> 'CatalogIndex':
+        """Read the index from disk; a missing or foreign file gives an empty index."""
+        index = cls(base_url, path, ttl)
+        try:
+            with open(index.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return index
+        site = data.get(index.base_url) or {}
+        index.products = site.get('products', {})
+        index.categories = site.get('categories', {})
+        index.built_at = site.get('built_at')
+        return index
+
+    def save(self):
+        """
+        Merge what was recorded since load into the file and write it
+        atomically. Products and categories others saved meanwhile, and
+        other base URLs, are preserved; this instance is refreshed from it.
+        """
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        with open(self.path + '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.path, encoding='utf-8') as f:
+                        data = json.load(f)
+                except (OSError, ValueError):
+                    data = {}
+                site = data.get(self.base_url) or {}
+                products = site.get('products', {})
+                categories = site.get('categories', {})
+                for url in self._changed:
+                    products[url] = self.products[url]
+                for category, success, latency in self._probes:
+                    _account_probe(categories, category, success, latency)
+                built = [t for t in (site.get('built_at'), self.built_at) if t is not None]
+                data[self.base_url] = {
+                    'built_at': max(built) if built else None,
+                    'products': products,
+                    'categories': categories,
+                }
+                fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.catalog-', suffix='.json')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=1)
+                os.replace(tmp_path, self.path)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+        self.products, self.categories = products, categories
+        self.built_at = data[self.base_url]['built_at']
+        self._changed.clear()
+        self._probes.clear()
+
+    def is_fresh(self, checked_at: Optional[float]) -> bool:
+        return checked_at is not None and time.time() - checked_at < self.ttl
+
+    def record_product(self, url: str, name: str = '', category: str = '', *,
+                       add_to_cart: bool, simple: bool = True, in_stock: bool = True):
+        """Store what a probe (browser or crawler) found out about a product."""
+        entry = self.products.get(url, {'failures': 0})
+        entry.update({
+            'name': name or entry.get('name', ''),
+            'category': category or entry.get('category', ''),
+            'simple': simple,
+            'in_stock': in_stock,
+            'add_to_cart': add_to_cart,
+            'checked_at': time.time(),
+        })
+        if add_to_cart:
+            entry['failures'] = 0
+        self.products[url] = entry
+        self._changed.add(url)
+
+    def mark_failed(self, url: str):
+        """A known-good product did not make it into the cart: demote it."""
+        entry = self.products.get(url)
+        if entry is None:
+            return
+        entry['failures'] = entry.get('failures', 0) + 1
+        entry['add_to_cart'] = False
+        entry['checked_at'] = time.time()
+        self._changed.add(url)
+
+    def known_good(self, limit: int = 3, categories: Iterable[str] = CATEGORIES) -> List[Dict]:
+        """
+        Fresh, simple, in-stock products with Add To Cart, most reliable first.
+        Only physical-goods categories by default: downloadable products (the
+        crawled /e-books) have no shipping step or stock to change.
+        """
+        categories = set(categories)
+        candidates = [
+            dict(entry, url=url) for url, entry in self.products.items()
+            if entry.get('add_to_cart') and entry.get('simple') and entry.get('in_stock')
+            and entry.get('category') in categories and self.is_fresh(entry.get('checked_at'))
+        ]
+        candidates.sort(key=lambda e: (e.get('failures', 0), -e['checked_at']))
+        return candidates[:limit]
+
+    def record_category(self, category: str, success: bool, latency: float):
+        """Account one browser probe of `category` (seconds until success/give-up)."""
+        _account_probe(self.categories, category, success, latency)
+        self._probes.append((category, success, latency))
+
+    def expected_cost(self, category: str) -> Optional[float]:
+        """Seconds per successful add, or None for a category never probed."""
+        stats = self.categories.get(category)
+        if not stats or not stats.get('attempts'):
+            return None
+        success_rate = stats['successes'] / stats['attempts']
+        if success_rate == 0:
+            return float('inf')
+        return stats['latency'] / success_rate
+
+    def order_categories(self, categories: List[str], policy: Optional[str] = None,
+                         seed: Optional[str] = None) -> List[str]:
+        """
+        Probe order for `categories`:
+          fastest - lowest expected cost first, unprobed ones before failing ones
+          seeded  - reproducible shuffle from PRODUCT_SEED
+          random  - fresh shuffle every call
+        """
+        policy = (policy or os.getenv('PRODUCT_SELECTION', 'fastest')).lower()
+        if policy not in SELECTION_POLICIES:
+            log.warning(f"⚠ Unknown PRODUCT_SELECTION '{policy}', using 'fastest'")
+            policy = 'fastest'
+        ordered = sorted(categories)
+        if policy == 'random':
+            random.shuffle(ordered)
+            return ordered
+        random.Random(seed if seed is not None else os.getenv('PRODUCT_SEED', '0')).shuffle(ordered)
+        if policy == 'seeded':
+            return ordered
+
+        def rank(category):
+            cost = self.expected_cost(category)
+            if cost is None:
+                return (1, 0.0)
+            if cost == float('inf'):
+                return (2, 0.0)
+            return (0, cost)
+        # Stable sort: ties keep the seeded order
+        return sorted(ordered, key=rank)
@@ -0,0 +1,127 @@
+"""
+CatalogLocks - per-product locks between parallel test processes.
+
+S4, S5 and S6 change a shared product through the admin panel (stock,
+price) while other scenarios may be buying it. Every product, keyed by its
+storefront URL, has a lock file under test-results/locks, and flock() gives
+buyers shared locks and a test marked `mutates_catalog` exclusive ones:
+
+  - StorePage only adds a product it could lock, so buyers skip a product
+    that is being changed and mutators skip products in another cart;
+  - when every candidate is taken, the first one is waited for (up to
+    CATALOG_LOCK_TIMEOUT seconds);
+  - locks are held until the test ends; the kernel drops them when a
+    worker dies, so there are no stale locks to clean up.
+
+Everything else runs in parallel. CATALOG_LOCKS=false turns locking off.
+"""
+import os
+import time
+import fcntl
+import hashlib
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+DEFAULT_LOCK_DIR = os.path.join('test-results', 'locks')
+
+_active: Optional['CatalogLocks'] = None
+
+
+def catalog_locks_enabled() -> bool:
+    return os.getenv('CATALOG_LOCKS', 'true').lower() == 'true'
+
+
+def product_key(url: str) -> str:
+    """The same product reached from a category, the cart or the index gives one key."""
+    parts = urlsplit(url)
+    return f"{parts.netloc.lower()}{parts.path.rstrip('/')}"
+
+
+class CatalogLocks:
+    """Product locks held by one test: shared for buyers, exclusive for mutators."""
+
+    def __init__(self, owner: str, exclusive: bool = False, directory: Optional[str] = None,
+                 timeout: Optional[float] = None):
+        self.owner = owner
+        self.exclusive = exclusive
+        self.directory = directory or os.getenv('CATALOG_LOCK_DIR', DEFAULT_LOCK_DIR)
+        self.timeout = timeout if timeout is not None else float(os.getenv('CATALOG_LOCK_TIMEOUT', '300'))
+        # key -> open lock file descriptor; nested lock()/unlock() pairs are counted
+        self.held: Dict[str, int] = {}
+        self._counts: Dict[str, int] = {}
+        # Called with the URL of every newly locked product (see catalog_snapshot);
+        # one that raises undoes the lock
+        self.lock_listeners: List[Callable[[str], None]] = []
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest()[:16] + '.lock')
+
+    def try_lock(self, url: str) -> bool:
+        """Lock the product without waiting; False if another test holds a conflicting lock."""
+        key = product_key(url)
+        if key in self.held:
+            self._counts[key] += 1
+            return True
+        fd = os.open(self._path(key), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, (fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        if self.exclusive:
+            # Who holds it, for anyone debugging a long wait
+            os.ftruncate(fd, 0)
+            os.pwrite(fd, f"{self.owner} pid={os.getpid()}\n".encode(), 0)
+        self.held[key] = fd
+        self._counts[key] = 1
+        try:
+            for listener in self.lock_listeners:
+                listener(url)
+        except BaseException:
+            self.unlock(url)
+            raise
+        return True
+
+    def lock(self, url: str) -> bool:
+        """Lock the product, waiting for conflicting holders up to the timeout."""
+        deadline = time.monotonic() + self.timeout
+        started = time.perf_counter()
+        while not self.try_lock(url):
+            if time.monotonic() >= deadline:
+                log.warning(f"  ⚠ Product still locked after {self.timeout:.0f}s: {url}")
+                return False
+            time.sleep(0.5)
+        waited = time.perf_counter() - started
+        if waited >= 0.5:
+            log.info(f"  ✓ Product lock after {waited:.1f}s wait: {product_key(url)}")
+        return True
+
+    def unlock(self, url: str):
+        key = product_key(url)
+        if key not in self.held:
+            return
+        self._counts[key] -= 1
+        if self._counts[key] == 0:
+            del self._counts[key]
+            os.close(self.held.pop(key))
+
+    def release(self):
+        for fd in self.held.values():
+            os.close(fd)
+        self.held.clear()
+        self._counts.clear()
+
+
+def current_locks() -> Optional[CatalogLocks]:
+    """Locks of the running test, if any."""
+    return _active
+
+
+def activate_locks(locks: Optional[CatalogLocks]):
+    global _active
+    _active = locks
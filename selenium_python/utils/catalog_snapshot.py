@@ -0,0 +1,355 @@
+"""
+CatalogSnapshot - put products changed through the admin back as they were.
+
+S4, S5 and S6 change stock and price through the admin panel. The products
+a scenario mutates are the ones it locks exclusively (utils.catalog_locks):
+when it takes such a lock, the product's price and per-source stock are
+read from its admin edit form and written to a journal file. At test end,
+passed or failed, every snapshotted product the test still holds is put
+back in one batch:
+
+  - stock over a single admin HTTP session, through the product's
+    inventories endpoint (concurrently, one PUT per product);
+  - price in the admin UI, by the `price_restorer` the caller passes in.
+
+Re-posting the scraped edit form is not an option: Vue renders images,
+categories, channels and the boolean switches client-side, so a form
+rebuilt from the HTML would clear them.
+
+No product is changed without a snapshot: if one cannot be taken (admin
+login or edit form fails), the lock is undone and SnapshotError fails the
+test before it touches the product. With CATALOG_LOCKS or CATALOG_SNAPSHOT
+off, tests marked `mutates_catalog` are skipped (see conftest).
+
+Snapshots whose restore never ran (worker killed, admin unreachable) stay
+in the journal. The session sweeper restores them at session start and end,
+as soon as no running test holds their product lock.
+
+CATALOG_SNAPSHOT=true | false
+CATALOG_SNAPSHOT_JOURNAL=test-results/catalog-snapshots.json
+"""
+import os
+import re
+import json
+import time
+import fcntl
+import tempfile
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.catalog_locks import CatalogLocks, product_key
+from utils.http_session import StorefrontSession
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+DEFAULT_JOURNAL_PATH = os.path.join('test-results', 'catalog-snapshots.json')
+
+# Hidden add-to-cart field on the storefront product page
+PRODUCT_ID = re.compile(r'name="product_id"\s+value="(\d+)"')
+
+PRICE_FIELD = 'price'
+STOCK_PREFIX = 'inventories['
+
+Fields = List[Tuple[str, str]]
+
+# Sets the price of {key: entry} back through a browser; verified afterwards
+PriceRestorer = Callable[[Dict[str, Dict]], None]
+
+
+def catalog_snapshot_enabled() -> bool:
+    return os.getenv('CATALOG_SNAPSHOT', 'true').lower() == 'true'
+
+
+class SnapshotError(RuntimeError):
+    """A product could not be snapshotted, so the test must not change it."""
+
+
+class _EditForm(HTMLParser):
+    """Name/value pairs the product edit form would submit."""
+
+    def __init__(self):
+        super().__init__()
+        self.fields: Fields = []
+        self._in_form = False
+        self._select: Optional[str] = None
+        self._textarea: Optional[str] = None
+        self._text: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'form' and '/catalog/products/edit/' in (attrs.get('action') or ''):
+            self._in_form = True
+        if not self._in_form:
+            return
+        name = attrs.get('name')
+        if tag == 'select':
+            self._select = name
+        elif tag == 'option' and self._select and 'selected' in attrs:
+            self.fields.append((self._select, attrs.get('value') or ''))
+        elif tag == 'textarea' and name:
+            self._textarea, self._text = name, []
+        elif name and tag != 'form':
+            if attrs.get('type') in ('checkbox', 'radio') and 'checked' not in attrs:
+                return
+            value = attrs.get('value')
+            if value is None:
+                # Vue-bound fields render `:value="'12.00'"`
+                value = (attrs.get(':value') or '').strip("'\"")
+            self.fields.append((name, value))
+
+    def handle_endtag(self, tag):
+        if tag == 'form':
+            self._in_form = False
+        elif tag == 'select':
+            self._select = None
+        elif tag == 'textarea' and self._textarea:
+            self.fields.append((self._textarea, ''.join(self._text)))
+            self._textarea = None
+
+    def handle_data(self, data):
+        if self._textarea:
+            self._text.append(data)
+
+
+def mutable_values(fields: Fields) -> Dict[str, str]:
+    """Price and stock per inventory source: what the mutating scenarios change."""
+    return {name: value for name, value in fields
+            if name == PRICE_FIELD or name.startswith(STOCK_PREFIX)}
+
+
+class AdminSession(StorefrontSession):
+    """Logged-in admin panel session; base URL is the admin root (…/admin)."""
+
+    @classmethod
+    def login(cls, admin_url: str, email: str, password: str, **kwargs) -> 'AdminSession':
+        http = cls(admin_url, **kwargs)
+        token = http.csrf_token('/login')
+        response = http.post('/login', data={'_token': token, 'email': email, 'password': password})
+        if response.url.rstrip('/').endswith('/login'):
+            raise RuntimeError(f"Admin login failed for {email}")
+        return http
+
+    @classmethod
+    def from_environment(cls, **kwargs) -> 'AdminSession':
+        return cls.login(os.getenv('BAGISTO_ADMIN_URL', 'https://commerce.bagisto.com/admin'),
+                         os.getenv('BAGISTO_ADMIN_EMAIL', 'admin@example.com'),
+                         os.getenv('BAGISTO_ADMIN_PASSWORD', 'admin123'), **kwargs)
+
+    def product_id(self, storefront_url: str) -> str:
+        response = self.get(storefront_url)
+        response.raise_for_status()
+        match = PRODUCT_ID.search(response.text)
+        if match is None:
+            raise RuntimeError(f"No product id on {storefront_url}")
+        return match.group(1)
+
+    def edit_form(self, product_id: str) -> Fields:
+        response = self.get(f'/catalog/products/edit/{product_id}')
+        response.raise_for_status()
+        parser = _EditForm()
+        parser.feed(response.text)
+        if not parser.fields:
+            raise RuntimeError(f"No edit form for product {product_id}")
+        return parser.fields
+
+    def snapshot(self, storefront_url: str) -> Dict:
+        product_id = self.product_id(storefront_url)
+        return {
+            'url': storefront_url,
+            'product_id': product_id,
+            'values': mutable_values(self.edit_form(product_id)),
+            'taken_at': time.time(),
+        }
+
+    def update_inventories(self, product_id: str, stock: Dict[str, str], token: str):
+        """Write stock per source; the endpoint touches no other product data."""
+        data = [('_token', token), ('_method', 'PUT')] + sorted(stock.items())
+        response = self.post(f'/catalog/products/edit/{product_id}/inventories', data=data,
+                             headers={'Accept': 'application/json', 'X-Requested-With': 'XMLHttpRequest'})
+        response.raise_for_status()
+
+    def restore(self, entry: Dict) -> bool:
+        """
+        Put the snapshotted stock back; True once the edit form shows every
+        snapshotted value. A changed price is left for the price restorer.
+        """
+        product_id, wanted = entry['product_id'], entry['values']
+        fields = self.edit_form(product_id)
+        current = mutable_values(fields)
+        if current == wanted:
+            return True
+        stock = {name: value for name, value in wanted.items() if name.startswith(STOCK_PREFIX)}
+        if any(current.get(name) != value for name, value in stock.items()):
+            self.update_inventories(product_id, stock, dict(fields).get('_token', ''))
+            current = mutable_values(self.edit_form(product_id))
+        return current == wanted
+
+    def restore_many(self, entries: Dict[str, Dict]) -> Dict[str, bool]:
+        """Restore all entries concurrently over this session; {key: restored}."""
+        def restore(item):
+            key, entry = item
+            try:
+                return key, self.restore(entry)
+            except Exception as e:
+                log.warning(f"  ⚠ Restore of product {entry['product_id']} failed: {type(e).__name__}: {e}")
+                return key, False
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            return dict(pool.map(restore, entries.items()))
+
+    def restore_all(self, entries: Dict[str, Dict],
+                    price_restorer: Optional[PriceRestorer] = None) -> Dict[str, bool]:
+        """restore_many(), then the price restorer for what is still off; {key: restored}."""
+        results = self.restore_many(entries)
+        pending = {key: entries[key] for key, ok in results.items() if not ok}
+        if pending and price_restorer is not None:
+            try:
+                price_restorer(pending)
+            except Exception as e:
+                log.warning(f"  ⚠ Price restore failed: {type(e).__name__}: {e}")
+            results.update(self.restore_many(pending))
+        return results
+
+
+class SnapshotJournal:
+    """Snapshots not restored yet, shared by all workers."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv('CATALOG_SNAPSHOT_JOURNAL', DEFAULT_JOURNAL_PATH)
+
+    @contextmanager
+    def _locked(self):
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        with open(self.path + '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                entries = self._read()
+                yield entries
+                fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.snapshots-', suffix='.json')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(entries, f, indent=1)
+                os.replace(tmp_path, self.path)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def entries(self) -> Dict[str, Dict]:
+        return self._read()
+
+    def add(self, key: str, entry: Dict) -> Dict:
+        """Journal a snapshot; an older unrestored one wins, it has the original values."""
+        with self._locked() as entries:
+            entries.setdefault(key, entry)
+            return entries[key]
+
+    def remove(self, keys):
+        with self._locked() as entries:
+            for key in keys:
+                entries.pop(key, None)
+
+
+class CatalogSnapshot:
+    """Snapshots of the products one test locked exclusively, restored at its end."""
+
+    def __init__(self, locks: CatalogLocks, journal: Optional[SnapshotJournal] = None,
+                 price_restorer: Optional[PriceRestorer] = None):
+        self.locks = locks
+        self.journal = journal or SnapshotJournal()
+        self.price_restorer = price_restorer
+        self.taken: Dict[str, Dict] = {}
+        self._admin: Optional[AdminSession] = None
+        locks.lock_listeners.append(self.take)
+
+    def connect(self):
+        """Log in to the admin panel; SnapshotError if snapshots cannot be taken."""
+        if self._admin is not None:
+            return
+        try:
+            self._admin = AdminSession.from_environment()
+        except Exception as e:
+            raise SnapshotError(f"No admin session for catalog snapshots: {type(e).__name__}: {e}") from e
+
+    def take(self, url: str):
+        """
+        Lock listener: remember price and stock before the test changes them.
+        Raises SnapshotError (undoing the lock) when the product cannot be journaled.
+        """
+        key = product_key(url)
+        if not self.locks.exclusive or key in self.taken:
+            return
+        self.connect()
+        try:
+            entry = self._admin.snapshot(url)
+            entry.update(owner=self.locks.owner, pid=os.getpid())
+            self.taken[key] = self.journal.add(key, entry)
+        except Exception as e:
+            raise SnapshotError(f"Catalog snapshot of {key} failed: {type(e).__name__}: {e}") from e
+        log.info(f"  ✓ Catalog snapshot of product {entry['product_id']}: {self.taken[key]['values']}")
+
+    def product_id(self, url: str) -> Optional[str]:
+        """Admin id of a snapshotted product: the one a test may edit."""
+        entry = self.taken.get(product_key(url))
+        return entry['product_id'] if entry else None
+
+    def restore(self) -> Dict[str, bool]:
+        """Restore every snapshotted product this test still holds the lock on."""
+        self.locks.lock_listeners.remove(self.take)
+        # Snapshots of products given up again (failed add) were never mutated
+        held = {key: entry for key, entry in self.taken.items() if key in self.locks.held}
+        dropped = set(self.taken) - set(held)
+        if dropped:
+            self.journal.remove(dropped)
+        results = self._admin.restore_all(held, self.price_restorer) if held and self._admin else {}
+        restored = [key for key, ok in results.items() if ok]
+        if restored:
+            self.journal.remove(restored)
+            log.info(f"✓ Restored {len(restored)} product(s) from catalog snapshot")
+        if len(restored) < len(held):
+            log.warning(f"⚠ {len(held) - len(restored)} product(s) left for the catalog sweeper")
+        if self._admin is not None:
+            self._admin.close()
+        return results
+
+
+def sweep(journal: Optional[SnapshotJournal] = None, price_restorer: Optional[PriceRestorer] = None) -> int:
+    """
+    Restore journaled snapshots no running test owns (its lock is free).
+    Returns the number of products restored.
+    """
+    journal = journal or SnapshotJournal()
+    pending = journal.entries()
+    if not pending:
+        return 0
+    locks = CatalogLocks('catalog-sweeper', exclusive=True)
+    try:
+        orphaned = {key: entry for key, entry in pending.items() if locks.try_lock(entry['url'])}
+        if not orphaned:
+            return 0
+        try:
+            admin = AdminSession.from_environment()
+        except Exception as e:
+            log.warning(f"⚠ Catalog sweeper cannot log in to admin: {type(e).__name__}: {e}")
+            return 0
+        try:
+            results = admin.restore_all(orphaned, price_restorer)
+        finally:
+            admin.close()
+        restored = [key for key, ok in results.items() if ok]
+        journal.remove(restored)
+        if restored:
+            log.info(f"✓ Catalog sweeper restored {len(restored)} product(s)")
+        if len(restored) < len(orphaned):
+            log.warning(f"⚠ Catalog sweeper could not restore {len(orphaned) - len(restored)} product(s)")
+        return len(restored)
+    finally:
+        locks.release()
@@ -0,0 +1,102 @@
+"""
+CDP event access for Chrome through chromedriver's performance log.
+
+Chromedriver records DevTools events (Network.*, Page.*) into the
+'performance' log when it is enabled in the capabilities. Reading that log
+drains it, so several consumers (tracer, HAR recorder, order watcher) share
+one PerformanceLogPump per driver that fans events out to subscribers.
+"""
+import json
+import threading
+import weakref
+from typing import Callable, Dict, List
+
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+_pumps = weakref.WeakKeyDictionary()
+_pumps_lock = threading.Lock()
+
+
+def enable_performance_logging(options, network: bool = True, page: bool = True):
+    """Turn on the chromedriver performance log in ChromeOptions."""
+    prefs = dict(options.capabilities.get('goog:loggingPrefs') or {})
+    prefs['performance'] = 'ALL'
+    options.set_capability('goog:loggingPrefs', prefs)
+    options.add_experimental_option('perfLoggingPrefs', {
+        'enableNetwork': network,
+        'enablePage': page,
+    })
+    return options
+
+
+def supports_cdp(driver) -> bool:
+    return hasattr(driver, 'execute_cdp_cmd')
+
+
+def mark_performance_logging(driver, network: bool = True):
+    """Remember that `driver` was launched with the performance log (and which events)."""
+    driver._performance_logging = True
+    driver._performance_network = network
+    return driver
+
+
+def has_performance_log(driver, network: bool = True) -> bool:
+    """Page events are in the log; with `network`, Network.* events are too."""
+    if not getattr(driver, '_performance_logging', False):
+        return False
+    return not network or getattr(driver, '_performance_network', True)
+
+
+class PerformanceLogPump:
+    """Drain the performance log of one driver and dispatch parsed events."""
+
+    def __init__(self, driver):
+        self._driver = weakref.ref(driver)
+        self._subscribers: List[Callable[[Dict], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[Dict], None]):
+        """`callback({'method', 'params', 'timestamp'})` for every event."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Dict], None]):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def pump(self) -> int:
+        """Read everything buffered so far; returns the number of events."""
+        driver = self._driver()
+        if driver is None or not self._subscribers:
+            return 0
+        # Serialise draining so events are dispatched in order
+        with self._lock:
+            try:
+                entries = driver.get_log('performance')
+            except Exception as e:
+                log.debug(f"Performance log unavailable: {type(e).__name__}")
+                return 0
+            for entry in entries:
+                try:
+                    message = json.loads(entry['message'])['message']
+                except (KeyError, ValueError):
+                    continue
+                event = {
+                    'method': message.get('method', ''),
+                    'params': message.get('params', {}),
+                    'timestamp': entry.get('timestamp'),
+                }
+                for callback in list(self._subscribers):
+                    callback(event)
+            return len(entries)
+
+
+def event_pump(driver) -> PerformanceLogPump:
+    """Return the shared pump of `driver`, creating it on first use."""
+    with _pumps_lock:
+        pump = _pumps.get(driver)
+        if pump is None:
+            pump = PerformanceLogPump(driver)
+            _pumps[driver] = pump
+        return pump
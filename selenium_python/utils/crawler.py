@@ -0,0 +1,266 @@
+"""
+Background catalog crawler that warms the CatalogIndex over plain HTTP.
+
+Category pages are fetched concurrently, product cards
+(`a[aria-label]` wrapping an `img[alt]`) are extracted with the stdlib
+HTMLParser, then every product page is fetched to check for a usable
+Add To Cart button. The result is written to the on-disk CatalogIndex, so
+StorePage.add_first_product_from_home can jump straight to a product
+instead of walking categories in a real browser.
+
+Run once per session from conftest (CATALOG_CRAWL=true) or by hand:
+
+    python -m utils.crawler [--base-url URL] [--workers N]
+"""
+import os
+import sys
+import time
+import fcntl
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.catalog import CatalogIndex, CATEGORIES
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+CRAWL_CATEGORIES = CATEGORIES + ['/e-books']
+
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) bagisto-catalog-crawler'
+
+_background: Optional[threading.Thread] = None
+
+
+class ProductCardParser(HTMLParser):
+    """Collect (href, aria-label) of links that wrap an image with alt text."""
+
+    def __init__(self, host: str):
+        super().__init__(convert_charrefs=True)
+        self.host = host
+        self.cards: List[Tuple[str, str]] = []
+        self._link: Optional[Tuple[str, str]] = None
+        self._link_has_image = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'a':
+            href = attrs.get('href') or ''
+            label = attrs.get('aria-label')
+            if label and self.host in href:
+                self._link = (href, label)
+                self._link_has_image = False
+        elif tag == 'img' and self._link is not None and attrs.get('alt'):
+            self._link_has_image = True
+
+    def handle_endtag(self, tag):
+        if tag == 'a' and self._link is not None:
+            if self._link_has_image and self._link not in self.cards:
+                self.cards.append(self._link)
+            self._link = None
+
+
+class ProductPageParser(HTMLParser):
+    """Find the Add To Cart button and configurable-option inputs of a product page."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.has_add_to_cart = False
+        self.add_to_cart_disabled = False
+        self.configurable = False
+        self.out_of_stock = False
+        self._button_disabled: Optional[bool] = None
+        self._button_text: List[str] = []
+        self._template: List[str] = []
+        self._in_template = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'script' and attrs.get('type') == 'text/x-template':
+            # Bagisto ships Vue component markup inside x-template scripts
+            self._in_template = True
+            self._template = []
+            return
+        if (attrs.get('name') or '').startswith('super_attribute'):
+            self.configurable = True
+        if tag == 'button':
+            self._button_disabled = 'disabled' in attrs
+            self._button_text = []
+
+    def handle_endtag(self, tag):
+        if tag == 'script' and self._in_template:
+            self._in_template = False
+            self._merge(''.join(self._template))
+        elif tag == 'button' and self._button_disabled is not None:
+            if 'Add To Cart' in ''.join(self._button_text):
+                self.has_add_to_cart = True
+                self.add_to_cart_disabled = self._button_disabled
+            self._button_disabled = None
+
+    def _merge(self, markup: str):
+        inner = ProductPageParser()
+        inner.feed(markup)
+        self.has_add_to_cart |= inner.has_add_to_cart
+        self.add_to_cart_disabled |= inner.add_to_cart_disabled
+        self.configurable |= inner.configurable
+        self.out_of_stock |= inner.out_of_stock
+
+    def handle_data(self, data):
+        if self._in_template:
+            self._template.append(data)
+            return
+        if self._button_disabled is not None:
+            self._button_text.append(data)
+        if 'out of stock' in data.lower():
+            self.out_of_stock = True
+
+
+class CatalogCrawler:
+    """Fetch category and product pages concurrently and fill a CatalogIndex."""
+
+    def __init__(self, base_url: str, workers: Optional[int] = None, timeout: float = 15,
+                 max_products_per_category: Optional[int] = None):
+        self.base_url = base_url.rstrip('/')
+        self.host = urlparse(self.base_url).netloc
+        self.workers = workers or int(os.getenv('CRAWL_WORKERS', '4'))
+        self.timeout = timeout
+        self.max_products_per_category = max_products_per_category or int(
+            os.getenv('CRAWL_MAX_PRODUCTS', '5')
+        )
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        # One pool per host, bounded to the worker count
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers, pool_block=True)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def fetch(self, url: str) -> Optional[str]:
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            log.warning(f"  ✗ Crawl failed for {url}: {type(e).__name__}")
+            return None
+        if response.status_code != 200:
+            log.warning(f"  ✗ Crawl got HTTP {response.status_code} for {url}")
+            return None
+        return response.text
+
+    def crawl_category(self, category: str) -> List[Tuple[str, str]]:
+        html = self.fetch(f"{self.base_url}{category}")
+        if html is None:
+            return []
+        parser = ProductCardParser(self.host)
+        parser.feed(html)
+        cards = [(urljoin(self.base_url, href), name) for href, name in parser.cards]
+        return cards[:self.max_products_per_category]
+
+    def inspect_product(self, url: str) -> Optional[ProductPageParser]:
+        html = self.fetch(url)
+        if html is None:
+            return None
+        parser = ProductPageParser()
+        parser.feed(html)
+        return parser
+
+    def crawl(self, index: Optional[CatalogIndex] = None) -> CatalogIndex:
+        """Crawl every category and its products; returns the saved index."""
+        started = time.perf_counter()
+        products: Dict[str, Tuple[str, str]] = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='catalog-crawl') as pool:
+            futures = {pool.submit(self.crawl_category, c): c for c in CRAWL_CATEGORIES}
+            for future in as_completed(futures):
+                category = futures[future]
+                cards = future.result()
+                log.info(f"  Crawled {category}: {len(cards)} product(s)")
+                for url, name in cards:
+                    products.setdefault(url, (name, category))
+
+            futures = {pool.submit(self.inspect_product, url): url for url in products}
+            results = {futures[f]: f.result() for f in as_completed(futures)}
+
+        # save() merges these into what browsers recorded meanwhile
+        index = index or CatalogIndex.load(self.base_url)
+        found = 0
+        for url, page in results.items():
+            if page is None:
+                continue
+            name, category = products[url]
+            index.record_product(
+                url, name, category,
+                add_to_cart=page.has_add_to_cart,
+                simple=not page.configurable,
+                in_stock=not (page.add_to_cart_disabled or page.out_of_stock),
+            )
+            found += 1
+        index.built_at = time.time()
+        index.save()
+
+        log.info(
+            f"✓ Catalog crawl: {found} product page(s), {len(index.known_good(limit=len(index.products)))} "
+            f"usable, {time.perf_counter() - started:.1f}s"
+        )
+        return index
+
+
+def start_background_crawl(base_url: str) -> Optional[threading.Thread]:
+    """
+    Warm the index in a daemon thread unless a fresh crawl is already on disk.
+    One process crawls at a time; the others wait for its lock and then find
+    the index fresh.
+    """
+    global _background
+    index = CatalogIndex.load(base_url)
+    if index.is_fresh(index.built_at):
+        return None
+
+    def run():
+        os.makedirs(os.path.dirname(index.path) or '.', exist_ok=True)
+        with open(index.path + '.crawl.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                current = CatalogIndex.load(base_url)
+                if current.is_fresh(current.built_at):
+                    log.info("  ✓ Catalog crawled by another worker")
+                    return
+                CatalogCrawler(base_url).crawl()
+            except Exception as e:
+                log.warning(f"⚠ Catalog crawl aborted: {type(e).__name__}: {e}")
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    _background = threading.Thread(target=run, name='catalog-crawler', daemon=True)
+    _background.start()
+    return _background
+
+
+def wait_for_background_crawl(timeout: Optional[float] = None):
+    """Block until a running background crawl has written the index (or timeout)."""
+    if _background is None or not _background.is_alive():
+        return
+    if timeout is None:
+        timeout = float(os.getenv('CRAWL_WAIT', '30'))
+    log.info("  → Waiting for catalog crawl to finish...")
+    _background.join(timeout)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Warm the catalog product index over HTTP.')
+    parser.add_argument('--base-url', default=os.getenv('BAGISTO_BASE_URL', 'https://commerce.bagisto.com'))
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    index = CatalogCrawler(args.base_url, workers=args.workers).crawl()
+    for product in index.known_good(limit=len(index.products), categories=CRAWL_CATEGORIES):
+        print(f"{product['category']:<22} {product['name']:<40} {product['url']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Form filling helpers.
+
+fill_form() sets a whole form in one execute_async_script round-trip: values
+go through the native value setter and input/change/blur events are
+dispatched, which is what Vue's v-model and vee-validate listen to. Selects
+are matched by option value; a select whose options are rendered after an
+earlier field changes (Bagisto's state list after country) is polled inside
+the browser instead of with time.sleep on the test side.
+
+type_form() keeps the old per-field send_keys behaviour for tests that need
+real keystrokes (HUMAN_TYPING=true).
+"""
+import os
+import time
+from typing import Dict, List, Optional
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import Select
+
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+# For selects, None picks the first option with a non-empty value
+FIRST_OPTION = None
+
+FILL_FORM_SCRIPT = """
+const pairs = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+
+const prototypes = {
+    INPUT: HTMLInputElement.prototype,
+    SELECT: HTMLSelectElement.prototype,
+    TEXTAREA: HTMLTextAreaElement.prototype
+};
+const setValue = (el, value) => {
+    const proto = prototypes[el.tagName] || HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+    for (const type of ['input', 'change', 'blur']) {
+        el.dispatchEvent(new Event(type, {bubbles: true}));
+    }
+};
+const pickOption = (el, value) => Array.from(el.options).find(
+    o => value === null ? o.value !== '' : o.value === value
+);
+const waitFor = async (probe) => {
+    const end = Date.now() + timeoutMs;
+    let found = probe();
+    while (!found && Date.now() < end) {
+        await new Promise(resolve => setTimeout(resolve, 50));
+        found = probe();
+    }
+    return found;
+};
+
+(async () => {
+    const filled = [], missing = [];
+    for (const [name, value] of pairs) {
+        const selector = '[name="' + CSS.escape(name) + '"]';
+        let el = document.querySelector(selector);
+        if ((el && el.tagName === 'SELECT') || value === null) {
+            // Options may be re-rendered after a previous field changed
+            const option = await waitFor(() => {
+                el = document.querySelector(selector);
+                return el && el.tagName === 'SELECT' ? pickOption(el, value) : null;
+            });
+            if (!option) { missing.push(name); continue; }
+            setValue(el, option.value);
+        } else if (el) {
+            setValue(el, value);
+        } else {
+            missing.push(name);
+            continue;
+        }
+        filled.push(name);
+    }
+    return {filled: filled, missing: missing};
+})().then(done, e => done({filled: [], missing: [], error: String(e)}));
+"""
+
+
+def human_typing_enabled() -> bool:
+    return os.getenv('HUMAN_TYPING', 'false').lower() == 'true'
+
+
+def fill_form(driver, values: Dict[str, Optional[str]], option_timeout: float = 3) -> Dict[str, List[str]]:
+    """
+    Set `values` (field name -> value, in order) in one round-trip.
+    Returns {'filled': [...], 'missing': [...]}; fields not on the page are skipped.
+    """
+    result = driver.execute_async_script(
+        FILL_FORM_SCRIPT, [[name, value] for name, value in values.items()], int(option_timeout * 1000)
+    ) or {}
+    if result.get('error'):
+        log.warning(f"  ⚠ Form fill script failed: {result['error']}")
+    if result.get('missing'):
+        log.debug(f"Form fields not found: {', '.join(result['missing'])}")
+    return result
+
+
+def type_form(driver, values: Dict[str, Optional[str]]) -> Dict[str, List[str]]:
+    """Fill `values` with real clicks and keystrokes, one field at a time."""
+    filled, missing = [], []
+    for name, value in values.items():
+        try:
+            element = driver.find_element(By.NAME, name)
+            if element.tag_name == 'select':
+                select = Select(element)
+                if value is FIRST_OPTION:
+                    option = next(o for o in select.options if o.get_attribute('value'))
+                    select.select_by_value(option.get_attribute('value'))
+                else:
+                    select.select_by_value(value)
+                # Dependent selects (state after country) re-render
+                time.sleep(1)
+            elif value is None:
+                missing.append(name)
+                continue
+            else:
+                element.clear()
+                element.send_keys(value)
+            filled.append(name)
+        except (NoSuchElementException, StopIteration):
+            missing.append(name)
+    return {'filled': filled, 'missing': missing}
@@ -0,0 +1,358 @@
+"""
+HarRecorder - one HAR file per browser per test, plus a waterfall summary
+of the slowest requests on each page (cart, checkout, success, orders...).
+
+Two sources, picked per driver:
+- Chrome launched with the performance log: CDP Network.* events
+  (full request/response data and timing phases)
+- any other driver (Firefox, ad-hoc Chrome): the browser's Resource Timing
+  buffer, collected before each navigation and at every step end. Pages
+  left by clicking a link between two collections are not covered.
+
+Enable with HAR=on.
+"""
+import os
+import json
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from utils.cdp_events import event_pump, has_performance_log
+from utils.timeline import add_command_listener, remove_command_listener
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+DEFAULT_HAR_DIR = os.path.join('test-results', 'har')
+# Commands after which the current page's resource buffer is lost
+NAVIGATION_COMMANDS = {'get', 'refresh', 'goBack', 'goForward', 'quit'}
+
+PAGE_LABELS = [
+    ('/checkout/onepage/success', 'success'),
+    ('/checkout/onepage', 'checkout'),
+    ('/checkout/cart', 'cart'),
+    ('/customer/account/orders/view', 'order-view'),
+    ('/customer/account/orders', 'orders'),
+    ('/customer/login', 'login'),
+]
+
+RESOURCE_TIMING_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const pick = e => ({
+    name: e.name, initiatorType: e.initiatorType || 'navigation',
+    startTime: e.startTime, duration: e.duration,
+    domainLookupStart: e.domainLookupStart, domainLookupEnd: e.domainLookupEnd,
+    connectStart: e.connectStart, connectEnd: e.connectEnd,
+    secureConnectionStart: e.secureConnectionStart,
+    requestStart: e.requestStart, responseStart: e.responseStart,
+    responseEnd: e.responseEnd, transferSize: e.transferSize,
+    encodedBodySize: e.encodedBodySize, responseStatus: e.responseStatus || 0
+});
+return {
+    timeOrigin: performance.timeOrigin,
+    url: location.href,
+    title: document.title,
+    navigation: nav ? pick(nav) : null,
+    resources: performance.getEntriesByType('resource').map(pick)
+};
+"""
+
+
+def har_enabled() -> bool:
+    return os.getenv('HAR', 'off').lower() in ('on', 'true')
+
+
+def page_label(url: str) -> str:
+    """Short name of a storefront page, used to group the waterfall summary."""
+    path = urlparse(url).path or '/'
+    for prefix, label in PAGE_LABELS:
+        if path.startswith(prefix):
+            return label
+    return 'home' if path == '/' else path.strip('/').split('/')[0]
+
+
+def _iso(epoch_seconds: float) -> str:
+    return datetime.fromtimestamp(epoch_seconds, timezone.utc).isoformat(timespec='milliseconds')
+
+
+def _headers(headers: Optional[Dict]) -> List[Dict]:
+    return [{'name': k, 'value': str(v)} for k, v in (headers or {}).items()]
+
+
+def _phase(start: float, end: float) -> float:
+    return round(end - start, 3) if start is not None and start >= 0 and end >= start else -1
+
+
+class HarRecorder:
+    """Collect network activity of one driver for the duration of a test."""
+
+    def __init__(self, driver, name: str = 'main'):
+        self.driver = driver
+        self.name = name
+        self.mode = 'cdp' if has_performance_log(driver) else 'resource-timing'
+        self.pages: List[Dict] = []
+        self.entries: List[Dict] = []
+        self._requests: Dict[str, Dict] = {}
+        self._page_starts: Dict[str, float] = {}
+        self._seen_pages: Dict[float, Dict] = {}
+        self._seen_resources = set()
+        self._finished = False
+        self._timeline = None
+
+    def start(self, timeline=None):
+        if self.mode == 'cdp':
+            event_pump(self.driver).subscribe(self._on_event)
+        add_command_listener(self.driver, self._before_command, before=True)
+        if timeline is not None:
+            self._timeline = timeline
+            timeline.step_listeners.append(self._on_step_end)
+        return self
+
+    def stop(self):
+        remove_command_listener(self.driver, self._before_command)
+        if self.mode == 'cdp':
+            event_pump(self.driver).unsubscribe(self._on_event)
+        if self._timeline is not None and self._on_step_end in self._timeline.step_listeners:
+            self._timeline.step_listeners.remove(self._on_step_end)
+        self._timeline = None
+
+    # -- collection -------------------------------------------------------
+
+    def _before_command(self, command, params):
+        if command in NAVIGATION_COMMANDS and not self._finished:
+            self.collect()
+            if command == 'quit':
+                self._finished = True
+
+    def _on_step_end(self, record):
+        if record.depth == 0 and not self._finished:
+            self.collect()
+
+    def collect(self):
+        """Pull whatever the browser has buffered since the last collection."""
+        try:
+            if self.mode == 'cdp':
+                event_pump(self.driver).pump()
+            else:
+                self._collect_resource_timing()
+        except Exception as e:
+            log.debug(f"HAR collection skipped for {self.name}: {type(e).__name__}")
+
+    def finish(self):
+        """Final collection; call before the browser quits."""
+        if not self._finished:
+            self.collect()
+            self._finished = True
+        self.stop()
+
+    # -- CDP mode ---------------------------------------------------------
+
+    def _current_page_id(self) -> Optional[str]:
+        return self.pages[-1]['id'] if self.pages else None
+
+    def _on_event(self, event: Dict):
+        method, params = event['method'], event['params']
+        if method == 'Network.requestWillBeSent':
+            request = params.get('request', {})
+            is_navigation = params.get('type') == 'Document' and params.get('requestId') == params.get('loaderId')
+            if is_navigation and not params.get('redirectResponse'):
+                page_id = f"page_{len(self.pages) + 1}"
+                self.pages.append({
+                    'id': page_id,
+                    'title': request.get('url', ''),
+                    'startedDateTime': _iso(params.get('wallTime', 0)),
+                    'pageTimings': {},
+                })
+                self._page_starts[page_id] = params.get('timestamp', 0)
+            self._requests[params['requestId']] = {
+                'pageref': self._current_page_id(),
+                'wallTime': params.get('wallTime', 0),
+                'timestamp': params.get('timestamp', 0),
+                'request': request,
+                'type': params.get('type', ''),
+            }
+        elif method == 'Network.responseReceived':
+            pending = self._requests.get(params.get('requestId'))
+            if pending is not None:
+                pending['response'] = params.get('response', {})
+        elif method in ('Network.loadingFinished', 'Network.loadingFailed'):
+            pending = self._requests.pop(params.get('requestId'), None)
+            if pending is not None:
+                pending['finished'] = params.get('timestamp', pending['timestamp'])
+                pending['encodedDataLength'] = params.get('encodedDataLength', -1)
+                pending['error'] = params.get('errorText')
+                self.entries.append(self._cdp_entry(pending))
+        elif method == 'Page.loadEventFired' and self.pages:
+            page = self.pages[-1]
+            started = self._page_starts.get(page['id'], 0)
+            page['pageTimings']['onLoad'] = round((params.get('timestamp', 0) - started) * 1000, 1)
+
+    def _cdp_entry(self, pending: Dict) -> Dict:
+        request = pending['request']
+        response = pending.get('response', {})
+        total = max((pending['finished'] - pending['timestamp']) * 1000, 0)
+        timing = response.get('timing')
+        if timing:
+            starts = [t for t in (timing.get('dnsStart'), timing.get('connectStart'), timing.get('sendStart'))
+                      if t is not None and t >= 0]
+            blocked = starts[0] if starts else 0
+            send_end = timing.get('sendEnd', 0)
+            headers_end = timing.get('receiveHeadersEnd', send_end)
+            offset = (timing.get('requestTime', pending['timestamp']) - pending['timestamp']) * 1000
+            timings = {
+                'blocked': round(blocked + offset, 3),
+                'dns': _phase(timing.get('dnsStart'), timing.get('dnsEnd', -1)),
+                'connect': _phase(timing.get('connectStart'), timing.get('connectEnd', -1)),
+                'ssl': _phase(timing.get('sslStart'), timing.get('sslEnd', -1)),
+                'send': _phase(timing.get('sendStart'), send_end),
+                'wait': round(max(headers_end - send_end, 0), 3),
+                'receive': round(max(total - headers_end - offset, 0), 3),
+            }
+        else:
+            timings = {'blocked': -1, 'dns': -1, 'connect': -1, 'send': 0, 'wait': round(total, 3), 'receive': 0}
+        return {
+            'pageref': pending['pageref'],
+            'startedDateTime': _iso(pending['wallTime']),
+            'time': round(total, 3),
+            'request': {
+                'method': request.get('method', 'GET'),
+                'url': request.get('url', ''),
+                'httpVersion': response.get('protocol', ''),
+                'headers': _headers(request.get('headers')),
+                'queryString': [],
+                'cookies': [],
+                'headersSize': -1,
+                'bodySize': len(request.get('postData', '') or ''),
+            },
+            'response': {
+                'status': response.get('status', 0),
+                'statusText': response.get('statusText', pending.get('error') or ''),
+                'httpVersion': response.get('protocol', ''),
+                'headers': _headers(response.get('headers')),
+                'cookies': [],
+                'content': {'size': pending['encodedDataLength'], 'mimeType': response.get('mimeType', '')},
+                'redirectURL': '',
+                'headersSize': -1,
+                'bodySize': pending['encodedDataLength'],
+            },
+            'cache': {},
+            'timings': timings,
+            '_resourceType': pending['type'],
+        }
+
+    # -- Resource Timing mode ---------------------------------------------
+
+    def _collect_resource_timing(self):
+        data = self.driver.execute_script(RESOURCE_TIMING_SCRIPT)
+        if not data or not data.get('timeOrigin'):
+            return
+        origin = data['timeOrigin']
+        page = self._seen_pages.get(origin)
+        if page is None:
+            page = {
+                'id': f"page_{len(self.pages) + 1}",
+                'title': data.get('url', ''),
+                'startedDateTime': _iso(origin / 1000),
+                'pageTimings': {},
+            }
+            nav = data.get('navigation')
+            if nav:
+                page['pageTimings']['onLoad'] = round(nav['duration'], 1)
+            self.pages.append(page)
+            self._seen_pages[origin] = page
+        resources = ([data['navigation']] if data.get('navigation') else []) + data.get('resources', [])
+        for resource in resources:
+            key = (origin, resource['name'], resource['startTime'])
+            if key in self._seen_resources:
+                continue
+            self._seen_resources.add(key)
+            self.entries.append(self._resource_entry(page['id'], origin, resource))
+
+    def _resource_entry(self, pageref: str, origin: float, r: Dict) -> Dict:
+        request_start = r.get('requestStart') or r['startTime']
+        response_start = r.get('responseStart') or request_start
+        return {
+            'pageref': pageref,
+            'startedDateTime': _iso((origin + r['startTime']) / 1000),
+            'time': round(r['duration'], 3),
+            'request': {
+                'method': 'GET', 'url': r['name'], 'httpVersion': '', 'headers': [],
+                'queryString': [], 'cookies': [], 'headersSize': -1, 'bodySize': 0,
+            },
+            'response': {
+                'status': r.get('responseStatus', 0), 'statusText': '', 'httpVersion': '',
+                'headers': [], 'cookies': [],
+                'content': {'size': r.get('encodedBodySize', 0), 'mimeType': ''},
+                'redirectURL': '', 'headersSize': -1, 'bodySize': r.get('transferSize', 0),
+            },
+            'cache': {},
+            'timings': {
+                'blocked': round(max((r.get('domainLookupStart') or r['startTime']) - r['startTime'], 0), 3),
+                'dns': _phase(r.get('domainLookupStart'), r.get('domainLookupEnd', -1)),
+                'connect': _phase(r.get('connectStart'), r.get('connectEnd', -1)),
+                'send': 0,
+                'wait': round(max(response_start - request_start, 0), 3),
+                'receive': round(max(r.get('responseEnd', 0) - response_start, 0), 3),
+            },
+            '_resourceType': r.get('initiatorType', ''),
+        }
+
+    # -- output -----------------------------------------------------------
+
+    def to_har(self) -> Dict:
+        return {
+            'log': {
+                'version': '1.2',
+                'creator': {'name': 'bagisto-selenium-har', 'version': '1.0'},
+                'browser': {'name': self.name, 'version': ''},
+                'pages': self.pages,
+                'entries': sorted(self.entries, key=lambda e: e['startedDateTime']),
+                'comment': f"source: {self.mode}",
+            }
+        }
+
+    def summary(self, top: int = 5) -> List[Dict]:
+        """Slowest requests per page navigation."""
+        by_page: Dict[str, List[Dict]] = {}
+        for entry in self.entries:
+            by_page.setdefault(entry['pageref'], []).append(entry)
+        pages = []
+        for page in self.pages:
+            page_entries = by_page.get(page['id'], [])
+            slowest = sorted(page_entries, key=lambda e: e['time'], reverse=True)[:top]
+            pages.append({
+                'page': page_label(page['title']),
+                'url': page['title'],
+                'requests': len(page_entries),
+                'onLoad': page['pageTimings'].get('onLoad'),
+                'slowest': [
+                    {'url': e['request']['url'], 'time': e['time'], 'status': e['response']['status'],
+                     'type': e.get('_resourceType', '')}
+                    for e in slowest
+                ],
+            })
+        return pages
+
+
+def write_har(directory: str, name: str, har: Dict, summary: List[Dict]):
+    """Write <name>.har and <name>.summary.json (runs on the writer thread)."""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, f"{name}.har"), 'w', encoding='utf-8') as f:
+        json.dump(har, f)
+    with open(os.path.join(directory, f"{name}.summary.json"), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+
+
+def log_summary(name: str, summary: List[Dict]):
+    log.info(f"\n  Network waterfall ({name}):")
+    for page in summary:
+        on_load = f"{page['onLoad']:.0f}ms" if page['onLoad'] else '-'
+        log.info(f"    [{page['page']}] {page['requests']} requests, onLoad {on_load}")
+        for request in page['slowest'][:3]:
+            log.info(f"      {request['time']:>8.0f}ms {request['status']} {request['url'][:100]}")
+
+
+def start_har_recorder(driver, name: str, timeline=None) -> Optional[HarRecorder]:
+    if not har_enabled():
+        return None
+    return HarRecorder(driver, name).start(timeline)
@@ -0,0 +1,131 @@
+"""
+StorefrontSession - plain HTTP access to the Bagisto storefront.
+
+Used for setup work that does not need a browser (provisioning a saved
+address) and for reading account pages without driving the UI. A session
+either logs in itself or borrows the cookies of a logged-in WebDriver.
+Laravel forms need the CSRF `_token` of the page that renders them.
+"""
+import re
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64) bagisto-test-http'
+
+CSRF_PATTERNS = [
+    re.compile(r'name="_token"\s+value="([^"]+)"'),
+    re.compile(r'<meta\s+name="csrf-token"\s+content="([^"]+)"'),
+]
+
+# Edit links of saved addresses on /customer/account/addresses
+ADDRESS_EDIT_LINK = re.compile(r'/customer/account/addresses/edit/(\d+)')
+
+# Saved default address used by checkout scenarios
+DEFAULT_ADDRESS = {
+    'company_name': '',
+    'first_name': 'Test',
+    'last_name': 'User',
+    'address[]': '123 Test Street',
+    'country': 'US',
+    'state': 'CA',
+    'city': 'Test City',
+    'postcode': '12345',
+    'phone': '1234567890',
+    'default_address': '1',
+}
+
+
+class StorefrontSession:
+    """requests.Session bound to one storefront base URL."""
+
+    def __init__(self, base_url: str, pool_size: int = 4, timeout: float = 20):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @classmethod
+    def from_driver(cls, driver, base_url: str, **kwargs) -> 'StorefrontSession':
+        """Reuse the login of a browser session by copying its cookies."""
+        http = cls(base_url, **kwargs)
+        http.sync_cookies(driver)
+        try:
+            http.session.headers['User-Agent'] = driver.execute_script('return navigator.userAgent;')
+        except Exception:
+            pass
+        return http
+
+    @classmethod
+    def login(cls, base_url: str, email: str, password: str, **kwargs) -> 'StorefrontSession':
+        """Log in with the customer login form; raises on failure."""
+        http = cls(base_url, **kwargs)
+        token = http.csrf_token('/customer/login')
+        response = http.post('/customer/login', data={
+            '_token': token,
+            'email': email,
+            'password': password,
+        })
+        if '/customer/login' in response.url:
+            raise RuntimeError(f"HTTP login failed for {email}")
+        return http
+
+    def sync_cookies(self, driver):
+        """Copy the current cookies of `driver` into this session."""
+        for cookie in driver.get_cookies():
+            self.session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain'), path=cookie.get('path', '/')
+            )
+
+    def url(self, path: str) -> str:
+        return path if path.startswith('http') else f"{self.base_url}{path}"
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(self.url(path), **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.post(self.url(path), **kwargs)
+
+    def csrf_token(self, path: str) -> str:
+        """CSRF token from the form (or meta tag) rendered at `path`."""
+        response = self.get(path)
+        response.raise_for_status()
+        for pattern in CSRF_PATTERNS:
+            match = pattern.search(response.text)
+            if match:
+                return match.group(1)
+        raise RuntimeError(f"No CSRF token on {path}")
+
+    def saved_address_ids(self) -> List[str]:
+        response = self.get('/customer/account/addresses')
+        response.raise_for_status()
+        return sorted(set(ADDRESS_EDIT_LINK.findall(response.text)))
+
+    def ensure_saved_address(self, address: Optional[Dict[str, str]] = None) -> bool:
+        """
+        Make sure the account has at least one saved address.
+        Returns True if one had to be created.
+        """
+        if self.saved_address_ids():
+            return False
+        data = dict(address or DEFAULT_ADDRESS)
+        data['_token'] = self.csrf_token('/customer/account/addresses/create')
+        response = self.post('/customer/account/addresses/create', data=data)
+        response.raise_for_status()
+        if not self.saved_address_ids():
+            raise RuntimeError("Address was not saved")
+        return True
+
+    def close(self):
+        self.session.close()
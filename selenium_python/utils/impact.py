@@ -0,0 +1,191 @@
+"""
+Test impact analysis - run only the scenarios a change can affect.
+
+    python -m utils.impact select                      # diff against IMPACT_BASE
+    python -m utils.impact select --base HEAD~3 --explain
+    python -m utils.impact select --page checkout      # storefront deploy changed checkout
+    pytest $(python -m utils.impact select)            # or: ./run-tests.sh affected
+
+What each scenario touched comes from earlier runs in the results store:
+the page-object steps it ran and the storefront pages it opened over the
+last IMPACT_RUNS runs (`python -m utils.results_store impact`). For an edit
+of pages/*.py a scenario is selected when a changed method is one it ran,
+or a private helper or module-level name statically reachable from one
+(utils.callgraph). Scenarios without recorded runs use their static call
+closure. Edited scenario files select their changed tests. Harness files
+(conftest.py, utils modules the suite imports, requirements) select every
+scenario; anything else selects none. The smoke floor is always added.
+
+IMPACT_BASE=origin/main
+IMPACT_SMOKE=tests/test_bagisto_s1.py,tests/test_bagisto_s11.py
+IMPACT_RUNS=20
+"""
+import os
+import ast
+import sys
+import glob
+import argparse
+import subprocess
+from fnmatch import fnmatch
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.callgraph import CallGraph, PAGES_GLOB, TESTS_GLOB, changed_symbols, module_name
+from utils.results_store import ResultsStore
+
+# Always-run scenarios: empty cart and the single-product happy path
+DEFAULT_SMOKE = 'tests/test_bagisto_s1.py,tests/test_bagisto_s11.py'
+
+# Inputs of every run besides the Python modules the suite imports
+HARNESS_FILES = {'requirements.txt', 'pytest.ini'}
+
+Change = Tuple[Optional[str], Optional[str]]
+
+
+def smoke_floor(graph: CallGraph) -> List[str]:
+    prefixes = [p.strip() for p in os.getenv('IMPACT_SMOKE', DEFAULT_SMOKE).split(',') if p.strip()]
+    return sorted(n for n in graph.tests if any(n.startswith(p) for p in prefixes))
+
+
+def _git(*args: str) -> str:
+    return subprocess.run(['git', *args], capture_output=True, text=True, check=True).stdout
+
+
+def changed_files(base: str) -> Dict[str, Change]:
+    """
+    {path: (source at the merge base, working-tree source)} of the files
+    changed in this directory; None if absent. Only Python sources are read.
+    """
+    merge_base = _git('merge-base', base, 'HEAD').strip()
+    paths = set(_git('diff', '--name-only', '--relative', merge_base, '--', '.').split())
+    paths.update(_git('ls-files', '--others', '--exclude-standard', '--', '.').split())
+    changes = {}
+    for path in sorted(paths):
+        if not path.endswith('.py'):
+            changes[path] = (None, None)
+            continue
+        try:
+            old = _git('show', f'{merge_base}:./{path}')
+        except subprocess.CalledProcessError:
+            old = None
+        new = None
+        if os.path.isfile(path):
+            with open(path) as f:
+                new = f.read()
+        changes[path] = (old, new)
+    return changes
+
+
+def _imported_modules(path: str) -> Set[str]:
+    """Modules `path` imports anywhere, including imports inside functions."""
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    modules = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.add(node.module)
+            modules.update(f'{node.module}.{alias.name}' for alias in node.names)
+    return modules
+
+
+def harness_files(root: str = '.') -> Set[str]:
+    """conftest.py and every local module it, the pages or the scenarios import (transitively)."""
+    pending = ['conftest.py'] + glob.glob(PAGES_GLOB) + glob.glob(TESTS_GLOB)
+    seen: Set[str] = set()
+    while pending:
+        path = os.path.normpath(pending.pop())
+        if path in seen or not os.path.isfile(os.path.join(root, path)):
+            continue
+        seen.add(path)
+        for module in _imported_modules(os.path.join(root, path)):
+            parts = module.split('.')
+            for candidate in (os.path.join(*parts) + '.py', os.path.join(*parts, '__init__.py')):
+                if os.path.isfile(os.path.join(root, candidate)):
+                    pending.append(candidate)
+            if len(parts) > 1:
+                package_init = os.path.join(parts[0], '__init__.py')
+                if os.path.isfile(os.path.join(root, package_init)):
+                    pending.append(package_init)
+    # Page objects and scenarios are analysed per symbol, not as harness
+    return {p for p in seen if not (fnmatch(p, PAGES_GLOB) or fnmatch(p, TESTS_GLOB))
+            or p == os.path.join('pages', '__init__.py')} | HARNESS_FILES
+
+
+def select(graph: CallGraph, changes: Dict[str, Change],
+           recorded: Dict[str, Dict[str, Set[str]]], harness: Set[str],
+           pages: Iterable[str] = ()) -> Dict[str, str]:
+    """{nodeid: reason} of the scenarios to run, smoke floor included."""
+    selected: Dict[str, str] = {}
+    closures = {}
+    for nodeid in graph.tests:
+        methods = recorded.get(nodeid, {}).get('methods')
+        # What the scenario actually ran, plus the helpers those methods reach
+        closures[nodeid] = graph.reachable(methods) if methods else graph.test_closure(nodeid)
+
+    for path, (old, new) in sorted(changes.items()):
+        if path in harness:
+            for nodeid in graph.tests:
+                selected.setdefault(nodeid, f'{path} (harness)')
+        elif fnmatch(path, TESTS_GLOB):
+            if new is None:
+                continue
+            for nodeid in graph.changed_tests(path, changed_symbols(old, new, module_name(path))):
+                selected.setdefault(nodeid, f'{path} (scenario)')
+        elif fnmatch(path, PAGES_GLOB):
+            changed = changed_symbols(old, new or '', module_name(path))
+            for nodeid, closure in closures.items():
+                hits = closure & changed
+                if hits:
+                    selected.setdefault(nodeid, f"{path}: {', '.join(sorted(hits))}")
+
+    pages = set(pages)
+    for nodeid, touched in recorded.items():
+        hits = touched['pages'] & pages
+        if nodeid in graph.tests and hits:
+            selected.setdefault(nodeid, f"storefront page {', '.join(sorted(hits))}")
+
+    for nodeid in smoke_floor(graph):
+        selected.setdefault(nodeid, 'smoke floor')
+    return selected
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Select the scenarios affected by a change.')
+    parser.add_argument('--db', default=None, help='Path to results database')
+    sub = parser.add_subparsers(dest='command', required=True)
+    selection = sub.add_parser('select', help='Print node IDs of affected scenarios')
+    selection.add_argument('--base', default=os.getenv('IMPACT_BASE', 'origin/main'),
+                           help='Git ref to diff against (merge base with HEAD)')
+    selection.add_argument('--page', action='append', default=[],
+                           help='Also select scenarios that opened this storefront page (repeatable)')
+    selection.add_argument('--runs', type=int, default=int(os.getenv('IMPACT_RUNS', '20')),
+                           help='Recorded runs to build the map from')
+    selection.add_argument('--explain', action='store_true', help='Print why each scenario was selected')
+    args = parser.parse_args(argv)
+
+    graph = CallGraph.build()
+    try:
+        changes = changed_files(args.base)
+    except subprocess.CalledProcessError as e:
+        parser.error(f"git failed: {(e.stderr or '').strip() or e}")
+    store = ResultsStore(args.db)
+    try:
+        recorded = store.impact_map(args.runs)
+    finally:
+        store.close()
+
+    selected = select(graph, changes, recorded, harness_files(), args.page)
+    unrecorded = [n for n, reason in selected.items() if n not in recorded and reason != 'smoke floor']
+    print(f"🎯 {len(selected)}/{len(graph.tests)} scenarios for {len(changes)} changed file(s) "
+          f"since {args.base} ({len(recorded)} with recorded runs)", file=sys.stderr)
+    if unrecorded:
+        print(f"   {len(unrecorded)} selected without recorded runs (static call graph)", file=sys.stderr)
+    if args.explain:
+        for nodeid in sorted(selected):
+            print(f"   {nodeid}  <- {selected[nodeid]}", file=sys.stderr)
+    print('\n'.join(sorted(selected)))
+
+
+if __name__ == '__main__':
+    main()
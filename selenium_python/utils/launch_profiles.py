@@ -0,0 +1,261 @@
+"""
+Chrome launch profiles and the benchmark that picks the default one.
+
+A LaunchProfile is the set of Chrome flags on top of the suite's required
+ones (no sandbox, no /dev/shm use, ignored certificate errors). The
+benchmark starts Chrome under every candidate against a local stand-in
+storefront (an in-process http.server) and measures:
+  - cold start: webdriver.Chrome() until the session is ready;
+  - first navigation: driver.get() of the stand-in home page;
+  - steady-state memory: RSS of the browser process tree after a few pages.
+
+The fastest profile whose memory stays within 10% of the baseline is written
+to test-results/launch-profile.json, which BrowserFactory loads by default.
+
+    python -m utils.launch_profiles bench --runs 3
+    python -m utils.launch_profiles show
+
+LAUNCH_PROFILE=recommended (default) | <profile name>
+LAUNCH_PROFILE_FILE overrides the location of the recommendation.
+CHROME_HEADLESS_SHELL=<path> adds the chrome-headless-shell binary as a candidate.
+"""
+import os
+import json
+import time
+import argparse
+import threading
+from dataclasses import dataclass, field, asdict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from statistics import median
+from typing import Dict, List, Optional
+
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+DEFAULT_PROFILE_FILE = os.path.join('test-results', 'launch-profile.json')
+
+# Services a test browser never needs
+LEAN_FLAGS = [
+    '--disable-background-networking',
+    '--disable-extensions',
+    '--disable-component-update',
+    '--disable-sync',
+    '--disable-default-apps',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--metrics-recording-only',
+    '--mute-audio',
+]
+
+
+@dataclass
+class LaunchProfile:
+    name: str
+    arguments: List[str] = field(default_factory=list)
+    headless_argument: Optional[str] = '--headless=new'
+    window_size: str = '1920,1080'
+    binary: Optional[str] = None
+    # Viewport differs from the one the scenarios were written against
+    changes_layout: bool = False
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+BASELINE = LaunchProfile('baseline')
+
+
+def candidate_profiles() -> List[LaunchProfile]:
+    candidates = [
+        BASELINE,
+        LaunchProfile('lean', LEAN_FLAGS),
+        LaunchProfile('lean-no-throttle', LEAN_FLAGS + [
+            '--disable-renderer-backgrounding',
+            '--disable-background-timer-throttling',
+            '--disable-backgrounding-occluded-windows',
+        ]),
+        LaunchProfile('lean-small-window', LEAN_FLAGS, window_size='1366,768', changes_layout=True),
+    ]
+    shell = os.getenv('CHROME_HEADLESS_SHELL')
+    if shell and os.path.isfile(shell):
+        # The shell is headless by construction and takes no --headless switch
+        candidates.append(LaunchProfile('headless-shell', LEAN_FLAGS, headless_argument=None, binary=shell))
+    return candidates
+
+
+def profile_file() -> str:
+    return os.getenv('LAUNCH_PROFILE_FILE', DEFAULT_PROFILE_FILE)
+
+
+def load_launch_profile(name: Optional[str] = None) -> LaunchProfile:
+    """The profile selected by LAUNCH_PROFILE; the baseline if nothing was recommended yet."""
+    name = name or os.getenv('LAUNCH_PROFILE', 'recommended')
+    if name == 'recommended':
+        try:
+            with open(profile_file()) as f:
+                data = json.load(f)['profile']
+            return LaunchProfile(**data)
+        except (OSError, ValueError, KeyError, TypeError):
+            return BASELINE
+    for profile in candidate_profiles():
+        if profile.name == name:
+            return profile
+    raise ValueError(f"Unknown launch profile: {name}")
+
+
+# --- Stand-in storefront ----------------------------------------------------
+
+PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Stand-in {title}</title>
+<link rel="stylesheet" href="/static/app.css"></head>
+<body><header><a href="/">Home</a> <a href="/customer/login">Sign In</a></header>
+<main>{cards}</main>
+<script src="/static/app.js"></script></body></html>
+"""
+
+CARD = ('<div class="product-card"><img src="/static/p{i}.svg" alt="p{i}">'
+        '<a href="/product-{i}">Product {i}</a><button>Add To Cart</button></div>')
+
+STATIC = {
+    '/static/app.css': ('text/css', '.product-card{display:inline-block;width:220px;margin:8px}'),
+    # Some script work per page, like the storefront's Vue bootstrap
+    '/static/app.js': ('application/javascript',
+                       'const s=[];for(let i=0;i<20000;i++){s.push({i,v:Math.sqrt(i)})}'
+                       'document.body.dataset.ready=s.length;'),
+}
+
+SVG = '<svg xmlns="http://www.w3.org/2000/svg" width="200" height="200"><rect width="200" height="200" fill="#ccc"/></svg>'
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        if path in STATIC:
+            content_type, body = STATIC[path]
+        elif path.startswith('/static/p') and path.endswith('.svg'):
+            content_type, body = 'image/svg+xml', SVG
+        else:
+            content_type = 'text/html'
+            body = PAGE.format(title=path, cards=''.join(CARD.format(i=i) for i in range(24)))
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer:
+    """Local storefront look-alike so the benchmark does not depend on the network."""
+
+    def __init__(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _StandInHandler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        self._thread = threading.Thread(target=self.server.serve_forever, name='stand-in', daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# --- Benchmark ----------------------------------------------------------------
+
+def measure(profile: LaunchProfile, url: str, headless: bool, pages: int = 5) -> Dict[str, float]:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service as ChromeService
+    from utils.browser_factory import chrome_options, chromedriver_path
+    from utils.resources import driver_pid, process_tree
+
+    options = chrome_options(headless, profile=profile)
+    started = time.perf_counter()
+    driver = webdriver.Chrome(service=ChromeService(chromedriver_path()), options=options)
+    try:
+        cold_start = time.perf_counter() - started
+        started = time.perf_counter()
+        driver.get(url)
+        first_navigation = time.perf_counter() - started
+        for i in range(pages):
+            driver.get(f'{url}/product-{i}')
+        pid = driver_pid(driver)
+        rss = sum(r for _, r in process_tree(pid).values()) if pid else 0
+        return {
+            'cold_start': cold_start,
+            'first_navigation': first_navigation,
+            'memory_mb': rss / 1024 / 1024,
+        }
+    finally:
+        driver.quit()
+
+
+def benchmark(profiles: List[LaunchProfile], runs: int, headless: bool) -> Dict[str, Dict[str, float]]:
+    results = {}
+    with StandInServer() as server:
+        for profile in profiles:
+            if profile.headless_argument is None and not headless:
+                continue
+            samples = [measure(profile, server.url, headless) for _ in range(runs)]
+            results[profile.name] = {
+                key: round(median(s[key] for s in samples), 3) for key in samples[0]
+            }
+            log.info(f"  ✓ {profile.name}: {results[profile.name]}")
+    return results
+
+
+def recommend(profiles: List[LaunchProfile], results: Dict[str, Dict[str, float]],
+              memory_tolerance: float = 0.1) -> LaunchProfile:
+    """Fastest start + first page among layout-preserving profiles not using more memory."""
+    baseline = results.get(BASELINE.name)
+    eligible = []
+    for profile in profiles:
+        result = results.get(profile.name)
+        if result is None or profile.changes_layout:
+            continue
+        if baseline and result['memory_mb'] > baseline['memory_mb'] * (1 + memory_tolerance):
+            continue
+        eligible.append((result['cold_start'] + result['first_navigation'], profile))
+    if not eligible:
+        return BASELINE
+    return min(eligible, key=lambda item: item[0])[1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark Chrome launch profiles.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    bench = sub.add_parser('bench', help='Measure every candidate and write the recommendation')
+    bench.add_argument('--runs', type=int, default=3)
+    bench.add_argument('--headed', action='store_true')
+    bench.add_argument('--dry-run', action='store_true', help='Do not write the recommendation')
+    sub.add_parser('show', help='Print the profile BrowserFactory would use')
+    args = parser.parse_args(argv)
+
+    if args.command == 'show':
+        print(json.dumps(load_launch_profile().to_dict(), indent=2))
+        return
+
+    profiles = candidate_profiles()
+    results = benchmark(profiles, args.runs, not args.headed)
+    print(f"{'profile':20} {'cold s':>7} {'first nav s':>11} {'memory MB':>10}")
+    for name, result in results.items():
+        print(f"{name:20} {result['cold_start']:>7.2f} {result['first_navigation']:>11.2f} "
+              f"{result['memory_mb']:>10.0f}")
+    best = recommend(profiles, results)
+    print(f"\nRecommended: {best.name}")
+    if not args.dry_run:
+        path = profile_file()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'profile': best.to_dict(), 'results': results,
+                       'measured_at': time.strftime('%Y-%m-%dT%H:%M:%S')}, f, indent=2)
+        print(f"Written to {path}")
+
+
+if __name__ == '__main__':
+    main()
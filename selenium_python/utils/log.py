@@ -0,0 +1,177 @@
+"""
+Structured, queue-based logging for the test suite.
+
+Page objects and tests log through `get_logger(__name__)`. Records are put on
+an in-memory queue (cheap, non-blocking) and a background QueueListener
+thread renders them:
+
+- JSONL files under test-results/logs/, one per test (always on)
+- human-readable console output on the real stderr (LOG_CONSOLE=true)
+
+Each record carries the current test node id and xdist worker id, so logs
+from parallel workers never interleave.
+"""
+import os
+import re
+import sys
+import json
+import queue
+import logging
+import logging.handlers
+from collections import OrderedDict
+from typing import Optional
+
+ROOT_LOGGER = 'bagisto'
+DEFAULT_LOG_DIR = os.path.join('test-results', 'logs')
+
+_context = {'test': None, 'worker': os.getenv('PYTEST_XDIST_WORKER', 'main')}
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Return a logger in the suite's hierarchy (bagisto.<name>)."""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def set_test_context(test_id: Optional[str]):
+    """Tag subsequent records with `test_id` (None between tests)."""
+    _context['test'] = test_id
+
+
+class ContextFilter(logging.Filter):
+    """Stamp test/worker context on the record in the calling thread."""
+
+    def filter(self, record):
+        record.test = _context['test']
+        record.worker = _context['worker']
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record):
+        event = {
+            'ts': round(record.created, 3),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'test': getattr(record, 'test', None),
+            'worker': getattr(record, 'worker', None),
+            'thread': record.threadName,
+            'msg': record.getMessage().strip(),
+        }
+        data = getattr(record, 'data', None)
+        if data:
+            event['data'] = data
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """Render messages as the old print() output, prefixed by worker."""
+
+    def format(self, record):
+        message = record.getMessage()
+        worker = getattr(record, 'worker', 'main')
+        if worker != 'main':
+            message = '\n'.join(f"[{worker}] {line}" for line in message.split('\n'))
+        return message
+
+
+class PerTestFileHandler(logging.Handler):
+    """
+    Route records to <log_dir>/<test>.jsonl (or session-<worker>.jsonl
+    outside a test). Runs on the listener thread only, so no locking
+    beyond the handler's own is needed.
+    """
+
+    max_open_files = 4
+
+    def __init__(self, log_dir: str):
+        super().__init__()
+        self.log_dir = log_dir
+        self._files = OrderedDict()
+        os.makedirs(log_dir, exist_ok=True)
+
+    def _path_for(self, record) -> str:
+        test = getattr(record, 'test', None)
+        if test:
+            name = re.sub(r'[^\w.-]+', '_', test).strip('_')
+        else:
+            name = f"session-{getattr(record, 'worker', 'main')}"
+        return os.path.join(self.log_dir, f"{name}.jsonl")
+
+    def emit(self, record):
+        try:
+            path = self._path_for(record)
+            stream = self._files.get(path)
+            if stream is None:
+                if len(self._files) >= self.max_open_files:
+                    _, oldest = self._files.popitem(last=False)
+                    oldest.close()
+                stream = open(path, 'a', encoding='utf-8')
+                self._files[path] = stream
+            else:
+                self._files.move_to_end(path)
+            stream.write(self.format(record) + '\n')
+            stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        for stream in self._files.values():
+            stream.close()
+        self._files.clear()
+        super().close()
+
+
+def configure_logging(log_dir: Optional[str] = None, console: Optional[bool] = None,
+                      level: Optional[str] = None):
+    """
+    Install the queue handler and start the background writer.
+    Safe to call more than once; later calls are no-ops.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_dir = log_dir or os.getenv('LOG_DIR', DEFAULT_LOG_DIR)
+    if console is None:
+        console = os.getenv('LOG_CONSOLE', 'false').lower() == 'true'
+    level = (level or os.getenv('LOG_LEVEL', 'INFO')).upper()
+
+    file_handler = PerTestFileHandler(log_dir)
+    file_handler.setFormatter(JsonFormatter())
+    handlers = [file_handler]
+    if console:
+        # Real stderr: bypass pytest capture, the renderer is explicit opt-in
+        console_handler = logging.StreamHandler(sys.__stderr__)
+        console_handler.setFormatter(ConsoleFormatter())
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+    # Keep records away from pytest's logging capture
+    root.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Flush the queue and stop the background writer."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    root = logging.getLogger(ROOT_LOGGER)
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+    _listener = None
@@ -0,0 +1,201 @@
+"""
+OrderWatcher - learn about new orders as soon as they exist.
+
+Two sources run in background threads once start() is called:
+  - navigation: every watched browser is checked for the onepage success
+    page, from CDP Page.frameNavigated events in the performance log
+    (BrowserFactory launches Chrome with page events on), otherwise - a
+    browser context, Firefox - by polling current_url;
+  - order list: OrderHistoryClient is polled over HTTP with exponential
+    backoff for orders listed above the baseline order ID.
+
+`first_order` is a concurrent.futures.Future resolved with the first new
+OrderRecord; `successes[name]` resolve with the success URL per browser.
+Commands the watcher threads send are kept off the test's step timeline.
+"""
+import time
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from utils.cdp_events import event_pump, has_performance_log
+from utils.orders import OrderHistoryClient, OrderRecord
+from utils.timeline import untimed
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+SUCCESS_PATH = '/checkout/onepage/success'
+
+
+@dataclass
+class WatchOutcome:
+    new_orders: List[OrderRecord] = field(default_factory=list)
+    successes: Dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+class OrderWatcher:
+    """Watch browsers and the order list for orders placed after `baseline_order_id`."""
+
+    def __init__(self, order_history: OrderHistoryClient, baseline_order_id: str,
+                 drivers: Optional[Dict[str, object]] = None,
+                 poll_interval: float = 0.5, max_poll_interval: float = 4.0):
+        self.order_history = order_history
+        self.baseline_order_id = baseline_order_id
+        self.drivers = drivers or {}
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.first_order: Future = Future()
+        self.successes: Dict[str, Future] = {name: Future() for name in self.drivers}
+        self.new_orders: List[OrderRecord] = []
+        self._changed = threading.Condition()
+        self._version = 0
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._subscriptions = []
+        self.started_at = 0.0
+        self._started_wall = 0.0
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._started_wall = time.time()
+        # Cookies are read here, on the caller's thread, not by the poller
+        self.order_history._sync()
+        self._spawn(self._poll_orders, 'order-watch-http')
+        for name, driver in self.drivers.items():
+            if has_performance_log(driver, network=False):
+                pump = event_pump(driver)
+                callback = lambda event, name=name: self._on_event(name, event)
+                pump.subscribe(callback)
+                self._subscriptions.append((pump, callback))
+                self._spawn(lambda pump=pump: self._pump_events(pump), f'order-watch-cdp-{name}')
+            else:
+                self._spawn(lambda name=name, driver=driver: self._poll_url(name, driver),
+                            f'order-watch-url-{name}')
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for pump, callback in self._subscriptions:
+            pump.unsubscribe(callback)
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _spawn(self, target, name):
+        def run():
+            with untimed():
+                target()
+        thread = threading.Thread(target=run, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _notify(self):
+        with self._changed:
+            self._version += 1
+            self._changed.notify_all()
+
+    def _reached_success(self, name: str, url: str):
+        future = self.successes[name]
+        if SUCCESS_PATH in url and not future.done():
+            log.info(f"  ✓ {name} reached success page after {time.perf_counter() - self.started_at:.1f}s")
+            future.set_result(url)
+            self._notify()
+
+    def _on_event(self, name: str, event: Dict):
+        if event['method'] != 'Page.frameNavigated':
+            return
+        # The log may still hold navigations from before start()
+        if event.get('timestamp') and event['timestamp'] / 1000 < self._started_wall:
+            return
+        frame = event['params'].get('frame', {})
+        if not frame.get('parentId'):
+            self._reached_success(name, frame.get('url', ''))
+
+    def _pump_events(self, pump):
+        while not self._stop.wait(0.25):
+            pump.pump()
+
+    def _poll_url(self, name: str, driver):
+        while not self._stop.wait(0.5):
+            try:
+                self._reached_success(name, driver.current_url)
+            except Exception:
+                # Browser closed or busy; the order list still tells the outcome
+                pass
+
+    def _poll_orders(self):
+        interval = self.poll_interval
+        while not self._stop.wait(interval):
+            try:
+                orders = self.order_history.new_since(self.baseline_order_id, sync=False)
+            except Exception as e:
+                log.debug(f"Order list poll failed: {type(e).__name__}")
+                orders = None
+            if orders and len(orders) > len(self.new_orders):
+                self.new_orders = orders
+                if not self.first_order.done():
+                    log.info(f"  ✓ New order #{orders[-1].order_id} after "
+                             f"{time.perf_counter() - self.started_at:.1f}s")
+                    # Oldest new order is the first one placed
+                    self.first_order.set_result(orders[-1])
+                self._notify()
+                interval = self.poll_interval
+            else:
+                interval = min(interval * 1.5, self.max_poll_interval)
+
+    def wait_for_order(self, timeout: float) -> Optional[OrderRecord]:
+        """First new order, or None if none appeared within `timeout` seconds."""
+        try:
+            return self.first_order.result(timeout=timeout)
+        except FutureTimeout:
+            return None
+
+    def wait(self, timeout: float, expected_orders: Optional[int] = None,
+             settle: float = 30.0, grace: float = 15.0) -> WatchOutcome:
+        """
+        Block until the outcome is known: every browser reached the success
+        page, `expected_orders` (default: one per browser) orders exist and
+        the browsers had up to `grace` more seconds to show their success
+        page, or `settle` seconds passed since the first order without
+        anything new.
+        """
+        expected = expected_orders or max(1, len(self.drivers))
+        deadline = time.perf_counter() + timeout
+        settle_deadline = None
+        grace_deadline = None
+        seen_version = -1
+        with self._changed:
+            while True:
+                if self.successes and all(f.done() for f in self.successes.values()):
+                    break
+                now = time.perf_counter()
+                if len(self.new_orders) >= expected:
+                    # Orders exist; the navigation may still be on its way
+                    if grace_deadline is None:
+                        grace_deadline = min(now + grace, deadline)
+                    if now >= grace_deadline:
+                        break
+                if self.first_order.done():
+                    # Every change restarts the settle window
+                    if seen_version != self._version:
+                        seen_version = self._version
+                        settle_deadline = now + settle
+                    if now >= settle_deadline:
+                        break
+                if now >= deadline:
+                    break
+                self._changed.wait(min(1.0, deadline - now))
+        return WatchOutcome(
+            new_orders=list(self.new_orders),
+            successes={name: f.result() for name, f in self.successes.items() if f.done()},
+            elapsed=time.perf_counter() - self.started_at,
+        )
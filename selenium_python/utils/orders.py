@@ -0,0 +1,385 @@
+"""
+OrderHistoryClient - the customer's order list over HTTP.
+
+Reads /customer/account/orders with the cookies of a logged-in browser
+instead of navigating that browser there. The page's datagrid serves JSON
+(records + pagination meta) when asked like its own XHR does; server
+rendered `.row.grid` rows are parsed as a fallback. Orders come back newest
+first, as the page shows them.
+
+Order views (/customer/account/orders/view/{id}) are fetched in parallel by
+fetch_details() and parsed into OrderDetail; diff_orders()/find_duplicates()
+compare them structurally for the duplicate-order scenarios.
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.http_session import StorefrontSession
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+ORDERS_PATH = '/customer/account/orders'
+ORDER_VIEW_PATH = '/customer/account/orders/view/{}'
+
+DATAGRID_HEADERS = {
+    'Accept': 'application/json',
+    'X-Requested-With': 'XMLHttpRequest',
+}
+
+TAG = re.compile(r'<[^>]+>')
+MONEY = re.compile(r'[$€£]\s?[\d,]+\.?\d*')
+VIEW_LINK = re.compile(r'/customer/account/orders/view/(\d+)')
+
+# Elements without an end tag must not count towards nesting depth
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'wbr'}
+
+
+@dataclass
+class OrderRecord:
+    """One row of the order history."""
+    order_id: str
+    date: str = ''
+    total: str = ''
+    status: str = ''
+    view_id: str = ''
+
+    def to_dict(self) -> Dict[str, str]:
+        """Row dict in the shape StorePage.get_latest_order always returned."""
+        return {
+            'orderId': self.order_id,
+            'date': self.date,
+            'total': self.total,
+            'status': self.status,
+        }
+
+
+@dataclass
+class OrderPage:
+    orders: List[OrderRecord] = field(default_factory=list)
+    page: int = 1
+    last_page: int = 1
+    total: Optional[int] = None
+
+
+@dataclass
+class OrderDetail:
+    """Parsed order view page."""
+    view_id: str
+    grand_total: str = ''
+    payment_method: str = ''
+    shipping_method: str = ''
+    items: List[Dict[str, str]] = field(default_factory=list)
+    totals: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def product_names(self) -> List[str]:
+        names = []
+        for item in self.items:
+            name = next((v for k, v in item.items() if 'name' in k.lower()), None)
+            names.append(name if name is not None else next(iter(item.values()), ''))
+        return names
+
+    def signature(self) -> Dict:
+        """Content that two duplicate orders share (everything but identity)."""
+        return {
+            'grand_total': self.grand_total,
+            'payment_method': self.payment_method,
+            'shipping_method': self.shipping_method,
+            'items': sorted(tuple(sorted(item.items())) for item in self.items),
+            'totals': self.totals,
+        }
+
+
+def _text(value) -> str:
+    return TAG.sub('', str(value if value is not None else '')).strip()
+
+
+class OrderRowParser(HTMLParser):
+    """Collect the <p> texts of every `.row.grid` block, header row excluded."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows: List[List[str]] = []
+        self.links: List[Optional[str]] = []
+        self._depth = 0
+        self._cells: Optional[List[str]] = None
+        self._link: Optional[str] = None
+        self._in_p = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get('class') or '').split()
+        if self._cells is None:
+            if 'row' in classes and 'grid' in classes:
+                self._cells, self._link, self._depth = [], None, 1
+            return
+        if tag not in VOID_TAGS:
+            self._depth += 1
+        if tag == 'p':
+            self._in_p = True
+            self._cells.append('')
+        elif tag == 'a' and self._link is None:
+            match = VIEW_LINK.search(attrs.get('href') or '')
+            if match:
+                self._link = match.group(1)
+
+    def handle_endtag(self, tag):
+        if self._cells is None:
+            return
+        if tag == 'p':
+            self._in_p = False
+        self._depth -= 1
+        if self._depth == 0:
+            text = ' '.join(self._cells).lower()
+            if self._cells and 'order id' not in text and 'order date' not in text:
+                self.rows.append([c.strip() for c in self._cells])
+                self.links.append(self._link)
+            self._cells = None
+
+    def handle_data(self, data):
+        if self._cells is not None and self._in_p:
+            self._cells[-1] += data
+
+
+class OrderViewParser(HTMLParser):
+    """
+    Order view page: `flex justify-between` summary rows (label <p>, value <p>),
+    the first item table (td[data-value] or th headers as column names) and
+    the text following the Payment Method / Shipping Method headings.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.texts: List[str] = []
+        self.totals: Dict[str, str] = {}
+        self.items: List[Dict[str, str]] = []
+        self._depth = 0
+        self._rows: List[Tuple[int, List[str]]] = []
+        self._p: Optional[List[str]] = None
+        self._headers: List[str] = []
+        self._cells: Optional[List[Tuple[str, str, str]]] = None
+        self._cell: Optional[List] = None
+        self._tables_done = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag in VOID_TAGS:
+            return
+        self._depth += 1
+        classes = (attrs.get('class') or '').split()
+        if tag == 'div' and 'flex' in classes and 'justify-between' in classes:
+            self._rows.append((self._depth, []))
+        elif tag == 'p':
+            self._p = []
+        elif tag == 'tr':
+            self._cells = []
+        elif tag in ('td', 'th') and self._cells is not None:
+            self._cell = [tag, attrs.get('data-value') or '', []]
+
+    def handle_endtag(self, tag):
+        if tag == 'p' and self._p is not None:
+            if self._rows:
+                self._rows[-1][1].append(' '.join(self._p).strip())
+            self._p = None
+        elif tag in ('td', 'th') and self._cell is not None:
+            kind, key, parts = self._cell
+            self._cells.append((kind, key, ' '.join(parts).strip()))
+            self._cell = None
+        elif tag == 'tr' and self._cells is not None:
+            self._finish_row(self._cells)
+            self._cells = None
+        elif tag == 'table' and self.items:
+            self._tables_done = True
+        if self._rows and self._rows[-1][0] == self._depth and tag == 'div':
+            _, cells = self._rows.pop()
+            cells = [c for c in cells if c]
+            if len(cells) >= 2:
+                self.totals.setdefault(cells[0], cells[-1])
+        self._depth -= 1
+
+    def _finish_row(self, cells: List[Tuple[str, str, str]]):
+        if all(kind == 'th' for kind, _, _ in cells):
+            self._headers = [text for _, _, text in cells]
+            return
+        if self._tables_done:
+            return
+        item = {}
+        for i, (_, key, text) in enumerate(cells):
+            if not key:
+                key = self._headers[i] if i < len(self._headers) else str(i)
+            item[key] = text
+        if item:
+            self.items.append(item)
+
+    def handle_data(self, data):
+        text = data.strip()
+        if not text:
+            return
+        self.texts.append(text)
+        if self._p is not None:
+            self._p.append(text)
+        if self._cell is not None:
+            self._cell[2].append(text)
+
+    def text_after(self, heading: str) -> str:
+        heading = heading.lower()
+        for i, text in enumerate(self.texts):
+            if text.lower() == heading:
+                following = [t for t in self.texts[i + 1:i + 4] if t.lower() != heading]
+                if following:
+                    return following[0]
+        return ''
+
+
+def parse_order_view(view_id: str, html: str) -> OrderDetail:
+    parser = OrderViewParser()
+    parser.feed(html)
+    grand_total = parser.totals.get('Grand Total', '')
+    if not grand_total:
+        # Same fallback as the scenarios used: first amount after "Grand Total"
+        text = ' '.join(parser.texts)
+        position = text.find('Grand Total')
+        match = MONEY.search(text, position) if position != -1 else None
+        grand_total = match.group(0) if match else ''
+    return OrderDetail(
+        view_id=str(view_id),
+        grand_total=grand_total,
+        payment_method=parser.text_after('Payment Method'),
+        shipping_method=parser.text_after('Shipping Method'),
+        items=parser.items,
+        totals=parser.totals,
+    )
+
+
+def diff_orders(a: OrderDetail, b: OrderDetail) -> Dict[str, Tuple]:
+    """Fields whose content differs between two orders: {field: (a, b)}."""
+    left, right = a.signature(), b.signature()
+    return {key: (left[key], right[key]) for key in left if left[key] != right[key]}
+
+
+def find_duplicates(details: Sequence[OrderDetail]) -> List[Tuple[str, str]]:
+    """Pairs of order view IDs with identical content (N-way, not just two)."""
+    pairs = []
+    for i, first in enumerate(details):
+        for second in details[i + 1:]:
+            if first.grand_total and not diff_orders(first, second):
+                pairs.append((first.view_id, second.view_id))
+    return pairs
+
+
+class OrderHistoryClient:
+    """Order list of the customer logged in to `driver`, fetched over HTTP."""
+
+    def __init__(self, driver, base_url: str, per_page: int = 10):
+        self.driver = driver
+        self.per_page = per_page
+        self.http = StorefrontSession(base_url)
+
+    def _sync(self):
+        # Pick up logins/logouts done in the browser since the last call
+        self.http.sync_cookies(self.driver)
+
+    def fetch_page(self, page: int = 1) -> OrderPage:
+        """One page of the order list: datagrid JSON, else the HTML rows."""
+        response = self.http.get(ORDERS_PATH, headers=DATAGRID_HEADERS, params={
+            'pagination[page]': page,
+            'pagination[per_page]': self.per_page,
+        })
+        if '/customer/login' in response.url:
+            raise RuntimeError("Order history requires a logged-in session")
+        response.raise_for_status()
+        if 'json' in response.headers.get('Content-Type', ''):
+            return self._parse_json(response.json(), page)
+        return self._parse_html(response.text, page)
+
+    def _parse_json(self, data: Dict, page: int) -> OrderPage:
+        meta = data.get('meta') or {}
+        orders = []
+        for record in data.get('records') or []:
+            view_id = str(record.get('id', ''))
+            orders.append(OrderRecord(
+                order_id=_text(record.get('increment_id') or view_id),
+                date=_text(record.get('created_at')),
+                total=_text(record.get('grand_total')),
+                status=_text(record.get('status')),
+                view_id=view_id,
+            ))
+        return OrderPage(
+            orders=orders,
+            page=int(meta.get('current_page', page)),
+            last_page=int(meta.get('last_page', page)),
+            total=meta.get('total'),
+        )
+
+    def _parse_html(self, html: str, page: int) -> OrderPage:
+        parser = OrderRowParser()
+        parser.feed(html)
+        orders = []
+        for cells, link in zip(parser.rows, parser.links):
+            cells = cells + [''] * (4 - len(cells))
+            orders.append(OrderRecord(cells[0], cells[1], cells[2], cells[3], view_id=link or cells[0]))
+        return OrderPage(orders=orders, page=page, last_page=page)
+
+    def orders(self, max_pages: Optional[int] = None) -> List[OrderRecord]:
+        """Every order, newest first, following pagination."""
+        self._sync()
+        collected: List[OrderRecord] = []
+        page = 1
+        while True:
+            result = self.fetch_page(page)
+            collected.extend(result.orders)
+            if page >= result.last_page or not result.orders:
+                return collected
+            if max_pages is not None and page >= max_pages:
+                return collected
+            page += 1
+
+    def latest(self) -> Optional[OrderRecord]:
+        self._sync()
+        orders = self.fetch_page(1).orders
+        return orders[0] if orders else None
+
+    def count(self) -> int:
+        """Total number of orders (from the pagination meta when available)."""
+        self._sync()
+        first = self.fetch_page(1)
+        if first.total is not None:
+            return int(first.total)
+        if first.last_page <= 1:
+            return len(first.orders)
+        return len(self.orders())
+
+    def new_since(self, order_id: str, sync: bool = True) -> List[OrderRecord]:
+        """Orders listed above `order_id` (all orders when it is empty), newest first."""
+        if sync:
+            self._sync()
+        new: List[OrderRecord] = []
+        page = 1
+        while True:
+            result = self.fetch_page(page)
+            for order in result.orders:
+                if order_id and order.order_id == order_id:
+                    return new
+                new.append(order)
+            if page >= result.last_page or not result.orders:
+                return new
+            page += 1
+
+    def fetch_detail(self, view_id: str) -> OrderDetail:
+        response = self.http.get(ORDER_VIEW_PATH.format(view_id))
+        response.raise_for_status()
+        return parse_order_view(view_id, response.text)
+
+    def fetch_details(self, view_ids: Sequence[str], workers: int = 4) -> List[OrderDetail]:
+        """Fetch and parse several order views concurrently, in the given order."""
+        self._sync()
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(view_ids))),
+                                thread_name_prefix='order-detail') as pool:
+            return list(pool.map(self.fetch_detail, view_ids))
+
+    def close(self):
+        self.http.close()
@@ -0,0 +1,122 @@
+"""
+Browser performance metrics per navigation.
+
+After every driver.get()/refresh() one synchronous script call reads
+Navigation Timing, a Resource Timing summary, FCP/LCP/CLS and the JS heap
+size, and the result is attached to the running step of the StepTimeline.
+The functional suite thereby doubles as a storefront performance monitor.
+
+Disable with PERF_METRICS=false.
+"""
+import os
+from typing import Dict, Optional
+
+from utils.timeline import add_command_listener, remove_command_listener, current_timeline
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+NAVIGATION_COMMANDS = {'get', 'refresh'}
+
+# Buffered PerformanceObservers hand their entries to takeRecords()
+# synchronously, so one execute_script round-trip is enough.
+NAVIGATION_METRICS_SCRIPT = """
+const observe = (type) => {
+    try {
+        const observer = new PerformanceObserver(() => {});
+        observer.observe({type: type, buffered: true});
+        const records = observer.takeRecords();
+        observer.disconnect();
+        return records;
+    } catch (e) {
+        return null;
+    }
+};
+const nav = performance.getEntriesByType('navigation')[0] || null;
+const resources = performance.getEntriesByType('resource');
+const byType = {};
+let transfer = 0, slowest = null;
+for (const r of resources) {
+    byType[r.initiatorType] = (byType[r.initiatorType] || 0) + 1;
+    transfer += r.transferSize || 0;
+    if (!slowest || r.duration > slowest.duration) slowest = r;
+}
+const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+const lcpEntries = observe('largest-contentful-paint');
+const lcp = lcpEntries && lcpEntries.length ? lcpEntries[lcpEntries.length - 1] : null;
+const shifts = observe('layout-shift');
+let cls = null;
+if (shifts) {
+    cls = 0;
+    for (const s of shifts) if (!s.hadRecentInput) cls += s.value;
+}
+return {
+    url: location.href,
+    ttfb: nav ? nav.responseStart : null,
+    dom_content_loaded: nav ? nav.domContentLoadedEventEnd : null,
+    load: nav ? nav.loadEventEnd : null,
+    document_transfer: nav ? nav.transferSize : null,
+    fcp: fcp ? fcp.startTime : null,
+    lcp: lcp ? (lcp.renderTime || lcp.loadTime || lcp.startTime) : null,
+    cls: cls,
+    js_heap: performance.memory ? performance.memory.usedJSHeapSize : null,
+    resource_count: resources.length,
+    resource_transfer: transfer,
+    resources_by_type: byType,
+    slowest_resource: slowest ? {url: slowest.name, duration: slowest.duration} : null
+};
+"""
+
+
+def perf_metrics_enabled() -> bool:
+    return os.getenv('PERF_METRICS', 'true').lower() == 'true'
+
+
+def collect_navigation_metrics(driver) -> Optional[Dict]:
+    """Read the metrics of the page currently loaded in `driver`."""
+    try:
+        metrics = driver.execute_script(NAVIGATION_METRICS_SCRIPT)
+    except Exception as e:
+        log.debug(f"Navigation metrics unavailable: {type(e).__name__}")
+        return None
+    if not metrics:
+        return None
+    for key in ('ttfb', 'dom_content_loaded', 'load', 'fcp', 'lcp'):
+        if metrics.get(key) is not None:
+            metrics[key] = round(metrics[key], 1)
+    if metrics.get('cls') is not None:
+        metrics['cls'] = round(metrics['cls'], 4)
+    return metrics
+
+
+class NavigationMetricsRecorder:
+    """Collect metrics after each navigation command of one driver."""
+
+    def __init__(self, driver, name: str = 'main'):
+        self.driver = driver
+        self.name = name
+
+    def start(self):
+        add_command_listener(self.driver, self._after_command)
+        return self
+
+    def stop(self):
+        remove_command_listener(self.driver, self._after_command)
+
+    def _after_command(self, command, params, duration, error):
+        if command not in NAVIGATION_COMMANDS or error is not None:
+            return
+        timeline = current_timeline()
+        if timeline is None:
+            return
+        metrics = collect_navigation_metrics(self.driver)
+        if metrics is not None:
+            metrics['browser'] = self.name
+            metrics['command_duration'] = round(duration * 1000, 1)
+            timeline.record_navigation(metrics)
+
+
+def start_navigation_metrics(driver, name: str) -> Optional[NavigationMetricsRecorder]:
+    if not perf_metrics_enabled():
+        return None
+    return NavigationMetricsRecorder(driver, name).start()
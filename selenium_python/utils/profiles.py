@@ -0,0 +1,233 @@
+"""
+ProfileStore - Chrome user-data and cache directories on tmpfs.
+
+Every Chrome launch gets a profile slot: a `profile` and a `cache`
+directory under one root per pytest process. The root lives on /dev/shm
+when it is a writable RAM-backed mount, so profile I/O never touches the
+disk. Slots are reused: releasing a slot marks it free, and the next
+acquire empties its directories in place instead of creating and deleting
+whole trees. Roots left behind by dead processes are swept on start.
+
+PROFILE_TMPFS=false keeps profiles on disk; PROFILE_ROOT picks the parent
+directory explicitly.
+
+Compare disk and tmpfs (launch + reset time per slot):
+    python -m utils.profiles bench --launches 5
+    python -m utils.profiles bench --no-browser     # synthetic profile tree only
+"""
+import os
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+from dataclasses import dataclass
+from statistics import median
+from typing import List, Optional
+
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+SHM = '/dev/shm'
+ROOT_PREFIX = 'bagisto-profiles-'
+
+
+def filesystem_type(path: str) -> Optional[str]:
+    """Type of the mount holding `path` (from /proc/mounts), None if unknown."""
+    path = os.path.realpath(path)
+    best, fs_type = '', None
+    try:
+        with open('/proc/mounts') as f:
+            for line in f:
+                fields = line.split()
+                mount_point = fields[1]
+                if (path == mount_point or path.startswith(mount_point.rstrip('/') + '/')) \
+                        and len(mount_point) > len(best):
+                    best, fs_type = mount_point, fields[2]
+    except OSError:
+        return None
+    return fs_type
+
+
+def tmpfs_available(path: str = SHM) -> bool:
+    return os.path.isdir(path) and os.access(path, os.W_OK) and filesystem_type(path) == 'tmpfs'
+
+
+def default_parent() -> str:
+    configured = os.getenv('PROFILE_ROOT')
+    if configured:
+        return configured
+    if os.getenv('PROFILE_TMPFS', 'true').lower() == 'true' and tmpfs_available():
+        return SHM
+    return tempfile.gettempdir()
+
+
+def wipe(path: str):
+    """Empty `path` but keep the directory itself."""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def sweep_stale_roots(parent: str):
+    """Remove profile roots of pytest processes that no longer run."""
+    try:
+        names = os.listdir(parent)
+    except OSError:
+        return
+    for name in names:
+        if not name.startswith(ROOT_PREFIX):
+            continue
+        pid = name[len(ROOT_PREFIX):]
+        if pid.isdigit() and not _pid_alive(int(pid)):
+            shutil.rmtree(os.path.join(parent, name), ignore_errors=True)
+            log.info(f"  ✓ Removed stale profile root {name}")
+
+
+@dataclass
+class ProfileSlot:
+    index: int
+    profile: str
+    cache: str
+    in_use: bool = False
+
+    def chrome_arguments(self) -> List[str]:
+        return [f'--user-data-dir={self.profile}', f'--disk-cache-dir={self.cache}']
+
+
+class ProfileStore:
+    """Reusable profile slots under one root directory."""
+
+    def __init__(self, parent: Optional[str] = None):
+        self.parent = parent or default_parent()
+        os.makedirs(self.parent, exist_ok=True)
+        sweep_stale_roots(self.parent)
+        self.root = os.path.join(self.parent, f'{ROOT_PREFIX}{os.getpid()}')
+        os.makedirs(self.root, exist_ok=True)
+        self.slots: List[ProfileSlot] = []
+        self._lock = threading.Lock()
+
+    @property
+    def on_tmpfs(self) -> bool:
+        return filesystem_type(self.root) == 'tmpfs'
+
+    def acquire(self) -> ProfileSlot:
+        """A free slot with empty profile and cache directories."""
+        with self._lock:
+            slot = next((s for s in self.slots if not s.in_use), None)
+            if slot is None:
+                base = os.path.join(self.root, f'slot-{len(self.slots)}')
+                slot = ProfileSlot(len(self.slots), os.path.join(base, 'profile'), os.path.join(base, 'cache'))
+                os.makedirs(slot.profile)
+                os.makedirs(slot.cache)
+                self.slots.append(slot)
+            else:
+                wipe(slot.profile)
+                wipe(slot.cache)
+            slot.in_use = True
+            return slot
+
+    def release(self, slot: ProfileSlot):
+        with self._lock:
+            slot.in_use = False
+
+    def close(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        self.slots = []
+
+
+def _synthetic_profile(path: str, files: int = 1500, size: int = 4096):
+    """Roughly the shape of a fresh Chrome profile after a few page loads."""
+    payload = os.urandom(size)
+    for i in range(files):
+        directory = os.path.join(path, f'd{i % 40}', f'e{i % 7}')
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f'f{i}'), 'wb') as f:
+            f.write(payload)
+
+
+def _launch_into(slot: ProfileSlot, headless: bool) -> float:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service as ChromeService
+    from utils.browser_factory import chrome_options, chromedriver_path
+
+    options = chrome_options(headless)
+    for argument in slot.chrome_arguments():
+        options.add_argument(argument)
+    started = time.perf_counter()
+    driver = webdriver.Chrome(service=ChromeService(chromedriver_path()), options=options)
+    try:
+        driver.get('about:blank')
+        return time.perf_counter() - started
+    finally:
+        driver.quit()
+
+
+def benchmark(parents: List[str], launches: int, browser: bool, headless: bool) -> List[dict]:
+    results = []
+    for parent in parents:
+        store = ProfileStore(parent)
+        on_tmpfs = store.on_tmpfs
+        launch_times, reset_times = [], []
+        try:
+            for _ in range(launches):
+                slot = store.acquire()
+                if browser:
+                    launch_times.append(_launch_into(slot, headless))
+                else:
+                    _synthetic_profile(slot.profile)
+                store.release(slot)
+                started = time.perf_counter()
+                store.release(store.acquire())
+                reset_times.append(time.perf_counter() - started)
+        finally:
+            store.close()
+        results.append({
+            'root': parent,
+            'tmpfs': on_tmpfs,
+            'launch': median(launch_times) if launch_times else None,
+            'reset': median(reset_times),
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Chrome profile directory benchmark: disk vs tmpfs.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    bench = sub.add_parser('bench', help='Median launch and reset time per profile root')
+    bench.add_argument('--launches', type=int, default=5)
+    bench.add_argument('--disk', default=tempfile.gettempdir(), help='Disk-backed parent directory')
+    bench.add_argument('--tmpfs', default=SHM, help='RAM-backed parent directory')
+    bench.add_argument('--no-browser', action='store_true',
+                       help='Fill slots with a synthetic profile instead of launching Chrome')
+    bench.add_argument('--headed', action='store_true')
+    args = parser.parse_args(argv)
+
+    parents = [args.disk] + ([args.tmpfs] if tmpfs_available(args.tmpfs) else [])
+    if len(parents) == 1:
+        print(f"{args.tmpfs} is not available; measuring disk only")
+    print(f"{'root':24} {'tmpfs':>5} {'launch s':>9} {'reset ms':>9}")
+    for row in benchmark(parents, args.launches, not args.no_browser, not args.headed):
+        launch = f"{row['launch']:>9.2f}" if row['launch'] is not None else f"{'-':>9}"
+        print(f"{row['root'][:24]:24} {str(row['tmpfs']):>5} {launch} {row['reset'] * 1000:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
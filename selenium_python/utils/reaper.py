@@ -0,0 +1,184 @@
+"""
+BrowserReaper - no browser process outlives the test that launched it.
+
+BrowserFactory registers every browser it launches: the driver service PID
+plus the browser processes below it, identified by PID and start time so
+a recycled PID is never killed. Browser contexts are registered too.
+
+Reaping happens at test end (for that test's browsers), at session end
+(for everything, including the pooled browser) and on SIGINT/SIGTERM.
+A browser whose driver is still running is quit first; processes that
+survive that are terminated, then killed. Leaked counts are logged per
+test and summed up at session end.
+"""
+import os
+import time
+import signal
+import atexit
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from utils.resources import PROC, descendants, driver_pid, process_table
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+SESSION = 'session'
+
+
+def _running(table, pid: int, started: int) -> bool:
+    """Same process as recorded (not a reused PID) and not a zombie."""
+    stat = table.get(pid)
+    return stat is not None and stat.started == started and stat.state != 'Z'
+
+
+@dataclass
+class TrackedBrowser:
+    name: str
+    owner: str
+    driver: object
+    is_open: Callable[[], bool]
+    # pid -> start time, so a reused PID is not mistaken for ours
+    pids: Dict[int, int] = field(default_factory=dict)
+
+
+class BrowserReaper:
+    """Registry of launched browsers, keyed by the test (or session) that owns them."""
+
+    def __init__(self, grace: float = 3.0):
+        self.grace = grace
+        self.owner = SESSION
+        self.tracked: List[TrackedBrowser] = []
+        self.leaked: Dict[str, int] = {}
+        # Re-entrant: the SIGINT/SIGTERM handler reaps on the main thread,
+        # possibly while that thread is inside reap() already
+        self._lock = threading.RLock()
+
+    def begin(self, owner: str):
+        """Browsers launched from now on belong to `owner` (a test node ID)."""
+        self.owner = owner
+
+    def track(self, driver, name: str, session: bool = False):
+        """Register a launched browser process tree."""
+        pid = driver_pid(driver)
+        service = getattr(driver, 'service', None)
+        process = getattr(service, 'process', None)
+        entry = TrackedBrowser(
+            name, SESSION if session else self.owner, driver,
+            is_open=lambda: process is not None and process.poll() is None,
+        )
+        if pid is not None and os.path.isdir(PROC):
+            entry.pids = {p: stat.started for p, stat in descendants([pid]).items()}
+        with self._lock:
+            self.tracked.append(entry)
+        return driver
+
+    def track_context(self, driver, name: str, is_open: Callable[[], bool]):
+        """Register a browser context; it has no processes of its own."""
+        with self._lock:
+            self.tracked.append(TrackedBrowser(name, self.owner, driver, is_open=is_open))
+        return driver
+
+    def _alive(self, entry: TrackedBrowser, table) -> Dict[int, int]:
+        """Our processes that still run, plus anything they spawned since."""
+        ours = [pid for pid, started in entry.pids.items() if _running(table, pid, started)]
+        return {pid: stat.started for pid, stat in descendants(ours, table).items()
+                if stat.state != 'Z'}
+
+    def _terminate(self, pids: Dict[int, int]) -> int:
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            table = process_table()
+            alive = [pid for pid, started in pids.items() if _running(table, pid, started)]
+            if not alive:
+                return len(pids)
+            for pid in alive:
+                try:
+                    os.kill(pid, sig)
+                except OSError:
+                    pass
+            deadline = time.monotonic() + self.grace
+            while time.monotonic() < deadline:
+                table = process_table()
+                if not any(_running(table, pid, pids[pid]) for pid in alive):
+                    break
+                time.sleep(0.1)
+        return len(pids)
+
+    def reap(self, owner: Optional[str] = None) -> int:
+        """
+        Close what `owner` (default: every owner) left behind.
+        Returns the number of leaked browsers.
+        """
+        with self._lock:
+            entries = [e for e in self.tracked if owner is None or e.owner == owner]
+            self.tracked = [e for e in self.tracked if e not in entries]
+        leaked = 0
+        for entry in entries:
+            was_open = False
+            try:
+                was_open = entry.is_open()
+            except Exception:
+                pass
+            if was_open:
+                try:
+                    entry.driver.quit()
+                except Exception as e:
+                    log.debug(f"Quit of leaked {entry.name} failed: {type(e).__name__}")
+            stragglers = self._alive(entry, process_table()) if entry.pids else {}
+            # Chrome may still be shutting down after a regular quit()
+            deadline = time.monotonic() + self.grace
+            while stragglers and time.monotonic() < deadline:
+                time.sleep(0.1)
+                stragglers = self._alive(entry, process_table())
+            if stragglers:
+                killed = self._terminate(stragglers)
+                log.warning(f"  ⚠ Killed {killed} leftover processes of {entry.name} ({entry.owner})")
+            elif was_open:
+                log.warning(f"  ⚠ {entry.name} was left open by {entry.owner}; closed it")
+            if was_open or stragglers:
+                leaked += 1
+                self.leaked[entry.owner] = self.leaked.get(entry.owner, 0) + 1
+        return leaked
+
+    def summary(self):
+        if self.leaked:
+            total = sum(self.leaked.values())
+            log.warning(f"⚠ Reaped {total} leaked browsers:")
+            for owner, count in sorted(self.leaked.items()):
+                log.warning(f"    {count} × {owner}")
+
+
+_reaper: Optional[BrowserReaper] = None
+_previous_handlers: Dict[int, object] = {}
+
+
+def browser_reaper() -> BrowserReaper:
+    global _reaper
+    if _reaper is None:
+        _reaper = BrowserReaper()
+        atexit.register(_reaper.reap)
+    return _reaper
+
+
+def _on_signal(signum, frame):
+    log.warning(f"⚠ {signal.Signals(signum).name}: closing all browsers")
+    browser_reaper().reap()
+    previous = _previous_handlers.get(signum)
+    if callable(previous):
+        previous(signum, frame)
+    else:
+        # Default action (terminate) once the browsers are gone
+        signal.signal(signum, signal.SIG_DFL)
+        os.kill(os.getpid(), signum)
+
+
+def install_signal_handlers():
+    """Reap on SIGINT/SIGTERM, then hand over to the previous handler."""
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        if signum in _previous_handlers:
+            continue
+        _previous_handlers[signum] = signal.getsignal(signum)
+        signal.signal(signum, _on_signal)
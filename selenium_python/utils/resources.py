@@ -0,0 +1,227 @@
+"""
+ResourceMonitor - memory and CPU of the browsers a test uses.
+
+At the end of every top-level step the monitor samples, for each registered
+browser:
+  - RSS and CPU of the chromedriver/geckodriver process tree (the driver and
+    every browser process below it), read from /proc;
+  - the JS heap of the page via CDP Runtime.getHeapUsage (Chrome only).
+
+Browser contexts of one Chrome share a process tree, so their RSS/CPU
+figures are the same; the JS heap is per page. Peaks per browser are kept
+on the timeline and stored with the test result. A pooled Chrome that ends
+a test above RECYCLE_RSS_MB or RECYCLE_JS_HEAP_MB is replaced by a fresh one.
+
+Disable with RESOURCE_MONITOR=false.
+"""
+import os
+import time
+import threading
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from utils.cdp_events import supports_cdp
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+PROC = '/proc'
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+
+def resource_monitor_enabled() -> bool:
+    return os.getenv('RESOURCE_MONITOR', 'true').lower() == 'true' and os.path.isdir(PROC)
+
+
+class ProcStat(NamedTuple):
+    pid: int
+    state: str
+    ppid: int
+    ticks: int
+    rss: int
+    started: int
+
+
+def read_proc_stat(pid: int) -> Optional[ProcStat]:
+    """State, parent, CPU ticks, RSS bytes and start time of one process; None if it is gone."""
+    try:
+        with open(f'{PROC}/{pid}/stat') as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # comm may contain spaces and parentheses; fields resume after the last ')'
+    fields = stat[stat.rfind(')') + 2:].split()
+    return ProcStat(
+        pid=pid,
+        state=fields[0],
+        ppid=int(fields[1]),
+        ticks=int(fields[11]) + int(fields[12]),
+        rss=int(fields[21]) * PAGE_SIZE,
+        started=int(fields[19]),
+    )
+
+
+def process_table() -> Dict[int, ProcStat]:
+    table = {}
+    for entry in os.listdir(PROC):
+        if entry.isdigit():
+            stat = read_proc_stat(int(entry))
+            if stat is not None:
+                table[stat.pid] = stat
+    return table
+
+
+def descendants(roots: Iterable[int], table: Optional[Dict[int, ProcStat]] = None) -> Dict[int, ProcStat]:
+    """`roots` that are alive plus all processes below them."""
+    table = process_table() if table is None else table
+    children: Dict[int, List[int]] = {}
+    for stat in table.values():
+        children.setdefault(stat.ppid, []).append(stat.pid)
+    tree = {}
+    pending = list(roots)
+    while pending:
+        pid = pending.pop()
+        if pid in table and pid not in tree:
+            tree[pid] = table[pid]
+            pending.extend(children.get(pid, []))
+    return tree
+
+
+def process_tree(root_pid: int) -> Dict[int, Tuple[int, int]]:
+    """{pid: (cpu ticks, rss bytes)} for `root_pid` and all its descendants."""
+    return {pid: (stat.ticks, stat.rss) for pid, stat in descendants([root_pid]).items()}
+
+
+def driver_pid(driver) -> Optional[int]:
+    """PID of the local driver service process (chromedriver/geckodriver)."""
+    service = getattr(driver, 'service', None)
+    process = getattr(service, 'process', None)
+    return getattr(process, 'pid', None)
+
+
+def js_heap_usage(driver) -> Optional[int]:
+    """Used JS heap of the current page in bytes."""
+    if not supports_cdp(driver):
+        return None
+    try:
+        return int(driver.execute_cdp_cmd('Runtime.getHeapUsage', {})['usedSize'])
+    except Exception as e:
+        log.debug(f"JS heap unavailable: {type(e).__name__}")
+        return None
+
+
+@dataclass
+class BrowserResources:
+    """Peak figures of one browser during a test."""
+    browser: str
+    samples: int = 0
+    rss_mb: float = 0.0
+    peak_rss_mb: float = 0.0
+    peak_cpu: float = 0.0
+    js_heap_mb: Optional[float] = None
+    peak_js_heap_mb: Optional[float] = None
+    processes: int = 0
+    recycled: bool = False
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+@dataclass
+class _TreeCounter:
+    ticks: int
+    at: float = field(default_factory=time.perf_counter)
+
+
+class ResourceMonitor:
+    """Samples the browsers of one test at step boundaries."""
+
+    def __init__(self, browsers, timeline=None,
+                 max_rss_mb: Optional[float] = None, max_js_heap_mb: Optional[float] = None):
+        self.browsers = browsers
+        self.timeline = timeline
+        self.max_rss_mb = max_rss_mb if max_rss_mb is not None else float(os.getenv('RECYCLE_RSS_MB', '1500'))
+        self.max_js_heap_mb = (max_js_heap_mb if max_js_heap_mb is not None
+                               else float(os.getenv('RECYCLE_JS_HEAP_MB', '400')))
+        self.peaks: Dict[str, BrowserResources] = {}
+        self._counters: Dict[int, _TreeCounter] = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self.timeline is not None:
+            self.timeline.step_listeners.append(self._on_step_end)
+        return self
+
+    def stop(self):
+        if self.timeline is not None and self._on_step_end in self.timeline.step_listeners:
+            self.timeline.step_listeners.remove(self._on_step_end)
+
+    def _on_step_end(self, record):
+        # Nested steps end inside their parent; one sample per top-level step
+        if record.depth == 0:
+            self.sample()
+
+    def _tree_usage(self, pid: int) -> Optional[Tuple[float, float, int]]:
+        """(rss MB, cpu % since last sample, process count) of a driver's tree."""
+        tree = process_tree(pid)
+        if not tree:
+            return None
+        ticks = sum(t for t, _ in tree.values())
+        rss = sum(r for _, r in tree.values())
+        now = time.perf_counter()
+        cpu = 0.0
+        previous = self._counters.get(pid)
+        if previous is not None and now > previous.at:
+            cpu = max(0.0, (ticks - previous.ticks) / CLOCK_TICKS / (now - previous.at) * 100)
+        self._counters[pid] = _TreeCounter(ticks, now)
+        return rss / 1024 / 1024, cpu, len(tree)
+
+    def sample(self) -> Dict[str, BrowserResources]:
+        """Take one sample of every registered browser; returns the running peaks."""
+        with self._lock:
+            trees: Dict[int, Optional[Tuple[float, float, int]]] = {}
+            for name, driver in self.browsers.items():
+                peak = self.peaks.setdefault(name, BrowserResources(name))
+                pid = driver_pid(driver)
+                if pid is not None:
+                    if pid not in trees:
+                        trees[pid] = self._tree_usage(pid)
+                    usage = trees[pid]
+                    if usage is not None:
+                        rss_mb, cpu, processes = usage
+                        peak.rss_mb = round(rss_mb, 1)
+                        peak.peak_rss_mb = max(peak.peak_rss_mb, peak.rss_mb)
+                        peak.peak_cpu = max(peak.peak_cpu, round(cpu, 1))
+                        peak.processes = max(peak.processes, processes)
+                heap = js_heap_usage(driver)
+                if heap is not None:
+                    peak.js_heap_mb = round(heap / 1024 / 1024, 1)
+                    peak.peak_js_heap_mb = max(peak.peak_js_heap_mb or 0.0, peak.js_heap_mb)
+                peak.samples += 1
+            return self.peaks
+
+    def over_limit(self, name: str = 'main') -> bool:
+        """Did `name` end its last sample above a recycle threshold?"""
+        peak = self.peaks.get(name)
+        if peak is None:
+            return False
+        if peak.rss_mb > self.max_rss_mb:
+            log.warning(f"  ⚠ {name} at {peak.rss_mb:.0f} MB RSS (limit {self.max_rss_mb:.0f} MB)")
+            return True
+        if peak.js_heap_mb is not None and peak.js_heap_mb > self.max_js_heap_mb:
+            log.warning(f"  ⚠ {name} JS heap at {peak.js_heap_mb:.0f} MB (limit {self.max_js_heap_mb:.0f} MB)")
+            return True
+        return False
+
+    def report(self) -> List[Dict]:
+        """Per-browser peaks of this test, logged and returned for the results store."""
+        rows = []
+        for peak in self.peaks.values():
+            if not peak.samples:
+                continue
+            heap = f", JS heap {peak.peak_js_heap_mb:.0f} MB" if peak.peak_js_heap_mb is not None else ''
+            log.info(f"📈 {peak.browser}: peak {peak.peak_rss_mb:.0f} MB RSS in {peak.processes} processes, "
+                     f"CPU {peak.peak_cpu:.0f}%{heap}")
+            rows.append(peak.to_dict())
+        return rows
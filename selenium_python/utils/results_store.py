@@ -0,0 +1,450 @@
+"""
+ResultsStore - SQLite history of test runs and per-step timings.
+
+Every pytest session records one run (environment + git commit), each test
+outcome and the StepTimeline of that test. The CLI answers trend questions:
+
+    python -m utils.results_store slowest --runs 20
+    python -m utils.results_store regressions --since <commit>
+    python -m utils.results_store history "StorePage.add_first_product_from_home"
+    python -m utils.results_store pages --runs 20
+    python -m utils.results_store memory --runs 20
+    python -m utils.results_store impact --runs 20
+    python -m utils.results_store report
+"""
+import os
+import sqlite3
+import argparse
+import subprocess
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Set
+
+from utils.har import page_label
+
+DEFAULT_DB_PATH = os.path.join('test-results', 'results.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    git_commit TEXT,
+    browser TEXT,
+    headless INTEGER,
+    base_url TEXT,
+    worker TEXT
+);
+CREATE TABLE IF NOT EXISTS tests (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    nodeid TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS steps (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    test_id INTEGER NOT NULL REFERENCES tests(id),
+    seq INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    sleep REAL NOT NULL,
+    commands INTEGER NOT NULL,
+    outcome TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS attachments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    test_id INTEGER NOT NULL REFERENCES tests(id),
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS navigations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    test_id INTEGER NOT NULL REFERENCES tests(id),
+    step_seq INTEGER,
+    step TEXT,
+    browser TEXT,
+    url TEXT NOT NULL,
+    page TEXT NOT NULL,
+    ttfb REAL,
+    dom_content_loaded REAL,
+    load REAL,
+    fcp REAL,
+    lcp REAL,
+    cls REAL,
+    js_heap INTEGER,
+    resource_count INTEGER,
+    resource_transfer INTEGER
+);
+CREATE TABLE IF NOT EXISTS resources (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    test_id INTEGER NOT NULL REFERENCES tests(id),
+    browser TEXT NOT NULL,
+    samples INTEGER NOT NULL,
+    peak_rss_mb REAL,
+    peak_cpu REAL,
+    peak_js_heap_mb REAL,
+    processes INTEGER,
+    recycled INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS visits (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    test_id INTEGER NOT NULL REFERENCES tests(id),
+    url TEXT NOT NULL,
+    page TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tests_run ON tests(run_id);
+CREATE INDEX IF NOT EXISTS idx_navigations_page ON navigations(page);
+CREATE INDEX IF NOT EXISTS idx_steps_test ON steps(test_id);
+CREATE INDEX IF NOT EXISTS idx_steps_name ON steps(name);
+"""
+
+
+def current_git_commit() -> Optional[str]:
+    """Return HEAD commit hash, or None outside a git checkout."""
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def collect_environment() -> Dict:
+    """Describe the environment this session runs against."""
+    return {
+        'browser': os.getenv('BROWSER', 'chrome').lower(),
+        'headless': os.getenv('HEADLESS', 'false').lower() == 'true',
+        'base_url': os.getenv('BAGISTO_BASE_URL', 'https://commerce.bagisto.com'),
+        'worker': os.getenv('PYTEST_XDIST_WORKER', 'main'),
+        'git_commit': current_git_commit(),
+    }
+
+
+class ResultsStore:
+    """Thin wrapper around the results SQLite database."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv('RESULTS_DB', DEFAULT_DB_PATH)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Parallel workers share the file: WAL + busy timeout avoid lock errors
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def start_run(self, environment: Dict) -> int:
+        with self.conn:
+            cursor = self.conn.execute(
+                'INSERT INTO runs (started_at, git_commit, browser, headless, base_url, worker) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (
+                    datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                    environment.get('git_commit'),
+                    environment.get('browser'),
+                    int(bool(environment.get('headless'))),
+                    environment.get('base_url'),
+                    environment.get('worker'),
+                )
+            )
+        return cursor.lastrowid
+
+    def record_test(self, run_id: int, nodeid: str, outcome: str,
+                    duration: float, steps: List[Dict],
+                    attachments: Optional[Dict[str, str]] = None,
+                    navigations: Optional[List[Dict]] = None,
+                    resources: Optional[List[Dict]] = None,
+                    urls: Optional[List[str]] = None) -> int:
+        """Store one test result with its steps, page loads, browser peaks, visited URLs and artifacts."""
+        with self.conn:
+            cursor = self.conn.execute(
+                'INSERT INTO tests (run_id, nodeid, outcome, duration) VALUES (?, ?, ?, ?)',
+                (run_id, nodeid, outcome, duration)
+            )
+            test_id = cursor.lastrowid
+            self.conn.executemany(
+                'INSERT INTO steps (test_id, seq, name, depth, duration, sleep, commands, outcome) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (test_id, s['seq'], s['name'], s['depth'], s['duration'],
+                     s['sleep'], s['commands'], s['outcome'])
+                    for s in steps
+                ]
+            )
+            self.conn.executemany(
+                'INSERT INTO attachments (test_id, kind, path) VALUES (?, ?, ?)',
+                [(test_id, kind, path) for kind, path in (attachments or {}).items()]
+            )
+            self.conn.executemany(
+                'INSERT INTO navigations (test_id, step_seq, step, browser, url, page, ttfb, '
+                'dom_content_loaded, load, fcp, lcp, cls, js_heap, resource_count, resource_transfer) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (test_id, n.get('step_seq'), n.get('step'), n.get('browser'), n['url'],
+                     page_label(n['url']), n.get('ttfb'), n.get('dom_content_loaded'), n.get('load'),
+                     n.get('fcp'), n.get('lcp'), n.get('cls'), n.get('js_heap'),
+                     n.get('resource_count'), n.get('resource_transfer'))
+                    for n in (navigations or [])
+                ]
+            )
+            self.conn.executemany(
+                'INSERT INTO resources (test_id, browser, samples, peak_rss_mb, peak_cpu, '
+                'peak_js_heap_mb, processes, recycled) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (test_id, r['browser'], r['samples'], r.get('peak_rss_mb'), r.get('peak_cpu'),
+                     r.get('peak_js_heap_mb'), r.get('processes'), int(bool(r.get('recycled'))))
+                    for r in (resources or [])
+                ]
+            )
+            # Opened with driver.get() or reached by clicking (page-load metrics)
+            visited = dict.fromkeys(list(urls or []) + [n['url'] for n in navigations or []])
+            self.conn.executemany(
+                'INSERT INTO visits (test_id, url, page) VALUES (?, ?, ?)',
+                [(test_id, url, page_label(url)) for url in visited if url.startswith('http')]
+            )
+        return test_id
+
+    def slowest_steps(self, last_runs: int = 20, limit: int = 10) -> List[sqlite3.Row]:
+        """Steps with the highest average duration over the last N runs."""
+        return self.conn.execute(
+            """
+            SELECT s.name, COUNT(*) AS samples,
+                   AVG(s.duration) AS avg_duration, MAX(s.duration) AS max_duration,
+                   AVG(s.sleep) AS avg_sleep, AVG(s.commands) AS avg_commands
+            FROM steps s
+            JOIN tests t ON t.id = s.test_id
+            WHERE t.run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?)
+            GROUP BY s.name
+            ORDER BY avg_duration DESC
+            LIMIT ?
+            """,
+            (last_runs, limit)
+        ).fetchall()
+
+    def regressions(self, since_commit: str, threshold: float = 0.2) -> List[sqlite3.Row]:
+        """
+        Steps whose average duration grew by more than `threshold` (fraction)
+        in runs at/after the first run of `since_commit` compared to before it.
+        """
+        row = self.conn.execute(
+            'SELECT MIN(id) AS first_id FROM runs WHERE git_commit LIKE ?',
+            (since_commit + '%',)
+        ).fetchone()
+        if row is None or row['first_id'] is None:
+            raise ValueError(f"No recorded runs for commit {since_commit}")
+        return self.conn.execute(
+            """
+            SELECT s.name,
+                   AVG(CASE WHEN t.run_id < :first THEN s.duration END) AS before_avg,
+                   AVG(CASE WHEN t.run_id >= :first THEN s.duration END) AS after_avg
+            FROM steps s
+            JOIN tests t ON t.id = s.test_id
+            GROUP BY s.name
+            HAVING before_avg IS NOT NULL AND after_avg IS NOT NULL
+               AND after_avg > before_avg * (1 + :threshold)
+            ORDER BY after_avg - before_avg DESC
+            """,
+            {'first': row['first_id'], 'threshold': threshold}
+        ).fetchall()
+
+    def page_metrics(self, last_runs: int = 20) -> List[sqlite3.Row]:
+        """Average browser metrics per storefront page over the last N runs."""
+        return self.conn.execute(
+            """
+            SELECT n.page, COUNT(*) AS samples,
+                   AVG(n.ttfb) AS ttfb, AVG(n.dom_content_loaded) AS dcl, AVG(n.load) AS load,
+                   AVG(n.lcp) AS lcp, AVG(n.cls) AS cls, MAX(n.js_heap) AS max_heap,
+                   AVG(n.resource_count) AS resources
+            FROM navigations n
+            JOIN tests t ON t.id = n.test_id
+            WHERE t.run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?)
+            GROUP BY n.page
+            ORDER BY load DESC
+            """,
+            (last_runs,)
+        ).fetchall()
+
+    def memory_peaks(self, last_runs: int = 20) -> List[sqlite3.Row]:
+        """Peak browser memory per scenario and browser over the last N runs."""
+        return self.conn.execute(
+            """
+            SELECT t.nodeid, r.browser, COUNT(*) AS samples,
+                   AVG(r.peak_rss_mb) AS avg_rss, MAX(r.peak_rss_mb) AS max_rss,
+                   MAX(r.peak_js_heap_mb) AS max_heap, MAX(r.peak_cpu) AS max_cpu,
+                   SUM(r.recycled) AS recycled
+            FROM resources r
+            JOIN tests t ON t.id = r.test_id
+            WHERE t.run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?)
+            GROUP BY t.nodeid, r.browser
+            ORDER BY max_rss DESC
+            """,
+            (last_runs,)
+        ).fetchall()
+
+    def impact_map(self, last_runs: int = 20) -> Dict[str, Dict[str, Set[str]]]:
+        """
+        {nodeid: {'methods': page-object steps, 'pages': storefront pages}}
+        each scenario exercised in any of the last N runs.
+        """
+        result: Dict[str, Dict[str, Set[str]]] = {}
+        recent = 'SELECT id FROM runs ORDER BY id DESC LIMIT ?'
+        for kind, query in (
+                ('methods', f'SELECT DISTINCT t.nodeid, s.name FROM steps s JOIN tests t ON t.id = s.test_id '
+                            f'WHERE t.run_id IN ({recent})'),
+                ('pages', f'SELECT DISTINCT t.nodeid, v.page FROM visits v JOIN tests t ON t.id = v.test_id '
+                          f'WHERE t.run_id IN ({recent})')):
+            for nodeid, name in self.conn.execute(query, (last_runs,)):
+                entry = result.setdefault(nodeid, {'methods': set(), 'pages': set()})
+                entry[kind].add(name)
+        return result
+
+    def run_report(self, run_id: Optional[int] = None) -> List[Dict]:
+        """Tests of one run (default: latest) with their steps and attachments."""
+        if run_id is None:
+            row = self.conn.execute('SELECT MAX(id) AS id FROM runs').fetchone()
+            run_id = row['id']
+        report = []
+        for test in self.conn.execute(
+                'SELECT id, nodeid, outcome, duration FROM tests WHERE run_id = ? ORDER BY id',
+                (run_id,)):
+            report.append({
+                'nodeid': test['nodeid'],
+                'outcome': test['outcome'],
+                'duration': test['duration'],
+                'steps': self.conn.execute(
+                    'SELECT name, depth, duration, sleep, commands, outcome FROM steps '
+                    'WHERE test_id = ? ORDER BY seq', (test['id'],)
+                ).fetchall(),
+                'attachments': self.conn.execute(
+                    'SELECT kind, path FROM attachments WHERE test_id = ? ORDER BY kind',
+                    (test['id'],)
+                ).fetchall(),
+                'resources': self.conn.execute(
+                    'SELECT browser, peak_rss_mb, peak_cpu, peak_js_heap_mb, processes, recycled '
+                    'FROM resources WHERE test_id = ? ORDER BY id', (test['id'],)
+                ).fetchall(),
+            })
+        return report
+
+    def step_history(self, name: str, last_runs: int = 20) -> List[sqlite3.Row]:
+        """Per-run timings of one step, newest first."""
+        return self.conn.execute(
+            """
+            SELECT r.id AS run_id, r.started_at, r.git_commit, t.nodeid,
+                   s.duration, s.sleep, s.commands, s.outcome
+            FROM steps s
+            JOIN tests t ON t.id = s.test_id
+            JOIN runs r ON r.id = t.run_id
+            WHERE s.name = ?
+              AND r.id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?)
+            ORDER BY r.id DESC, s.seq
+            """,
+            (name, last_runs)
+        ).fetchall()
+
+
+def _fmt(value, spec: str) -> str:
+    """Format a nullable number, keeping column alignment for missing values."""
+    if value is None:
+        return format('-', spec.split('.')[0])
+    return format(value, spec)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Query recorded test step timings.')
+    parser.add_argument('--db', default=None, help='Path to results database')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    slowest = sub.add_parser('slowest', help='Slowest steps over the last N runs')
+    slowest.add_argument('--runs', type=int, default=20)
+    slowest.add_argument('--limit', type=int, default=10)
+
+    regress = sub.add_parser('regressions', help='Steps that got slower since a commit')
+    regress.add_argument('--since', required=True, help='Commit hash (prefix allowed)')
+    regress.add_argument('--threshold', type=float, default=0.2,
+                         help='Minimum relative slowdown (default 0.2 = 20%%)')
+
+    pages = sub.add_parser('pages', help='Average page-load metrics per storefront page')
+    pages.add_argument('--runs', type=int, default=20)
+
+    memory = sub.add_parser('memory', help='Peak browser memory per scenario')
+    memory.add_argument('--runs', type=int, default=20)
+
+    impact = sub.add_parser('impact', help='Page-object methods and pages each scenario touched')
+    impact.add_argument('--runs', type=int, default=20)
+
+    report = sub.add_parser('report', help='Step timing report of one run, with artifact links')
+    report.add_argument('--run', type=int, default=None, help='Run id (default: latest)')
+
+    history = sub.add_parser('history', help='Timings of one step per run')
+    history.add_argument('step')
+    history.add_argument('--runs', type=int, default=20)
+
+    args = parser.parse_args(argv)
+    store = ResultsStore(args.db)
+    try:
+        if args.command == 'slowest':
+            print(f"{'step':50} {'n':>4} {'avg s':>8} {'max s':>8} {'sleep s':>8} {'cmds':>6}")
+            for row in store.slowest_steps(args.runs, args.limit):
+                print(f"{row['name']:50} {row['samples']:>4} {row['avg_duration']:>8.2f} "
+                      f"{row['max_duration']:>8.2f} {row['avg_sleep']:>8.2f} {row['avg_commands']:>6.0f}")
+        elif args.command == 'regressions':
+            try:
+                rows = store.regressions(args.since, args.threshold)
+            except ValueError as e:
+                parser.error(str(e))
+            print(f"{'step':50} {'before s':>9} {'after s':>9} {'change':>8}")
+            for row in rows:
+                change = (row['after_avg'] / row['before_avg'] - 1) * 100 if row['before_avg'] else 0
+                print(f"{row['name']:50} {row['before_avg']:>9.2f} {row['after_avg']:>9.2f} {change:>7.0f}%")
+        elif args.command == 'pages':
+            print(f"{'page':24} {'n':>4} {'ttfb ms':>8} {'dcl ms':>8} {'load ms':>8} "
+                  f"{'lcp ms':>8} {'cls':>6} {'heap MB':>8} {'res':>5}")
+            for row in store.page_metrics(args.runs):
+                heap = row['max_heap'] / 1024 / 1024 if row['max_heap'] else None
+                print(f"{row['page'][:24]:24} {row['samples']:>4} {_fmt(row['ttfb'], '>8.0f')} "
+                      f"{_fmt(row['dcl'], '>8.0f')} {_fmt(row['load'], '>8.0f')} {_fmt(row['lcp'], '>8.0f')} "
+                      f"{_fmt(row['cls'], '>6.3f')} {_fmt(heap, '>8.1f')} {_fmt(row['resources'], '>5.0f')}")
+        elif args.command == 'memory':
+            print(f"{'test':60} {'browser':8} {'n':>4} {'avg MB':>7} {'max MB':>7} "
+                  f"{'heap MB':>8} {'cpu %':>6} {'recyc':>5}")
+            for row in store.memory_peaks(args.runs):
+                print(f"{row['nodeid'][-60:]:60} {row['browser'][:8]:8} {row['samples']:>4} "
+                      f"{_fmt(row['avg_rss'], '>7.0f')} {_fmt(row['max_rss'], '>7.0f')} "
+                      f"{_fmt(row['max_heap'], '>8.1f')} {_fmt(row['max_cpu'], '>6.0f')} {row['recycled']:>5}")
+        elif args.command == 'impact':
+            for nodeid, touched in sorted(store.impact_map(args.runs).items()):
+                print(f"\n{nodeid}")
+                print(f"  methods: {', '.join(sorted(touched['methods'])) or '-'}")
+                print(f"  pages:   {', '.join(sorted(touched['pages'])) or '-'}")
+        elif args.command == 'report':
+            for test in store.run_report(args.run):
+                print(f"\n{test['nodeid']}  {test['outcome']}  {test['duration']:.1f}s")
+                for step in test['steps']:
+                    indent = '  ' * (step['depth'] + 1)
+                    print(f"{indent}{step['name']:<{50 - len(indent)}} {step['duration']:>7.2f}s "
+                          f"sleep={step['sleep']:.2f}s cmds={step['commands']} {step['outcome']}")
+                for res in test['resources']:
+                    recycled = ' recycled' if res['recycled'] else ''
+                    print(f"  memory {res['browser']}: {_fmt(res['peak_rss_mb'], '.0f')} MB RSS, "
+                          f"{_fmt(res['peak_js_heap_mb'], '.1f')} MB JS heap, "
+                          f"{_fmt(res['peak_cpu'], '.0f')}% CPU{recycled}")
+                for attachment in test['attachments']:
+                    print(f"  {attachment['kind']}: {attachment['path']}")
+        elif args.command == 'history':
+            for row in store.step_history(args.step, args.runs):
+                commit = (row['git_commit'] or '-')[:8]
+                print(f"run {row['run_id']:>4} {row['started_at']} {commit} {row['duration']:>7.2f}s "
+                      f"sleep={row['sleep']:.2f}s cmds={row['commands']} {row['outcome']} {row['nodeid']}")
+    finally:
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+"""
+StepTimeline - per-test timing of page-object steps.
+
+Every public StorePage/AdminPage method decorated with @timed_step becomes
+a step. For each step we record wall-clock duration, time spent in blind
+time.sleep() calls and the number of WebDriver commands sent. Page loads
+inside a step carry browser performance metrics (see perf_metrics).
+"""
+import sys
+import time
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Callable
+
+_real_sleep = time.sleep
+_active: Optional['StepTimeline'] = None
+# Per-thread flag set by untimed()
+_local = threading.local()
+
+
+class StepRecord:
+    """Timing data for a single step."""
+
+    def __init__(self, name: str, seq: int, depth: int):
+        self.name = name
+        self.seq = seq
+        self.depth = depth
+        self.started_at = time.time()
+        self.duration = 0.0
+        self.sleep = 0.0
+        self.commands = 0
+        self.outcome = 'passed'
+        # Only sleeps on the thread that runs the step are its blind waits
+        self.thread = threading.get_ident()
+
+    def to_dict(self) -> Dict:
+        return {
+            'seq': self.seq,
+            'name': self.name,
+            'depth': self.depth,
+            'started_at': self.started_at,
+            'duration': round(self.duration, 3),
+            'sleep': round(self.sleep, 3),
+            'commands': self.commands,
+            'outcome': self.outcome,
+        }
+
+
+class StepTimeline:
+    """Collects StepRecords for one test."""
+
+    def __init__(self, test_id: str):
+        self.test_id = test_id
+        self.steps: List[StepRecord] = []
+        self.step_listeners: List[Callable[[StepRecord], None]] = []
+        self.attachments: Dict[str, str] = {}
+        self.navigations: List[Dict] = []
+        self.resources: List[Dict] = []
+        # URLs opened with driver.get(), for test impact analysis
+        self.urls: List[str] = []
+        self._open: List[StepRecord] = []
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> Optional[StepRecord]:
+        """Innermost open step, if any."""
+        return self._open[-1] if self._open else None
+
+    @contextmanager
+    def step(self, name: str):
+        """Time the enclosed block as a step (steps may nest)."""
+        with self._lock:
+            record = StepRecord(name, len(self.steps) + 1, len(self._open))
+            self.steps.append(record)
+            self._open.append(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException:
+            record.outcome = 'failed'
+            raise
+        finally:
+            record.duration = time.perf_counter() - start
+            with self._lock:
+                if record in self._open:
+                    self._open.remove(record)
+            for listener in self.step_listeners:
+                listener(record)
+
+    def record_sleep(self, seconds: float):
+        # Nested steps include their children's totals, like duration does.
+        # Background threads (crawler, watchers, monitors) sleep on their own.
+        thread = threading.get_ident()
+        with self._lock:
+            for record in self._open:
+                if record.thread == thread:
+                    record.sleep += seconds
+
+    def record_command(self, command: str):
+        with self._lock:
+            for record in self._open:
+                record.commands += 1
+
+    def sleep(self, seconds: float):
+        """Drop-in replacement for time.sleep() that accounts blind waits."""
+        # WebDriverWait polling also goes through time.sleep - that is an
+        # explicit wait, not a blind sleep, so only count our own callers.
+        caller = sys._getframe(1).f_globals.get('__name__', '')
+        if not caller.startswith('selenium'):
+            self.record_sleep(seconds)
+        _real_sleep(seconds)
+
+    def record_navigation(self, metrics: Dict):
+        """Attach browser performance metrics of a page load to the running step."""
+        with self._lock:
+            step = self._open[-1] if self._open else None
+            metrics = dict(metrics, step=step.name if step else None, step_seq=step.seq if step else None)
+            self.navigations.append(metrics)
+
+    def record_url(self, url: str):
+        with self._lock:
+            if url not in self.urls:
+                self.urls.append(url)
+
+    def attach(self, kind: str, path: str):
+        """Link an artifact (e.g. a HAR file) to this test's timing report."""
+        self.attachments[kind] = path
+
+    def summary(self) -> List[Dict]:
+        return [record.to_dict() for record in self.steps]
+
+
+def current_timeline() -> Optional[StepTimeline]:
+    """Return the timeline of the running test, if any."""
+    return _active
+
+
+def activate_timeline(timeline: Optional[StepTimeline]):
+    """Make `timeline` the target of @timed_step and command counting."""
+    global _active
+    _active = timeline
+
+
+@contextmanager
+def untimed():
+    """Keep WebDriver commands this thread sends off the timeline (background watchers)."""
+    previous = getattr(_local, 'untimed', False)
+    _local.untimed = True
+    try:
+        yield
+    finally:
+        _local.untimed = previous
+
+
+def timed_step(func):
+    """Record a page-object method call as a step on the active timeline."""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        timeline = _active
+        if timeline is None:
+            return func(self, *args, **kwargs)
+        with timeline.step(f"{type(self).__name__}.{func.__name__}"):
+            return func(self, *args, **kwargs)
+    return wrapper
+
+
+def instrument_driver(driver):
+    """
+    Count WebDriver commands sent through `driver`.
+    WebElements call back into their parent driver's execute(), so wrapping
+    the instance method covers element commands too.
+    """
+    if getattr(driver, '_command_listeners', None) is not None:
+        return driver
+    listeners = []
+    pre_listeners = []
+    driver._command_listeners = listeners
+    driver._command_pre_listeners = pre_listeners
+    original_execute = driver.execute
+
+    def execute(driver_command, params=None):
+        timeline = _active
+        if timeline is not None and not getattr(_local, 'untimed', False):
+            timeline.record_command(driver_command)
+            if driver_command == 'get' and params:
+                timeline.record_url(params.get('url', ''))
+        for listener in pre_listeners:
+            listener(driver_command, params)
+        if not listeners:
+            return original_execute(driver_command, params)
+        started = time.perf_counter()
+        error = None
+        try:
+            return original_execute(driver_command, params)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            for listener in listeners:
+                listener(driver_command, params, elapsed, error)
+
+    driver.execute = execute
+    return driver
+
+
+def add_command_listener(driver, listener, before: bool = False):
+    """
+    Call `listener(command, params, duration, error)` after every command,
+    or `listener(command, params)` before it when `before` is set.
+    """
+    instrument_driver(driver)
+    if before:
+        driver._command_pre_listeners.append(listener)
+    else:
+        driver._command_listeners.append(listener)
+
+
+def remove_command_listener(driver, listener):
+    for attr in ('_command_listeners', '_command_pre_listeners'):
+        listeners = getattr(driver, attr, None) or []
+        if listener in listeners:
+            listeners.remove(listener)
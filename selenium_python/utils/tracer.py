@@ -0,0 +1,157 @@
+"""
+CdpTracer - Selenium counterpart of Playwright's `trace: 'on-first-retry'`.
+
+While a test runs, the tracer keeps bounded ring buffers of
+- WebDriver commands (name, trimmed params, duration, error)
+- CDP Network/Page events from the chromedriver performance log
+- DOM snapshots taken at the end of each top-level page-object step
+
+Nothing touches the disk unless the test fails or is rerun; green runs only
+pay for appending to in-memory deques. Enable with TRACE=on-failure
+(Chrome only).
+"""
+import os
+import gzip
+import json
+import time
+import zlib
+from collections import deque
+from typing import Dict, Optional
+
+from utils.cdp_events import event_pump, supports_cdp
+from utils.timeline import add_command_listener, remove_command_listener
+from utils.log import get_logger
+
+log = get_logger(__name__)
+
+TRACED_EVENT_PREFIXES = ('Network.', 'Page.')
+# Commands the tracer issues itself; recording them would only add noise
+INTERNAL_COMMANDS = {'getLog', 'executeCdpCommand'}
+
+
+def tracing_enabled() -> bool:
+    return os.getenv('TRACE', 'off').lower() in ('on-failure', 'on-first-retry', 'on')
+
+
+def _trim(value, limit: int = 200):
+    """Keep command params small: long strings (scripts, keys) are cut."""
+    if isinstance(value, str):
+        return value if len(value) <= limit else value[:limit] + '…'
+    if isinstance(value, dict):
+        return {k: _trim(v, limit) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_trim(v, limit) for v in value[:20]]
+    return value
+
+
+class CdpTracer:
+    """Ring-buffered trace of one Chrome driver."""
+
+    def __init__(self, driver, name: str = 'main', max_events: Optional[int] = None,
+                 max_commands: Optional[int] = None, max_snapshot_bytes: Optional[int] = None):
+        self.driver = driver
+        self.name = name
+        self.events = deque(maxlen=max_events or int(os.getenv('TRACE_MAX_EVENTS', '5000')))
+        self.commands = deque(maxlen=max_commands or int(os.getenv('TRACE_MAX_COMMANDS', '2000')))
+        self.snapshots = deque()
+        self.max_snapshot_bytes = max_snapshot_bytes or int(
+            os.getenv('TRACE_MAX_SNAPSHOT_BYTES', str(16 * 1024 * 1024))
+        )
+        self._snapshot_bytes = 0
+        self._pump = event_pump(driver)
+        self._timeline = None
+        self._busy = False
+
+    def start(self, timeline=None):
+        """Begin recording; snapshots are taken at `timeline` step ends."""
+        add_command_listener(self.driver, self._on_command)
+        self._pump.subscribe(self._on_event)
+        if timeline is not None:
+            self._timeline = timeline
+            timeline.step_listeners.append(self._on_step_end)
+        return self
+
+    def stop(self):
+        remove_command_listener(self.driver, self._on_command)
+        self._pump.unsubscribe(self._on_event)
+        if self._timeline is not None and self._on_step_end in self._timeline.step_listeners:
+            self._timeline.step_listeners.remove(self._on_step_end)
+        self._timeline = None
+
+    def _on_command(self, command, params, duration, error):
+        if self._busy or command in INTERNAL_COMMANDS:
+            return
+        self.commands.append({
+            'ts': time.time(),
+            'command': command,
+            'params': _trim(params or {}),
+            'duration': round(duration, 4),
+            'error': error,
+        })
+
+    def _on_event(self, event: Dict):
+        if event['method'].startswith(TRACED_EVENT_PREFIXES):
+            self.events.append(event)
+
+    def _on_step_end(self, record):
+        # Nested steps share the parent's page; one snapshot per top-level step
+        if record.depth == 0:
+            self.checkpoint(record.name)
+
+    def checkpoint(self, label: str):
+        """Drain pending CDP events and keep a DOM snapshot labelled `label`."""
+        self._busy = True
+        try:
+            self._pump.pump()
+            snapshot = self.driver.execute_cdp_cmd('DOMSnapshot.captureSnapshot', {'computedStyles': []})
+            url = self.driver.current_url
+        except Exception as e:
+            log.debug(f"Trace checkpoint skipped: {type(e).__name__}")
+            return
+        finally:
+            self._busy = False
+        blob = zlib.compress(json.dumps(snapshot).encode('utf-8'), 1)
+        self.snapshots.append({'ts': time.time(), 'label': label, 'url': url, 'data': blob})
+        self._snapshot_bytes += len(blob)
+        # Bounded by compressed size; always keep the newest snapshot
+        while self._snapshot_bytes > self.max_snapshot_bytes and len(self.snapshots) > 1:
+            self._snapshot_bytes -= len(self.snapshots.popleft()['data'])
+
+    def export(self, label: str = 'failure') -> Dict:
+        """Final checkpoint, then hand over the buffers (cheap: no encoding)."""
+        self.checkpoint(label)
+        trace = {
+            'browser': self.name,
+            'commands': list(self.commands),
+            'events': list(self.events),
+            'snapshots': list(self.snapshots),
+        }
+        self.discard()
+        return trace
+
+    def discard(self):
+        self.events.clear()
+        self.commands.clear()
+        self.snapshots.clear()
+        self._snapshot_bytes = 0
+
+
+def write_trace(path: str, trace: Dict):
+    """Serialise a trace exported by CdpTracer (runs on the writer thread)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    trace = dict(trace)
+    trace['snapshots'] = [
+        dict(s, data=json.loads(zlib.decompress(s['data']))) for s in trace['snapshots']
+    ]
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump(trace, f)
+
+
+def start_tracer(driver, name: str, timeline=None) -> Optional[CdpTracer]:
+    """Start a tracer if TRACE is enabled and the driver speaks CDP."""
+    if not tracing_enabled():
+        return None
+    if not supports_cdp(driver):
+        log.info(f"  ℹ Tracing skipped for {name}: driver has no CDP support")
+        return None
+    return CdpTracer(driver, name).start(timeline)
@@ -0,0 +1,142 @@
+"""
+Watch mode - re-run the scenarios an edit affects, against warm browsers.
+
+    python -m utils.watch                   # or: ./run-tests.sh watch
+    python -m utils.watch --start-daemon    # also start the browser daemon
+    python -m utils.watch --dry-run         # only print what would run
+
+Polls pages/*.py and tests/test_bagisto_s*.py. On a save it compares the
+file with its previous version symbol by symbol (see utils.callgraph):
+  - a changed page-object method or module-level name re-runs every
+    scenario whose static call closure reaches it;
+  - a changed scenario file re-runs its changed tests (all of the file's
+    tests if module-level code changed).
+Runs use BROWSER_DAEMON=true so they attach to the daemon's browsers.
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+import subprocess
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.callgraph import CallGraph, PAGES_GLOB, TESTS_GLOB, changed_symbols, module_name
+from utils.browser_daemon import DaemonClient
+
+Snapshot = Dict[str, Tuple[float, str]]
+
+
+def watched_files() -> List[str]:
+    return sorted(glob.glob(PAGES_GLOB) + glob.glob(TESTS_GLOB))
+
+
+def snapshot(previous: Optional[Snapshot] = None) -> Snapshot:
+    """{path: (mtime, source)}; unchanged files are not re-read."""
+    result = {}
+    for path in watched_files():
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            continue
+        if previous and path in previous and previous[path][0] == mtime:
+            result[path] = previous[path]
+        else:
+            with open(path) as f:
+                result[path] = (mtime, f.read())
+    return result
+
+
+def affected_by(graph: CallGraph, path: str, old_source: Optional[str], new_source: str) -> Set[str]:
+    """Node IDs to re-run for one edited file."""
+    changed = changed_symbols(old_source, new_source, module_name(path))
+    if not changed:
+        return set()
+    if path.startswith('tests' + os.sep):
+        return graph.changed_tests(path, changed)
+    return set(graph.affected_tests(changed))
+
+
+def changes(before: Snapshot, after: Snapshot) -> List[Tuple[str, Optional[str], str]]:
+    return [(path, before[path][1] if path in before else None, after[path][1])
+            for path in after if path not in before or before[path][0] != after[path][0]]
+
+
+def run(nodeids: List[str], extra_args: List[str]) -> int:
+    env = dict(os.environ, BROWSER_DAEMON='true')
+    command = [sys.executable, '-m', 'pytest', '-q', *extra_args, *nodeids]
+    print(f"\n▶ {' '.join(command[3:])}", flush=True)
+    started = time.perf_counter()
+    code = subprocess.call(command, env=env)
+    print(f"{'✅' if code == 0 else '❌'} {len(nodeids)} scenario(s) in {time.perf_counter() - started:.1f}s",
+          flush=True)
+    return code
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Re-run affected scenarios on every save.')
+    parser.add_argument('--interval', type=float, default=0.5, help='Polling interval in seconds')
+    parser.add_argument('--dry-run', action='store_true', help='Print affected scenarios only')
+    parser.add_argument('--start-daemon', action='store_true', help='Start the browser daemon for this session')
+    parser.add_argument('pytest_args', nargs=argparse.REMAINDER, help='Extra pytest arguments after --')
+    args = parser.parse_args(argv)
+    extra = [a for a in args.pytest_args if a != '--']
+
+    daemon = None
+    if args.start_daemon and not DaemonClient().available():
+        daemon = subprocess.Popen([sys.executable, '-m', 'utils.browser_daemon', 'start'])
+        print("⏳ Starting browser daemon...", flush=True)
+        deadline = time.monotonic() + 120
+        while time.monotonic() < deadline and not DaemonClient().available():
+            time.sleep(1)
+    if not args.dry_run and not DaemonClient().available():
+        print("⚠️  No browser daemon running - runs will launch fresh browsers "
+              "(start one with --start-daemon or ./run-tests.sh daemon)", flush=True)
+
+    graph = CallGraph.build()
+    state = snapshot()
+    last_error = None
+    print(f"👀 Watching {len(state)} files ({len(graph.tests)} scenarios). Ctrl+C to stop.", flush=True)
+    try:
+        while True:
+            time.sleep(args.interval)
+            current = snapshot(state)
+            edited = changes(state, current)
+            if not edited:
+                continue
+            # Let the editor finish writing (atomic saves touch files twice)
+            time.sleep(0.2)
+            current = snapshot(current)
+            edited = changes(state, current)
+            try:
+                graph = CallGraph.build()
+            except SyntaxError as e:
+                error = f"{e.filename}:{e.lineno}: {e.msg}"
+                if error != last_error:
+                    print(f"⚠️  {error} - waiting for a valid save", flush=True)
+                    last_error = error
+                continue
+            last_error = None
+            selected: Set[str] = set()
+            for path, old_source, new_source in edited:
+                affected = affected_by(graph, path, old_source, new_source)
+                print(f"✏️  {path}: {len(affected)} scenario(s) affected", flush=True)
+                selected |= affected
+            state = current
+            if not selected:
+                continue
+            nodeids = sorted(selected)
+            if args.dry_run:
+                print('\n'.join(f"   {n}" for n in nodeids), flush=True)
+            else:
+                run(nodeids, extra)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if daemon is not None:
+            daemon.terminate()
+            daemon.wait(timeout=60)
+
+
+if __name__ == '__main__':
+    main()